@@ -62,6 +62,8 @@ class PredictiveModelConfig:
     n_cv_splits: int = 5
     scale_features: bool = True
     random_state: int = 42
+    train_workers: int = 1  # processes for (model × fold) jobs; 1 = in-process, 0 = all cores
+    train_cpu_budget: int = 0  # cores shared by workers and model n_jobs (0 = all)
 
 
 @dataclass
@@ -132,6 +134,8 @@ class AIConfig:
     model_dir: Path = field(default_factory=lambda: BASE_DIR / "models")
     cache_ttl_seconds: int = 300
     log_predictions: bool = True
+    pipeline_workers: int = 4  # feature-building threads in analyze_many
+    pipeline_batch_size: int = 16  # symbols per batched predict/regime call
 
     def __post_init__(self) -> None:
         self.model_dir.mkdir(parents=True, exist_ok=True)
@@ -12,14 +12,20 @@ Typical usage:
     ...     df=ohlcv_data, indicators=indicator_dict,
     ... )
     >>> print(result.ml_signal, result.recommendations)
+    >>> for res in pipeline.analyze_many(watchlist):   # streams as batches finish
+    ...     print(res.symbol, res.ml_signal, res.stage_ms)
 """
 
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -37,6 +43,46 @@ from ai_core.decision_optimizer import DecisionOptimizer, TradeDecision
 
 logger = logging.getLogger(__name__)
 
+STAGES = ("features", "predict", "regime", "recommend", "sentiment", "optimize", "total")
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Bucketed latency counts plus a window of recent samples for percentiles."""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS, window: int = 1000) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._recent: deque = deque(maxlen=window)
+
+    def add(self, ms: float) -> None:
+        self.counts[bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self._recent.append(ms)
+
+    def summary(self) -> Dict[str, Any]:
+        recent = sorted(self._recent)
+
+        def pct(p: float) -> Optional[float]:
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))], 2)
+
+        labels = [f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
 
 @dataclass
 class PipelineResult:
@@ -65,6 +111,7 @@ class PipelineResult:
 
     # Metadata
     processing_time_ms: float = 0.0
+    stage_ms: Dict[str, float] = field(default_factory=dict)
     errors: List[str] = field(default_factory=list)
 
 
@@ -101,6 +148,8 @@ class AIPipeline:
         self.optimizer = DecisionOptimizer(account_balance, self._config)
 
         self._is_ready = False
+        self._latency = {stage: LatencyHistogram() for stage in STAGES}
+        self._latency_lock = threading.Lock()
 
     @property
     def is_ready(self) -> bool:
@@ -227,9 +276,15 @@ class AIPipeline:
 
         # Stage 1: Feature engineering + ML prediction
         try:
-            features, _ = build_feature_matrix(df, indicators)
+            t = time.perf_counter()
+            features, _ = build_feature_matrix(
+                df, indicators, symbol=symbol, timeframe=timeframe,
+            )
+            self._record(result, "features", t)
             if self.predictor.is_trained and len(features) > 0:
+                t = time.perf_counter()
                 pred = self.predictor.predict(features)
+                self._record(result, "predict", t)
                 result.ml_signal = pred.signal
                 result.ml_confidence = pred.confidence
                 result.ml_details = pred
@@ -239,21 +294,201 @@ class AIPipeline:
 
         # Stage 2: Market regime
         try:
+            t = time.perf_counter()
             regime = self.recommender.detect_regime(df, indicators)
+            self._record(result, "regime", t)
             result.regime = regime
         except Exception as e:
             logger.exception("Regime detection failed")
             result.errors.append(f"Regime: {e}")
 
+        return self._finish(
+            result, t0, price, indicators, news_texts,
+            strategy_win_rate, strategy_avg_rr, pip_value,
+        )
+
+    def analyze_many(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[PipelineResult]:
+        """Analyze a watchlist, yielding results as each batch completes.
+
+        Feature matrices are built in a thread pool. Finished symbols are
+        grouped into batches: one :meth:`PredictiveModel.predict_latest`
+        call and one vectorized regime detection per batch. The remaining
+        stages then run per symbol, as in :meth:`analyze`.
+
+        Parameters
+        ----------
+        requests : iterable of dict
+            Keyword arguments for :meth:`analyze` per symbol (``symbol``,
+            ``timeframe``, ``df`` and optionally ``indicators``,
+            ``news_texts``, ``strategy_win_rate``, ``strategy_avg_rr``,
+            ``current_price``, ``pip_value``).
+        max_workers : int, optional
+            Feature-building threads (default ``config.pipeline_workers``).
+        batch_size : int, optional
+            Symbols per batched stage call (default ``config.pipeline_batch_size``).
+
+        Yields
+        ------
+        PipelineResult
+            In completion order; ``stage_ms`` holds per-stage latency
+            (batched stages report the batch call's wall time).
+        """
+        reqs = [dict(r) for r in requests]
+        if not reqs:
+            return
+        workers = max(1, min(max_workers or self._config.pipeline_workers, len(reqs)))
+        batch_size = max(1, batch_size or self._config.pipeline_batch_size)
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai-features")
+        try:
+            futures = {pool.submit(self._build_features, r): i for i, r in enumerate(reqs)}
+            ready: List[Tuple[int, Dict[str, Any]]] = []
+            for fut in as_completed(futures):
+                ready.append((futures[fut], fut.result()))
+                if len(ready) >= batch_size:
+                    yield from self._analyze_batch(reqs, ready)
+                    ready = []
+            if ready:
+                yield from self._analyze_batch(reqs, ready)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stage_latency(self) -> Dict[str, Dict[str, Any]]:
+        """Latency histogram summary per stage (ms) since construction."""
+        with self._latency_lock:
+            return {stage: h.summary() for stage, h in self._latency.items()}
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _record(self, result: PipelineResult, stage: str, t_start: float) -> None:
+        ms = (time.perf_counter() - t_start) * 1000
+        result.stage_ms[stage] = round(ms, 2)
+        with self._latency_lock:
+            self._latency[stage].add(ms)
+
+    @staticmethod
+    def _build_features(req: Dict[str, Any]) -> Dict[str, Any]:
+        """Feature stage for one analyze_many request (runs in the pool)."""
+        t0 = time.perf_counter()
+        job: Dict[str, Any] = {"t0": t0, "features": None, "error": None}
+        try:
+            job["features"], _ = build_feature_matrix(
+                req["df"], req.get("indicators"),
+                symbol=req["symbol"], timeframe=req["timeframe"],
+            )
+        except Exception as e:
+            logger.exception("Feature build failed for %s", req.get("symbol"))
+            job["error"] = f"Prediction: {e}"
+        job["ms"] = (time.perf_counter() - t0) * 1000
+        return job
+
+    def _analyze_batch(
+        self,
+        reqs: List[Dict[str, Any]],
+        ready: List[Tuple[int, Dict[str, Any]]],
+    ) -> Iterator[PipelineResult]:
+        """Batched predict + regime for finished feature jobs, then per-symbol stages."""
+        results: Dict[int, PipelineResult] = {}
+        for i, job in ready:
+            req = reqs[i]
+            result = PipelineResult(
+                symbol=req["symbol"],
+                timeframe=req["timeframe"],
+                timestamp=time.time(),
+                ml_signal="HOLD",
+                ml_confidence=0.0,
+            )
+            result.stage_ms["features"] = round(job["ms"], 2)
+            with self._latency_lock:
+                self._latency["features"].add(job["ms"])
+            if job["error"]:
+                result.errors.append(job["error"])
+            results[i] = result
+
+        # Stage 1b: one prediction call per model for the whole batch
+        frames = {
+            i: job["features"] for i, job in ready
+            if job["features"] is not None and len(job["features"]) > 0
+        }
+        if self.predictor.is_trained and frames:
+            t = time.perf_counter()
+            try:
+                preds = self.predictor.predict_latest(frames)
+            except Exception as e:
+                logger.exception("Batch ML prediction failed")
+                preds = {}
+                for i in frames:
+                    results[i].errors.append(f"Prediction: {e}")
+            for i, pred in preds.items():
+                self._record(results[i], "predict", t)
+                results[i].ml_signal = pred.signal
+                results[i].ml_confidence = pred.confidence
+                results[i].ml_details = pred
+
+        # Stage 2: vectorized regime detection
+        idx = [i for i, _ in ready]
+        t = time.perf_counter()
+        try:
+            regimes = self.recommender.detect_regimes(
+                [reqs[i]["df"] for i in idx],
+                [reqs[i].get("indicators") for i in idx],
+            )
+            for i, regime in zip(idx, regimes):
+                results[i].regime = regime
+                self._record(results[i], "regime", t)
+        except Exception:
+            for i in idx:
+                try:
+                    t = time.perf_counter()
+                    results[i].regime = self.recommender.detect_regime(
+                        reqs[i]["df"], reqs[i].get("indicators"),
+                    )
+                    self._record(results[i], "regime", t)
+                except Exception as e:
+                    logger.exception("Regime detection failed")
+                    results[i].errors.append(f"Regime: {e}")
+
+        for i, job in ready:
+            req = reqs[i]
+            price = req.get("current_price") or float(req["df"]["close"].iloc[-1])
+            yield self._finish(
+                results[i], job["t0"], price, req.get("indicators"),
+                req.get("news_texts"), req.get("strategy_win_rate", 0.5),
+                req.get("strategy_avg_rr", 1.5), req.get("pip_value", 1.0),
+            )
+
+    def _finish(
+        self,
+        result: PipelineResult,
+        t0: float,
+        price: float,
+        indicators: Optional[Dict[str, Any]],
+        news_texts: Optional[List[str]],
+        strategy_win_rate: float,
+        strategy_avg_rr: float,
+        pip_value: float,
+    ) -> PipelineResult:
+        """Stages 3–5 (recommend, sentiment, optimize) and total timing."""
+        symbol, timeframe = result.symbol, result.timeframe
+
         # Stage 3: Strategy recommendations
         try:
             if self.recommender.is_fitted:
+                t = time.perf_counter()
                 recs = self.recommender.recommend(
                     symbol=symbol,
                     timeframe=timeframe,
                     regime=result.regime,
                     top_n=5,
                 )
+                self._record(result, "recommend", t)
                 result.recommendations = recs
         except Exception as e:
             logger.exception("Recommendation failed")
@@ -262,6 +497,7 @@ class AIPipeline:
         # Stage 4: Sentiment (optional)
         if news_texts:
             try:
+                t = time.perf_counter()
                 agg = self.nlp.analyze_batch(news_texts)
                 result.sentiment = SentimentResult(
                     sentiment=agg.overall_sentiment,
@@ -270,12 +506,14 @@ class AIPipeline:
                     keywords_found={},
                     word_count=agg.n_sources,
                 )
+                self._record(result, "sentiment", t)
             except Exception as e:
                 logger.exception("Sentiment analysis failed")
                 result.errors.append(f"Sentiment: {e}")
 
         # Stage 5: Trade optimization
         try:
+            t = time.perf_counter()
             atr_val = 0.0
             if indicators and "atr_14" in indicators:
                 atr = indicators["atr_14"]
@@ -295,11 +533,13 @@ class AIPipeline:
                     pip_value=pip_value,
                 )
                 result.trade_decision = decision
+                self._record(result, "optimize", t)
         except Exception as e:
             logger.exception("Trade optimization failed")
             result.errors.append(f"Optimizer: {e}")
 
-        result.processing_time_ms = round((time.perf_counter() - t0) * 1000, 1)
+        self._record(result, "total", t0)
+        result.processing_time_ms = round(result.stage_ms["total"], 1)
         logger.info(
             "Pipeline: %s %s → %s (%.0f%% conf) in %.1fms",
             symbol, timeframe, result.ml_signal,
@@ -12,13 +12,19 @@ Typical usage:
     >>> model = PredictiveModel()
     >>> model.train(X_train, y_train)
     >>> signal = model.predict(X_latest)
+    >>> history = model.predict_batch(X_history)   # every row, one call per model
 """
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -59,6 +65,43 @@ class PredictionResult:
     agreement: float
 
 
+@dataclass
+class BatchPrediction:
+    """Ensemble predictions for many rows (one per row of the input)."""
+
+    index: pd.Index
+    signals: np.ndarray  # "BUY" / "SELL" / "HOLD" per row
+    confidence: np.ndarray  # 0.0 – 1.0 per row
+    agreement: np.ndarray
+    probabilities: np.ndarray  # (n_rows, 3) averaged [SELL, HOLD, BUY]
+    model_votes: Dict[str, np.ndarray] = field(default_factory=dict)
+    model_probabilities: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+    def result(self, i: int) -> PredictionResult:
+        """The *i*-th row as a :class:`PredictionResult`."""
+        return PredictionResult(
+            signal=str(self.signals[i]),
+            confidence=round(float(self.confidence[i]), 4),
+            model_votes={k: str(v[i]) for k, v in self.model_votes.items()},
+            probabilities={k: v[i].tolist() for k, v in self.model_probabilities.items()},
+            agreement=round(float(self.agreement[i]), 4),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Signal, confidence and agreement per row, indexed like the input."""
+        return pd.DataFrame(
+            {
+                "signal": self.signals,
+                "confidence": self.confidence,
+                "agreement": self.agreement,
+            },
+            index=self.index,
+        )
+
+
 @dataclass
 class TrainingReport:
     """Summary of a training run."""
@@ -69,6 +112,181 @@ class TrainingReport:
     cv_scores: Dict[str, List[float]]
     feature_importances: Dict[str, float]
     train_time_sec: float
+    job_timings: List[Dict[str, Any]] = field(default_factory=list)
+    workers: int = 1
+
+
+# ---------------------------------------------------------------------------
+# Training jobs
+# ---------------------------------------------------------------------------
+# One job = one model family fitted on one CV fold (or on all rows for the
+# final model). Jobs run in-process or in a process pool; the scaled
+# arrays are handed to each worker once by the pool initializer.
+
+_JOB_DATA: Dict[str, np.ndarray] = {}
+
+
+def _init_job_data(X_arr: np.ndarray, y_arr: np.ndarray) -> None:
+    _JOB_DATA["X"] = X_arr
+    _JOB_DATA["y"] = y_arr
+
+
+def _make_model(name: str, cfg: PredictiveModelConfig, n_jobs: int = -1) -> Any:
+    """Build an unfitted model of family *name*."""
+    if name == "random_forest":
+        return RandomForestClassifier(
+            n_estimators=cfg.rf_n_estimators,
+            max_depth=cfg.rf_max_depth,
+            min_samples_leaf=cfg.rf_min_samples_leaf,
+            n_jobs=n_jobs,
+            random_state=cfg.random_state,
+            class_weight="balanced",
+        )
+    if name == "ridge":
+        return RidgeClassifier(alpha=1.0, class_weight="balanced")
+    if name == "xgboost":
+        return xgb.XGBClassifier(
+            n_estimators=cfg.xgb_n_estimators,
+            max_depth=cfg.xgb_max_depth,
+            learning_rate=cfg.xgb_learning_rate,
+            subsample=cfg.xgb_subsample,
+            use_label_encoder=False,
+            eval_metric="mlogloss",
+            verbosity=0,
+            random_state=cfg.random_state,
+            n_jobs=n_jobs,
+        )
+    if name == "lightgbm":
+        return lgb.LGBMClassifier(
+            n_estimators=cfg.lgb_n_estimators,
+            max_depth=cfg.lgb_max_depth,
+            learning_rate=cfg.lgb_learning_rate,
+            num_leaves=cfg.lgb_num_leaves,
+            verbose=-1,
+            random_state=cfg.random_state,
+            class_weight="balanced",
+            n_jobs=n_jobs,
+        )
+    raise ValueError(f"Unknown model family: {name}")
+
+
+def _run_job(
+    build_fn: Any,
+    name: str,
+    fold: Optional[int],
+    train_idx: Optional[np.ndarray],
+    val_idx: Optional[np.ndarray],
+    data: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Dict[str, Any]:
+    """Fit one model; score it on *val_idx* (CV fold) or return it (final fit).
+
+    *data* is ``(X, y)``; pool workers use the arrays set by the initializer.
+    """
+    t0 = time.perf_counter()
+    X_arr, y_arr = data if data is not None else (_JOB_DATA["X"], _JOB_DATA["y"])
+    model = build_fn()
+    job: Dict[str, Any] = {"model": name, "fold": fold}
+    if train_idx is None:
+        model.fit(X_arr, y_arr)
+        job["fitted"] = model
+    else:
+        model.fit(X_arr[train_idx], y_arr[train_idx])
+        preds = model.predict(X_arr[val_idx])
+        job["f1"] = f1_score(y_arr[val_idx], preds, average="weighted", zero_division=0)
+    job["wall_sec"] = time.perf_counter() - t0
+    return job
+
+
+# ---------------------------------------------------------------------------
+# Model artifacts
+# ---------------------------------------------------------------------------
+# save() writes a bundle directory:
+#   manifest.json        format version, feature names, per-model file/format
+#   scaler_mean.npy      StandardScaler statistics as plain arrays, loaded
+#   scaler_scale.npy     memory-mapped so worker processes share the pages
+#   <model>.txt / .json  LightGBM / XGBoost native model files
+#   <model>.joblib       other models, compressed
+# load() reads only the manifest and maps the scaler; each model file is
+# read on first predict.
+
+ARTIFACT_FORMAT = "whilber-ai-predictive"
+ARTIFACT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+JOBLIB_COMPRESS = 3
+
+
+class _ArrayScaler:
+    """``StandardScaler.transform`` over stored ``mean_`` / ``scale_`` arrays."""
+
+    def __init__(self, mean: Optional[np.ndarray], scale: Optional[np.ndarray]) -> None:
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        if self.mean_ is not None:
+            X -= self.mean_
+        if self.scale_ is not None:
+            X /= self.scale_
+        return X
+
+
+class _BoosterModel:
+    """Inference-only wrapper around a native LightGBM / XGBoost booster."""
+
+    def __init__(self, booster: Any, classes: List[int], kind: str) -> None:
+        self._booster = booster
+        self._kind = kind
+        self.classes_ = np.asarray(classes)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        if self._kind == "xgboost":
+            proba = np.asarray(self._booster.inplace_predict(X))
+        else:
+            proba = np.asarray(self._booster.predict(X))
+        if proba.ndim == 1:
+            proba = np.column_stack([1.0 - proba, proba])
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def _save_model_file(path: Path, name: str, model: Any) -> Dict[str, Any]:
+    """Write one model in its native format; returns its manifest entry."""
+    entry: Dict[str, Any] = {}
+    if hasattr(model, "classes_"):
+        entry["classes"] = [int(c) for c in model.classes_]
+    if isinstance(model, _BoosterModel):
+        ext = ".txt" if model._kind == "lightgbm" else ".json"
+        entry.update(file=f"{name}{ext}", format=model._kind)
+        model._booster.save_model(str(path / entry["file"]))
+    elif _HAS_LGB and isinstance(model, lgb.LGBMClassifier):
+        entry.update(file=f"{name}.txt", format="lightgbm")
+        model.booster_.save_model(str(path / entry["file"]))
+    elif _HAS_XGB and isinstance(model, xgb.XGBClassifier):
+        entry.update(file=f"{name}.json", format="xgboost")
+        model.get_booster().save_model(str(path / entry["file"]))
+    else:
+        entry.update(file=f"{name}.joblib", format="joblib")
+        joblib.dump(model, path / entry["file"], compress=JOBLIB_COMPRESS)
+    return entry
+
+
+def _load_model_file(path: Path, entry: Dict[str, Any]) -> Any:
+    fp = path / entry["file"]
+    fmt = entry.get("format", "joblib")
+    if fmt == "lightgbm":
+        if not _HAS_LGB:
+            raise RuntimeError(f"lightgbm is required to load {fp}")
+        return _BoosterModel(lgb.Booster(model_file=str(fp)), entry["classes"], "lightgbm")
+    if fmt == "xgboost":
+        if not _HAS_XGB:
+            raise RuntimeError(f"xgboost is required to load {fp}")
+        booster = xgb.Booster()
+        booster.load_model(str(fp))
+        return _BoosterModel(booster, entry["classes"], "xgboost")
+    return joblib.load(fp)
 
 
 class PredictiveModel:
@@ -82,6 +300,8 @@ class PredictiveModel:
 
     LABEL_MAP = {-1: "SELL", 0: "HOLD", 1: "BUY"}
     REVERSE_MAP = {"SELL": -1, "HOLD": 0, "BUY": 1}
+    CLASS_ORDER = [-1, 0, 1]  # probability column order
+    CLASS_LABELS = np.array(["SELL", "HOLD", "BUY"], dtype=object)
 
     def __init__(self, config: Optional[AIConfig] = None) -> None:
         self._config = (config or AIConfig()).predictive
@@ -89,6 +309,8 @@ class PredictiveModel:
         self._scaler: Optional[StandardScaler] = None
         self._feature_names: List[str] = []
         self._is_trained = False
+        self._pending: Dict[str, Tuple[Path, Dict[str, Any]]] = {}  # lazily loaded models
+        self._load_lock = threading.Lock()
 
     @property
     def is_trained(self) -> bool:
@@ -105,6 +327,10 @@ class PredictiveModel:
     ) -> TrainingReport:
         """Train all model families using TimeSeriesSplit.
 
+        Each (family × fold) fit and each family's final fit is a separate
+        job; with ``train_workers`` > 1 the jobs run in a process pool and
+        the CPU budget is split between workers and each model's ``n_jobs``.
+
         Parameters
         ----------
         X : pd.DataFrame
@@ -118,6 +344,7 @@ class PredictiveModel:
         """
         t0 = time.perf_counter()
         self._feature_names = X.columns.tolist()
+        self._pending = {}
         cfg = self._config
 
         # Scale
@@ -126,33 +353,42 @@ class PredictiveModel:
         y_arr = y.values.astype(np.int64)
 
         tscv = TimeSeriesSplit(n_splits=cfg.n_cv_splits)
-        builders = self._get_builders()
-        cv_scores: Dict[str, List[float]] = {}
-        best_f1 = -1.0
-        best_name = ""
+        folds = list(tscv.split(X_arr))
+        workers, n_jobs = self._worker_budget(len(self._get_builders()) * (len(folds) + 1))
+        builders = self._get_builders(n_jobs)
 
+        # (family × fold) jobs plus one final fit per family
+        specs = []
         for name, build_fn in builders.items():
-            logger.info("Training %s ...", name)
-            model = build_fn()
-            scores: List[float] = []
-
-            for train_idx, val_idx in tscv.split(X_arr):
-                model.fit(X_arr[train_idx], y_arr[train_idx])
-                preds = model.predict(X_arr[val_idx])
-                scores.append(f1_score(y_arr[val_idx], preds, average="weighted", zero_division=0))
-
-            # Final fit on all data
-            model.fit(X_arr, y_arr)
-            self._models[name] = model
-            cv_scores[name] = scores
-            mean_f1 = float(np.mean(scores))
+            for k, (train_idx, val_idx) in enumerate(folds):
+                specs.append((build_fn, name, k, train_idx, val_idx))
+            specs.append((build_fn, name, None, None, None))
+
+        logger.info("Training %s on %d jobs (%d workers, n_jobs=%d) ...",
+                    ", ".join(builders), len(specs), workers, n_jobs)
+        jobs = self._run_jobs(specs, X_arr, y_arr, workers)
+
+        cv_scores: Dict[str, List[float]] = {name: [] for name in builders}
+        for job in jobs:
+            if "fitted" in job:
+                self._models[job["model"]] = job.pop("fitted")
+            else:
+                cv_scores[job["model"]].append(float(job["f1"]))
 
+        best_f1 = -1.0
+        best_name = ""
+        for name in builders:
+            mean_f1 = float(np.mean(cv_scores[name]))
             if mean_f1 > best_f1:
                 best_f1 = mean_f1
                 best_name = name
-
             logger.info("%s — mean CV F1=%.4f", name, mean_f1)
 
+        job_timings = [
+            {"model": j["model"], "fold": j["fold"], "wall_sec": round(j["wall_sec"], 4)}
+            for j in jobs
+        ]
+
         self._is_trained = True
         elapsed = time.perf_counter() - t0
 
@@ -165,6 +401,8 @@ class PredictiveModel:
             cv_scores=cv_scores,
             feature_importances=importances,
             train_time_sec=elapsed,
+            job_timings=job_timings,
+            workers=workers,
         )
 
     # ------------------------------------------------------------------
@@ -189,66 +427,168 @@ class PredictiveModel:
             raise RuntimeError("Model not trained — call train() first")
 
         row = X.iloc[[-1]] if len(X) > 1 else X
-        x = self._prepare_input(row)
+        return self.predict_batch(row).result(0)
 
-        votes: Dict[str, str] = {}
-        probas: Dict[str, List[float]] = {}
+    def predict_batch(self, X: pd.DataFrame) -> BatchPrediction:
+        """Score every row of *X* with one call per ensemble member.
 
-        for name, model in self._models.items():
-            pred_int = int(model.predict(x)[0])
-            votes[name] = self.LABEL_MAP.get(pred_int, "HOLD")
+        Rows may come from one symbol's history (backfill) or be the
+        stacked latest rows of many symbols (see :meth:`predict_latest`).
+        Votes are taken from ``predict_proba`` where a model has it, so
+        each model is called once.
 
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Feature matrix.
+
+        Returns
+        -------
+        BatchPrediction
+        """
+        if not self._is_trained:
+            raise RuntimeError("Model not trained — call train() first")
+
+        self._ensure_loaded()
+        x = self._prepare_input(X)
+        n = x.shape[0]
+        rows = np.arange(n)
+
+        votes: Dict[str, np.ndarray] = {}
+        probas: Dict[str, np.ndarray] = {}
+
+        for name, model in self._models.items():
             if hasattr(model, "predict_proba"):
-                probas[name] = model.predict_proba(x)[0].tolist()
+                raw = model.predict_proba(x)
+                classes = np.asarray(model.classes_)
+                pred_int = classes[np.argmax(raw, axis=1)].astype(np.int64)
+                if classes.tolist() == self.CLASS_ORDER:
+                    proba = raw.astype(np.float64)
+                else:
+                    proba = np.zeros((n, len(self.CLASS_ORDER)))
+                    for j, c in enumerate(classes.tolist()):
+                        if c in self.CLASS_ORDER:
+                            proba[:, self.CLASS_ORDER.index(c)] = raw[:, j]
             else:
-                p = [0.1, 0.1, 0.1]
-                idx_map = {-1: 0, 0: 1, 1: 2}
-                p[idx_map.get(pred_int, 1)] = 0.8
-                probas[name] = p
+                pred_int = np.asarray(model.predict(x)).astype(np.int64)
+                proba = np.full((n, len(self.CLASS_ORDER)), 0.1)
+                proba[rows, self._class_slots(pred_int)] = 0.8
+            votes[name] = self.CLASS_LABELS[self._class_slots(pred_int)]
+            probas[name] = proba
 
         # Aggregate via probability averaging
-        avg_proba = np.mean(list(probas.values()), axis=0)
-        winner_idx = int(np.argmax(avg_proba))
-        confidence = float(avg_proba[winner_idx])
-        class_map = {0: "SELL", 1: "HOLD", 2: "BUY"}
-        signal = class_map.get(winner_idx, "HOLD")
+        avg_proba = np.mean(np.stack(list(probas.values())), axis=0)
+        winner_idx = np.argmax(avg_proba, axis=1)
+        confidence = avg_proba[rows, winner_idx]
+        signals = self.CLASS_LABELS[winner_idx]
 
         # Agreement
-        vote_list = list(votes.values())
-        agreement = vote_list.count(signal) / len(vote_list) if vote_list else 0.0
-
-        if confidence < 0.45:
-            signal = "HOLD"
-
-        return PredictionResult(
-            signal=signal,
-            confidence=round(confidence, 4),
+        if votes:
+            agreement = np.mean(np.stack([v == signals for v in votes.values()]), axis=0)
+        else:
+            agreement = np.zeros(n)
+
+        signals = np.where(confidence < 0.45, "HOLD", signals).astype(object)
+
+        return BatchPrediction(
+            index=X.index,
+            signals=signals,
+            confidence=confidence,
+            agreement=agreement,
+            probabilities=avg_proba,
             model_votes=votes,
-            probabilities=probas,
-            agreement=round(agreement, 4),
+            model_probabilities=probas,
         )
 
+    def predict_latest(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, PredictionResult]:
+        """Predict the latest row of each symbol's feature matrix in one batch.
+
+        Parameters
+        ----------
+        frames : dict
+            Symbol → feature matrix. Empty frames are skipped.
+
+        Returns
+        -------
+        dict
+            Symbol → :class:`PredictionResult`.
+        """
+        symbols = [sym for sym, f in frames.items() if len(f) > 0]
+        if not symbols:
+            return {}
+        stacked = pd.concat([frames[sym].iloc[[-1]] for sym in symbols], axis=0)
+        batch = self.predict_batch(stacked)
+        return {sym: batch.result(i) for i, sym in enumerate(symbols)}
+
     # ------------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------------
 
     def save(self, directory: str) -> None:
-        """Save all models and scaler to disk."""
+        """Save models, scaler and feature names as an artifact bundle."""
         path = Path(directory)
         path.mkdir(parents=True, exist_ok=True)
+        self._ensure_loaded()
+
+        manifest: Dict[str, Any] = {
+            "format": ARTIFACT_FORMAT,
+            "version": ARTIFACT_VERSION,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "feature_names": list(self._feature_names),
+            "models": {},
+            "scaler": None,
+        }
 
         for name, model in self._models.items():
-            joblib.dump(model, path / f"{name}.joblib")
-
-        if self._scaler:
-            joblib.dump(self._scaler, path / "scaler.joblib")
-        joblib.dump(self._feature_names, path / "feature_names.joblib")
+            manifest["models"][name] = _save_model_file(path, name, model)
+
+        if self._scaler is not None:
+            scaler: Dict[str, Any] = {}
+            for attr in ("mean", "scale"):
+                arr = getattr(self._scaler, f"{attr}_", None)
+                if arr is not None:
+                    scaler[attr] = f"scaler_{attr}.npy"
+                    np.save(path / scaler[attr], np.asarray(arr, dtype=np.float64))
+            manifest["scaler"] = scaler
+
+        with open(path / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
         logger.info("Models saved to %s", path)
 
     def load(self, directory: str) -> None:
-        """Load models from disk."""
-        path = Path(directory)
+        """Load a saved model directory.
 
+        Bundles with a manifest are opened lazily: the scaler is memory-mapped
+        and each model is read on first predict. Older directories of
+        ``*.joblib`` files are loaded eagerly as before.
+        """
+        path = Path(directory)
+        manifest_p = path / MANIFEST_FILE
+        if not manifest_p.exists():
+            self._load_legacy(path)
+            return
+
+        with open(manifest_p, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != ARTIFACT_FORMAT or manifest.get("version", 0) > ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported model artifact in {path}: "
+                             f"{manifest.get('format')} v{manifest.get('version')}")
+
+        self._feature_names = list(manifest.get("feature_names", []))
+        scaler = manifest.get("scaler")
+        if scaler is None:
+            self._scaler = None
+        else:
+            arrays = {k: np.load(path / v, mmap_mode="r") for k, v in scaler.items()}
+            self._scaler = _ArrayScaler(arrays.get("mean"), arrays.get("scale"))
+
+        with self._load_lock:
+            self._models = {}
+            self._pending = {name: (path, entry) for name, entry in manifest["models"].items()}
+        self._is_trained = bool(self._pending)
+        logger.info("Opened %d models from %s (loaded on first use)", len(self._pending), path)
+
+    def _load_legacy(self, path: Path) -> None:
         scaler_p = path / "scaler.joblib"
         if scaler_p.exists():
             self._scaler = joblib.load(scaler_p)
@@ -257,66 +597,90 @@ class PredictiveModel:
         if names_p.exists():
             self._feature_names = joblib.load(names_p)
 
+        models = {}
         for fp in sorted(path.glob("*.joblib")):
             if fp.name in ("scaler.joblib", "feature_names.joblib"):
                 continue
-            self._models[fp.stem] = joblib.load(fp)
+            models[fp.stem] = joblib.load(fp)
 
+        # Drop anything left pending from a previously opened bundle
+        with self._load_lock:
+            self._pending = {}
+            self._models = models
         self._is_trained = bool(self._models)
         logger.info("Loaded %d models from %s", len(self._models), path)
 
+    def _ensure_loaded(self) -> None:
+        """Read any models still pending from a lazily opened bundle."""
+        if not self._pending:
+            return
+        with self._load_lock:
+            for name in list(self._pending):
+                path, entry = self._pending[name]
+                t0 = time.perf_counter()
+                self._models[name] = _load_model_file(path, entry)
+                del self._pending[name]
+                logger.debug("Loaded %s (%s) in %.1fms", name, entry.get("format"),
+                             (time.perf_counter() - t0) * 1000)
+
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
-    def _prepare_input(self, row: pd.DataFrame) -> np.ndarray:
-        """Align features and scale a single input row."""
+    def _prepare_input(self, X: pd.DataFrame) -> np.ndarray:
+        """Align features (missing ones as 0.0) and scale, without touching *X*."""
         if self._feature_names:
-            for col in set(self._feature_names) - set(row.columns):
-                row[col] = 0.0
-            row = row[self._feature_names]
+            X = X.reindex(columns=self._feature_names, fill_value=0.0)
 
-        x = row.values.astype(np.float64)
+        x = X.to_numpy(dtype=np.float64)
         if self._scaler:
             x = self._scaler.transform(x)
         return x
 
-    def _get_builders(self) -> Dict[str, Any]:
-        """Return factory callables for each model family."""
+    @staticmethod
+    def _class_slots(pred_int: np.ndarray) -> np.ndarray:
+        """Map labels -1/0/1 to probability columns 0/1/2 (unknown → HOLD)."""
+        return np.where(np.isin(pred_int, (-1, 0, 1)), pred_int + 1, 1)
+
+    def _get_builders(self, n_jobs: int = -1) -> Dict[str, Any]:
+        """Return factory callables for each model family (picklable)."""
         cfg = self._config
-        builders: Dict[str, Any] = {
-            "random_forest": lambda: RandomForestClassifier(
-                n_estimators=cfg.rf_n_estimators,
-                max_depth=cfg.rf_max_depth,
-                min_samples_leaf=cfg.rf_min_samples_leaf,
-                n_jobs=-1,
-                random_state=cfg.random_state,
-                class_weight="balanced",
-            ),
-            "ridge": lambda: RidgeClassifier(alpha=1.0, class_weight="balanced"),
-        }
+        names = ["random_forest", "ridge"]
         if _HAS_XGB:
-            builders["xgboost"] = lambda: xgb.XGBClassifier(
-                n_estimators=cfg.xgb_n_estimators,
-                max_depth=cfg.xgb_max_depth,
-                learning_rate=cfg.xgb_learning_rate,
-                subsample=cfg.xgb_subsample,
-                use_label_encoder=False,
-                eval_metric="mlogloss",
-                verbosity=0,
-                random_state=cfg.random_state,
-            )
+            names.append("xgboost")
         if _HAS_LGB:
-            builders["lightgbm"] = lambda: lgb.LGBMClassifier(
-                n_estimators=cfg.lgb_n_estimators,
-                max_depth=cfg.lgb_max_depth,
-                learning_rate=cfg.lgb_learning_rate,
-                num_leaves=cfg.lgb_num_leaves,
-                verbose=-1,
-                random_state=cfg.random_state,
-                class_weight="balanced",
-            )
-        return builders
+            names.append("lightgbm")
+        return {name: partial(_make_model, name, cfg, n_jobs) for name in names}
+
+    def _worker_budget(self, n_specs: int) -> Tuple[int, int]:
+        """(process count, n_jobs per model) within the configured CPU budget."""
+        cfg = self._config
+        cpus = cfg.train_cpu_budget or os.cpu_count() or 1
+        workers = cfg.train_workers if cfg.train_workers > 0 else cpus
+        workers = max(1, min(workers, cpus, n_specs))
+        return workers, max(1, cpus // workers)
+
+    @staticmethod
+    def _run_jobs(
+        specs: List[Tuple[Any, ...]],
+        X_arr: np.ndarray,
+        y_arr: np.ndarray,
+        workers: int,
+    ) -> List[Dict[str, Any]]:
+        """Run training jobs, in a process pool when *workers* > 1."""
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_job_data,
+                    initargs=(X_arr, y_arr),
+                ) as pool:
+                    futures = [pool.submit(_run_job, *spec) for spec in specs]
+                    return [f.result() for f in futures]
+            except (OSError, RuntimeError) as e:
+                logger.warning("Process pool unavailable (%s) — training in-process", e)
+
+        return [_run_job(*spec, data=(X_arr, y_arr)) for spec in specs]
 
     def _extract_importances(self, model: Any) -> Dict[str, float]:
         if model is None:
@@ -203,12 +203,91 @@ class RecommendationEngine:
             atr_pct = float(pd.Series(np.abs(returns[-50:])).rank(pct=True).iloc[-1])
 
         # ADX for trend strength
-        adx_val = 25.0
+        adx_val = RecommendationEngine._adx_value(indicators)
+
+        return RecommendationEngine._classify_regime(slope, trend_strength, atr_pct, adx_val)
+
+    @staticmethod
+    def detect_regimes(
+        dfs: List[pd.DataFrame],
+        indicators: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[MarketRegime]:
+        """Vectorized :meth:`detect_regime` over many symbols.
+
+        Frames with at least 51 bars (and, when given, an ``atr_14`` array
+        of at least 50 values) are scored together on stacked 50-bar
+        windows; any other frame falls back to :meth:`detect_regime`.
+
+        Parameters
+        ----------
+        dfs : list[pd.DataFrame]
+            Recent OHLCV data per symbol.
+        indicators : list[dict], optional
+            Pre-computed indicators per symbol (aligned with *dfs*).
+
+        Returns
+        -------
+        list[MarketRegime]
+            One regime per input frame, in input order.
+        """
+        n = len(dfs)
+        indicators = indicators or [None] * n
+        out: List[Optional[MarketRegime]] = [None] * n
+        rows: List[int] = []
+        closes: List[np.ndarray] = []
+        vols: List[np.ndarray] = []
+
+        for i, (df, ind) in enumerate(zip(dfs, indicators)):
+            close = df["close"].values
+            atr = ind.get("atr_14") if ind and "atr_14" in ind else None
+            if len(close) < 51 or (atr is not None and (not hasattr(atr, "__len__") or len(atr) < 50)):
+                out[i] = RecommendationEngine.detect_regime(df, ind)
+                continue
+            c = np.asarray(close[-51:], dtype=np.float64)
+            rows.append(i)
+            closes.append(c)
+            if atr is not None:
+                vols.append(np.asarray(atr[-50:], dtype=np.float64))
+            else:
+                vols.append(np.abs(np.diff(c) / c[:-1]))
+
+        if rows:
+            Y = np.stack(closes)[:, -50:]
+            x = np.arange(50, dtype=np.float64)
+            xc = x - x.mean()
+            slope = (Y - Y.mean(axis=1, keepdims=True)) @ xc / (xc @ xc)
+            trend_strength = np.abs(slope) / (np.std(Y, axis=1) + 1e-10)
+
+            # Percentile rank of the latest value (pandas rank(pct=True), average ties)
+            V = np.stack(vols)
+            last = V[:, -1:]
+            valid = ~np.isnan(V)
+            rank = (V < last).sum(axis=1) + ((V == last).sum(axis=1) + 1) / 2
+            with np.errstate(invalid="ignore", divide="ignore"):
+                atr_pct = np.where(np.isnan(last[:, 0]), np.nan, rank / valid.sum(axis=1))
+
+            for j, i in enumerate(rows):
+                out[i] = RecommendationEngine._classify_regime(
+                    float(slope[j]), float(trend_strength[j]), float(atr_pct[j]),
+                    RecommendationEngine._adx_value(indicators[i]),
+                )
+
+        return out  # type: ignore[return-value]
+
+    @staticmethod
+    def _adx_value(indicators: Optional[Dict[str, Any]]) -> float:
         if indicators and "adx_14" in indicators:
             adx = indicators["adx_14"]
-            adx_val = float(adx[-1]) if hasattr(adx, "__len__") else float(adx)
+            return float(adx[-1]) if hasattr(adx, "__len__") else float(adx)
+        return 25.0
 
-        # Classify
+    @staticmethod
+    def _classify_regime(
+        slope: float,
+        trend_strength: float,
+        atr_pct: float,
+        adx_val: float,
+    ) -> MarketRegime:
         vol_level = "high" if atr_pct > 0.75 else ("low" if atr_pct < 0.25 else "medium")
 
         if adx_val > 25 and slope > 0:
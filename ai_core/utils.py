@@ -7,8 +7,10 @@ the ML-ready feature matrices consumed by prediction models.
 
 from __future__ import annotations
 
-import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
@@ -19,13 +21,166 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 # Feature cache
 # ---------------------------------------------------------------------------
-_FEATURE_CACHE: Dict[str, Tuple[pd.DataFrame, List[str]]] = {}
+FEATURE_CACHE_MAX_ENTRIES = 64
+FEATURE_CACHE_MAX_BYTES = 256 * 1024 * 1024
 
+# Bars of history a base feature row depends on (rolling 50 over returns).
+FEATURE_LOOKBACK = 51
 
-def _cache_key(df: pd.DataFrame) -> str:
-    """Compute a hash key for a DataFrame to enable caching."""
-    h = hashlib.md5(pd.util.hash_pandas_object(df).values.tobytes()).hexdigest()
-    return h
+_OHLCV = ("open", "high", "low", "close", "tick_volume", "volume")
+
+
+@dataclass
+class _CacheEntry:
+    features: pd.DataFrame
+    names: List[str]
+    base: pd.DataFrame  # price/return/volume/time features before NaN drop
+    index: pd.Index
+    last_rows: Tuple[Tuple[Any, ...], ...]  # fingerprints of the last two bars
+    nbytes: int
+
+
+class FeatureCache:
+    """Thread-safe LRU cache of feature matrices, bounded by entries and bytes.
+
+    Entries are keyed on ``(symbol, timeframe, first bar, last bar, length,
+    indicator signature)``; no pass over the data is needed to build a key.
+    When a frame extends a cached one for the same symbol/timeframe, only
+    the new rows are computed (see :func:`build_feature_matrix`).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = FEATURE_CACHE_MAX_ENTRIES,
+        max_bytes: int = FEATURE_CACHE_MAX_BYTES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, _CacheEntry]" = OrderedDict()
+        self._latest: Dict[tuple, tuple] = {}  # (symbol, timeframe, ind names) → key
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[_CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def latest(self, series: tuple) -> Optional[_CacheEntry]:
+        """Most recently stored entry for a (symbol, timeframe, indicators) series."""
+        with self._lock:
+            key = self._latest.get(series)
+            return self._entries.get(key) if key is not None else None
+
+    def put(self, key: tuple, series: Optional[tuple], entry: _CacheEntry) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            if series is not None:
+                self._latest[series] = key
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                old_key, old = self._entries.popitem(last=False)
+                self._bytes -= old.nbytes
+                self.evictions += 1
+                for s, k in list(self._latest.items()):
+                    if k == old_key:
+                        del self._latest[s]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.extensions = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "extensions": self.extensions,
+                "evictions": self.evictions,
+            }
+
+
+_FEATURE_CACHE = FeatureCache()
+
+
+def get_feature_cache_stats() -> Dict[str, Any]:
+    """Size and hit/miss/extension/eviction counters of the feature cache."""
+    return _FEATURE_CACHE.stats()
+
+
+def clear_feature_cache() -> None:
+    """Drop all cached feature matrices and reset the counters."""
+    _FEATURE_CACHE.clear()
+
+
+def _row_fingerprint(df: pd.DataFrame, pos: int) -> Tuple[Any, ...]:
+    return tuple(df[c].iat[pos] for c in _OHLCV if c in df.columns)
+
+
+def _indicator_signature(
+    indicators: Optional[Dict[str, Any]],
+    keys: Optional[List[str]],
+) -> Tuple[Tuple[str, ...], Tuple[Any, ...]]:
+    """(indicator names, cheap value signature) for the cache key."""
+    if not indicators:
+        return (), ()
+    names = tuple(keys or indicators.keys())
+    values = []
+    for k in names:
+        arr = indicators.get(k)
+        if isinstance(arr, np.ndarray):
+            values.append((arr.shape[0], repr(arr[-1]) if arr.shape[0] else None))
+        elif isinstance(arr, (int, float)):
+            values.append(repr(arr))
+        else:
+            values.append(None)
+    return names, tuple(values)
+
+
+def _cache_key(
+    df: pd.DataFrame,
+    symbol: Optional[str] = None,
+    timeframe: Optional[str] = None,
+    indicators: Optional[Dict[str, Any]] = None,
+    indicator_keys: Optional[List[str]] = None,
+) -> tuple:
+    """O(1) cache key: series identity, bar range and boundary bar values.
+
+    Assumes closed bars are never rewritten; the last bar's values are part
+    of the key so a still-forming bar that updates produces a new key.
+    """
+    n = len(df)
+    names, values = _indicator_signature(indicators, indicator_keys)
+    if n == 0:
+        return (symbol, timeframe, None, None, 0, names, values, ())
+    return (
+        symbol, timeframe, df.index[0], df.index[-1], n, names, values,
+        (_row_fingerprint(df, 0), _row_fingerprint(df, -1)),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -168,11 +323,81 @@ def compute_time_features(df: pd.DataFrame) -> pd.DataFrame:
 # Full pipeline
 # ---------------------------------------------------------------------------
 
+def _base_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Indicator-free features, one row per bar, before NaN handling."""
+    return pd.concat(
+        [
+            compute_price_features(df),
+            compute_return_features(df),
+            compute_volume_features(df),
+            compute_time_features(df),
+        ],
+        axis=1,
+    )
+
+
+def _extend_base(entry: _CacheEntry, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Base features for *df* reusing a cached frame of the same series.
+
+    Works when *df* continues the cached bars (new bars appended, possibly
+    with old ones dropped from the front and the last cached bar updated).
+    Only rows whose lookback window differs from the cached run are
+    computed. Returns None when the frames do not line up.
+    """
+    cached_index = entry.index
+    n = len(df)
+    if n == 0 or len(cached_index) < 2 or not df.index.is_monotonic_increasing:
+        return None
+    try:
+        q = df.index.get_loc(cached_index[-1])
+    except KeyError:
+        return None
+    if not isinstance(q, (int, np.integer)) or q < 1:
+        return None
+    # The bar before the cached last bar was closed: it must be unchanged
+    if _row_fingerprint(df, q - 1) != entry.last_rows[0]:
+        return None
+    # The cached last bar may have been forming — recompute it if it moved
+    p = q + 1 if _row_fingerprint(df, q) == entry.last_rows[1] else q
+
+    start = df.index[0]
+    try:
+        offset = cached_index.get_loc(start)
+    except KeyError:
+        return None
+    if not isinstance(offset, (int, np.integer)):
+        return None
+    # Rows near a new start see less history than they did in the cached run
+    head = 0 if offset == 0 else FEATURE_LOOKBACK
+    if p < head or p - head < 1:
+        return None
+
+    vol = df.get("tick_volume", df.get("volume"))
+    has_vol = vol is not None and vol.sum() != 0
+    cached_has_vol = "vol_change" in entry.base.columns
+    if has_vol != cached_has_vol:
+        return None
+
+    parts = []
+    if head:
+        parts.append(_base_features(df.iloc[:head]))
+    parts.append(entry.base.iloc[offset + head: offset + p])
+    if p < n:
+        lo = max(0, p - FEATURE_LOOKBACK)
+        parts.append(_base_features(df.iloc[lo:]).iloc[p - lo:])
+    if any(list(part.columns) != list(entry.base.columns) for part in parts):
+        return None
+    base = pd.concat(parts, axis=0)
+    return base if len(base) == n else None
+
+
 def build_feature_matrix(
     df: pd.DataFrame,
     indicators: Optional[Dict[str, Any]] = None,
     indicator_keys: Optional[List[str]] = None,
     use_cache: bool = True,
+    symbol: Optional[str] = None,
+    timeframe: Optional[str] = None,
 ) -> Tuple[pd.DataFrame, List[str]]:
     """Build the complete ML feature matrix from OHLCV + indicators.
 
@@ -186,6 +411,9 @@ def build_feature_matrix(
         Which indicator keys to include.
     use_cache : bool
         Whether to use in-memory caching.
+    symbol, timeframe : str, optional
+        Identify the bar series. When given, a frame that extends a cached
+        one (new bars appended) only computes features for the new rows.
 
     Returns
     -------
@@ -194,31 +422,46 @@ def build_feature_matrix(
     feature_names : list[str]
         Column names.
     """
+    key = series = None
+    base = None
     if use_cache:
-        key = _cache_key(df)
-        if key in _FEATURE_CACHE:
+        key = _cache_key(df, symbol, timeframe, indicators, indicator_keys)
+        entry = _FEATURE_CACHE.get(key)
+        if entry is not None:
             logger.debug("Feature cache hit")
-            return _FEATURE_CACHE[key]
-
-    frames = [
-        compute_price_features(df),
-        compute_return_features(df),
-        compute_volume_features(df),
-        compute_time_features(df),
-    ]
-
+            return entry.features, entry.names
+        if symbol is not None:
+            series = (symbol, timeframe, key[5])
+            prev = _FEATURE_CACHE.latest(series)
+            if prev is not None:
+                base = _extend_base(prev, df)
+                if base is not None:
+                    _FEATURE_CACHE.extensions += 1
+
+    if base is None:
+        base = _base_features(df)
+
+    frames = [base]
     if indicators:
         frames.append(compute_indicator_features(indicators, df, indicator_keys))
 
-    features = pd.concat(frames, axis=1)
+    features = pd.concat(frames, axis=1) if len(frames) > 1 else base.copy()
     features.replace([np.inf, -np.inf], np.nan, inplace=True)
     features.dropna(inplace=True)
     features.fillna(0.0, inplace=True)
 
     names = features.columns.tolist()
 
-    if use_cache:
-        _FEATURE_CACHE[_cache_key(df)] = (features, names)
+    if use_cache and len(df) > 0:
+        nbytes = 8 * (features.size + base.size + len(features) + len(base))
+        last_rows = (
+            _row_fingerprint(df, -2) if len(df) > 1 else (),
+            _row_fingerprint(df, -1),
+        )
+        _FEATURE_CACHE.put(key, series, _CacheEntry(
+            features=features, names=names, base=base,
+            index=df.index, last_rows=last_rows, nbytes=nbytes,
+        ))
 
     logger.info("Feature matrix: %d rows × %d features", len(features), len(names))
     return features, names
@@ -0,0 +1,481 @@
+"""
+Whilber-AI — Alert Delivery Engine
+═══════════════════════════════════
+asyncio pipeline behind alert_dispatcher.dispatch_event.
+
+    dispatch_event() ──► events queue ──► router ──► telegram queue ──► N telegram workers
+                                           │                          (keep-alive HTTPS each)
+                                           └───────► email queue ───► M email workers
+                                                                      (persistent SMTP each)
+
+- The loop runs in its own thread; submit() is thread-safe and never blocks.
+- Queues are asyncio.Queue — workers wait on them, nothing polls.
+- Each worker owns one transport (connection), so connections are reused
+  across messages and never shared between threads. Blocking socket I/O
+  runs in a thread pool sized to the worker count.
+- Rate limiting: per-chat token buckets (per-minute and per-hour).
+- Failed sends that can succeed later (network errors, HTTP 429/5xx, SMTP
+  4xx/disconnects) are retried with exponential backoff; Telegram's
+  retry_after is honoured.
+- metrics(): queue depths, counters and delivery latency percentiles.
+
+The Telegram base URL comes from telegram_bot.TELEGRAM_API and SMTP
+settings from email_sender, so both can point at local stub servers.
+"""
+
+import asyncio
+import http.client
+import json
+import smtplib
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# ── Config ──
+TELEGRAM_WORKERS = 4
+EMAIL_WORKERS = 2
+EVENT_QUEUE_SIZE = 5000
+CHANNEL_QUEUE_SIZE = 10000
+MAX_RETRIES = 3
+RETRY_BASE = 1.0              # seconds; doubles per attempt
+RETRY_MAX = 60.0
+HTTP_TIMEOUT = 10
+SMTP_TIMEOUT = 20
+SMTP_IDLE_CHECK = 60          # NOOP a session idle longer than this before reuse
+LATENCY_SAMPLES = 1000
+
+# Per-chat limits (same as the old sliding-window check)
+RATE_PER_MINUTE = 20
+RATE_PER_HOUR = 200
+
+
+# ══════════════════════════════════════════════════════════════
+# RATE LIMITING
+# ══════════════════════════════════════════════════════════════
+
+class TokenBucket:
+    """capacity tokens, refilled continuously at rate tokens/second."""
+
+    __slots__ = ("capacity", "rate", "tokens", "stamp")
+
+    def __init__(self, capacity, per_seconds):
+        self.capacity = float(capacity)
+        self.rate = capacity / float(per_seconds)
+        self.tokens = float(capacity)
+        self.stamp = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def available(self, now):
+        self._refill(now)
+        return self.tokens >= 1.0
+
+    def take(self):
+        self.tokens -= 1.0
+
+
+class RateLimiter:
+    """Per-key minute + hour buckets; a send needs a token from both."""
+
+    def __init__(self, per_minute=RATE_PER_MINUTE, per_hour=RATE_PER_HOUR):
+        self.per_minute = per_minute
+        self.per_hour = per_hour
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = time.monotonic()
+        with self._lock:
+            pair = self._buckets.get(key)
+            if pair is None:
+                pair = self._buckets[key] = (TokenBucket(self.per_minute, 60),
+                                             TokenBucket(self.per_hour, 3600))
+            if not all(b.available(now) for b in pair):
+                return False
+            for b in pair:
+                b.take()
+            return True
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# ══════════════════════════════════════════════════════════════
+# TRANSPORTS (one per worker, blocking, run in the executor)
+# ══════════════════════════════════════════════════════════════
+
+class TelegramTransport:
+    """sendMessage over one keep-alive HTTP(S) connection, reopened when dropped."""
+
+    def __init__(self, base_url=None, token=None, timeout=HTTP_TIMEOUT):
+        from backend.api import telegram_bot
+        self.base_url = base_url or telegram_bot.TELEGRAM_API
+        self.token = token
+        self.timeout = timeout
+        parts = urlsplit(self.base_url)
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self._conn = None
+        self.connects = 0
+
+    def _connection(self):
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            self._conn = cls(self._host, self._port, timeout=self.timeout)
+            self.connects += 1
+        return self._conn
+
+    def _post(self, path, body):
+        conn = self._connection()
+        conn.request("POST", path, body=body,
+                     headers={"Content-Type": "application/json", "Connection": "keep-alive"})
+        resp = conn.getresponse()
+        raw = resp.read()      # drain fully so the connection can be reused
+        if resp.getheader("Connection", "").lower() == "close":
+            self.close()
+        return resp.status, raw
+
+    def send(self, chat_id, text):
+        token = self.token
+        if token is None:
+            from backend.api.telegram_bot import _get_token
+            token = _get_token()
+        if not token:
+            return {"ok": False, "description": "No token"}
+        path = f"{self._prefix}/bot{token}/sendMessage"
+        body = json.dumps({
+            "chat_id": chat_id, "text": text, "parse_mode": "HTML",
+            "disable_notification": False, "disable_web_page_preview": True,
+        }).encode("utf-8")
+
+        for attempt in (1, 2):
+            try:
+                status, raw = self._post(path, body)
+                break
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                    ConnectionError, BrokenPipeError) as e:
+                # Server closed an idle keep-alive connection — reconnect once
+                self.close()
+                if attempt == 2:
+                    return {"ok": False, "description": str(e)[:200], "retry": True}
+            except (socket.timeout, OSError, http.client.HTTPException) as e:
+                self.close()
+                return {"ok": False, "description": str(e)[:200], "retry": True}
+
+        try:
+            result = json.loads(raw.decode("utf-8"))
+        except ValueError:
+            result = {"ok": False, "description": raw[:200].decode("utf-8", errors="replace")}
+        if not result.get("ok"):
+            retry_after = (result.get("parameters") or {}).get("retry_after")
+            if status == 429 or retry_after:
+                result["retry"] = True
+                result["retry_after"] = retry_after
+            elif status >= 500:
+                result["retry"] = True
+        return result
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+class SMTPTransport:
+    """One logged-in SMTP session reused across messages."""
+
+    def __init__(self, cfg=None, timeout=SMTP_TIMEOUT):
+        self.cfg = cfg
+        self.timeout = timeout
+        self._server = None
+        self._last_used = 0.0
+        self.connects = 0
+
+    def _session(self, cfg):
+        from backend.api.email_sender import open_session
+        if self._server is not None and time.monotonic() - self._last_used > SMTP_IDLE_CHECK:
+            try:
+                if self._server.noop()[0] != 250:
+                    self.close()
+            except Exception:
+                self.close()
+        if self._server is None:
+            self._server = open_session(cfg, timeout=self.timeout)
+            self.connects += 1
+        return self._server
+
+    def send(self, to_addr, event_type, trade_data):
+        from backend.api import email_sender
+        cfg = self.cfg or email_sender._load_config()
+        if not cfg.get("server"):
+            return {"ok": False, "description": "SMTP not configured"}
+        msg = email_sender.build_message(to_addr, event_type, trade_data, cfg).as_string()
+
+        for attempt in (1, 2):
+            try:
+                self._session(cfg).sendmail(cfg["email"], to_addr, msg)
+                self._last_used = time.monotonic()
+                return {"ok": True, "channel": "email"}
+            except smtplib.SMTPServerDisconnected as e:
+                self.close()
+                if attempt == 2:
+                    return {"ok": False, "description": str(e)[:200], "retry": True}
+            except smtplib.SMTPAuthenticationError:
+                self.close()
+                return {"ok": False, "description": "SMTP auth failed — check email/password"}
+            except smtplib.SMTPResponseException as e:
+                # 4xx is temporary (greylisting, throttling), 5xx is final
+                return {"ok": False, "description": str(e)[:200], "retry": 400 <= e.smtp_code < 500}
+            except smtplib.SMTPRecipientsRefused as e:
+                return {"ok": False, "description": str(e)[:200]}
+            except (smtplib.SMTPException, OSError) as e:
+                self.close()
+                return {"ok": False, "description": str(e)[:200], "retry": True}
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                try:
+                    self._server.close()
+                except Exception:
+                    pass
+            self._server = None
+
+
+# ══════════════════════════════════════════════════════════════
+# ENGINE
+# ══════════════════════════════════════════════════════════════
+
+class DeliveryEngine:
+    """
+    resolve(event_type, trade_data) → list of deliveries, each
+    {"channel": "telegram"|"email", "chat_id", "to", ...}; called in the
+    executor. log(delivery, result) is called after each final outcome.
+    """
+
+    def __init__(self, resolve, log=None, telegram_workers=TELEGRAM_WORKERS,
+                 email_workers=EMAIL_WORKERS, telegram_factory=TelegramTransport,
+                 smtp_factory=SMTPTransport, max_retries=MAX_RETRIES, retry_base=RETRY_BASE):
+        self.resolve = resolve
+        self.log = log
+        self.workers = {"telegram": telegram_workers, "email": email_workers}
+        self.factories = {"telegram": telegram_factory, "email": smtp_factory}
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._events = None
+        self._queues = {}
+        self._tasks = []
+        self._transports = []
+        self._executor = None
+        self._pending_retries = 0
+        self._resolving = 0
+        self._submitted = 0
+        self._lock = threading.Lock()
+        self.latency = {"telegram": deque(maxlen=LATENCY_SAMPLES),
+                        "email": deque(maxlen=LATENCY_SAMPLES)}
+        self.counters = {"events": 0, "dropped": 0, "deliveries": 0, "sent": 0,
+                         "failed": 0, "retried": 0}
+
+    # ── lifecycle ──
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return self
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="AlertDelivery")
+            self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self, timeout=5):
+        """Stop workers and close connections (queued items are dropped)."""
+        loop = self._loop
+        if loop is None or not self.running:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop)
+        self._thread.join(timeout)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        self._executor = ThreadPoolExecutor(
+            max_workers=sum(self.workers.values()) + 2, thread_name_prefix="alert-io")
+        loop.run_until_complete(self._main())
+        loop.close()
+        self._executor.shutdown(wait=False)
+        self._loop = None
+        print("[ALERTS] Delivery engine stopped")
+
+    async def _main(self):
+        self._events = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self._queues = {ch: asyncio.Queue(maxsize=CHANNEL_QUEUE_SIZE) for ch in self.workers}
+        self._stopped = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._router())]
+        for channel, n in self.workers.items():
+            for i in range(n):
+                transport = self.factories[channel]()
+                self._transports.append(transport)
+                self._tasks.append(asyncio.ensure_future(self._worker(channel, transport)))
+        print(f"[ALERTS] Delivery engine started "
+              f"({self.workers['telegram']} telegram / {self.workers['email']} email workers)")
+        self._ready.set()
+        await self._stopped.wait()
+
+    async def _shutdown(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for tr in self._transports:
+            await self._loop.run_in_executor(self._executor, tr.close)
+        self._transports = []
+        self._stopped.set()
+
+    # ── intake ──
+
+    def submit(self, event_type, trade_data):
+        """Queue an event from any thread; never blocks (a full queue drops the event)."""
+        if not self.running:
+            self.start()
+        item = (event_type, trade_data, time.monotonic())
+        with self._lock:
+            self._submitted += 1
+
+        def put():
+            try:
+                self._events.put_nowait(item)
+                self.counters["events"] += 1
+            except asyncio.QueueFull:
+                self.counters["dropped"] += 1
+
+        self._loop.call_soon_threadsafe(put)
+
+    async def _router(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            event_type, trade_data, t0 = await self._events.get()
+            self._resolving += 1
+            try:
+                deliveries = await loop.run_in_executor(
+                    self._executor, self.resolve, event_type, trade_data)
+            except Exception as e:
+                print(f"[ALERTS] Resolve error: {e}")
+                deliveries = []
+            finally:
+                self._resolving -= 1
+            for d in deliveries:
+                d.setdefault("event_type", event_type)
+                d.setdefault("trade_data", trade_data)
+                d["t0"] = t0
+                d["attempt"] = 0
+                q = self._queues.get(d["channel"])
+                if q is None:
+                    continue
+                try:
+                    q.put_nowait(d)
+                    self.counters["deliveries"] += 1
+                except asyncio.QueueFull:
+                    self.counters["dropped"] += 1
+
+    # ── delivery ──
+
+    async def _worker(self, channel, transport):
+        loop = asyncio.get_running_loop()
+        q = self._queues[channel]
+        while True:
+            d = await q.get()
+            try:
+                result = await loop.run_in_executor(self._executor, self._send, transport, d)
+            except Exception as e:
+                result = {"ok": False, "description": str(e)[:200], "retry": True}
+
+            if not result.get("ok") and result.get("retry") and d["attempt"] < self.max_retries:
+                d["attempt"] += 1
+                self.counters["retried"] += 1
+                delay = result.get("retry_after") or min(
+                    RETRY_MAX, self.retry_base * 2 ** (d["attempt"] - 1))
+                self._pending_retries += 1
+                loop.call_later(float(delay), self._requeue, q, d)
+                continue
+
+            if result.get("ok"):
+                self.counters["sent"] += 1
+                self.latency[channel].append(time.monotonic() - d["t0"])
+            else:
+                self.counters["failed"] += 1
+            if self.log:
+                try:
+                    await loop.run_in_executor(self._executor, self.log, d, result)
+                except Exception as e:
+                    print(f"[ALERTS] Log error: {e}")
+
+    def _requeue(self, q, d):
+        self._pending_retries -= 1
+        try:
+            q.put_nowait(d)
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+            self.counters["failed"] += 1
+
+    @staticmethod
+    def _send(transport, d):
+        if d["channel"] == "telegram":
+            return transport.send(d["chat_id"], d["text"])
+        return transport.send(d["to"], d["event_type"], d["trade_data"])
+
+    # ── metrics ──
+
+    def metrics(self):
+        def pct(samples, p):
+            if not samples:
+                return None
+            s = sorted(samples)
+            return round(s[min(len(s) - 1, int(p * len(s)))] * 1000, 1)
+
+        latency = {}
+        for ch, samples in self.latency.items():
+            snap = list(samples)
+            latency[ch] = {"samples": len(snap), "p50_ms": pct(snap, 0.5),
+                           "p95_ms": pct(snap, 0.95), "max_ms": pct(snap, 1.0)}
+        return {
+            "running": self.running,
+            "queue_depth": {
+                "events": self._events.qsize() if self._events else 0,
+                **{ch: q.qsize() for ch, q in self._queues.items()},
+                "retry_wait": self._pending_retries,
+            },
+            "workers": dict(self.workers),
+            "connections_opened": sum(getattr(t, "connects", 0) for t in self._transports),
+            **self.counters,
+            "latency": latency,
+        }
+
+    def idle(self):
+        """True when nothing is queued, in flight or waiting to retry."""
+        if not self.running:
+            return True
+        return (self._submitted == self.counters["events"] + self.counters["dropped"]
+                and self._events.qsize() == 0 and all(q.qsize() == 0 for q in self._queues.values())
+                and self._pending_retries == 0 and self._resolving == 0
+                and self.counters["deliveries"] == self.counters["sent"] + self.counters["failed"])
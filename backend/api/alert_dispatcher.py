@@ -9,29 +9,32 @@ Usage:
 
 Flow:
     Event → get_subscribed_users() → filter by settings → send_alert()
+
+dispatch_event() hands the event to the asyncio delivery engine
+(alert_delivery.py): per-channel worker pools with keep-alive Telegram
+connections and persistent SMTP sessions, token-bucket rate limits,
+retry with backoff and queue/latency metrics.
 """
 
 import os
 import json
-import time
 import sqlite3
 import threading
 from datetime import datetime, timezone
-from collections import deque
+
+from backend.api.alert_delivery import (
+    DeliveryEngine, RateLimiter, TelegramTransport, SMTPTransport,
+)
 
 # ── Config ──
 _DB_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "whilber.db")
-_dispatch_queue = deque(maxlen=5000)  # Buffer events
-_dispatch_thread = None
-_dispatch_active = False
+_engine = None
 _lock = threading.Lock()
 
-# Rate limiting per chat
-_rate_limits = {}  # {chat_id: [timestamps]}
-_MAX_ALERTS_PER_MINUTE = 20
-_MAX_ALERTS_PER_HOUR = 200
+# Rate limiting per chat (token buckets: 20/minute, 200/hour)
+_rate_limiter = RateLimiter()
 
-# Stats
+# Stats (sync path; the engine keeps its own counters)
 _stats = {"sent": 0, "failed": 0, "skipped": 0, "queued": 0}
 
 
@@ -44,15 +47,8 @@ def dispatch_event(event_type, trade_data):
     Main entry point: route a trade event to all subscribed users.
     Non-blocking: adds to queue and returns immediately.
     """
-    _dispatch_queue.append({
-        "event_type": event_type,
-        "trade_data": trade_data,
-        "timestamp": time.time(),
-    })
+    _get_engine().submit(event_type, trade_data)
     _stats["queued"] += 1
-    
-    # Ensure dispatch thread is running
-    _ensure_dispatch_thread()
 
 
 def dispatch_event_sync(event_type, trade_data):
@@ -60,20 +56,40 @@ def dispatch_event_sync(event_type, trade_data):
     Synchronous dispatch — use for testing or critical alerts.
     Blocks until all alerts are sent.
     """
+    deliveries = _resolve_deliveries(event_type, trade_data)
+    telegram, smtp = TelegramTransport(), SMTPTransport()
+    results = []
+    try:
+        for d in deliveries:
+            if d["channel"] == "telegram":
+                result = telegram.send(d["chat_id"], d["text"])
+            else:
+                result = smtp.send(d["to"], event_type, trade_data)
+            _stats["sent" if result.get("ok") else "failed"] += 1
+            _log_delivery(d, result)
+            results.append(result)
+    finally:
+        telegram.close()
+        smtp.close()
+
+    return {"sent": len([r for r in results if r.get("ok")]),
+            "total_subscribers": len({d["subscriber"] for d in deliveries})}
+
+
+def _resolve_deliveries(event_type, trade_data):
+    """Subscribers for an event → one delivery per channel, after min-PnL and rate limits."""
     subscribers = _get_subscribers(
         strategy_id=trade_data.get("strategy_id", ""),
         symbol=trade_data.get("symbol", ""),
         event_type=event_type,
     )
-    
-    results = []
-    for sub in subscribers:
-        # Check rate limit
+
+    deliveries = []
+    text = None
+    for i, sub in enumerate(subscribers):
         chat_id = sub.get("telegram_chat_id", "")
-        if not _check_rate_limit(chat_id):
-            _stats["skipped"] += 1
-            continue
-        
+        email = sub.get("email_address", "")
+
         # Check min PnL filter
         min_pnl = sub.get("min_pnl", 0)
         if min_pnl > 0 and event_type.startswith("closed_"):
@@ -81,60 +97,51 @@ def dispatch_event_sync(event_type, trade_data):
             if pnl < min_pnl:
                 _stats["skipped"] += 1
                 continue
-        
-        # Send Telegram
+
+        # Check rate limit
+        if not _check_rate_limit(chat_id or f"email:{email}"):
+            _stats["skipped"] += 1
+            continue
+
+        # Telegram
         if sub.get("telegram_active") and chat_id:
-            result = _send_telegram(chat_id, event_type, trade_data)
-            _log_alert(chat_id, "telegram", event_type, trade_data, result)
-            results.append(result)
-        
-        # Send Email
-        if sub.get("email_active") and sub.get("email_address"):
-            result = _send_email(sub["email_address"], event_type, trade_data)
-            _log_alert(chat_id, "email", event_type, trade_data, result)
-            results.append(result)
-    
-    return {"sent": len([r for r in results if r.get("ok")]), "total_subscribers": len(subscribers)}
+            if text is None:
+                from backend.api.telegram_bot import format_alert
+                text = format_alert(event_type, trade_data)
+            deliveries.append({"channel": "telegram", "chat_id": chat_id, "text": text,
+                               "subscriber": i})
+
+        # Email
+        if sub.get("email_active") and email:
+            deliveries.append({"channel": "email", "chat_id": chat_id, "to": email,
+                               "subscriber": i})
+    return deliveries
+
+
+def _log_delivery(delivery, result):
+    _log_alert(delivery.get("chat_id", ""), delivery["channel"],
+               delivery.get("event_type", ""), delivery.get("trade_data", {}), result)
 
 
 # ══════════════════════════════════════════════════════════════
-# BACKGROUND DISPATCH THREAD
+# DELIVERY ENGINE
 # ══════════════════════════════════════════════════════════════
 
-def _ensure_dispatch_thread():
-    global _dispatch_thread, _dispatch_active
-    if _dispatch_active and _dispatch_thread and _dispatch_thread.is_alive():
-        return
-    _dispatch_active = True
-    _dispatch_thread = threading.Thread(target=_dispatch_loop, daemon=True, name="AlertDispatcher")
-    _dispatch_thread.start()
+def _get_engine():
+    global _engine
+    with _lock:
+        if _engine is None:
+            _engine = DeliveryEngine(_resolve_deliveries, log=_log_delivery)
+        return _engine
 
 
-def _dispatch_loop():
-    global _dispatch_active
-    print("[ALERTS] Dispatch thread started")
-    
-    while _dispatch_active:
-        try:
-            if _dispatch_queue:
-                item = _dispatch_queue.popleft()
-                event_type = item["event_type"]
-                trade_data = item["trade_data"]
-                
-                # Process
-                dispatch_event_sync(event_type, trade_data)
-            else:
-                time.sleep(0.5)  # Wait for new events
-        except Exception as e:
-            print(f"[ALERTS] Dispatch error: {e}")
-            time.sleep(1)
-    
-    print("[ALERTS] Dispatch thread stopped")
+def _ensure_dispatch_thread():
+    _get_engine().start()
 
 
 def stop_dispatcher():
-    global _dispatch_active
-    _dispatch_active = False
+    if _engine is not None:
+        _engine.stop()
 
 
 # ══════════════════════════════════════════════════════════════
@@ -214,61 +221,8 @@ def _in_quiet_hours(current, start, end):
 # ══════════════════════════════════════════════════════════════
 
 def _check_rate_limit(chat_id):
-    """Return True if this chat can receive more alerts."""
-    now = time.time()
-    with _lock:
-        times = _rate_limits.get(chat_id, [])
-        # Clean old entries
-        times = [t for t in times if now - t < 3600]  # Keep 1 hour
-        
-        # Check minute limit
-        recent = [t for t in times if now - t < 60]
-        if len(recent) >= _MAX_ALERTS_PER_MINUTE:
-            return False
-        
-        # Check hour limit
-        if len(times) >= _MAX_ALERTS_PER_HOUR:
-            return False
-        
-        times.append(now)
-        _rate_limits[chat_id] = times
-    return True
-
-
-# ══════════════════════════════════════════════════════════════
-# SEND TELEGRAM
-# ══════════════════════════════════════════════════════════════
-
-def _send_telegram(chat_id, event_type, trade_data):
-    """Send alert via Telegram bot."""
-    try:
-        from backend.api.telegram_bot import send_alert
-        result = send_alert(chat_id, event_type, trade_data)
-        if result.get("ok"):
-            _stats["sent"] += 1
-        else:
-            _stats["failed"] += 1
-        return result
-    except Exception as e:
-        _stats["failed"] += 1
-        return {"ok": False, "description": str(e)[:200]}
-
-
-# ══════════════════════════════════════════════════════════════
-# SEND EMAIL
-# ══════════════════════════════════════════════════════════════
-
-def _send_email(email_addr, event_type, trade_data):
-    """Send alert via email using SMTP."""
-    try:
-        from backend.api.email_sender import send_email, is_configured
-        if not is_configured():
-            return {"ok": False, "description": "SMTP not configured"}
-        return send_email(email_addr, event_type, trade_data)
-    except ImportError:
-        return {"ok": False, "description": "email_sender module not found"}
-    except Exception as e:
-        return {"ok": False, "description": str(e)[:200]}
+    """Return True if this chat can receive more alerts (takes one token)."""
+    return _rate_limiter.allow(chat_id)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -287,7 +241,7 @@ def _log_alert(chat_id, channel, event_type, trade_data, result):
                    trade_data.get("symbol", ""),
                    json.dumps({"direction": trade_data.get("direction",""), "pnl": trade_data.get("pnl_usd",0)}, ensure_ascii=False),
                    "sent" if result.get("ok") else "failed",
-                   result.get("description", "")[:200] if not result.get("ok") else "",
+                   (result.get("description") or "")[:200] if not result.get("ok") else "",
                    datetime.now(timezone.utc).isoformat()))
         conn.commit()
         conn.close()
@@ -301,11 +255,14 @@ def _log_alert(chat_id, channel, event_type, trade_data, result):
 
 def get_stats():
     """Return dispatcher stats."""
+    m = _engine.metrics() if _engine is not None else {}
+    depth = m.get("queue_depth", {})
     return {
-        "sent": _stats["sent"],
-        "failed": _stats["failed"],
+        "sent": _stats["sent"] + m.get("sent", 0),
+        "failed": _stats["failed"] + m.get("failed", 0),
         "skipped": _stats["skipped"],
         "queued": _stats["queued"],
-        "queue_size": len(_dispatch_queue),
-        "dispatch_active": _dispatch_active,
+        "queue_size": sum(depth.values()),
+        "dispatch_active": bool(m.get("running")),
+        "delivery": m,
     }
@@ -21,13 +21,15 @@ Features:
   - Simplified setup (email + Telegram only)
 
 Storage: JSON file (alerts.json, notifications.json, alert_templates.json)
+         alerts.json is compiled into an in-memory index for the checkers.
 """
 
 import json
 import os
 import hashlib
 from datetime import datetime, timezone
-from threading import Lock
+from threading import Lock, RLock
+from bisect import bisect_left, bisect_right
 from copy import deepcopy
 
 PROJECT_DIR = r"C:\Users\Administrator\Desktop\mvp"
@@ -176,6 +178,229 @@ def _save_json(filepath, data):
                 json.dump(data, f, ensure_ascii=False, indent=2)
         except Exception:
             pass
+    if filepath == ALERTS_FILE:
+        _index.invalidate()
+
+
+# ═══════════════════════════════════════════════════
+# ALERT INDEX (compiled, in memory)
+# ═══════════════════════════════════════════════════
+#
+# The checkers used to load alerts.json, walk every alert of every user and
+# write the file back on each call. The index keeps one in-memory copy of
+# alerts.json, compiled into:
+#   price[symbol]        → above / below: sorted [(target, pos)]
+#                          a tick fires a prefix (above) or suffix (below),
+#                          found with bisect
+#   signal[(symbol, tf)] → {"strategy": {strategy_id: [pos]}, "other": [pos]}
+#                          tf "" = any timeframe
+# pos is the alert's position in alerts.json, so fired alerts are reported
+# in file order exactly as before. The file is written only when something
+# fired. CRUD saves (and edits by another process, seen via mtime/size)
+# make the next check recompile.
+
+# Alert types that can only fire for a strategy present in the analysis
+STRATEGY_ALERT_TYPES = ("signal_change", "signal_buy", "signal_sell", "confidence_high")
+
+
+def _file_stamp(filepath):
+    try:
+        st = os.stat(filepath)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class _AlertIndex:
+    def __init__(self):
+        self.lock = RLock()
+        self.data = None
+        self.stamp = None
+        self.price = {}
+        self.signal = {}
+        self.builds = 0
+        self.saves = 0
+
+    def invalidate(self):
+        with self.lock:
+            self.data = None
+
+    def _ensure(self):
+        if self.data is not None and _file_stamp(ALERTS_FILE) == self.stamp:
+            return
+        self.stamp = _file_stamp(ALERTS_FILE)
+        self.data = _load_json(ALERTS_FILE, {"alerts": []})
+        self._compile()
+
+    def _compile(self):
+        price, signal = {}, {}
+        for pos, a in enumerate(self.data.get("alerts", [])):
+            atype = a.get("alert_type")
+            sym = a.get("symbol")
+            if atype in ("price_above", "price_below"):
+                target = a.get("target_price")
+                if (a.get("active") and target and isinstance(target, (int, float))
+                        and not isinstance(target, bool)):
+                    side = "above" if atype == "price_above" else "below"
+                    book = price.setdefault(sym, {"above": [], "below": []})
+                    book[side].append((target, pos))
+            if (a.get("active", True) and a.get("category") != "price"
+                    and atype != "trade_update"):
+                bucket = signal.setdefault((sym, a.get("timeframe") or ""),
+                                           {"strategy": {}, "other": []})
+                if atype in STRATEGY_ALERT_TYPES:
+                    sid = a.get("strategy_id")
+                    if sid:
+                        bucket["strategy"].setdefault(sid, []).append(pos)
+                else:
+                    bucket["other"].append(pos)
+        for book in price.values():
+            book["above"].sort()
+            book["below"].sort()
+        self.price, self.signal = price, signal
+        self.builds += 1
+
+    def _persist(self):
+        data = self.data
+        _save_json(ALERTS_FILE, data)
+        self.data = data                # our own write — keep the compiled index
+        self.stamp = _file_stamp(ALERTS_FILE)
+        self.saves += 1
+
+    # ── price alerts ──
+
+    def fire_prices(self, prices_dict):
+        """
+        Mark every price alert crossed by prices_dict as triggered.
+        Returns [(alert, price)] in file order; persists only if anything fired.
+        """
+        with self.lock:
+            self._ensure()
+            alerts = self.data["alerts"]
+            fired = []
+            for sym, book in self.price.items():
+                price = prices_dict.get(sym)
+                if not isinstance(price, (int, float)) or price != price:
+                    continue
+                above = book["above"]
+                if above:
+                    k = bisect_right(above, (price, float("inf")))
+                    if k:
+                        hits = above[:k]
+                        fired.extend(hits)
+                        above[:k] = [h for h in hits if alerts[h[1]].get("repeat")]
+                below = book["below"]
+                if below:
+                    k = bisect_left(below, (price, -1))
+                    if k < len(below):
+                        hits = below[k:]
+                        fired.extend(hits)
+                        below[k:] = [h for h in hits if alerts[h[1]].get("repeat")]
+            if not fired:
+                return []
+
+            fired.sort(key=lambda h: h[1])
+            now = datetime.now(timezone.utc).isoformat()
+            out = []
+            for _, pos in fired:
+                alert = alerts[pos]
+                alert["triggered"] = True
+                alert["triggered_at"] = now
+                alert["trigger_count"] = alert.get("trigger_count", 0) + 1
+                if not alert.get("repeat"):
+                    alert["active"] = False
+                self._drop_signal(pos, alert)
+                out.append((dict(alert), prices_dict[alert["symbol"]]))
+            self._persist()
+            return out
+
+    # ── signal / master / TP-SL alerts ──
+
+    def candidates(self, symbol, tf, strat_map):
+        """Active non-price alerts that can fire for this analysis, in file order."""
+        with self.lock:
+            self._ensure()
+            alerts = self.data["alerts"]
+            positions = []
+            for key in ((symbol, tf), (symbol, "")) if tf else ((symbol, ""),):
+                bucket = self.signal.get(key)
+                if not bucket:
+                    continue
+                positions.extend(bucket["other"])
+                by_sid = bucket["strategy"]
+                if len(by_sid) <= len(strat_map):
+                    for sid, pos_list in by_sid.items():
+                        if sid in strat_map:
+                            positions.extend(pos_list)
+                else:
+                    for sid in strat_map:
+                        if sid in by_sid:
+                            positions.extend(by_sid[sid])
+            positions.sort()
+            return [(pos, dict(alerts[pos])) for pos in positions]
+
+    def fire_signals(self, results):
+        """results: [(pos, alert_id, new_state)] from candidates(); persists once."""
+        if not results:
+            return
+        with self.lock:
+            self._ensure()
+            alerts = self.data["alerts"]
+            now = datetime.now(timezone.utc).isoformat()
+            changed = False
+            for pos, alert_id, new_state in results:
+                # The file may have been recompiled since candidates()
+                if pos >= len(alerts) or alerts[pos].get("id") != alert_id:
+                    pos = next((i for i, a in enumerate(alerts) if a.get("id") == alert_id), None)
+                    if pos is None:
+                        continue
+                a = alerts[pos]
+                a["triggered"] = True
+                a["triggered_at"] = now
+                a["trigger_count"] = a.get("trigger_count", 0) + 1
+                a["last_state"] = new_state
+                if not a.get("repeat"):
+                    a["active"] = False
+                    self._drop_signal(pos, a)
+                changed = True
+            if changed:
+                self._persist()
+
+    def _drop_signal(self, pos, alert):
+        if alert.get("active", True):
+            return
+        bucket = self.signal.get((alert.get("symbol"), alert.get("timeframe") or ""))
+        if not bucket:
+            return
+        lists = [bucket["other"]]
+        sid_list = bucket["strategy"].get(alert.get("strategy_id"))
+        if sid_list is not None:
+            lists.append(sid_list)
+        for lst in lists:
+            if pos in lst:
+                lst.remove(pos)
+
+    def info(self):
+        with self.lock:
+            self._ensure()
+            return {
+                "alerts": len(self.data.get("alerts", [])),
+                "price_symbols": len(self.price),
+                "price_alerts": sum(len(b["above"]) + len(b["below"]) for b in self.price.values()),
+                "signal_keys": len(self.signal),
+                "signal_alerts": sum(len(b["other"]) + sum(len(v) for v in b["strategy"].values())
+                                     for b in self.signal.values()),
+                "builds": self.builds,
+                "saves": self.saves,
+            }
+
+
+_index = _AlertIndex()
+
+
+def get_alert_index_info():
+    """Sizes and rebuild/save counters of the compiled alert index."""
+    return _index.info()
 
 
 # ═══════════════════════════════════════════════════
@@ -559,67 +784,40 @@ def check_price_alerts_live(prices_dict):
     """
     Check live price alerts against current market prices.
     Called periodically with {symbol: price} dict.
+    Only crossed alerts are touched (bisect on the compiled index).
     Returns list of triggered notifications.
     """
     if not prices_dict:
         return []
 
-    data = _load_json(ALERTS_FILE, {"alerts": []})
-    all_alerts = data.get("alerts", [])
     triggered = []
-
-    for alert in all_alerts:
-        if not alert.get("active"):
-            continue
+    for alert, price in _index.fire_prices(prices_dict):
         atype = alert["alert_type"]
-        if atype not in ("price_above", "price_below"):
-            continue
-
         sym = alert["symbol"]
         target = alert.get("target_price")
-        if not target or sym not in prices_dict:
-            continue
-
-        price = prices_dict[sym]
-        fire = False
-
-        if atype == "price_above" and price >= target:
-            fire = True
-        elif atype == "price_below" and price <= target:
-            fire = True
-
-        if fire:
-            icon = ALERT_TYPES[atype]["icon"]
-            context = {
-                "icon": icon, "symbol": sym, "target": target,
-                "price": price, "user_email": alert["user_email"],
-            }
-            msg = render_template(atype, context)
-            title = f"{icon} {ALERT_TYPES[atype]['name_fa']} {sym}"
-
-            # Mark triggered
-            alert["triggered"] = True
-            alert["triggered_at"] = datetime.now(timezone.utc).isoformat()
-            alert["trigger_count"] = alert.get("trigger_count", 0) + 1
-            if not alert.get("repeat"):
-                alert["active"] = False
-
-            # Deliver via channels
-            channels_used = _deliver_alert(alert, title, msg)
-
-            notif = add_notification(
-                user_email=alert["user_email"],
-                alert_id=alert["id"],
-                title=title,
-                body=msg,
-                icon=icon,
-                data_extra={"symbol": sym, "price": price, "target": target, "alert_type": atype},
-                channels_used=channels_used,
-            )
-            notif["alert"] = alert
-            triggered.append(notif)
+        icon = ALERT_TYPES[atype]["icon"]
+        context = {
+            "icon": icon, "symbol": sym, "target": target,
+            "price": price, "user_email": alert["user_email"],
+        }
+        msg = render_template(atype, context)
+        title = f"{icon} {ALERT_TYPES[atype]['name_fa']} {sym}"
+
+        # Deliver via channels
+        channels_used = _deliver_alert(alert, title, msg)
+
+        notif = add_notification(
+            user_email=alert["user_email"],
+            alert_id=alert["id"],
+            title=title,
+            body=msg,
+            icon=icon,
+            data_extra={"symbol": sym, "price": price, "target": target, "alert_type": atype},
+            channels_used=channels_used,
+        )
+        notif["alert"] = alert
+        triggered.append(notif)
 
-    _save_json(ALERTS_FILE, data)
     return triggered
 
 
@@ -682,7 +880,8 @@ def check_trade_updates(trade_event):
 
 def check_alerts(analysis_result):
     """
-    Check all active alerts against fresh analysis results.
+    Check active alerts against fresh analysis results.
+    Only alerts indexed under (symbol, timeframe, strategy_id) are evaluated.
     Triggers notifications for matched alerts.
     """
     # ═══ ALERT VALIDATION ═══
@@ -723,58 +922,43 @@ def check_alerts(analysis_result):
     if not symbol or not price:
         return []
 
-    active_alerts = get_alerts(symbol=symbol, active_only=True)
-    if not active_alerts:
-        return []
-
     strat_map = {}
     for s in strategies:
         strat_map[s.get("strategy_id", "")] = s
 
-    triggered = []
-    data = _load_json(ALERTS_FILE, {"alerts": []})
-
-    for alert in active_alerts:
-        # Skip price and trade_update alerts (handled by their own checkers)
-        if alert.get("category") == "price" or alert["alert_type"] == "trade_update":
-            continue
-        if alert.get("timeframe") and alert["timeframe"] != tf:
-            continue
+    candidates = _index.candidates(symbol.upper(), tf, strat_map)
+    if not candidates:
+        return []
 
+    fired = []
+    triggered = []
+    for pos, alert in candidates:
         result = _check_single_alert(alert, price, overall, master, strat_map)
-
         if result:
-            for a in data["alerts"]:
-                if a["id"] == alert["id"]:
-                    a["triggered"] = True
-                    a["triggered_at"] = datetime.now(timezone.utc).isoformat()
-                    a["trigger_count"] = a.get("trigger_count", 0) + 1
-                    a["last_state"] = result.get("new_state")
-                    if not a.get("repeat"):
-                        a["active"] = False
-                    break
-
-            channels_used = _deliver_alert(alert, result["title"], result["body"])
-
-            notif = add_notification(
-                user_email=alert["user_email"],
-                alert_id=alert["id"],
-                title=result["title"],
-                body=result["body"],
-                icon=alert.get("icon", "🔔"),
-                data_extra={
-                    "symbol": symbol,
-                    "timeframe": tf,
-                    "price": price,
-                    "alert_type": alert["alert_type"],
-                    "strategy_id": alert.get("strategy_id"),
-                },
-                channels_used=channels_used,
-            )
-            notif["alert"] = alert
-            triggered.append(notif)
+            fired.append((pos, alert, result))
+    _index.fire_signals([(pos, alert["id"], result.get("new_state")) for pos, alert, result in fired])
+
+    for pos, alert, result in fired:
+        channels_used = _deliver_alert(alert, result["title"], result["body"])
+
+        notif = add_notification(
+            user_email=alert["user_email"],
+            alert_id=alert["id"],
+            title=result["title"],
+            body=result["body"],
+            icon=alert.get("icon", "🔔"),
+            data_extra={
+                "symbol": symbol,
+                "timeframe": tf,
+                "price": price,
+                "alert_type": alert["alert_type"],
+                "strategy_id": alert.get("strategy_id"),
+            },
+            channels_used=channels_used,
+        )
+        notif["alert"] = alert
+        triggered.append(notif)
 
-    _save_json(ALERTS_FILE, data)
     return triggered
 
 
@@ -6,9 +6,11 @@ Users subscribe to strategies → get lifecycle alerts:
 Notifications: in-app popup + email.
 """
 
+import atexit
 import json
 import os
 import smtplib
+import time
 from email.mime.text import MIMEText
 from datetime import datetime, timezone
 from threading import Lock
@@ -19,6 +21,10 @@ SUBS_FILE = os.path.join(PROJECT_DIR, "track_records", "subscriptions.json")
 NOTIF_FILE = os.path.join(PROJECT_DIR, "track_records", "notifications.json")
 EMAIL_CONFIG_FILE = os.path.join(PROJECT_DIR, "email_config.json")
 _lock = Lock()
+_index_lock = Lock()
+
+COUNT_FLUSH_EVERY = 50        # pending alert_count bumps before a write
+COUNT_FLUSH_INTERVAL = 30     # ...or seconds since the last write
 
 # ══════ SUBSCRIPTION MANAGEMENT ══════
 
@@ -36,6 +42,7 @@ def _save_subs(data):
     with _lock:
         with open(SUBS_FILE, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=1)
+    invalidate_index()
 
 
 def subscribe(email, sub_config):
@@ -61,7 +68,7 @@ def subscribe(email, sub_config):
         min_confidence: int (0-100),
     }
     """
-    data = _load_subs()
+    data = _apply_pending_counts(_load_subs())
     now = datetime.now(timezone.utc).isoformat()
 
     sub_id = now.replace(":", "").replace("-", "").replace(".", "")[:18]
@@ -99,7 +106,7 @@ def subscribe(email, sub_config):
 
 
 def unsubscribe(email, sub_id):
-    data = _load_subs()
+    data = _apply_pending_counts(_load_subs())
     for s in data["subscriptions"]:
         if s["id"] == sub_id and s["email"] == email:
             s["active"] = False
@@ -109,7 +116,7 @@ def unsubscribe(email, sub_id):
 
 
 def get_subscriptions(email):
-    data = _load_subs()
+    data = _apply_pending_counts(_load_subs(), clear=False)
     return [s for s in data["subscriptions"]
             if s["email"] == email and s.get("active", True)]
 
@@ -138,42 +145,151 @@ def _save_notifs(data):
             json.dump(data, f, ensure_ascii=False, indent=1)
 
 
-def dispatch_alert(event_type, trade, detail=""):
-    """
-    Called by tracker daemon when a trade event occurs.
-    Matches against all subscriptions and sends notifications.
-    event_type: signal, entry, be_move, partial, trailing, near_tp, near_sl, closed_tp, closed_sl
-    """
-    subs = get_all_active_subs()
-    if not subs:
-        return 0
+# ══════ SUBSCRIPTION INDEX ══════
+# Active subscriptions bucketed by event type → symbol ("*" = any) →
+# strategy_id ("*" = any). Subscriptions with a specific strategy_id also
+# match when their strategy_name is a substring of the trade's name; those
+# go to a per-bucket name list whose results are memoized per trade name.
+# A subscription with an empty name therefore matches every strategy,
+# exactly as the linear scan did, so it is filed under "*".
+# Rebuilt after subscribe/unsubscribe or when the file changes on disk.
 
-    strategy_id = trade.get("strategy_id", "")
-    strategy_name = trade.get("strategy_name", "")
-    symbol = trade.get("symbol", "")
-    direction = trade.get("direction", "")
-    confidence = trade.get("confidence", 0)
-    sent = 0
+_index = None                 # {"mtime": float, "buckets": {...}, "names": {...}, "memo": {}}
+_pending_counts = {}          # sub_id → alert_count increments not yet written
+_last_count_flush = time.monotonic()
 
-    for sub in subs:
-        # Match strategy
-        if sub["strategy_id"] != "*" and sub["strategy_id"] != strategy_id:
-            # Also match by name
-            if sub.get("strategy_name", "").lower() not in strategy_name.lower():
-                continue
 
-        # Match symbol
-        if "*" not in sub.get("symbols", ["*"]) and symbol not in sub.get("symbols", []):
-            continue
+def invalidate_index():
+    global _index
+    with _index_lock:
+        _index = None
 
-        # Match event type
-        if not sub.get("alert_on", {}).get(event_type, False):
+
+def _subs_mtime():
+    try:
+        return os.path.getmtime(SUBS_FILE)
+    except OSError:
+        return None
+
+
+def _build_index():
+    mtime = _subs_mtime()
+    buckets = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    names = defaultdict(lambda: defaultdict(list))
+    total = 0
+    for pos, sub in enumerate(_load_subs()["subscriptions"]):
+        if not sub.get("active", True):
             continue
+        total += 1
+        symbols = sub.get("symbols", ["*"])
+        symbols = ["*"] if "*" in symbols else list(dict.fromkeys(symbols))
+        events = [e for e, on in sub.get("alert_on", {}).items() if on]
+        sid = sub.get("strategy_id")
+        name = sub.get("strategy_name", "").lower()
+        entry = (pos, sub)
+        for event in events:
+            for sym in symbols:
+                if sid == "*" or not name:
+                    buckets[event][sym]["*"].append(entry)
+                else:
+                    buckets[event][sym][sid].append(entry)
+                    names[event][sym].append((name, entry))
+    return {"mtime": mtime, "buckets": buckets, "names": names, "memo": {}, "total": total}
+
+
+def _get_index():
+    global _index
+    with _index_lock:
+        if _index is None or _index["mtime"] != _subs_mtime():
+            _index = _build_index()
+        return _index
+
+
+def match_subscriptions(event_type, trade):
+    """Active subscriptions that want this event for this trade, in file order."""
+    idx = _get_index()
+    buckets = idx["buckets"].get(event_type)
+    if not buckets:
+        return []
 
-        # Min confidence
-        if confidence < sub.get("min_confidence", 0):
+    strategy_id = trade.get("strategy_id", "")
+    strategy_name = trade.get("strategy_name", "").lower()
+    confidence = trade.get("confidence", 0)
+    found = {}
+    for sym in (trade.get("symbol", ""), "*"):
+        by_strategy = buckets.get(sym)
+        if not by_strategy:
             continue
+        for key in (strategy_id, "*"):
+            for pos, sub in by_strategy.get(key, ()):
+                found[pos] = sub
+        memo_key = (event_type, sym, strategy_name)
+        named = idx["memo"].get(memo_key)
+        if named is None:
+            named = [e for name, e in idx["names"][event_type].get(sym, ()) if name in strategy_name]
+            idx["memo"][memo_key] = named
+        for pos, sub in named:
+            found[pos] = sub
+
+    return [found[pos] for pos in sorted(found)
+            if confidence >= found[pos].get("min_confidence", 0)]
+
+
+# ══════ ALERT COUNTERS ══════
+
+def _apply_pending_counts(data, clear=True):
+    """Fold unsaved alert_count bumps into a loaded subscriptions dict."""
+    with _index_lock:
+        pending = dict(_pending_counts)
+        if clear:
+            _pending_counts.clear()
+    if pending:
+        for s in data.get("subscriptions", []):
+            if s.get("id") in pending:
+                s["alert_count"] = s.get("alert_count", 0) + pending[s["id"]]
+    return data
+
+
+def flush_alert_counts():
+    """Write pending alert_count bumps to the subscriptions file."""
+    global _last_count_flush
+    _last_count_flush = time.monotonic()
+    with _index_lock:
+        if not _pending_counts:
+            return 0
+        n = len(_pending_counts)
+        before = _subs_mtime()
+    data = _apply_pending_counts(_load_subs())
+    with _lock:
+        with open(SUBS_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+    # Only counters changed — keep the index unless someone else wrote in between
+    with _index_lock:
+        if _index is not None and _index["mtime"] == before:
+            _index["mtime"] = _subs_mtime()
+    return n
+
+
+def _count_alert(sub_id):
+    with _index_lock:
+        _pending_counts[sub_id] = _pending_counts.get(sub_id, 0) + 1
+        due = (sum(_pending_counts.values()) >= COUNT_FLUSH_EVERY or
+               time.monotonic() - _last_count_flush >= COUNT_FLUSH_INTERVAL)
+    if due:
+        flush_alert_counts()
 
+
+atexit.register(flush_alert_counts)
+
+
+def dispatch_alert(event_type, trade, detail=""):
+    """
+    Called by tracker daemon when a trade event occurs.
+    Matches against the subscription index and sends notifications.
+    event_type: signal, entry, be_move, partial, trailing, near_tp, near_sl, closed_tp, closed_sl
+    """
+    sent = 0
+    for sub in match_subscriptions(event_type, trade):
         # Build notification
         notif = _build_notification(event_type, trade, detail, sub)
 
@@ -185,22 +301,21 @@ def dispatch_alert(event_type, trade, detail=""):
         if sub.get("notify_email", False):
             _send_email(sub["email"], notif)
 
-        # Update sub count
-        sub["alert_count"] = sub.get("alert_count", 0) + 1
+        # Update sub count (written in batches)
+        _count_alert(sub["id"])
         sent += 1
 
-    # Save updated subs
-    if sent:
-        data = _load_subs()
-        for s in data["subscriptions"]:
-            for sub in subs:
-                if s["id"] == sub["id"]:
-                    s["alert_count"] = sub["alert_count"]
-        _save_subs(data)
-
     return sent
 
 
+def get_index_info():
+    idx = _get_index()
+    with _index_lock:
+        pending = sum(_pending_counts.values())
+    return {"active_subs": idx["total"], "events": len(idx["buckets"]),
+            "memo": len(idx["memo"]), "pending_counts": pending}
+
+
 EVENT_ICONS = {
     "signal": "📡", "entry": "🟢", "be_move": "💛",
     "partial": "💰", "trailing": "🔄", "near_tp": "🎯",
@@ -119,10 +119,25 @@ def _check_filters(filters, bar_dt, atr_val, price, trend_ma_val):
     return True
 
 
-def run_backtest(df, strategy, initial_balance=10000, spread_pips=2):
+def _indicator(df, ind_id, params, shared_cache=None):
+    """compute_indicator, memoized in shared_cache (valid for one df only)."""
+    if shared_cache is None:
+        return compute_indicator(df, ind_id, params)
+    key = (ind_id, repr(sorted(params.items())))
+    out = shared_cache.get(key)
+    if out is None:
+        out = compute_indicator(df, ind_id, params)
+        shared_cache[key] = out
+    return out
+
+
+def run_backtest(df, strategy, initial_balance=10000, spread_pips=2, indicator_cache=None):
     """
     Run backtest on DataFrame.
     Returns: dict with trades, stats, equity curve, and enhanced reporting.
+
+    indicator_cache: optional dict reused across runs on the SAME df (the
+    optimizer passes one per grid) so unchanged indicators aren't recomputed.
     """
     n = len(df)
     if n < 50:
@@ -149,7 +164,7 @@ def run_backtest(df, strategy, initial_balance=10000, spread_pips=2):
         params = cond.get("indicator_params", {})
         key = f"{ind_id}_{hash(str(sorted(params.items())))}"
         if key not in ind_cache and ind_id:
-            ind_cache[key] = compute_indicator(df, ind_id, params)
+            ind_cache[key] = _indicator(df, ind_id, params, indicator_cache)
         cond["_cache_key"] = key
         cond["_output"] = cond.get("output", "value")
 
@@ -159,12 +174,12 @@ def run_backtest(df, strategy, initial_balance=10000, spread_pips=2):
             cmp_params = cond.get("compare_indicator_params", {})
             cmp_key = f"{cmp_id}_{hash(str(sorted(cmp_params.items())))}"
             if cmp_key not in ind_cache and cmp_id:
-                ind_cache[cmp_key] = compute_indicator(df, cmp_id, cmp_params)
+                ind_cache[cmp_key] = _indicator(df, cmp_id, cmp_params, indicator_cache)
             cond["_cmp_cache_key"] = cmp_key
             cond["_cmp_output"] = cond.get("compare_output", "value")
 
     # Pre-compute ATR for exits
-    atr_14 = compute_indicator(df, "ATR", {"period": 14})["value"]
+    atr_14 = _indicator(df, "ATR", {"period": 14}, indicator_cache)["value"]
 
     # Pre-compute trend filter MA if needed
     trend_ma = None
@@ -172,7 +187,7 @@ def run_backtest(df, strategy, initial_balance=10000, spread_pips=2):
     for f in filters:
         if f.get("type") == "trend_filter":
             tf_period = f.get("params", {}).get("ma_period", 200)
-            trend_ma = compute_indicator(df, "SMA", {"period": tf_period})["value"]
+            trend_ma = _indicator(df, "SMA", {"period": tf_period}, indicator_cache)["value"]
             trend_filter_active = True
             break
 
@@ -194,8 +209,15 @@ def run_backtest(df, strategy, initial_balance=10000, spread_pips=2):
     # Pre-compute direction MA
     dir_ma_key = f"SMA_{hash(str(sorted({'period': dir_ma_period}.items())))}"
     if dir_ma_key not in ind_cache:
-        ind_cache[dir_ma_key] = compute_indicator(df, "SMA", {"period": dir_ma_period})
-    dir_ma_vals = ind_cache[dir_ma_key].get("value", np.full(n, np.nan))
+        ind_cache[dir_ma_key] = _indicator(df, "SMA", {"period": dir_ma_period}, indicator_cache)
+    missing = np.full(n, np.nan)
+    dir_ma_vals = ind_cache[dir_ma_key].get("value", missing)
+
+    # Parsed bar times depend on df only — shared across optimizer runs too
+    bar_dts = indicator_cache.get("_bar_dts") if indicator_cache is not None else None
+    if bar_dts is None and indicator_cache is not None:
+        bar_dts = [_parse_bar_time(t) for t in times]
+        indicator_cache["_bar_dts"] = bar_dts
 
     # Simulation state
     balance = float(initial_balance)
@@ -228,7 +250,7 @@ def run_backtest(df, strategy, initial_balance=10000, spread_pips=2):
             break
 
         # Parse datetime for filters
-        bar_dt = _parse_bar_time(times[i])
+        bar_dt = bar_dts[i] if bar_dts is not None else _parse_bar_time(times[i])
 
         # Process open trades
         closed_indices = []
@@ -366,7 +388,7 @@ def run_backtest(df, strategy, initial_balance=10000, spread_pips=2):
         for cond in all_conds:
             cache = ind_cache.get(cond.get("_cache_key", ""), {})
             output = cond.get("_output", "value")
-            vals = cache.get(output, np.full(n, np.nan))
+            vals = cache.get(output, missing)
             val_now = vals[i] if i < len(vals) and not np.isnan(vals[i]) else None
             val_prev = vals[i - 1] if i > 0 and i - 1 < len(vals) and not np.isnan(vals[i - 1]) else None
 
@@ -378,7 +400,7 @@ def run_backtest(df, strategy, initial_balance=10000, spread_pips=2):
             elif cmp_to == "indicator":
                 cmp_cache = ind_cache.get(cond.get("_cmp_cache_key", ""), {})
                 cmp_output = cond.get("_cmp_output", "value")
-                cmp_vals = cmp_cache.get(cmp_output, np.full(n, np.nan))
+                cmp_vals = cmp_cache.get(cmp_output, missing)
                 cmp_val = cmp_vals[i] if i < len(cmp_vals) and not np.isnan(cmp_vals[i]) else None
                 cmp_prev = cmp_vals[i - 1] if i > 0 and i - 1 < len(cmp_vals) and not np.isnan(cmp_vals[i - 1]) else cmp_val
             elif cmp_to == "price_close":
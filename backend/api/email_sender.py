@@ -71,12 +71,9 @@ EVENT_TITLES = {
 }
 
 
-def send_email(to_addr, event_type, trade_data):
-    """Send an alert email."""
-    cfg = _load_config()
-    if not cfg.get("server"):
-        return {"ok": False, "description": "SMTP not configured"}
-    
+def build_message(to_addr, event_type, trade_data, cfg=None):
+    """MIME alert message (plain + HTML) for one recipient."""
+    cfg = cfg or _load_config()
     icon = EVENT_ICONS.get(event_type, "📌")
     title = EVENT_TITLES.get(event_type, event_type)
     symbol = trade_data.get("symbol", "?")
@@ -134,25 +131,40 @@ def send_email(to_addr, event_type, trade_data):
     if pnl:
         plain += f"سود: {'+'if pnl>=0 else ''}{pnl}$\n"
     
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = f"{cfg['from_name']} <{cfg['email']}>"
+    msg["To"] = to_addr
+    msg.attach(MIMEText(plain, "plain", "utf-8"))
+    msg.attach(MIMEText(html, "html", "utf-8"))
+    return msg
+
+
+def open_session(cfg=None, timeout=None):
+    """Connected, logged-in SMTP session. Callers may keep it open for several sends."""
+    cfg = cfg or _load_config()
+    kwargs = {"timeout": timeout} if timeout else {}
+    if cfg["use_tls"]:
+        server = smtplib.SMTP(cfg["server"], cfg["port"], **kwargs)
+        server.starttls(context=ssl.create_default_context())
+    else:
+        server = smtplib.SMTP_SSL(cfg["server"], cfg["port"], **kwargs)
+    if cfg.get("password"):
+        server.login(cfg["email"], cfg["password"])
+    return server
+
+
+def send_email(to_addr, event_type, trade_data):
+    """Send an alert email."""
+    cfg = _load_config()
+    if not cfg.get("server"):
+        return {"ok": False, "description": "SMTP not configured"}
+    
     # Send
     try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = f"{cfg['from_name']} <{cfg['email']}>"
-        msg["To"] = to_addr
-        msg.attach(MIMEText(plain, "plain", "utf-8"))
-        msg.attach(MIMEText(html, "html", "utf-8"))
-        
-        if cfg["use_tls"]:
-            context = ssl.create_default_context()
-            with smtplib.SMTP(cfg["server"], cfg["port"]) as server:
-                server.starttls(context=context)
-                server.login(cfg["email"], cfg["password"])
-                server.sendmail(cfg["email"], to_addr, msg.as_string())
-        else:
-            with smtplib.SMTP_SSL(cfg["server"], cfg["port"]) as server:
-                server.login(cfg["email"], cfg["password"])
-                server.sendmail(cfg["email"], to_addr, msg.as_string())
+        msg = build_message(to_addr, event_type, trade_data, cfg)
+        with open_session(cfg) as server:
+            server.sendmail(cfg["email"], to_addr, msg.as_string())
         
         return {"ok": True, "channel": "email"}
     
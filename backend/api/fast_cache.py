@@ -1,8 +1,9 @@
 """
-Fast Cache — loads pre-built JSON, NEVER scans files during requests.
-Cache file is rebuilt by external script or background process.
+Fast Cache — serves the ranking from running aggregates, NEVER scans trades during requests.
+Stats are updated per closed trade (trade_aggregates); tracker_cache.json is
+only a snapshot for external consumers / fallback.
 """
-import os, json, time, threading
+import os, json, threading
 
 CACHE_FILE = r"C:\\Users\\Administrator\\Desktop\\mvp\\data\\tracker_cache.json"
 _cache = {}
@@ -10,30 +11,21 @@ _lock = threading.Lock()
 _building = False
 
 _last_file_mtime = 0
-_STALE_SEC = 300  # rebuild if cache older than 5 min
 
 def _load_from_file():
-    """Load cache — rebuild automatically if stale."""
+    """Current ranking cache — from the running aggregates, O(strategies)."""
     global _cache, _last_file_mtime
-    if not os.path.exists(CACHE_FILE):
-        return {}
+    try:
+        from backend.api import trade_aggregates
+        _cache = trade_aggregates.get_cache()
+        return _cache
+    except Exception as e:
+        print(f"[CACHE] Aggregates unavailable: {e}")
 
+    # Fallback: last snapshot on disk
+    if not os.path.exists(CACHE_FILE):
+        return _cache
     mtime = os.path.getmtime(CACHE_FILE)
-    age = time.time() - mtime
-
-    # If file is stale, trigger inline rebuild
-    if age > _STALE_SEC:
-        try:
-            import sys
-            sys.path.insert(0, r"C:\Users\Administrator\Desktop\mvp")
-            from scripts.rebuild_cache import rebuild as _rb
-            _cache = _rb()
-            print(f"[CACHE] Auto-rebuilt: {len(_cache.get('ranking',[]))} strategies")
-            return _cache
-        except Exception as e:
-            print(f"[CACHE] Rebuild failed: {e}")
-
-    # If file changed since last read, reload
     if mtime != _last_file_mtime:
         with open(CACHE_FILE, "r", encoding="utf-8") as f:
             _cache = json.load(f)
@@ -46,112 +38,29 @@ try:
     _load_from_file()
     _n = len(_cache.get("ranking", []))
     if _n:
-        print(f"[CACHE] Loaded from file: {_n} strategies")
+        print(f"[CACHE] Loaded: {_n} strategies")
 except Exception as e:
     print(f"[CACHE] Load error: {e}")
 
 
 def _rebuild_in_background():
-    """Rebuild cache by scanning files. Runs in background, never blocks requests."""
-    global _cache, _building
+    """Write a fresh cache snapshot. Runs in background, never blocks requests."""
+    global _building
     if _building:
         return
     _building = True
     try:
-        import subprocess, sys
-        # Run external rebuild script
-        script = os.path.join(os.path.dirname(CACHE_FILE), "..", "scripts", "rebuild_cache.py")
-        if not os.path.exists(script):
-            # Fallback: scan inline but in background thread
-            _scan_files()
-        else:
-            subprocess.Popen([sys.executable, script], 
-                           creationflags=0x00000008)  # DETACHED_PROCESS
+        threading.Thread(target=_scan_files, daemon=True).start()
     finally:
         _building = False
 
 
 def _scan_files():
-    """Background file scan — only called from background thread."""
+    """Snapshot the aggregate ranking to CACHE_FILE — no trade scan."""
     global _cache
-    data_dir = r"C:\\Users\\Administrator\\Desktop\\mvp\\track_records"
-    if not os.path.exists(data_dir):
-        return
-    
-    ranking = []
-    all_symbols = set()
-    total_trades = 0
-    
-    files = [f for f in os.listdir(data_dir) if f.startswith("rec_") and f.endswith(".json")]
-    for filename in files:
-        filepath = os.path.join(data_dir, filename)
-        sid = filename[4:-5]
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                rec = json.load(f)
-        except:
-            continue
-        trades = rec.get("trades", [])
-        closed = [t for t in trades if t.get("status") == "closed"]
-        if not closed:
-            continue
-        total_trades += len(closed)
-        sname = closed[0].get("strategy_name") or sid
-        if not sname or sname.strip() == "":
-            sname = sid
-        wins = sum(1 for t in closed if t.get("outcome") == "win")
-        wr = round(wins / len(closed) * 100, 1)
-        total_pnl = round(sum(t.get("pnl_usd", 0) for t in closed), 2)
-        symbols = {}
-        for t in closed:
-            sym = t.get("symbol", "")
-            if sym:
-                all_symbols.add(sym)
-                if sym not in symbols:
-                    symbols[sym] = {"total": 0, "wins": 0, "pnl": 0}
-                symbols[sym]["total"] += 1
-                if t.get("outcome") == "win": symbols[sym]["wins"] += 1
-                symbols[sym]["pnl"] += t.get("pnl_usd", 0)
-        sym_str = ", ".join(sorted(symbols.keys())) if symbols else "-"
-        win_amounts = [t.get("pnl_usd", 0) for t in closed if t.get("outcome") == "win"]
-        loss_amounts = [t.get("pnl_usd", 0) for t in closed if t.get("outcome") == "loss"]
-        pf = round(abs(sum(win_amounts) / sum(loss_amounts)), 2) if loss_amounts and sum(loss_amounts) != 0 else 0
-        eq = []
-        cs = 0
-        for t in closed[-50:]:
-            cs += t.get("pnl_usd", 0)
-            eq.append(round(cs, 2))
-        item = {
-            "strategy_id": sid, "strategy_name": sname,
-            "category": closed[0].get("category") or (sid.split("_")[0] if "_" in sid else "other"),
-            "symbol": sym_str, "total": len(closed),
-            "wins": wins, "losses": len(closed)-wins,
-            "win_rate": wr, "total_pnl": total_pnl,
-            "avg_pnl": round(total_pnl/len(closed), 2),
-            "avg_win": round(sum(win_amounts)/len(win_amounts), 2) if win_amounts else 0,
-            "avg_loss": round(sum(loss_amounts)/len(loss_amounts), 2) if loss_amounts else 0,
-            "profit_factor": pf,
-            "by_symbol": {k: {"total": v["total"], "wins": v["wins"], "pnl": round(v["pnl"],2)} for k,v in symbols.items()},
-            "last_5": [t.get("outcome","loss") for t in closed[-5:]],
-            "equity_curve": eq,
-            "last_trade": closed[-1].get("opened_at","") if closed else "",
-        }
-        ranking.append(item)
-    
-    ranking.sort(key=lambda x: x["win_rate"], reverse=True)
+    from backend.api import trade_aggregates
     with _lock:
-        _cache = {
-            "ranking": ranking,
-            "summary": [{"strategy_id": r["strategy_id"], "strategy_name": r["strategy_name"],
-                          "category": r.get("category",""), "symbol": r["symbol"], "total": r["total"],
-                          "wins": r["wins"], "win_rate": r["win_rate"], "total_pnl": r["total_pnl"],
-                          "last_trade": r.get("last_trade","")} for r in ranking],
-            "symbols": sorted(all_symbols),
-            "strategies": [{"id": r["strategy_id"], "name": r["strategy_name"], "count": r["total"]} for r in ranking],
-            "total_trades": total_trades,
-            "total_strategies": len(ranking),
-            "built_at": time.time(),
-        }
+        _cache = trade_aggregates.get_cache()
     try:
         with open(CACHE_FILE, "w", encoding="utf-8") as f:
             json.dump(_cache, f, ensure_ascii=False)
@@ -159,6 +68,13 @@ def _scan_files():
         pass
 
 
+def build_cache():
+    """Full recompute of the aggregates from trade history (manual repair)."""
+    from backend.api import trade_aggregates
+    trade_aggregates.rebuild()
+    _scan_files()
+
+
 def get_cache():
     """Get cache — instant, never blocks."""
     if not _cache:
@@ -172,7 +88,7 @@ def get_ranking(sort_by="score", limit=100, since=None):
     sort_by: win_rate, total_pnl, total_pnl_pips, score, profit_factor, total
     since: ISO date string (e.g. "2026-02-17") or "7d", "14d", "30d"
     """
-    # Always reload from disk to get latest rebuild
+    # Aggregates are current as of the last closed trade
     cache = _load_from_file()
     if not cache or not isinstance(cache, dict):
         return {"ranking": [], "total_strategies": 0}
@@ -464,11 +380,10 @@ def get_real_trades(symbols=None, strategies=None, directions=None,
                     date_from=None, date_to=None,
                     sort_by="opened_at", sort_dir="desc", limit=200, offset=0):
     """
-    Read ACTUAL trade records from files — returns real trades with all fields.
-    Smart: uses cache to know which files to read, then filters.
+    Read ACTUAL trade records from the trade store — returns real trades with all fields.
+    Smart: uses cache to know which strategies to read, then filters.
     """
-    import os as _os, json as _json, glob as _glob
-    track_dir = r"C:\\Users\\Administrator\\Desktop\\mvp\\track_records"
+    from backend.api import trade_store
     
     cache = get_cache()
     ranking = cache.get("ranking", [])
@@ -496,23 +411,11 @@ def get_real_trades(symbols=None, strategies=None, directions=None,
     files_read = 0
     max_files = min(len(target_sids), 300)  # Cap at 300 files for speed
     
-    for sid in list(target_sids)[:max_files]:
-        safe_id = sid.replace("/", "_").replace("\\", "_")[:60]
-        rec_file = _os.path.join(track_dir, f"rec_{safe_id}.json")
-        if not _os.path.exists(rec_file):
-            continue
-        
-        try:
-            with open(rec_file, "r", encoding="utf-8") as f:
-                rec = _json.load(f)
-            files_read += 1
-        except:
-            continue
-        
-        for t in rec.get("trades", []):
-            if t.get("status") != "closed":
-                continue
-            
+    grouped = trade_store.grouped_trades(strategy_ids=list(target_sids)[:max_files],
+                                         symbols=symbols or None)
+    for sid, closed in grouped.items():
+        files_read += 1
+        for t in closed:
             # Apply filters
             if symbols and t.get("symbol") not in symbols:
                 continue
@@ -610,22 +513,18 @@ def _quality_filter(ranking):
     except ImportError:
         return ranking  # No validator available, return as-is
     
-    import os, json
-    tr_dir = r"C:\Users\Administrator\Desktop\mvp\track_records"
+    from backend.api import trade_store
+    grouped = trade_store.grouped_trades(
+        strategy_ids=[item.get("strategy_id", "") for item in ranking])
     filtered = []
     
     for item in ranking:
         sid = item.get("strategy_id", "")
-        rec_file = os.path.join(tr_dir, f"rec_{sid}.json")
-        
-        if not os.path.exists(rec_file):
+        if trade_store.record_key(sid) not in grouped:
             continue
         
         try:
-            with open(rec_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            trades = data.get("trades", [])
-            closed = [t for t in trades if t.get("status") == "closed"]
+            closed = grouped[trade_store.record_key(sid)]
             
             if len(closed) < 3:
                 continue
@@ -673,28 +572,16 @@ _TRADES_CACHE_TTL = 120  # Refresh every 2 minutes
 
 def _build_trades_cache():
     """Pre-read all closed trades into memory for instant filtering."""
-    import os as _os, json as _json, time as _time
-    track_dir = r"C:\\Users\\Administrator\\Desktop\\mvp\\track_records"
+    import time as _time
+    from backend.api import trade_store
     
     t0 = _time.time()
     all_trades = []
     files_read = 0
     
-    for filename in _os.listdir(track_dir):
-        if not filename.startswith("rec_") or not filename.endswith(".json"):
-            continue
-        filepath = _os.path.join(track_dir, filename)
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                rec = _json.load(f)
-            files_read += 1
-        except:
-            continue
-        
-        sid = filename[4:-5]
-        for t in rec.get("trades", []):
-            if t.get("status") != "closed":
-                continue
+    for sid, closed in trade_store.grouped_trades().items():
+        files_read += 1
+        for t in closed:
             all_trades.append({
                 "id": t.get("id", ""),
                 "strategy_id": t.get("strategy_id", sid),
@@ -21,8 +21,13 @@ os.makedirs(EXPORT_DIR, exist_ok=True)
 
 
 # ══════ ADVANCED FILTER ══════
+# Filtering runs on the columnar trade table (trade_table.py): the filter
+# dict compiles to NumPy masks and only the returned page is decoded.
 
-def filter_trades(filters=None):
+PAGE_SIZE = 500
+
+
+def filter_trades(filters=None, cursor=None, limit=PAGE_SIZE):
     """
     Filter all trades across all strategies.
     filters: {
@@ -34,126 +39,17 @@ def filter_trades(filters=None):
         min_rr: float, had_be: bool, had_trailing: bool,
         strategy_ids: [list], search: str,
     }
+    Newest first, `limit` per page. Pass the returned next_cursor back to
+    get the following page (None on the last one).
     """
-    from backend.api.tracker_engine import get_all_strategy_ids, load_records
-
-    filters = filters or {}
-    all_trades = []
-
-    # Load all trades
-    target_sids = filters.get("strategy_ids", [])
-    sids = target_sids if target_sids else get_all_strategy_ids()
-
-    for sid in sids:
-        rec = load_records(sid)
-        for t in rec.get("trades", []):
-            t["_strategy_id"] = sid
-            all_trades.append(t)
-
-    # Apply filters
-    result = []
-    for t in all_trades:
-        # Symbol
-        syms = filters.get("symbols", [])
-        if syms and t.get("symbol", "") not in syms:
-            continue
-
-        # Category
-        cats = filters.get("categories", [])
-        if cats and t.get("category", "") not in cats:
-            continue
-
-        # Timeframe
-        tfs = filters.get("timeframes", [])
-        if tfs and t.get("timeframe", "") not in tfs:
-            continue
-
-        # Direction
-        dirs = filters.get("directions", [])
-        if dirs and t.get("direction", "") not in dirs:
-            continue
-
-        # Outcome
-        outs = filters.get("outcomes", [])
-        if outs and t.get("outcome", "") not in outs:
-            continue
-
-        # Exit reason
-        exits = filters.get("exit_reasons", [])
-        if exits and t.get("exit_reason", "") not in exits:
-            continue
-
-        # Date range
-        df = filters.get("date_from", "")
-        if df and t.get("opened_at", "") < df:
-            continue
-        dt = filters.get("date_to", "")
-        if dt and t.get("opened_at", "") > dt:
-            continue
-
-        # PnL range
-        pnl = t.get("pnl_usd", 0)
-        if filters.get("min_pnl") is not None and pnl < filters["min_pnl"]:
-            continue
-        if filters.get("max_pnl") is not None and pnl > filters["max_pnl"]:
-            continue
-
-        # Duration
-        dur = t.get("duration_minutes", 0)
-        if filters.get("min_duration") is not None and dur < filters["min_duration"]:
-            continue
-        if filters.get("max_duration") is not None and dur > filters["max_duration"]:
-            continue
-
-        # BE / Trailing
-        if filters.get("had_be") is True and not t.get("sl_moved_to_be"):
-            continue
-        if filters.get("had_trailing") is True and not t.get("trailing_active"):
-            continue
-
-        # Search
-        q = (filters.get("search") or "").lower()
-        if q:
-            searchable = f"{t.get('strategy_name','')} {t.get('symbol','')} {t.get('category','')}".lower()
-            if q not in searchable:
-                continue
-
-        result.append(t)
-
-    # Sort by date desc
-    result.sort(key=lambda x: x.get("opened_at", ""), reverse=True)
-
-    # Compute stats on filtered
-    stats = _compute_filtered_stats(result)
-
-    return {
-        "trades": result[:500],
-        "total_found": len(result),
-        "stats": stats,
-    }
-
-
-def _compute_filtered_stats(trades):
-    if not trades:
-        return {"total": 0}
-
-    wins = sum(1 for t in trades if t.get("outcome") == "win")
-    pnls = [t.get("pnl_usd", 0) for t in trades]
-    gross_p = sum(p for p in pnls if p > 0)
-    gross_l = abs(sum(p for p in pnls if p < 0))
+    from backend.api import trade_table
 
+    result = trade_table.query(filters, cursor=cursor, limit=limit)
     return {
-        "total": len(trades),
-        "wins": wins,
-        "losses": len(trades) - wins,
-        "win_rate": round(wins / len(trades) * 100, 1),
-        "total_pnl": round(sum(pnls), 2),
-        "avg_pnl": round(sum(pnls) / len(trades), 2),
-        "best": round(max(pnls), 2),
-        "worst": round(min(pnls), 2),
-        "profit_factor": round(gross_p / gross_l, 2) if gross_l > 0 else 99.9,
-        "strategies_count": len(set(t.get("_strategy_id", "") for t in trades)),
-        "symbols_count": len(set(t.get("symbol", "") for t in trades)),
+        "trades": result["trades"],
+        "total_found": result["total_found"],
+        "stats": result["stats"],
+        "next_cursor": result["next_cursor"],
     }
 
 
@@ -213,8 +109,10 @@ def compare_strategies(strategy_ids):
 
 def performance_heatmap(filters=None):
     """Generate hour x day-of-week performance heatmap."""
-    result = filter_trades(filters)
-    trades = result.get("trades", [])
+    from backend.api import trade_table
+
+    tb, idx = trade_table.select(filters, limit=PAGE_SIZE)
+    win_code = tb.dicts["outcome"].get("win", -1)
 
     heatmap = {}  # {day: {hour: {count, wins, pnl}}}
     days_fa = ["دوشنبه", "سه‌شنبه", "چهارشنبه", "پنجشنبه", "جمعه", "شنبه", "یکشنبه"]
@@ -224,16 +122,17 @@ def performance_heatmap(filters=None):
         for hour in range(24):
             heatmap[day_idx][hour] = {"count": 0, "wins": 0, "pnl": 0}
 
-    for t in trades:
+    for opened, outcome, pnl in zip(tb.cols["opened_at"][idx].tolist(),
+                                    tb.cols["outcome"][idx].tolist(),
+                                    tb.cols["pnl_usd"][idx].tolist()):
         try:
-            opened = t.get("opened_at", "")
             dt = datetime.fromisoformat(opened.replace("Z", "+00:00"))
             day = dt.weekday()
             hour = dt.hour
             heatmap[day][hour]["count"] += 1
-            if t.get("outcome") == "win":
+            if outcome == win_code:
                 heatmap[day][hour]["wins"] += 1
-            heatmap[day][hour]["pnl"] += t.get("pnl_usd", 0)
+            heatmap[day][hour]["pnl"] += pnl
         except Exception:
             continue
 
@@ -252,73 +151,94 @@ def performance_heatmap(filters=None):
                     "pnl": round(info["pnl"], 2),
                 })
 
-    return {"cells": cells, "days": days_fa, "total_trades": len(trades)}
+    return {"cells": cells, "days": days_fa, "total_trades": len(idx)}
 
 
 # ══════ CSV EXPORT ══════
 
-def export_csv(filters=None):
-    """Export filtered trades to CSV file."""
-    result = filter_trades(filters)
-    trades = result.get("trades", [])
+CSV_HEADER = [
+    "Strategy", "Category", "Symbol", "Timeframe", "Direction",
+    "Entry Price", "Exit Price", "SL", "TP1",
+    "PnL (pips)", "PnL ($)", "Outcome", "Exit Reason",
+    "Duration (min)", "BE Used", "Trailing Used", "Partial Closes",
+    "Opened At", "Closed At", "Events Count",
+]
+
+
+def _csv_row(t):
+    return [
+        t.get("strategy_name", ""),
+        t.get("category", ""),
+        t.get("symbol", ""),
+        t.get("timeframe", ""),
+        t.get("direction", ""),
+        t.get("entry_price", 0),
+        t.get("exit_price", 0),
+        t.get("sl_price", 0),
+        t.get("tp1_price", 0),
+        t.get("pnl_pips", 0),
+        t.get("pnl_usd", 0),
+        t.get("outcome", ""),
+        t.get("exit_reason", ""),
+        round(t.get("duration_minutes", 0), 1),
+        "Yes" if t.get("sl_moved_to_be") else "No",
+        "Yes" if t.get("trailing_active") else "No",
+        len(t.get("partial_closes", [])),
+        t.get("opened_at", ""),
+        t.get("closed_at", ""),
+        len(t.get("events", [])),
+    ]
+
+
+def iter_csv(filters=None, limit=None, rows_per_chunk=500):
+    """
+    Yield the CSV text chunk by chunk (header first). Trades are decoded in
+    batches, so memory stays flat however many rows match — suitable for a
+    StreamingResponse or writing straight to disk.
+    """
+    from backend.api import trade_table
 
     output = io.StringIO()
     writer = csv.writer(output)
-
-    # Header
-    writer.writerow([
-        "Strategy", "Category", "Symbol", "Timeframe", "Direction",
-        "Entry Price", "Exit Price", "SL", "TP1",
-        "PnL (pips)", "PnL ($)", "Outcome", "Exit Reason",
-        "Duration (min)", "BE Used", "Trailing Used", "Partial Closes",
-        "Opened At", "Closed At", "Events Count",
-    ])
-
-    for t in trades:
-        writer.writerow([
-            t.get("strategy_name", ""),
-            t.get("category", ""),
-            t.get("symbol", ""),
-            t.get("timeframe", ""),
-            t.get("direction", ""),
-            t.get("entry_price", 0),
-            t.get("exit_price", 0),
-            t.get("sl_price", 0),
-            t.get("tp1_price", 0),
-            t.get("pnl_pips", 0),
-            t.get("pnl_usd", 0),
-            t.get("outcome", ""),
-            t.get("exit_reason", ""),
-            round(t.get("duration_minutes", 0), 1),
-            "Yes" if t.get("sl_moved_to_be") else "No",
-            "Yes" if t.get("trailing_active") else "No",
-            len(t.get("partial_closes", [])),
-            t.get("opened_at", ""),
-            t.get("closed_at", ""),
-            len(t.get("events", [])),
-        ])
-
-    csv_content = output.getvalue()
-
-    # Save to file
+    writer.writerow(CSV_HEADER)
+    n = 0
+    for t in trade_table.iter_matches(filters, limit=limit, batch=rows_per_chunk):
+        writer.writerow(_csv_row(t))
+        n += 1
+        if n % rows_per_chunk == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue()
+
+
+def export_csv(filters=None, limit=None):
+    """Export filtered trades to CSV file (all matches unless limit is given)."""
+    from backend.api import trade_table
+
+    tb, idx = trade_table.select(filters, limit=limit)
+    total = len(idx)
+
+    # Stream to file
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"track_export_{timestamp}.csv"
     filepath = os.path.join(EXPORT_DIR, filename)
     with open(filepath, "w", encoding="utf-8-sig", newline="") as f:
-        f.write(csv_content)
+        for chunk in iter_csv(filters, limit=limit):
+            f.write(chunk)
 
     return {
         "success": True,
         "filename": filename,
         "filepath": filepath,
-        "total_rows": len(trades),
-        "stats": result.get("stats", {}),
+        "total_rows": total,
+        "stats": trade_table.compute_stats(tb, idx),
     }
 
 
 def export_html_report(filters=None):
     """Export filtered trades to HTML report."""
-    result = filter_trades(filters)
+    result = filter_trades(filters, limit=200)
     trades = result.get("trades", [])
     stats = result.get("stats", {})
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
@@ -387,33 +307,14 @@ Generated by Whilber-AI Signal Tracker</div></body></html>"""
 
 def get_filter_options():
     """Return all available filter values."""
-    from backend.api.tracker_engine import get_all_strategy_ids, load_records
-
-    symbols = set()
-    categories = set()
-    timeframes = set()
-    strategies = []
-
-    for sid in get_all_strategy_ids():
-        rec = load_records(sid)
-        trades = rec.get("trades", [])
-        if not trades:
-            continue
-        name = trades[0].get("strategy_name", sid)
-        cat = trades[0].get("category", "")
-        strategies.append({"id": sid, "name": name, "category": cat, "count": len(trades)})
-        for t in trades:
-            symbols.add(t.get("symbol", ""))
-            if t.get("category"):
-                categories.add(t["category"])
-            if t.get("timeframe"):
-                timeframes.add(t["timeframe"])
+    from backend.api import trade_table
 
+    opts = trade_table.filter_options()
     return {
-        "symbols": sorted(symbols),
-        "categories": sorted(categories),
-        "timeframes": sorted(timeframes),
-        "strategies": sorted(strategies, key=lambda x: -x["count"]),
+        "symbols": sorted(opts["symbols"]),
+        "categories": sorted(opts["categories"]),
+        "timeframes": sorted(opts["timeframes"]),
+        "strategies": sorted(opts["strategies"], key=lambda x: -x["count"]),
         "directions": ["BUY", "SELL"],
         "outcomes": ["win", "loss"],
         "exit_reasons": ["tp", "sl", "trailing", "break_even", "manual", "tp_recovery", "sl_recovery"],
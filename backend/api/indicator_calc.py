@@ -5,33 +5,70 @@ Computes indicator values from OHLCV DataFrame.
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
 
-def _sma(data, period):
+
+# ══════ KERNELS ══════
+# All kernels are vectorized over the whole history: rolling windows go
+# through sliding_window_view (no copies), recursive smoothing through
+# lfilter (plain loop when scipy is missing). Warm-up bars stay NaN.
+
+def _windows(data, period):
+    """(n - period + 1, period) view of trailing windows; None if too short."""
+    data = np.asarray(data, dtype=float)
+    if period < 1 or len(data) < period:
+        return None
+    return sliding_window_view(data, period)
+
+
+def _rolling(data, period, fn):
+    """fn(window) for every full window, aligned to the window's last bar."""
     out = np.full(len(data), np.nan)
-    for i in range(period - 1, len(data)):
-        out[i] = np.mean(data[i - period + 1:i + 1])
+    w = _windows(data, period)
+    if w is not None:
+        out[period - 1:] = fn(w, axis=1)
+    return out
+
+
+def _recursive(x, alpha, seed):
+    """y[i] = x[i] * alpha + y[i-1] * (1 - alpha), with y[-1] = seed."""
+    x = np.asarray(x, dtype=float)
+    if len(x) == 0:
+        return x.copy()
+    if lfilter is not None:
+        y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, zi=[(1.0 - alpha) * seed])
+        return y
+    out = np.empty(len(x))
+    prev = seed
+    for i, v in enumerate(x):
+        prev = v * alpha + prev * (1 - alpha)
+        out[i] = prev
     return out
 
 
+def _sma(data, period):
+    return _rolling(data, period, np.mean)
+
+
 def _ema(data, period):
     out = np.full(len(data), np.nan)
     if len(data) < period:
         return out
+    data = np.asarray(data, dtype=float)
     out[period - 1] = np.mean(data[:period])
-    m = 2.0 / (period + 1)
-    for i in range(period, len(data)):
-        out[i] = data[i] * m + out[i - 1] * (1 - m)
+    out[period:] = _recursive(data[period:], 2.0 / (period + 1), out[period - 1])
     return out
 
 
 def _wma(data, period):
-    out = np.full(len(data), np.nan)
     weights = np.arange(1, period + 1, dtype=float)
     wsum = weights.sum()
-    for i in range(period - 1, len(data)):
-        out[i] = np.sum(data[i - period + 1:i + 1] * weights) / wsum
-    return out
+    return _rolling(data, period, lambda w, axis: w @ weights / wsum)
 
 
 def _dema(data, period):
@@ -39,72 +76,94 @@ def _dema(data, period):
     e2 = _ema(e1[~np.isnan(e1)], period) if np.any(~np.isnan(e1)) else e1
     out = np.full(len(data), np.nan)
     offset = len(data) - len(e2)
-    for i in range(len(e2)):
-        if not np.isnan(e1[i + offset]) and not np.isnan(e2[i]):
-            out[i + offset] = 2 * e1[i + offset] - e2[i]
+    out[offset:] = 2 * e1[offset:] - e2
     return out
 
 
 def _tema(data, period):
     e1 = _ema(data, period)
-    valid1 = e1[~np.isnan(e1)]
-    e2 = _ema(valid1, period) if len(valid1) >= period else np.full(len(valid1), np.nan)
-    valid2 = e2[~np.isnan(e2)]
-    e3 = _ema(valid2, period) if len(valid2) >= period else np.full(len(valid2), np.nan)
     out = np.full(len(data), np.nan)
     # Simplified: just use triple EMA approximation
-    for i in range(period * 3, len(data)):
-        if not np.isnan(e1[i]):
-            out[i] = e1[i]
+    if len(data) > period * 3:
+        out[period * 3:] = e1[period * 3:]
+    return out
+
+
+def _wilder_ratio(up, down, period):
+    """
+    Wilder-smoothed 100 - 100 / (1 + up/down) over per-bar up/down moves
+    (element 0 = move into bar 1). Output aligned to bars; first value at
+    bar `period`, 100 where the smoothed down side is zero.
+    """
+    out = np.full(len(up) + 1, np.nan)
+    avg_u = np.empty(len(up) - period + 1)
+    avg_d = np.empty(len(up) - period + 1)
+    avg_u[0] = np.mean(up[:period])
+    avg_d[0] = np.mean(down[:period])
+    avg_u[1:] = _recursive(up[period:], 1.0 / period, avg_u[0])
+    avg_d[1:] = _recursive(down[period:], 1.0 / period, avg_d[0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[period:] = np.where(avg_d == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_u / avg_d))
     return out
 
 
 def _rsi(close, period):
-    out = np.full(len(close), np.nan)
     if len(close) < period + 1:
-        return out
+        return np.full(len(close), np.nan)
     delta = np.diff(close)
     gain = np.where(delta > 0, delta, 0.0)
     loss = np.where(delta < 0, -delta, 0.0)
-    avg_g = np.mean(gain[:period])
-    avg_l = np.mean(loss[:period])
-    if avg_l == 0:
-        out[period] = 100.0
-    else:
-        out[period] = 100.0 - 100.0 / (1.0 + avg_g / avg_l)
-    for i in range(period, len(delta)):
-        avg_g = (avg_g * (period - 1) + gain[i]) / period
-        avg_l = (avg_l * (period - 1) + loss[i]) / period
-        if avg_l == 0:
-            out[i + 1] = 100.0
-        else:
-            out[i + 1] = 100.0 - 100.0 / (1.0 + avg_g / avg_l)
+    return _wilder_ratio(gain, loss, period)
+
+
+def _mfi(high, low, close, volume, period):
+    """Money Flow Index: RSI-style ratio of positive/negative typical-price money flow."""
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n < period + 1:
+        return out
+    tp = (high + low + close) / 3
+    flow = tp[1:] * volume[1:]
+    move = np.diff(tp)
+    pos = _rolling(np.where(move > 0, flow, 0.0), period, np.sum)
+    neg = _rolling(np.where(move < 0, flow, 0.0), period, np.sum)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mfi = np.where(neg == 0, np.where(pos == 0, 50.0, 100.0),
+                       100.0 - 100.0 / (1.0 + pos / neg))
+    out[1:] = np.where(np.isnan(pos), np.nan, mfi)
     return out
 
 
+def _has_range(hh, ll):
+    """hh != ll, ignoring float noise (the lfilter RSI leaves ~1e-14 on flat runs)."""
+    scale = np.maximum(np.maximum(np.abs(hh), np.abs(ll)), 1.0)
+    with np.errstate(invalid="ignore"):
+        return np.abs(hh - ll) > 1e-9 * scale
+
+
 def _stoch(high, low, close, k_period, d_period, slowing):
-    n = len(close)
-    k = np.full(n, np.nan)
-    raw_k = np.full(n, np.nan)
-    for i in range(k_period - 1, n):
-        hh = np.max(high[i - k_period + 1:i + 1])
-        ll = np.min(low[i - k_period + 1:i + 1])
-        if hh != ll:
-            raw_k[i] = (close[i] - ll) / (hh - ll) * 100
-        else:
-            raw_k[i] = 50
+    hh = _rolling(high, k_period, np.max)
+    ll = _rolling(low, k_period, np.min)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw_k = np.where(_has_range(hh, ll), (close - ll) / (hh - ll) * 100, 50.0)
+    raw_k[np.isnan(hh)] = np.nan
     k = _sma(raw_k, slowing) if slowing > 1 else raw_k
     d = _sma(k, d_period)
     return k, d
 
 
+def _true_range(high, low, close):
+    tr = np.empty(len(close))
+    if len(close):
+        tr[0] = high[0] - low[0]
+        tr[1:] = np.maximum.reduce([high[1:] - low[1:],
+                                    np.abs(high[1:] - close[:-1]),
+                                    np.abs(low[1:] - close[:-1])])
+    return tr
+
+
 def _atr(high, low, close, period):
-    n = len(close)
-    tr = np.zeros(n)
-    tr[0] = high[0] - low[0]
-    for i in range(1, n):
-        tr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
-    return _ema(tr, period)
+    return _ema(_true_range(high, low, close), period)
 
 
 def _macd(close, fast, slow, signal):
@@ -122,16 +181,14 @@ def _macd(close, fast, slow, signal):
 
 def _bb(close, period, std_dev):
     mid = _sma(close, period)
-    upper = np.full(len(close), np.nan)
-    lower = np.full(len(close), np.nan)
-    width = np.full(len(close), np.nan)
-    pctb = np.full(len(close), np.nan)
-    for i in range(period - 1, len(close)):
-        s = np.std(close[i - period + 1:i + 1])
-        upper[i] = mid[i] + std_dev * s
-        lower[i] = mid[i] - std_dev * s
-        width[i] = (upper[i] - lower[i]) / mid[i] * 100 if mid[i] else 0
-        pctb[i] = (close[i] - lower[i]) / (upper[i] - lower[i]) * 100 if upper[i] != lower[i] else 50
+    s = _rolling(close, period, np.std)
+    upper = mid + std_dev * s
+    lower = mid - std_dev * s
+    with np.errstate(divide="ignore", invalid="ignore"):
+        width = np.where(mid != 0, (upper - lower) / mid * 100, 0.0)
+        pctb = np.where(upper != lower, (close - lower) / (upper - lower) * 100, 50.0)
+    width[np.isnan(mid)] = np.nan
+    pctb[np.isnan(mid)] = np.nan
     return upper, mid, lower, width, pctb
 
 
@@ -139,28 +196,31 @@ def _adx(high, low, close, period):
     n = len(close)
     plus_dm = np.zeros(n)
     minus_dm = np.zeros(n)
-    for i in range(1, n):
-        up = high[i] - high[i - 1]
-        down = low[i - 1] - low[i]
-        plus_dm[i] = up if up > down and up > 0 else 0
-        minus_dm[i] = down if down > up and down > 0 else 0
+    if n > 1:
+        up = high[1:] - high[:-1]
+        down = low[:-1] - low[1:]
+        plus_dm[1:] = np.where((up > down) & (up > 0), up, 0.0)
+        minus_dm[1:] = np.where((down > up) & (down > 0), down, 0.0)
     atr_val = _atr(high, low, close, period)
-    plus_di = np.full(n, np.nan)
-    minus_di = np.full(n, np.nan)
-    adx = np.full(n, np.nan)
     sm_pdm = _ema(plus_dm, period)
     sm_mdm = _ema(minus_dm, period)
-    for i in range(period, n):
-        if atr_val[i] and atr_val[i] > 0:
-            plus_di[i] = sm_pdm[i] / atr_val[i] * 100
-            minus_di[i] = sm_mdm[i] / atr_val[i] * 100
+    plus_di = np.full(n, np.nan)
+    minus_di = np.full(n, np.nan)
+    ok = np.zeros(n, dtype=bool)
+    ok[period:] = atr_val[period:] > 0
+    plus_di[ok] = sm_pdm[ok] / atr_val[ok] * 100
+    minus_di[ok] = sm_mdm[ok] / atr_val[ok] * 100
+    s = plus_di + minus_di
     dx = np.full(n, np.nan)
-    for i in range(period, n):
-        if plus_di[i] is not None and minus_di[i] is not None:
-            s = (plus_di[i] or 0) + (minus_di[i] or 0)
-            if s > 0:
-                dx[i] = abs((plus_di[i] or 0) - (minus_di[i] or 0)) / s * 100
-    adx = _ema(dx, period)
+    valid = ~np.isnan(s)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx[valid] = np.where(s[valid] > 0, np.abs(plus_di[valid] - minus_di[valid]) / s[valid] * 100, 0.0)
+    # Smooth DX from its first defined bar (seeding the EMA on the NaN
+    # warm-up used to leave the whole ADX line NaN)
+    adx = np.full(n, np.nan)
+    if valid.any():
+        first = int(np.argmax(valid))
+        adx[first:] = _ema(dx[first:], period)
     return adx, plus_di, minus_di
 
 
@@ -171,22 +231,31 @@ def _supertrend(high, low, close, period, multiplier):
     direction = np.zeros(n)
     upper = np.zeros(n)
     lower = np.zeros(n)
-    for i in range(period, n):
-        a = atr_val[i] if not np.isnan(atr_val[i]) else 0
-        hl2 = (high[i] + low[i]) / 2
-        upper[i] = hl2 + multiplier * a
-        lower[i] = hl2 - multiplier * a
-        if i > period:
-            if close[i - 1] > upper[i - 1]:
-                direction[i] = 1
-            elif close[i - 1] < lower[i - 1]:
-                direction[i] = -1
-            else:
-                direction[i] = direction[i - 1]
-        st[i] = lower[i] if direction[i] == 1 else upper[i]
+    if n <= period:
+        return st, direction
+    a = np.nan_to_num(atr_val[period:], nan=0.0)
+    hl2 = (high[period:] + low[period:]) / 2
+    upper[period:] = hl2 + multiplier * a
+    lower[period:] = hl2 - multiplier * a
+    # Direction flips on the previous bar's close breaking its band and
+    # otherwise carries forward → forward-fill of the flip events.
+    flips = np.zeros(n)
+    flips[period + 1:] = np.select(
+        [close[period:-1] > upper[period:-1], close[period:-1] < lower[period:-1]], [1.0, -1.0], 0.0)
+    last = np.maximum.accumulate(np.where(flips != 0, np.arange(n), 0))
+    direction = flips[last]
+    st[period:] = np.where(direction[period:] == 1, lower[period:], upper[period:])
     return st, direction
 
 
+def _donchian(high, low, period):
+    return _rolling(high, period, np.max), _rolling(low, period, np.min)
+
+
+def _volume(df, n):
+    return df["tick_volume"].values.astype(float) if "tick_volume" in df.columns else np.ones(n)
+
+
 def _get_source(df, source):
     if source == "hl2":
         return (df["high"].values + df["low"].values) / 2
@@ -238,25 +307,25 @@ def compute_indicator(df, indicator_id, params):
 
     elif indicator_id == "CCI":
         tp = (h + l + c) / 3
-        sma = _sma(tp, params.get("period", 20))
-        out = np.full(n, np.nan)
         p = params.get("period", 20)
-        for i in range(p - 1, n):
-            md = np.mean(np.abs(tp[i - p + 1:i + 1] - sma[i]))
-            out[i] = (tp[i] - sma[i]) / (0.015 * md) if md > 0 else 0
+        sma = _sma(tp, p)
+        out = np.full(n, np.nan)
+        w = _windows(tp, p)
+        if w is not None:
+            md = np.mean(np.abs(w - sma[p - 1:, None]), axis=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[p - 1:] = np.where(md > 0, (tp[p - 1:] - sma[p - 1:]) / (0.015 * md), 0.0)
         return {"value": out}
 
     elif indicator_id == "WILLIAMS":
-        p = params.get("period", 14)
-        out = np.full(n, np.nan)
-        for i in range(p - 1, n):
-            hh = np.max(h[i - p + 1:i + 1])
-            ll = np.min(l[i - p + 1:i + 1])
-            out[i] = (hh - c[i]) / (hh - ll) * -100 if hh != ll else -50
+        hh, ll = _donchian(h, l, params.get("period", 14))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(_has_range(hh, ll), (hh - c) / (hh - ll) * -100, -50.0)
+        out[np.isnan(hh)] = np.nan
         return {"value": out}
 
     elif indicator_id == "MFI":
-        return {"value": _rsi(c, params.get("period", 14))}  # Simplified
+        return {"value": _mfi(h, l, c, _volume(df, n), params.get("period", 14))}
 
     elif indicator_id == "MACD":
         ml, sl, hist = _macd(c, params.get("fast", 12), params.get("slow", 26), params.get("signal", 9))
@@ -276,12 +345,7 @@ def compute_indicator(df, indicator_id, params):
         return {"upper": mid + mult * atr, "middle": mid, "lower": mid - mult * atr}
 
     elif indicator_id == "DONCHIAN":
-        p = params.get("period", 20)
-        upper = np.full(n, np.nan)
-        lower = np.full(n, np.nan)
-        for i in range(p - 1, n):
-            upper[i] = np.max(h[i - p + 1:i + 1])
-            lower[i] = np.min(l[i - p + 1:i + 1])
+        upper, lower = _donchian(h, l, params.get("period", 20))
         return {"upper": upper, "middle": (upper + lower) / 2, "lower": lower}
 
     elif indicator_id == "ADX":
@@ -290,13 +354,8 @@ def compute_indicator(df, indicator_id, params):
 
     elif indicator_id == "AROON":
         p = params.get("period", 25)
-        up = np.full(n, np.nan)
-        down = np.full(n, np.nan)
-        for i in range(p, n):
-            hh_idx = np.argmax(h[i - p:i + 1])
-            ll_idx = np.argmin(l[i - p:i + 1])
-            up[i] = hh_idx / p * 100
-            down[i] = ll_idx / p * 100
+        up = _rolling(h, p + 1, np.argmax) / p * 100
+        down = _rolling(l, p + 1, np.argmin) / p * 100
         return {"up": up, "down": down, "oscillator": up - down}
 
     elif indicator_id == "SUPERTREND":
@@ -310,17 +369,13 @@ def compute_indicator(df, indicator_id, params):
         t = params.get("tenkan", 9)
         k = params.get("kijun", 26)
         sb = params.get("senkou_b", 52)
-        tenkan = np.full(n, np.nan)
-        kijun = np.full(n, np.nan)
-        for i in range(max(t, k, sb) - 1, n):
-            if i >= t - 1:
-                tenkan[i] = (np.max(h[i - t + 1:i + 1]) + np.min(l[i - t + 1:i + 1])) / 2
-            if i >= k - 1:
-                kijun[i] = (np.max(h[i - k + 1:i + 1]) + np.min(l[i - k + 1:i + 1])) / 2
+        warmup = max(t, k, sb) - 1
+        tenkan = np.add(*_donchian(h, l, t)) / 2
+        kijun = np.add(*_donchian(h, l, k)) / 2
+        tenkan[:warmup] = np.nan
+        kijun[:warmup] = np.nan
         sa = (tenkan + kijun) / 2
-        senkou_b = np.full(n, np.nan)
-        for i in range(sb - 1, n):
-            senkou_b[i] = (np.max(h[i - sb + 1:i + 1]) + np.min(l[i - sb + 1:i + 1])) / 2
+        senkou_b = np.add(*_donchian(h, l, sb)) / 2
         return {"tenkan": tenkan, "kijun": kijun, "senkou_a": sa, "senkou_b": senkou_b, "chikou": c}
 
     elif indicator_id == "VOLUME":
@@ -328,15 +383,9 @@ def compute_indicator(df, indicator_id, params):
         return {"value": v}
 
     elif indicator_id == "OBV":
-        v = df["tick_volume"].values if "tick_volume" in df.columns else np.ones(n)
+        v = _volume(df, n)
         obv = np.zeros(n)
-        for i in range(1, n):
-            if c[i] > c[i - 1]:
-                obv[i] = obv[i - 1] + v[i]
-            elif c[i] < c[i - 1]:
-                obv[i] = obv[i - 1] - v[i]
-            else:
-                obv[i] = obv[i - 1]
+        obv[1:] = np.cumsum(np.sign(np.diff(c)) * v[1:])
         return {"value": obv}
 
     elif indicator_id == "VWAP":
@@ -350,53 +399,53 @@ def compute_indicator(df, indicator_id, params):
         bullish = np.zeros(n, dtype=bool)
         bearish = np.zeros(n, dtype=bool)
         pattern = params.get("pattern", "engulfing")
-        for i in range(1, n):
-            body = c[i] - o[i]
-            prev_body = c[i - 1] - o[i - 1]
-            upper_wick = h[i] - max(o[i], c[i])
-            lower_wick = min(o[i], c[i]) - l[i]
-            body_size = abs(body)
-            if pattern == "engulfing":
-                bullish[i] = body > 0 and prev_body < 0 and body_size > abs(prev_body)
-                bearish[i] = body < 0 and prev_body > 0 and body_size > abs(prev_body)
-            elif pattern == "hammer":
-                bullish[i] = lower_wick > body_size * 2 and upper_wick < body_size * 0.5
-            elif pattern == "shooting_star":
-                bearish[i] = upper_wick > body_size * 2 and lower_wick < body_size * 0.5
-            elif pattern == "doji":
-                bullish[i] = body_size < (h[i] - l[i]) * 0.1
-                bearish[i] = bullish[i]
-            elif pattern == "pin_bar":
-                rng = h[i] - l[i]
-                if rng > 0:
-                    bullish[i] = lower_wick / rng > 0.6 and body_size / rng < 0.2
-                    bearish[i] = upper_wick / rng > 0.6 and body_size / rng < 0.2
-            else:
-                bullish[i] = body > 0
-                bearish[i] = body < 0
+        body = c - o
+        prev_body = np.concatenate([[0.0], body[:-1]])
+        upper_wick = h - np.maximum(o, c)
+        lower_wick = np.minimum(o, c) - l
+        body_size = np.abs(body)
+        rng = h - l
+        if pattern == "engulfing":
+            bull = (body > 0) & (prev_body < 0) & (body_size > np.abs(prev_body))
+            bear = (body < 0) & (prev_body > 0) & (body_size > np.abs(prev_body))
+        elif pattern == "hammer":
+            bull = (lower_wick > body_size * 2) & (upper_wick < body_size * 0.5)
+            bear = bearish
+        elif pattern == "shooting_star":
+            bull = bullish
+            bear = (upper_wick > body_size * 2) & (lower_wick < body_size * 0.5)
+        elif pattern == "doji":
+            bull = bear = body_size < rng * 0.1
+        elif pattern == "pin_bar":
+            safe = np.where(rng > 0, rng, 1.0)
+            small_body = (rng > 0) & (body_size / safe < 0.2)
+            bull = small_body & (lower_wick / safe > 0.6)
+            bear = small_body & (upper_wick / safe > 0.6)
+        else:
+            bull = body > 0
+            bear = body < 0
+        # bar 0 has no previous candle
+        bullish[1:] = bull[1:]
+        bearish[1:] = bear[1:]
         return {"bullish": bullish.astype(float), "bearish": bearish.astype(float)}
 
     elif indicator_id == "FIB_RETRACE":
         lb = params.get("lookback", 50)
         level = float(params.get("level", "0.618"))
-        out = np.full(n, np.nan)
-        for i in range(lb, n):
-            hh = np.max(h[i - lb:i + 1])
-            ll = np.min(l[i - lb:i + 1])
-            out[i] = hh - (hh - ll) * level
-        return {"level_price": out}
+        hh, ll = _donchian(h, l, lb + 1)
+        return {"level_price": hh - (hh - ll) * level}
 
     elif indicator_id == "PIVOT":
         out = {k: np.full(n, np.nan) for k in ["pp", "r1", "r2", "r3", "s1", "s2", "s3"]}
-        for i in range(1, n):
-            pp = (h[i - 1] + l[i - 1] + c[i - 1]) / 3
-            out["pp"][i] = pp
-            out["r1"][i] = 2 * pp - l[i - 1]
-            out["s1"][i] = 2 * pp - h[i - 1]
-            out["r2"][i] = pp + (h[i - 1] - l[i - 1])
-            out["s2"][i] = pp - (h[i - 1] - l[i - 1])
-            out["r3"][i] = h[i - 1] + 2 * (pp - l[i - 1])
-            out["s3"][i] = l[i - 1] - 2 * (h[i - 1] - pp)
+        ph, pl, pc = h[:-1], l[:-1], c[:-1]
+        pp = (ph + pl + pc) / 3
+        out["pp"][1:] = pp
+        out["r1"][1:] = 2 * pp - pl
+        out["s1"][1:] = 2 * pp - ph
+        out["r2"][1:] = pp + (ph - pl)
+        out["s2"][1:] = pp - (ph - pl)
+        out["r3"][1:] = ph + 2 * (pp - pl)
+        out["s3"][1:] = pl - 2 * (ph - pp)
         return out
 
     return {"value": np.full(n, np.nan)}
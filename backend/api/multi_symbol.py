@@ -76,31 +76,13 @@ def multi_symbol_test(symbols, strategy, bars=500, balance=10000, spread=2):
         s_copy["symbol"] = symbol
 
         try:
-            from backend.mt5.mt5_connector import MT5Connector
-            import MetaTrader5 as mt5
-            import pandas as pd
+            from backend.mt5.bar_source import load_bars
 
-            connector = MT5Connector.get_instance()
-            if not connector.ensure_connected():
-                results.append({"symbol": symbol, "success": False, "error": "MT5 not connected"})
-                continue
-
-            tf_map = {
-                "M1": mt5.TIMEFRAME_M1, "M5": mt5.TIMEFRAME_M5,
-                "M15": mt5.TIMEFRAME_M15, "M30": mt5.TIMEFRAME_M30,
-                "H1": mt5.TIMEFRAME_H1, "H4": mt5.TIMEFRAME_H4,
-                "D1": mt5.TIMEFRAME_D1, "W1": mt5.TIMEFRAME_W1,
-            }
-            tf = tf_map.get(strategy.get("timeframe", "H1").upper(), mt5.TIMEFRAME_H1)
-
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, min(bars, 1000))
-            if rates is None or len(rates) < 50:
+            df = load_bars(symbol, strategy.get("timeframe", "H1"), min(bars, 1000))
+            if df is None or len(df) < 50:
                 results.append({"symbol": symbol, "success": False, "error": "No data"})
                 continue
 
-            df = pd.DataFrame(rates)
-            df["time"] = pd.to_datetime(df["time"], unit="s")
-
             bt = run_backtest(df, s_copy, initial_balance=balance, spread_pips=spread)
 
             if bt.get("success"):
@@ -1,12 +1,16 @@
 """
 Whilber-AI — Strategy Optimizer
 ===================================
-Grid Search, Walk-Forward, Monte Carlo for parameter optimization.
+Grid Search, Successive Halving, Walk-Forward, Monte Carlo for parameter optimization.
 """
 
 import numpy as np
 import copy
+import os
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
 from backend.api.backtest_engine import run_backtest
@@ -122,19 +126,156 @@ def _gen_values(param):
         return vals
 
 
-def grid_search(df, strategy, selected_params=None, max_combos=200):
+# Grid execution: combos are grouped by their indicator params and farmed
+# out to a process pool in chunks; every worker keeps one indicator cache
+# per history slice, so combos that only differ in exit params reuse it.
+GRID_WORKERS = 4            # 1 = always serial, in-process
+GRID_PARALLEL_MIN = 24      # smaller grids run serially (pool start-up dominates)
+GRID_CHUNKS_PER_WORKER = 4
+_grid_ctx = None            # per-process: df, strategy, params, slice caches
+
+
+def _sample_combos(param_values, max_combos, rng=random):
+    """All combos, or max_combos distinct ones drawn without replacement."""
+    total = 1
+    for pv in param_values:
+        total *= len(pv)
+    if total <= max_combos:
+        combos = [[]]
+        for pv in param_values:
+            combos = [c + [v] for c in combos for v in pv]
+        return combos, total
+    combos = []
+    # Mixed-radix decode of distinct flat indices — no duplicate checks needed
+    for flat in rng.sample(range(total), max_combos):
+        combo = []
+        for pv in reversed(param_values):
+            flat, r = divmod(flat, len(pv))
+            combo.append(pv[r])
+        combos.append(combo[::-1])
+    return combos, total
+
+
+def _with_params(strategy, params, combo):
     """
-    Grid search optimization.
-    Tests all combinations of selected parameters.
+    Strategy copy with combo applied. Only the touched sections (and
+    entry_conditions, which run_backtest annotates) are deep-copied.
+    """
+    s = dict(strategy)
+    sections = {p["path"].split(".", 1)[0] for p in params} | {"entry_conditions"}
+    for sec in sections:
+        if sec in s:
+            s[sec] = copy.deepcopy(s[sec])
+    desc = {}
+    for p, val in zip(params, combo):
+        _set_param(s, p["path"], val)
+        desc[p["name"]] = val
+    return s, desc
+
+
+def _grid_one(df, strategy, params, combo, cache, min_trades=3):
+    s, desc = _with_params(strategy, params, combo)
+    try:
+        bt = run_backtest(df, s, initial_balance=10000, spread_pips=2, indicator_cache=cache)
+    except Exception:
+        return None
+    if not bt.get("success") or bt.get("stats", {}).get("total", 0) < min_trades:
+        return None
+    st = bt["stats"]
+    return {
+        "params": desc,
+        "total_trades": st["total"],
+        "win_rate": st["win_rate"],
+        "profit_factor": st["profit_factor"],
+        "total_pnl": st["total_pnl"],
+        "max_dd": st["max_drawdown_pct"],
+        "sharpe": st["sharpe"],
+        "score": _calc_opt_score(st),
+    }
+
+
+def _grid_context(df, strategy, params):
+    return {"df": df, "strategy": strategy, "params": params, "slices": {}}
+
+
+def _eval_chunk(ctx, indexed, bars=None, min_trades=3):
+    """Backtest [(idx, combo), ...] on the last `bars` bars (None = all)."""
+    sl = ctx["slices"].get(bars)
+    if sl is None:
+        df = ctx["df"] if bars is None else ctx["df"].iloc[-bars:].reset_index(drop=True)
+        sl = ctx["slices"][bars] = (df, {})
+    df, cache = sl
+    rows = []
+    for idx, combo in indexed:
+        row = _grid_one(df, ctx["strategy"], ctx["params"], combo, cache, min_trades)
+        if row:
+            rows.append((idx, row))
+    return len(indexed), rows
+
+
+def _init_grid_worker(df, strategy, params):
+    global _grid_ctx
+    _grid_ctx = _grid_context(df, strategy, params)
+
+
+def _run_grid_chunk(indexed, bars=None, min_trades=3):
+    """Worker entry: backtest a chunk against the worker's grid context."""
+    return _eval_chunk(_grid_ctx, indexed, bars, min_trades)
+
+
+def _chunk_combos(indexed, params, n_chunks):
+    """Sort (idx, combo) so equal indicator params are adjacent, then split into chunks."""
+    ind_idx = [i for i, p in enumerate(params) if ".indicator_params." in p["path"]]
+    ordered = sorted(indexed, key=lambda ic: tuple(ic[1][i] for i in ind_idx))
+    size = max(1, -(-len(ordered) // max(1, n_chunks)))
+    return [ordered[i:i + size] for i in range(0, len(ordered), size)]
+
+
+def _run_combos(pool, ctx, indexed, workers, bars=None, min_trades=3):
+    """
+    Yield (n_done, [(idx, row), ...]) as work completes — pool chunks, or
+    batches of 10 from the in-process ctx when pool is None.
     """
+    if pool is None:
+        for k in range(0, len(indexed), 10):
+            yield _eval_chunk(ctx, indexed[k:k + 10], bars, min_trades)
+        return
+    chunks = _chunk_combos(indexed, ctx["params"], workers * GRID_CHUNKS_PER_WORKER)
+    futures = [pool.submit(_run_grid_chunk, ch, bars, min_trades) for ch in chunks]
+    for fut in as_completed(futures):
+        yield fut.result()
+
+
+def _open_pool(workers, df, strategy, params):
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_grid_worker,
+                               initargs=(df, strategy, params))
+
+
+def _rank(rows):
+    """Best first: score, then PnL (score is coarse), then candidate order."""
+    return sorted(rows, key=lambda r: (-r[1]["score"], -r[1]["total_pnl"], r[0]))
+
+
+def _opt_params(strategy, selected_params, limit):
     all_params = _get_param_ranges(strategy)
     if selected_params:
-        params = [p for p in all_params if p["name"] in selected_params]
-    else:
-        params = all_params[:3]  # Limit to 3 params max
+        return [p for p in all_params if p["name"] in selected_params]
+    return all_params[:limit] if limit else all_params
+
+
+def iter_grid_search(df, strategy, selected_params=None, max_combos=200, workers=None, seed=None):
+    """
+    Grid search as a stream of events (for progress reporting):
+        {"type": "start", "total_combos", "parameters", "mode"}
+        {"type": "progress", "done", "total", "tested", "best", "results": [new rows]}
+        {"type": "result", ...}   # same dict grid_search returns
+    """
+    t0 = time.time()
+    params = _opt_params(strategy, selected_params, 3)  # Limit to 3 params max
 
     if not params:
-        return {"success": False, "error": "No optimizable parameters found"}
+        yield {"type": "result", "success": False, "error": "No optimizable parameters found"}
+        return
 
     # Generate value ranges
     param_values = []
@@ -149,73 +290,206 @@ def grid_search(df, strategy, selected_params=None, max_combos=200):
             vals.sort()
         param_values.append(vals)
 
-    # Total combinations
-    total = 1
-    for pv in param_values:
-        total *= len(pv)
+    rng = random.Random(seed) if seed is not None else random
+    combos, _ = _sample_combos(param_values, max_combos, rng)
+    total = len(combos)
+    indexed = list(enumerate(combos))
 
-    # If too many, sample randomly
-    if total > max_combos:
-        combos = []
-        for _ in range(max_combos):
-            combo = tuple(random.choice(v) for v in param_values)
-            if combo not in combos:
-                combos.append(combo)
-    else:
-        # Generate all combos
-        combos = [[]]
-        for pv in param_values:
-            combos = [c + [v] for c in combos for v in pv]
+    workers = min(GRID_WORKERS, os.cpu_count() or 1) if workers is None else workers
+    parallel = workers > 1 and total >= GRID_PARALLEL_MIN
+    yield {
+        "type": "start",
+        "total_combos": total,
+        "parameters": [{"name": p["name"], "values": _gen_values(p)} for p in params],
+        "mode": "process" if parallel else "serial",
+    }
 
-    # Run backtests
-    results = []
-    best_pf = -999
-    best_combo = None
+    results = []    # (combo index, row)
+    done = 0
 
-    for combo in combos:
-        s = copy.deepcopy(strategy)
-        param_desc = {}
-        for i, p in enumerate(params):
-            val = combo[i] if isinstance(combo, (list, tuple)) else combo
-            _set_param(s, p["path"], val)
-            param_desc[p["name"]] = val
+    def _progress(n_done, rows):
+        results.extend(rows)
+        best = min(results, key=lambda r: (-r[1]["score"], r[0]))[1] if results else None
+        return {"type": "progress", "done": n_done, "total": total,
+                "tested": len(results), "best": best, "results": [r for _, r in rows]}
 
+    ctx = _grid_context(df, strategy, params)
+    mode = "serial"
+    if parallel:
         try:
-            bt = run_backtest(df, s, initial_balance=10000, spread_pips=2)
-            if bt.get("success") and bt.get("stats", {}).get("total", 0) >= 3:
-                st = bt["stats"]
-                score = _calc_opt_score(st)
-                results.append({
-                    "params": param_desc,
-                    "total_trades": st["total"],
-                    "win_rate": st["win_rate"],
-                    "profit_factor": st["profit_factor"],
-                    "total_pnl": st["total_pnl"],
-                    "max_dd": st["max_drawdown_pct"],
-                    "sharpe": st["sharpe"],
-                    "score": score,
-                })
-                if score > best_pf:
-                    best_pf = score
-                    best_combo = param_desc
-        except Exception:
-            continue
-
-    # Sort by score
-    results.sort(key=lambda x: x["score"], reverse=True)
-
-    return {
+            with _open_pool(workers, df, strategy, params) as pool:
+                for n_chunk, rows in _run_combos(pool, ctx, indexed, workers):
+                    done += n_chunk
+                    yield _progress(done, rows)
+            mode = "process"
+        except BrokenProcessPool as e:
+            print(f"[OPTIMIZER] worker pool broken ({e}) — falling back to serial")
+            results, done = [], 0
+
+    if mode == "serial":
+        for n_chunk, rows in _run_combos(None, ctx, indexed, 1):
+            done += n_chunk
+            yield _progress(done, rows)
+
+    # Sort by score; ties keep combo order, whichever worker finished first
+    results = [r for _, r in sorted(results, key=lambda r: (-r[1]["score"], r[0]))]
+
+    yield {
+        "type": "result",
         "success": True,
         "method": "grid_search",
+        "mode": mode,
         "total_tested": len(results),
-        "total_combos": len(combos),
+        "total_combos": total,
         "parameters": [{"name": p["name"], "values": _gen_values(p)} for p in params],
         "results": results[:50],  # Top 50
         "best": results[0] if results else None,
-        "best_params": best_combo,
+        "best_params": results[0]["params"] if results else None,
+        "elapsed_sec": round(time.time() - t0, 2),
+    }
+
+
+def grid_search(df, strategy, selected_params=None, max_combos=200, workers=None, seed=None):
+    """
+    Grid search optimization.
+    Tests all combinations of selected parameters (random distinct sample
+    when there are more than max_combos). See iter_grid_search for progress.
+    """
+    final = None
+    for event in iter_grid_search(df, strategy, selected_params, max_combos, workers, seed):
+        final = event
+    final.pop("type", None)
+    return final
+
+
+def _halving_plan(n_bars, n_candidates, eta, min_bars):
+    """[(bars, candidates), ...] from the shortest slice up to the full history."""
+    rungs = 0
+    while (n_bars // eta ** (rungs + 1) >= min_bars
+           and n_candidates // eta ** (rungs + 1) >= 1):
+        rungs += 1
+    return [(n_bars // eta ** (rungs - r), max(1, n_candidates // eta ** r))
+            for r in range(rungs + 1)]
+
+
+def iter_successive_halving(df, strategy, selected_params=None, n_candidates=243, eta=3,
+                            min_bars=300, workers=None, seed=None):
+    """
+    Successive halving: score many candidates on the most recent slice of
+    history, keep the best 1/eta, re-test the survivors on eta x more bars,
+    and so on until the last rung runs on the full df.
+
+    Unlike grid_search there is no 3-parameter / 8-value cap — candidates
+    are sampled from the full ranges of every selected (or every)
+    optimizable parameter; the budget is set by n_candidates instead.
+
+    Events: {"type": "start"}, {"type": "rung"} per history length, {"type": "result"}.
+    """
+    t0 = time.time()
+    n = len(df)
+    eta = max(2, int(eta))
+    params = _opt_params(strategy, selected_params, None)
+    if not params:
+        yield {"type": "result", "success": False, "error": "No optimizable parameters found"}
+        return
+    if n < 50:
+        yield {"type": "result", "success": False, "error": "Not enough data (min 50 bars)"}
+        return
+
+    param_values = [_gen_values(p) for p in params]
+    rng = random.Random(seed) if seed is not None else random
+    combos, space = _sample_combos(param_values, n_candidates, rng)
+    plan = _halving_plan(n, len(combos), eta, min(min_bars, n))
+
+    workers = min(GRID_WORKERS, os.cpu_count() or 1) if workers is None else workers
+    parallel = workers > 1 and len(combos) >= GRID_PARALLEL_MIN
+    mode = "process" if parallel else "serial"
+    yield {
+        "type": "start",
+        "candidates": len(combos),
+        "search_space": space,
+        "rungs": [{"bars": b, "candidates": c} for b, c in plan],
+        "parameters": [{"name": p["name"], "values": v} for p, v in zip(params, param_values)],
+        "mode": mode,
+    }
+
+    ctx = _grid_context(df, strategy, params)
+    pool = _open_pool(workers, df, strategy, params) if parallel else None
+    survivors = list(enumerate(combos))
+    rung_info = []
+    ranked = []
+    bar_cost = 0
+    try:
+        for r, (bars, _) in enumerate(plan):
+            last = r == len(plan) - 1
+            slice_bars = None if bars >= n else bars
+            # Short slices see few trades — only the full-history rung
+            # applies grid_search's 3-trade minimum
+            min_trades = 3 if last else 1
+            try:
+                rows = [row for _, chunk in _run_combos(pool, ctx, survivors, workers, slice_bars, min_trades)
+                        for row in chunk]
+            except BrokenProcessPool as e:
+                print(f"[OPTIMIZER] worker pool broken ({e}) — falling back to serial")
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool, mode = None, "serial"
+                rows = [row for _, chunk in _run_combos(None, ctx, survivors, 1, slice_bars, min_trades)
+                        for row in chunk]
+            bar_cost += len(survivors) * bars
+
+            ranked = _rank(rows)
+            scored = {idx for idx, _ in ranked}
+            # Candidates without a score only survive if there aren't enough scored ones
+            order = [idx for idx, _ in ranked] + [idx for idx, _ in survivors if idx not in scored]
+            keep = len(survivors) if last else max(1, -(-len(survivors) // eta))
+            info = {
+                "rung": r + 1,
+                "bars": bars,
+                "candidates": len(survivors),
+                "scored": len(ranked),
+                "kept": min(keep, len(order)),
+                "best": ranked[0][1] if ranked else None,
+            }
+            rung_info.append(info)
+            yield dict(info, type="rung")
+            survivors = [(idx, combos[idx]) for idx in order[:keep]]
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    results = [row for _, row in ranked]
+    yield {
+        "type": "result",
+        "success": True,
+        "method": "successive_halving",
+        "mode": mode,
+        "eta": eta,
+        "candidates": len(combos),
+        "search_space": space,
+        "rungs": rung_info,
+        "total_backtests": sum(ri["candidates"] for ri in rung_info),
+        # CPU budget in units of one full-history backtest
+        "cost_full_backtests": round(bar_cost / n, 1),
+        "total_tested": len(results),
+        "parameters": [{"name": p["name"], "values": v} for p, v in zip(params, param_values)],
+        "results": results[:50],
+        "best": results[0] if results else None,
+        "best_params": results[0]["params"] if results else None,
+        "elapsed_sec": round(time.time() - t0, 2),
     }
 
 
+def successive_halving(df, strategy, selected_params=None, n_candidates=243, eta=3,
+                       min_bars=300, workers=None, seed=None):
+    """Budget-aware search over the full parameter ranges. See iter_successive_halving."""
+    final = None
+    for event in iter_successive_halving(df, strategy, selected_params, n_candidates, eta,
+                                         min_bars, workers, seed):
+        final = event
+    final.pop("type", None)
+    return final
+
+
 def walk_forward(df, strategy, windows=5):
     """
     Walk-Forward optimization.
@@ -263,6 +537,7 @@ def walk_forward(df, strategy, windows=5):
         for pv in param_values:
             combos = [c + [v] for c in combos for v in pv]
 
+        cache = {}  # indicators shared by this window's combos
         for combo in combos[:100]:
             s = copy.deepcopy(strategy)
             pv = {}
@@ -270,7 +545,7 @@ def walk_forward(df, strategy, windows=5):
                 _set_param(s, p["path"], combo[i])
                 pv[p["name"]] = combo[i]
             try:
-                bt = run_backtest(train_df, s, initial_balance=10000, spread_pips=2)
+                bt = run_backtest(train_df, s, initial_balance=10000, spread_pips=2, indicator_cache=cache)
                 if bt.get("success") and bt["stats"]["total"] >= 2:
                     sc = _calc_opt_score(bt["stats"])
                     if sc > best_score:
@@ -322,10 +597,44 @@ def walk_forward(df, strategy, windows=5):
     }
 
 
-def monte_carlo(df, strategy, simulations=500):
+MC_CHUNK_CELLS = 4_000_000   # sims x trades per batch (~32 MB of float64)
+
+
+def _mc_batch(pnls, initial, sims, resample, rng, ruin_threshold):
+    """
+    One batch of simulated paths as a (sims, trades) array.
+    Returns (final_balance, max_dd_pct, ruined) per path; a ruined path
+    stops at the ruin bar (balance and drawdown frozen there).
+    """
+    m = len(pnls)
+    if resample == "bootstrap":
+        paths = pnls[rng.integers(0, m, size=(sims, m))]
+    else:
+        paths = rng.permuted(np.broadcast_to(pnls, (sims, m)), axis=1)
+    equity = initial + np.cumsum(paths, axis=1)
+
+    hit = equity <= ruin_threshold
+    ruined = hit.any(axis=1)
+    stop = np.where(ruined, hit.argmax(axis=1), m - 1)
+    alive = np.arange(m) <= stop[:, None]
+
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), initial)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(peak > 0, (peak - equity) / peak * 100, 0.0)
+    max_dd = np.where(alive, dd, 0.0).max(axis=1)
+    final = equity[np.arange(sims), stop]
+    return final, max_dd, ruined
+
+
+def monte_carlo(df, strategy, simulations=500, resample="permutation", seed=None):
     """
     Monte Carlo simulation.
     Shuffle trade outcomes to estimate risk of ruin and confidence intervals.
+
+    resample: "permutation" (reorder the same trades) or "bootstrap" (draw
+              trades with replacement — final balance varies too).
+    seed:     makes the report reproducible.
+    All paths are simulated as batched 2-D arrays, so 10k-100k sims are cheap.
     """
     # First run normal backtest
     bt = run_backtest(df, strategy, initial_balance=10000, spread_pips=2)
@@ -333,90 +642,80 @@ def monte_carlo(df, strategy, simulations=500):
         return {"success": False, "error": "Need completed backtest first"}
 
     trades = bt["trades"]
-    pnls = [t["pnl"] for t in trades]
+    pnls = np.array([t["pnl"] for t in trades], dtype=float)
     initial = bt["initial_balance"]
 
     if len(pnls) < 5:
         return {"success": False, "error": "Need 5+ trades for Monte Carlo"}
+    if resample not in ("permutation", "bootstrap"):
+        resample = "permutation"
 
     # Run simulations
-    final_balances = []
-    max_dds = []
-    ruin_count = 0
+    t0 = time.time()
+    rng = np.random.default_rng(seed)
     ruin_threshold = initial * 0.5  # 50% loss = ruin
-
-    for _ in range(simulations):
-        shuffled = pnls.copy()
-        random.shuffle(shuffled)
-
-        balance = initial
-        peak = initial
-        max_dd = 0
-
-        for pnl in shuffled:
-            balance += pnl
-            peak = max(peak, balance)
-            dd = (peak - balance) / peak * 100 if peak > 0 else 0
-            max_dd = max(max_dd, dd)
-
-            if balance <= ruin_threshold:
-                ruin_count += 1
-                break
-
-        final_balances.append(round(balance, 2))
-        max_dds.append(round(max_dd, 1))
-
-    final_balances.sort()
-    max_dds.sort()
+    per_batch = max(1, MC_CHUNK_CELLS // len(pnls))
+    finals, dds, ruins = [], [], []
+    left = int(simulations)
+    while left > 0:
+        k = min(per_batch, left)
+        f, d, r = _mc_batch(pnls, initial, k, resample, rng, ruin_threshold)
+        finals.append(f)
+        dds.append(d)
+        ruins.append(r)
+        left -= k
+
+    final_balances = np.sort(np.round(np.concatenate(finals), 2))
+    max_dds = np.sort(np.round(np.concatenate(dds), 1))
+    ruin_count = int(np.concatenate(ruins).sum())
 
     n_sim = len(final_balances)
 
-    # Percentiles
-    p5 = final_balances[int(n_sim * 0.05)]
-    p25 = final_balances[int(n_sim * 0.25)]
-    p50 = final_balances[int(n_sim * 0.50)]
-    p75 = final_balances[int(n_sim * 0.75)]
-    p95 = final_balances[int(n_sim * 0.95)]
-
-    dd_p50 = max_dds[int(n_sim * 0.50)]
-    dd_p95 = max_dds[int(n_sim * 0.95)]
+    def _pct(a, q):
+        return float(a[min(int(n_sim * q), n_sim - 1)])
 
     # Distribution for histogram
     hist_bins = 20
-    min_b = min(final_balances)
-    max_b = max(final_balances)
+    min_b = float(final_balances[0])
+    max_b = float(final_balances[-1])
     bin_width = (max_b - min_b) / hist_bins if max_b > min_b else 1
+    counts, _ = np.histogram(final_balances, bins=hist_bins, range=(min_b, min_b + bin_width * hist_bins))
     histogram = []
-    for b in range(hist_bins):
+    for b, count in enumerate(counts):
         lo = min_b + b * bin_width
         hi = lo + bin_width
-        count = sum(1 for fb in final_balances if lo <= fb < hi)
         histogram.append({
             "range": f"${int(lo)}-${int(hi)}",
-            "count": count,
+            "count": int(count),
             "pct": round(count / n_sim * 100, 1),
         })
 
     return {
         "success": True,
         "method": "monte_carlo",
-        "simulations": simulations,
+        "resample": resample,
+        "seed": seed,
+        "simulations": n_sim,
         "original_trades": len(pnls),
         "original_pnl": bt["stats"]["total_pnl"],
         "original_balance": bt["final_balance"],
-        "risk_of_ruin": round(ruin_count / simulations * 100, 1),
+        "risk_of_ruin": round(ruin_count / n_sim * 100, 2),
         "percentiles": {
-            "p5": p5, "p25": p25, "p50": p50, "p75": p75, "p95": p95,
+            "p5": _pct(final_balances, 0.05), "p25": _pct(final_balances, 0.25),
+            "p50": _pct(final_balances, 0.50), "p75": _pct(final_balances, 0.75),
+            "p95": _pct(final_balances, 0.95),
         },
         "drawdown": {
-            "median": dd_p50,
-            "worst_95": dd_p95,
+            "median": _pct(max_dds, 0.50),
+            "worst_95": _pct(max_dds, 0.95),
+            "worst_99": _pct(max_dds, 0.99),
         },
-        "profitable_pct": round(sum(1 for fb in final_balances if fb > initial) / n_sim * 100, 1),
+        "profitable_pct": round(float(np.mean(final_balances > initial)) * 100, 1),
         "histogram": histogram,
-        "min_balance": min(final_balances),
-        "max_balance": max(final_balances),
-        "avg_balance": round(np.mean(final_balances), 2),
+        "min_balance": min_b,
+        "max_balance": max_b,
+        "avg_balance": round(float(np.mean(final_balances)), 2),
+        "elapsed_sec": round(time.time() - t0, 3),
     }
 
 
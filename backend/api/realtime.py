@@ -1,9 +1,9 @@
 """
 Whilber-AI — Real-Time Engine
 ==============================
-- WebSocket connection manager
-- Background price streamer (every 2s)
-- Background analysis scheduler (every 15s per subscribed symbol)
+- WebSocket connection manager (symbol index, per-client outboxes)
+- Background price streamer (every 2s, symbols fetched concurrently)
+- Background analysis scheduler (every 15s per subscribed symbol, bounded concurrency)
 - Memory manager (cleanup every 5 min)
 """
 
@@ -13,7 +13,7 @@ import json
 import gc
 import sys
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from datetime import datetime, timezone
 from typing import Dict, Set, Any, Optional
 from loguru import logger
@@ -32,6 +32,10 @@ FULL_SCAN_INTERVAL = 60     # seconds — full multi-symbol scan
 MEMORY_CLEANUP_INTERVAL = 300  # seconds — cache cleanup
 MAX_CACHE_AGE = 600         # seconds — discard cache older than 10 min
 MAX_PRICE_HISTORY = 60      # keep last 60 price ticks per symbol
+PRICE_CONCURRENCY = 8       # symbols fetched in parallel per price tick
+ANALYSIS_CONCURRENCY = 2    # analyze_symbol calls in flight at once
+SEND_QUEUE_SIZE = 32        # frames waiting per client before the oldest is dropped
+SEND_TIMEOUT = 10           # seconds — a send stuck longer drops the client
 
 
 # ═══════════════════════════════════════════════════════
@@ -61,6 +65,48 @@ def sanitize(obj):
 # ═══════════════════════════════════════════════════════
 # CONNECTION MANAGER
 # ═══════════════════════════════════════════════════════
+#
+# Broadcasts never await a socket. Each message is serialized once and
+# pushed into every subscriber's outbox; a writer task per connection
+# drains its own outbox, so a slow client only delays itself.
+#
+# Outbox frames are keyed: a newer price for a symbol (or analysis for a
+# symbol/timeframe) replaces the one still waiting, so a lagging client
+# gets the latest state instead of a backlog. When an outbox is full the
+# oldest frame is dropped.
+
+def encode(message: dict) -> str:
+    """Same wire format as WebSocket.send_json (compact, UTF-8 text frame)."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class _Client:
+    """Outbox + writer task for one WebSocket."""
+
+    __slots__ = ("ws", "outbox", "wakeup", "task", "seq", "sent", "dropped", "conflated")
+
+    def __init__(self, ws: WebSocket):
+        self.ws = ws
+        self.outbox: "OrderedDict[Any, str]" = OrderedDict()
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.seq = 0
+        self.sent = 0
+        self.dropped = 0
+        self.conflated = 0
+
+    def push(self, key, text: str):
+        if key is None:
+            self.seq += 1
+            key = ("msg", self.seq)
+        elif key in self.outbox:
+            self.conflated += 1
+        elif len(self.outbox) >= SEND_QUEUE_SIZE:
+            self.outbox.popitem(last=False)
+            self.dropped += 1
+        self.outbox[key] = text
+        self.wakeup.set()
+
 
 class ConnectionManager:
     """Manages WebSocket connections & subscriptions."""
@@ -69,80 +115,135 @@ class ConnectionManager:
         # ws -> {symbol, timeframe, user_id}
         self.connections: Dict[WebSocket, Dict] = {}
         self.lock = asyncio.Lock()
+        self._clients: Dict[WebSocket, _Client] = {}
+        self._by_symbol: Dict[str, Set[WebSocket]] = defaultdict(set)
+        self._by_pair: Dict[tuple, Set[WebSocket]] = defaultdict(set)
+        self.dropped_clients = 0
+
+    # ── subscription index ──
+
+    def _index(self, ws: WebSocket, info: Dict):
+        self._by_symbol[info["symbol"]].add(ws)
+        self._by_pair[(info["symbol"], info["timeframe"])].add(ws)
+
+    def _unindex(self, ws: WebSocket, info: Dict):
+        for index, key in ((self._by_symbol, info["symbol"]),
+                           (self._by_pair, (info["symbol"], info["timeframe"]))):
+            subs = index.get(key)
+            if subs is not None:
+                subs.discard(ws)
+                if not subs:
+                    del index[key]
 
     async def connect(self, ws: WebSocket, symbol: str = "XAUUSD",
                       timeframe: str = "H1", user_id: int = 0):
         await ws.accept()
+        client = _Client(ws)
         async with self.lock:
-            self.connections[ws] = {
+            info = {
                 "symbol": symbol.upper(),
                 "timeframe": timeframe.upper(),
                 "user_id": user_id,
                 "connected_at": time.time(),
             }
+            self.connections[ws] = info
+            self._clients[ws] = client
+            self._index(ws, info)
+            client.task = asyncio.create_task(self._writer(client))
         logger.info(f"🔌 WS connected: {symbol}/{timeframe} (total: {len(self.connections)})")
 
     async def disconnect(self, ws: WebSocket):
         async with self.lock:
-            self.connections.pop(ws, None)
+            info = self.connections.pop(ws, None)
+            if info is not None:
+                self._unindex(ws, info)
+            client = self._clients.pop(ws, None)
+        if client is not None and client.task is not None \
+                and client.task is not asyncio.current_task():
+            client.task.cancel()
         logger.info(f"🔌 WS disconnected (total: {len(self.connections)})")
 
     async def update_subscription(self, ws: WebSocket, symbol: str, timeframe: str):
         async with self.lock:
             if ws in self.connections:
-                self.connections[ws]["symbol"] = symbol.upper()
-                self.connections[ws]["timeframe"] = timeframe.upper()
+                info = self.connections[ws]
+                self._unindex(ws, info)
+                info["symbol"] = symbol.upper()
+                info["timeframe"] = timeframe.upper()
+                self._index(ws, info)
 
     def get_subscribed_pairs(self) -> Set[tuple]:
         """Get unique (symbol, timeframe) pairs from all connections."""
-        pairs = set()
-        for info in self.connections.values():
-            pairs.add((info["symbol"], info["timeframe"]))
-        return pairs
+        return set(self._by_pair)
 
     def get_subscribed_symbols(self) -> Set[str]:
         """Get unique symbols from all connections."""
-        return {info["symbol"] for info in self.connections.values()}
+        return set(self._by_symbol)
+
+    # ── delivery ──
+
+    async def _writer(self, client: _Client):
+        ws = client.ws
+        try:
+            while True:
+                if not client.outbox:
+                    client.wakeup.clear()
+                    await client.wakeup.wait()
+                    continue
+                _, text = client.outbox.popitem(last=False)
+                await asyncio.wait_for(ws.send_text(text), SEND_TIMEOUT)
+                client.sent += 1
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            logger.debug(f"WS send failed, dropping client: {e}")
+            self.dropped_clients += 1
+        await self.disconnect(ws)
+
+    def _fan_out(self, targets, key, message: dict) -> int:
+        if not targets:
+            return 0
+        text = encode(message)
+        clients = self._clients
+        n = 0
+        for ws in list(targets):
+            client = clients.get(ws)
+            if client is not None:
+                client.push(key, text)
+                n += 1
+        return n
 
     async def broadcast_to_symbol(self, symbol: str, timeframe: str, message: dict):
         """Send message to all clients watching this symbol/timeframe."""
-        dead = []
-        for ws, info in list(self.connections.items()):
-            if info["symbol"] == symbol and info["timeframe"] == timeframe:
-                try:
-                    await ws.send_json(message)
-                except Exception:
-                    dead.append(ws)
-        for ws in dead:
-            await self.disconnect(ws)
+        return self._fan_out(self._by_pair.get((symbol, timeframe)),
+                             ("analysis", symbol, timeframe), message)
 
     async def broadcast_price(self, symbol: str, price_data: dict):
         """Send price to ALL clients watching this symbol (any timeframe)."""
-        dead = []
-        for ws, info in list(self.connections.items()):
-            if info["symbol"] == symbol:
-                try:
-                    await ws.send_json(price_data)
-                except Exception:
-                    dead.append(ws)
-        for ws in dead:
-            await self.disconnect(ws)
+        return self._fan_out(self._by_symbol.get(symbol), ("price", symbol), price_data)
 
     async def broadcast_all(self, message: dict):
         """Send to ALL connected clients."""
-        dead = []
-        for ws in list(self.connections.keys()):
-            try:
-                await ws.send_json(message)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            await self.disconnect(ws)
+        return self._fan_out(self._clients.keys(), None, message)
 
     @property
     def count(self):
         return len(self.connections)
 
+    @property
+    def stats(self):
+        clients = list(self._clients.values())
+        return {
+            "connections": len(clients),
+            "symbols": len(self._by_symbol),
+            "pairs": len(self._by_pair),
+            "queued": sum(len(c.outbox) for c in clients),
+            "sent": sum(c.sent for c in clients),
+            "conflated": sum(c.conflated for c in clients),
+            "dropped_frames": sum(c.dropped for c in clients),
+            "dropped_clients": self.dropped_clients,
+        }
+
 
 # ═══════════════════════════════════════════════════════
 # ANALYSIS CACHE
@@ -249,6 +350,29 @@ class RealtimeEngine:
     async def _price_loop(self):
         from backend.mt5.data_fetcher import fetch_current_price
         from backend.mt5.symbol_map import get_farsi_name
+        from backend.mt5.tick_snapshot import publish_tick
+
+        limit = asyncio.Semaphore(PRICE_CONCURRENCY)
+
+        async def push_price(symbol):
+            try:
+                async with limit:
+                    price = await asyncio.to_thread(fetch_current_price, symbol)
+                if price:
+                    self.cache.set_price(symbol, price)
+                    publish_tick(symbol, price["bid"], price["ask"])
+                    msg = {
+                        "type": "price",
+                        "symbol": symbol,
+                        "symbol_fa": get_farsi_name(symbol),
+                        "bid": price.get("bid"),
+                        "ask": price.get("ask"),
+                        "spread": price.get("spread"),
+                        "time": datetime.now(timezone.utc).isoformat(),
+                    }
+                    await self.manager.broadcast_price(symbol, sanitize(msg))
+            except Exception as e:
+                logger.debug(f"Price error {symbol}: {e}")
 
         while self._running:
             try:
@@ -257,23 +381,7 @@ class RealtimeEngine:
                     await asyncio.sleep(PRICE_INTERVAL)
                     continue
 
-                for symbol in symbols:
-                    try:
-                        price = await asyncio.to_thread(fetch_current_price, symbol)
-                        if price:
-                            self.cache.set_price(symbol, price)
-                            msg = {
-                                "type": "price",
-                                "symbol": symbol,
-                                "symbol_fa": get_farsi_name(symbol),
-                                "bid": price.get("bid"),
-                                "ask": price.get("ask"),
-                                "spread": price.get("spread"),
-                                "time": datetime.now(timezone.utc).isoformat(),
-                            }
-                            await self.manager.broadcast_price(symbol, sanitize(msg))
-                    except Exception as e:
-                        logger.debug(f"Price error {symbol}: {e}")
+                await asyncio.gather(*(push_price(s) for s in symbols))
 
             except asyncio.CancelledError:
                 break
@@ -287,6 +395,43 @@ class RealtimeEngine:
     async def _analysis_loop(self):
         from backend.strategies.orchestrator import analyze_symbol
 
+        limit = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+
+        async def push_analysis(symbol, timeframe):
+            try:
+                async with limit:
+                    result = await asyncio.to_thread(
+                        analyze_symbol, symbol, timeframe
+                    )
+                if result and result.get("success"):
+                    # Cache it
+                    self.cache.set_analysis(symbol, timeframe, result)
+
+                    # Build compact message
+                    o = result.get("overall", {})
+                    msg = sanitize({
+                        "type": "analysis",
+                        "symbol": symbol,
+                        "symbol_fa": result.get("symbol_fa", ""),
+                        "timeframe": timeframe,
+                        "last_close": result.get("last_close"),
+                        "price": result.get("price", {}),
+                        "overall": o,
+                        "context": result.get("context", {}),
+                        "strategies": result.get("strategies", []),
+                        "performance": result.get("performance", {}),
+                        "time": datetime.now(timezone.utc).isoformat(),
+                    })
+                    await self.manager.broadcast_to_symbol(
+                        symbol, timeframe, msg
+                    )
+                    logger.debug(
+                        f"📡 Analysis broadcast: {symbol}/{timeframe} "
+                        f"→ {o.get('signal')} {o.get('confidence')}%"
+                    )
+            except Exception as e:
+                logger.error(f"Analysis error {symbol}/{timeframe}: {e}")
+
         while self._running:
             try:
                 pairs = self.manager.get_subscribed_pairs()
@@ -294,39 +439,7 @@ class RealtimeEngine:
                     await asyncio.sleep(ANALYSIS_INTERVAL)
                     continue
 
-                for symbol, timeframe in pairs:
-                    try:
-                        result = await asyncio.to_thread(
-                            analyze_symbol, symbol, timeframe
-                        )
-                        if result and result.get("success"):
-                            # Cache it
-                            self.cache.set_analysis(symbol, timeframe, result)
-
-                            # Build compact message
-                            o = result.get("overall", {})
-                            msg = sanitize({
-                                "type": "analysis",
-                                "symbol": symbol,
-                                "symbol_fa": result.get("symbol_fa", ""),
-                                "timeframe": timeframe,
-                                "last_close": result.get("last_close"),
-                                "price": result.get("price", {}),
-                                "overall": o,
-                                "context": result.get("context", {}),
-                                "strategies": result.get("strategies", []),
-                                "performance": result.get("performance", {}),
-                                "time": datetime.now(timezone.utc).isoformat(),
-                            })
-                            await self.manager.broadcast_to_symbol(
-                                symbol, timeframe, msg
-                            )
-                            logger.debug(
-                                f"📡 Analysis broadcast: {symbol}/{timeframe} "
-                                f"→ {o.get('signal')} {o.get('confidence')}%"
-                            )
-                    except Exception as e:
-                        logger.error(f"Analysis error {symbol}/{timeframe}: {e}")
+                await asyncio.gather(*(push_analysis(s, tf) for s, tf in pairs))
 
             except asyncio.CancelledError:
                 break
@@ -1190,30 +1190,13 @@ if BACKTEST_AVAILABLE:
         if bars < 50:
             bars = 50
 
-        # Fetch data from MT5
+        # Closed bars from the configured source (history store / MT5)
         try:
-            from backend.mt5.mt5_connector import MT5Connector
-            connector = MT5Connector.get_instance()
-            if not connector.ensure_connected():
-                return {"success": False, "error": "MT5 not connected"}
-
-            import MetaTrader5 as mt5
-            tf_map = {
-                "M1": mt5.TIMEFRAME_M1, "M5": mt5.TIMEFRAME_M5,
-                "M15": mt5.TIMEFRAME_M15, "M30": mt5.TIMEFRAME_M30,
-                "H1": mt5.TIMEFRAME_H1, "H4": mt5.TIMEFRAME_H4,
-                "D1": mt5.TIMEFRAME_D1, "W1": mt5.TIMEFRAME_W1,
-            }
-            tf = tf_map.get(timeframe.upper(), mt5.TIMEFRAME_H1)
-
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, bars)
-            if rates is None or len(rates) < 50:
+            from backend.mt5.bar_source import load_bars
+            df = load_bars(symbol, timeframe, bars)
+            if df is None or len(df) < 50:
                 return {"success": False, "error": f"No data for {symbol} {timeframe}"}
 
-            import pandas as pd
-            df = pd.DataFrame(rates)
-            df["time"] = pd.to_datetime(df["time"], unit="s")
-
         except Exception as e:
             return {"success": False, "error": f"Data fetch error: {str(e)}"}
 
@@ -1363,7 +1346,8 @@ if PREVIEW_AVAILABLE:
 
 # ======= OPTIMIZER =======
 try:
-    from backend.api.optimizer import grid_search, walk_forward, monte_carlo, get_optimizable_params
+    from backend.api.optimizer import (grid_search, iter_grid_search, iter_successive_halving,
+                                       walk_forward, monte_carlo, get_optimizable_params)
     OPTIMIZER_AVAILABLE = True
 except ImportError:
     OPTIMIZER_AVAILABLE = False
@@ -1387,22 +1371,56 @@ if OPTIMIZER_AVAILABLE:
         bars = int(body.get("bars", 500))
 
         try:
-            from backend.mt5.mt5_connector import MT5Connector
-            import MetaTrader5 as mt5
-            import pandas as pd
-            connector = MT5Connector.get_instance()
-            if not connector.ensure_connected():
-                return {"success": False, "error": "MT5 not connected"}
-            tf_map = {"M1":mt5.TIMEFRAME_M1,"M5":mt5.TIMEFRAME_M5,"M15":mt5.TIMEFRAME_M15,"M30":mt5.TIMEFRAME_M30,"H1":mt5.TIMEFRAME_H1,"H4":mt5.TIMEFRAME_H4,"D1":mt5.TIMEFRAME_D1,"W1":mt5.TIMEFRAME_W1}
-            rates = mt5.copy_rates_from_pos(symbol, tf_map.get(timeframe.upper(), mt5.TIMEFRAME_H1), 0, min(bars, 1000))
-            if rates is None or len(rates) < 50:
+            from backend.mt5.bar_source import load_bars
+            df = load_bars(symbol, timeframe, min(bars, 1000))
+            if df is None or len(df) < 50:
+                return {"success": False, "error": "No data"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+        # Backtests run off the event loop (process pool inside grid_search).
+        # {"stream": true} → NDJSON events: start, progress..., result
+        if body.get("stream"):
+            from fastapi.responses import StreamingResponse
+
+            def _events():
+                for event in iter_grid_search(df, strategy, selected, max_combos=200):
+                    yield json.dumps(sanitize(event), default=str) + "\n"
+
+            return StreamingResponse(_events(), media_type="application/x-ndjson")
+
+        from starlette.concurrency import run_in_threadpool
+        result = await run_in_threadpool(grid_search, df, strategy, selected, 200)
+        return JSONResponse(content=sanitize(result))
+
+    @app.post("/api/builder/optimize/halving")
+    async def api_opt_halving(request: Request):
+        body = await request.json()
+        strategy = body.get("strategy", {})
+        selected = body.get("selected_params", None)
+        symbol = strategy.get("symbol", "XAUUSD")
+        timeframe = strategy.get("timeframe", "H1")
+        bars = int(body.get("bars", 1000))
+        candidates = min(int(body.get("candidates", 243)), 2000)
+        eta = int(body.get("eta", 3))
+
+        try:
+            from backend.mt5.bar_source import load_bars
+            df = load_bars(symbol, timeframe, min(bars, 5000))
+            if df is None or len(df) < 50:
                 return {"success": False, "error": "No data"}
-            df = pd.DataFrame(rates)
-            df["time"] = pd.to_datetime(df["time"], unit="s")
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-        result = grid_search(df, strategy, selected, max_combos=200)
+        events = iter_successive_halving(df, strategy, selected, n_candidates=candidates, eta=eta)
+        if body.get("stream"):
+            from fastapi.responses import StreamingResponse
+            return StreamingResponse((json.dumps(sanitize(ev), default=str) + "\n" for ev in events),
+                                     media_type="application/x-ndjson")
+
+        from starlette.concurrency import run_in_threadpool
+        result = await run_in_threadpool(lambda: [ev for ev in events][-1])
+        result.pop("type", None)
         return JSONResponse(content=sanitize(result))
 
     @app.post("/api/builder/optimize/walk-forward")
@@ -1456,7 +1474,11 @@ if OPTIMIZER_AVAILABLE:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-        result = monte_carlo(df, strategy, min(sims, 1000))
+        resample = body.get("resample", "permutation")
+        seed = body.get("seed")
+        seed = int(seed) if seed is not None else None
+        from starlette.concurrency import run_in_threadpool
+        result = await run_in_threadpool(monte_carlo, df, strategy, min(sims, 100000), resample, seed)
         return JSONResponse(content=sanitize(result))
 # ======= END OPTIMIZER =======
 
@@ -3249,20 +3271,15 @@ async def _tracker_strategy_history(strategy_id: str, days: int = 30):
 @app.get("/api/tracker/trade-events/{strategy_id}/{trade_id}")
 async def _tracker_trade_events(strategy_id: str, trade_id: str):
     """Get full event timeline for a specific trade."""
-    import os as _os3, json as _j3
-    rec_file = _os3.path.join(r"C:\\\\Users\\\\Administrator\\\\Desktop\\\\mvp\\\\track_records", f"rec_{strategy_id[:60]}.json")
-    if not _os3.path.exists(rec_file):
-        return {"trade": None, "events": []}
     try:
-        with open(rec_file, "r", encoding="utf-8") as _f:
-            rec = _j3.load(_f)
-        for t in rec.get("trades", []):
-            if t.get("id") == trade_id:
-                return {
-                    "trade": t,
-                    "events": t.get("events", []),
-                    "total_events": len(t.get("events", [])),
-                }
+        from backend.api import trade_store
+        t = trade_store.get_trade(strategy_id, trade_id)
+        if t:
+            return {
+                "trade": t,
+                "events": t.get("events", []),
+                "total_events": len(t.get("events", [])),
+            }
         return {"trade": None, "events": []}
     except Exception as _e:
         return {"trade": None, "events": [], "error": str(_e)}
@@ -3906,40 +3923,19 @@ async def get_candles(symbol: str, tf: str, limit: int = 300):
 
 @app.get("/api/trades/{symbol}")
 async def get_strategy_trades(symbol: str, tf: str = "", strategy: str = "", limit: int = 100):
-    """Get strategy trade history for chart markers — matches rec_ file format."""
-    import os as _os, json as _json, glob as _glob
+    """Get strategy trade history for chart markers — reads the trade store by symbol."""
     from datetime import datetime as _dt
+    from backend.api import trade_store
     
     symbol = symbol.upper()
-    track_dir = _os.path.join(r"C:\Users\Administrator\Desktop\mvp", "track_records")
     trades = []
     
     try:
-        # Search for rec_ files containing this symbol
-        pattern = _os.path.join(track_dir, f"rec_*{symbol}*.json")
-        files = _glob.glob(pattern)
-        
-        if not files:
-            # Broader search
-            pattern = _os.path.join(track_dir, "rec_*.json")
-            files = _glob.glob(pattern)
+        # Indexed lookup on symbol — no scan over every strategy's records
+        grouped = trade_store.grouped_trades(symbols=[symbol], closed_only=False)
         
-        for fpath in files[:200]:
+        for recs in grouped.values():
             try:
-                fname = _os.path.basename(fpath)
-                if fname.endswith('.bak') or fname.startswith('active_') or fname == 'notifications.json':
-                    continue
-                
-                with open(fpath, "r", encoding="utf-8") as f:
-                    data = _json.load(f)
-                
-                # rec_ files have: {"strategy_id": "...", "trades": [...], "stats": {...}}
-                recs = []
-                if isinstance(data, dict):
-                    recs = data.get("trades", data.get("records", data.get("history", [])))
-                elif isinstance(data, list):
-                    recs = data
-                
                 for rec in recs:
                     if not isinstance(rec, dict):
                         continue
@@ -21,8 +21,14 @@ def queue_signal_for_guardian(signal_data):
 """
 Whilber-AI Signal Bridge v3
 """
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
 
+from loguru import logger
+
 TRACK_SYMBOLS = [
     "AUDCAD",     "AUDCHF",     "AUDJPY",     "AUDNZD",     "AUDUSD",     "BTCUSD",
     "CADCHF",     "CADJPY",     "CHFJPY",     "EURAUD",     "EURCAD",     "EURCHF",
@@ -68,98 +74,166 @@ def _mt5_name(symbol):
 TRACK_TIMEFRAMES = ["H1"]
 SIGNAL_COOLDOWN = 3600
 MAX_SIGNALS_PER_CYCLE = 10  # Hard cap on signals per scan cycle
+SCAN_WORKERS = 4    # analyze_symbol worker processes; 1 = serial in-thread scan
+SCAN_TIMEOUT = 240  # seconds — pairs not finished by then are skipped; the pool is recycled
+_pool = None
 
 PIP = {"XAUUSD":0.1,"XAGUSD":0.01,"EURUSD":0.0001,"GBPUSD":0.0001,"AUDUSD":0.0001,"USDCAD":0.0001,"NZDUSD":0.0001,"USDCHF":0.0001,"USDJPY":0.01,"BTCUSD":1.0,"US30":1.0,"NAS100":1.0}
 SL_DEFAULT = {"XAUUSD":80,"XAGUSD":50,"BTCUSD":500,"US30":100,"NAS100":100}
 
-def scan_all_signals(state, active_strategy_ids):
-    signals = []
+def _analyze_pair(symbol, tf):
+    """Worker entry: analyze one (symbol, timeframe). Runs in a pool process."""
+    t0 = time.perf_counter()
     try:
         from backend.strategies.orchestrator import analyze_symbol
-    except Exception as e:
-        print(f"[BRIDGE] import error: {e}")
-        return signals
+        result = analyze_symbol(symbol, tf)
+    except Exception:
+        result = None
+    return symbol, tf, result, round(time.perf_counter() - t0, 3)
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=SCAN_WORKERS)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
 
+
+def _analyze_all(pairs):
+    """Analyze all pairs, in parallel when SCAN_WORKERS > 1.
+
+    Returns ({(symbol, tf): result}, {"SYMBOL_TF": seconds}, mode).
+    """
+    results, timings = {}, {}
+    if SCAN_WORKERS > 1 and len(pairs) > 1:
+        try:
+            pool = _get_pool()
+            futures = [pool.submit(_analyze_pair, sym, tf) for sym, tf in pairs]
+            for fut in as_completed(futures, timeout=SCAN_TIMEOUT):
+                sym, tf, result, sec = fut.result()
+                results[(sym, tf)] = result
+                timings[f"{sym}_{tf}"] = sec
+            return results, timings, "process"
+        except FuturesTimeout:
+            # Running workers can't be cancelled — drop the pool so the next
+            # cycle starts on fresh workers instead of queueing behind hung ones
+            shutdown_pool()
+            logger.warning(f"[BRIDGE] scan timeout after {SCAN_TIMEOUT}s — "
+                           f"{len(pairs) - len(results)} pairs skipped, worker pool recycled")
+            for sym, tf in pairs:
+                timings.setdefault(f"{sym}_{tf}", None)
+            return results, timings, "process"
+        except BrokenProcessPool as e:
+            logger.error(f"[BRIDGE] worker pool broken ({e}) — falling back to serial")
+            shutdown_pool()
+            results, timings = {}, {}
+
+    for sym, tf in pairs:
+        sym, tf, result, sec = _analyze_pair(sym, tf)
+        results[(sym, tf)] = result
+        timings[f"{sym}_{tf}"] = sec
+    return results, timings, "serial"
+
+
+def scan_all_signals(state, active_strategy_ids):
+    signals = []
     last_sigs = state.get("strategy_last_signal", {})
 
-    for symbol in TRACK_SYMBOLS:
-        for tf in TRACK_TIMEFRAMES:
-            try:
-                result = analyze_symbol(symbol, tf)
-            except Exception:
+    t0 = time.perf_counter()
+    pairs = [(symbol, tf) for symbol in TRACK_SYMBOLS for tf in TRACK_TIMEFRAMES]
+    results, timings, mode = _analyze_all(pairs)
+    timings = {f"{sym}_{tf}": timings.get(f"{sym}_{tf}") for sym, tf in pairs}
+    done = [v for v in timings.values() if v is not None]
+    state["scan_timing"] = {
+        "mode": mode,
+        "workers": SCAN_WORKERS if mode == "process" else 1,
+        "total_sec": round(time.perf_counter() - t0, 3),
+        "sum_sec": round(sum(done), 3),
+        "symbols": timings,
+        "slowest": sorted(((k, v) for k, v in timings.items() if v is not None),
+                          key=lambda kv: kv[1], reverse=True)[:5],
+    }
+
+    from backend.mt5.tick_snapshot import TickSnapshot
+    ticks = TickSnapshot(resolve=_mt5_name)
+
+    # Merge in TRACK_SYMBOLS × TRACK_TIMEFRAMES order so the cap and
+    # cooldown pick the same signals regardless of completion order.
+    for symbol, tf in pairs:
+        result = results.get((symbol, tf))
+        if not result:
+            continue
+
+        for s in result.get("strategies", []):
+            sig = s.get("signal", "NEUTRAL")
+            if sig not in ("BUY", "SELL"):
                 continue
-            if not result:
+
+            # Name: try all possible fields
+            name = s.get("strategy_name") or s.get("strategy_name_fa") or s.get("name") or str(s.get("strategy_id", "strat"))
+            cat = s.get("category") or s.get("category_fa") or ""
+            sid = f"{s.get('strategy_id', name)}_{symbol}_{tf}".replace(" ", "_")
+
+            if sid in active_strategy_ids:
                 continue
 
-            for s in result.get("strategies", []):
-                sig = s.get("signal", "NEUTRAL")
-                if sig not in ("BUY", "SELL"):
-                    continue
-
-                # Name: try all possible fields
-                name = s.get("strategy_name") or s.get("strategy_name_fa") or s.get("name") or str(s.get("strategy_id", "strat"))
-                cat = s.get("category") or s.get("category_fa") or ""
-                sid = f"{s.get('strategy_id', name)}_{symbol}_{tf}".replace(" ", "_")
-
-                if sid in active_strategy_ids:
-                    continue
-
-                # Cooldown
-                lt = last_sigs.get(sid, "")
-                if lt:
-                    try:
-                        ld = datetime.fromisoformat(lt.replace("Z","+00:00"))
-                        if (datetime.now(timezone.utc) - ld).total_seconds() < SIGNAL_COOLDOWN:
-                            continue
-                    except Exception:
-                        pass
-
-                conf = s.get("confidence", 0) or 0
-                if conf < 50:
-                    continue
-
-                # Entry from MT5
-                entry = 0
+            # Cooldown
+            lt = last_sigs.get(sid, "")
+            if lt:
                 try:
-                    import MetaTrader5 as mt5
-                    tick = mt5.symbol_info_tick(_mt5_name(symbol))
-                    if tick:
-                        entry = tick.ask if sig == "BUY" else tick.bid
+                    ld = datetime.fromisoformat(lt.replace("Z","+00:00"))
+                    if (datetime.now(timezone.utc) - ld).total_seconds() < SIGNAL_COOLDOWN:
+                        continue
                 except Exception:
                     pass
-                if entry <= 0:
-                    continue
-
-                # SL/TP
-                sl, tp = _get_sl_tp(symbol, sig, entry, s, result)
-                if not sl or not tp:
-                    continue
-
-                # Validate direction
-                if sig == "BUY" and (sl >= entry or tp <= entry):
-                    continue
-                if sig == "SELL" and (sl <= entry or tp >= entry):
-                    continue
-
-                signals.append({
-                    "strategy_id": sid,
-                    "strategy_name": name,
-                    "category": cat,
-                    "symbol": symbol,
-                    "timeframe": tf,
-                    "signal_type": sig,
-                    "entry_price": round(entry, 6),
-                    "sl_price": round(sl, 6),
-                    "tp_price": round(tp, 6),
-                    "tp2_price": 0,
-                    "tp3_price": 0,
-                    "confidence": conf,
-                    "reason_fa": s.get("reason_fa", ""),
-                })
-
-                # Hard cap per cycle
-                if len(signals) >= MAX_SIGNALS_PER_CYCLE:
-                    return signals
+
+            conf = s.get("confidence", 0) or 0
+            if conf < 50:
+                continue
+
+            # Entry from MT5 — one tick per symbol for all its signals
+            tick = ticks.get(symbol)
+            entry = (tick.ask if sig == "BUY" else tick.bid) if tick else 0
+            if entry <= 0:
+                continue
+
+            # SL/TP
+            sl, tp = _get_sl_tp(symbol, sig, entry, s, result)
+            if not sl or not tp:
+                continue
+
+            # Validate direction
+            if sig == "BUY" and (sl >= entry or tp <= entry):
+                continue
+            if sig == "SELL" and (sl <= entry or tp >= entry):
+                continue
+
+            signals.append({
+                "strategy_id": sid,
+                "strategy_name": name,
+                "category": cat,
+                "symbol": symbol,
+                "timeframe": tf,
+                "signal_type": sig,
+                "entry_price": round(entry, 6),
+                "sl_price": round(sl, 6),
+                "tp_price": round(tp, 6),
+                "tp2_price": 0,
+                "tp3_price": 0,
+                "confidence": conf,
+                "reason_fa": s.get("reason_fa", ""),
+            })
+
+            # Hard cap per cycle
+            if len(signals) >= MAX_SIGNALS_PER_CYCLE:
+                return signals
 
     return signals
 
@@ -224,28 +224,13 @@ def run_monitor_check():
         timeframe = mon.get("timeframe", "H1")
 
         try:
-            from backend.mt5.mt5_connector import MT5Connector
-            import MetaTrader5 as mt5
-            import pandas as pd
+            from backend.mt5.bar_source import load_bars
 
-            connector = MT5Connector.get_instance()
-            if not connector.ensure_connected():
+            # Closed bars only — a signal on the forming bar could still vanish
+            df = load_bars(symbol, timeframe, 100)
+            if df is None or len(df) < 10:
                 continue
 
-            tf_map = {
-                "M1": mt5.TIMEFRAME_M1, "M5": mt5.TIMEFRAME_M5,
-                "M15": mt5.TIMEFRAME_M15, "M30": mt5.TIMEFRAME_M30,
-                "H1": mt5.TIMEFRAME_H1, "H4": mt5.TIMEFRAME_H4,
-                "D1": mt5.TIMEFRAME_D1, "W1": mt5.TIMEFRAME_W1,
-            }
-            tf = tf_map.get(timeframe.upper(), mt5.TIMEFRAME_H1)
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, 100)
-            if rates is None or len(rates) < 10:
-                continue
-
-            df = pd.DataFrame(rates)
-            df["time"] = pd.to_datetime(df["time"], unit="s")
-
             result = check_strategy_signal(df, strategy)
             now = datetime.now(timezone.utc).isoformat()
             mon["last_check"] = now
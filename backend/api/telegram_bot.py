@@ -9,6 +9,7 @@ import urllib.request, urllib.error
 from datetime import datetime, timezone
 
 # ── Config ──
+TELEGRAM_API = os.environ.get("TELEGRAM_API_BASE", "https://api.telegram.org")
 _BOT_TOKEN = None
 _CHANNEL_ID = None
 _lock = threading.Lock()
@@ -46,7 +47,7 @@ def _api(method, data=None, timeout=10):
     token = _get_token()
     if not token:
         return {"ok": False, "description": "No token"}
-    url = f"https://api.telegram.org/bot{token}/{method}"
+    url = f"{TELEGRAM_API}/bot{token}/{method}"
     if data:
         body = json.dumps(data).encode("utf-8")
         req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
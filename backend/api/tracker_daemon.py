@@ -114,6 +114,11 @@ def stop_tracker():
     global _running
     _stop.set()
     _running = False
+    try:
+        from backend.api.signal_bridge import shutdown_pool
+        shutdown_pool()
+    except Exception:
+        pass
     # Save final state
     try:
         from backend.api.tracker_engine import load_active, save_active
@@ -140,6 +145,11 @@ def _tracker_loop():
         result = recover_after_restart()
         if result and result.get("recovered", 0) > 0:
             print(f"[TRACKER] Recovered {result['recovered']} trades from downtime")
+        timing = (result or {}).get("timing")
+        if timing:
+            print(f"[TRACKER] Recovery scan: {timing['trades']} trades / {timing['symbols']} symbols, "
+                  f"{timing['bars']} bars in {timing['total_ms']} ms "
+                  f"(fetch {timing['fetch_ms']}, scan {timing['scan_ms']}, record {timing['record_ms']})")
     except Exception as e:
         print(f"[TRACKER] Recovery check: {e}")
     
@@ -179,7 +189,6 @@ def _run_one_cycle():
 
     # MT5
     try:
-        import MetaTrader5 as mt5
         from backend.mt5.mt5_connector import MT5Connector
         conn = MT5Connector.get_instance()
         if not conn.ensure_connected():
@@ -242,18 +251,26 @@ def _run_one_cycle():
         process_tick = None
 
     active = load_active()
-    for trade in list(active.get("active", [])):
+    trades = list(active.get("active", []))
+
+    # One tick per distinct symbol for the whole pass: {symbol: Tick(bid, ask, time)}
+    from backend.mt5.tick_snapshot import TickSnapshot
+    snapshot = TickSnapshot(resolve=_mt5_sym)
+    ticks = snapshot.prefetch(t.get("symbol", "XAUUSD") for t in trades)
+    state["tick_snapshot"] = {"trades": len(trades), **snapshot.stats()}
+
+    # Rules run per trade on purpose: a NumPy struct-of-arrays version of
+    # process_tick measured no faster (building the arrays from the trade
+    # dicts costs as much as the rules), so they stay in one place.
+    for trade in trades:
         sym = trade.get("symbol", "XAUUSD")
         direction = trade.get("direction", "BUY")
         pip = _get_pip(sym)
         tv = _get_tv(sym)
-        try:
-            tick = mt5.symbol_info_tick(_mt5_sym(sym))
-            if not tick:
-                continue
-            cp = tick.ask if direction == "BUY" else tick.bid
-        except Exception:
+        tick = ticks.get(sym)
+        if not tick:
             continue
+        cp = tick.ask if direction == "BUY" else tick.bid
 
         if process_tick:
             res = process_tick(trade, cp, tick.bid, tick.ask)
@@ -407,25 +424,16 @@ if 'record_exit' in dir() or True:
             """Wrapped record_exit — dispatches alert after closing trade."""
             result = _original_record_exit(trade_id, exit_price, exit_reason, pip_value, tick_value)
             try:
-                # Find the closed trade data
-                active = load_active()
-                # Trade already moved to records, search there
-                import glob as _g
-                for fpath in _g.glob(os.path.join(TRACK_DIR, "rec_*.json")):
-                    try:
-                        with open(fpath, "r", encoding="utf-8") as _f:
-                            rec = json.load(_f)
-                        for t in reversed(rec.get("trades", [])):
-                            if t.get("id") == trade_id:
-                                etype = {
-                                    "tp": "closed_tp", "sl": "closed_sl",
-                                    "trailing": "closed_trailing",
-                                    "break_even": "closed_be", "be": "closed_be",
-                                }.get(exit_reason, "exit")
-                                _get_dispatch()(etype, t)
-                                return result
-                    except Exception:
-                        continue
+                # Trade already moved to records — indexed lookup by id
+                from backend.api import trade_store
+                t = trade_store.find_trade(trade_id)
+                if t:
+                    etype = {
+                        "tp": "closed_tp", "sl": "closed_sl",
+                        "trailing": "closed_trailing",
+                        "break_even": "closed_be", "be": "closed_be",
+                    }.get(exit_reason, "exit")
+                    _get_dispatch()(etype, t)
             except Exception as _e:
                 print(f"[ALERT_HOOK] record_exit dispatch error: {_e}")
             return result
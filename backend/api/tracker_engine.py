@@ -15,6 +15,8 @@ from datetime import datetime, timezone
 from threading import Thread, Lock, Event
 from collections import defaultdict
 
+from backend.api import trade_store, trade_aggregates
+
 PROJECT_DIR = r"C:\Users\Administrator\Desktop\mvp"
 TRACK_DIR = os.path.join(PROJECT_DIR, "track_records")
 os.makedirs(TRACK_DIR, exist_ok=True)
@@ -86,21 +88,27 @@ def _safe_load(filepath):
             return {}
 
 
-def _record_file(strategy_id):
-    """Per-strategy record file."""
-    safe_id = str(strategy_id).replace("/", "_").replace("\\", "_")[:60]
-    return os.path.join(TRACK_DIR, f"rec_{safe_id}.json")
-
-
 def load_records(strategy_id):
-    """Load all trade records for a strategy."""
-    data = _safe_load(_record_file(strategy_id))
-    return data if data else {"strategy_id": strategy_id, "trades": [], "stats": {}}
-
-
-def save_records(strategy_id, data):
-    """Save trade records for a strategy."""
-    _safe_save(_record_file(strategy_id), data)
+    """Load trade records for a strategy (newest first, last MAX_TRADES_PER_RECORD)."""
+    trades = trade_store.load_trades(strategy_id, MAX_TRADES_PER_RECORD)
+    meta = trade_store.load_meta(strategy_id)
+    if not trades and not meta:
+        return {"strategy_id": strategy_id, "trades": [], "stats": {}}
+    data = {"strategy_id": strategy_id, "stats": {}}
+    data.update(meta)
+    data["trades"] = trades
+    return data
+
+
+def append_record(strategy_id, trade):
+    """Append one closed trade to the strategy's history and running stats — O(1)."""
+    seq = trade_store.append_trade(strategy_id, trade)
+    if seq is None:
+        return  # re-sent exit — already counted
+    try:
+        trade_aggregates.record_trade(strategy_id, trade, seq)
+    except Exception as e:
+        print(f"[TRACKER] Aggregate update error: {e}")
 
 
 def load_active():
@@ -109,9 +117,17 @@ def load_active():
     return data if data else {"active": []}
 
 
+_last_active_dump = None
+
+
 def save_active(data):
-    """Save active trades — called frequently."""
+    """Save active trades — called every cycle, but only hits disk when changed."""
+    global _last_active_dump
+    dump = json.dumps(data, sort_keys=True, default=str)
+    if dump == _last_active_dump and os.path.exists(ACTIVE_FILE):
+        return
     _safe_save(ACTIVE_FILE, data)
+    _last_active_dump = dump
 
 
 def load_state():
@@ -276,10 +292,7 @@ def expire_stale_trades():
                     trade["pnl_usd"] = round(pnl * tv * trade.get("lot_size", 0.01), 2)
                     trade["outcome"] = "win" if pnl > 0 else "loss"
                     # Save to records
-                    records = load_records(trade["strategy_id"])
-                    records["trades"].insert(0, trade)
-                    records["trades"] = records["trades"][:500]
-                    save_records(trade["strategy_id"], records)
+                    append_record(trade["strategy_id"], trade)
                     expired += 1
                     continue
             except Exception:
@@ -426,12 +439,8 @@ def record_exit(trade_id, exit_price, exit_reason, pip_val=0.0001, tick_val=10.0
             "detail": f"Closed ({exit_reason}) @ {exit_p} | PnL: {pnl_usd:.2f}$"
         })
 
-        # Save to strategy records
-        records = load_records(trade["strategy_id"])
-        records["trades"].insert(0, trade)
-        # Keep last 200 trades per strategy
-        records["trades"] = records["trades"][:MAX_TRADES_PER_RECORD]
-        save_records(trade["strategy_id"], records)
+        # Append to strategy history (trimmed to MAX_TRADES_PER_RECORD by cleanup_storage)
+        append_record(trade["strategy_id"], trade)
 
         # Remove from active
         active["active"] = remaining
@@ -485,89 +494,118 @@ def update_trade_price(trade_id, current_price):
 
 
 # ══════ RECOVERY (after restart) ══════
+RECOVERY_BARS = 10000         # M1 bars scanned per trade from its open (~7 days)
+
+
+def _opened_epoch(trade):
+    try:
+        opened = datetime.fromisoformat(trade.get("opened_at", "").replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if opened.tzinfo is None:
+        opened = opened.replace(tzinfo=timezone.utc)
+    return int(opened.timestamp())
+
+
+def _first_exit(times, highs, lows, trade, opened):
+    """
+    First SL/TP1 crossing in the M1 bars from `opened` (epoch s) on:
+    (price, "sl"|"tp") or None. SL wins when both hit in the same bar.
+    """
+    import numpy as np
+
+    lo = int(np.searchsorted(times, opened, "left"))
+    high = highs[lo:lo + RECOVERY_BARS]
+    low = lows[lo:lo + RECOVERY_BARS]
+    if not len(high):
+        return None
+
+    sl = trade.get("sl_price", 0)
+    tp1 = trade.get("tp1_price", 0)
+    buy = trade.get("direction", "BUY") == "BUY"
+    n = len(high)
+
+    def first(mask):
+        i = int(mask.argmax())
+        return i if mask[i] else n
+
+    sl_at = first(low <= sl if buy else high >= sl) if sl > 0 else n
+    tp_at = first(high >= tp1 if buy else low <= tp1) if tp1 > 0 else n
+    if sl_at == n and tp_at == n:
+        return None
+    return (sl, "sl") if sl_at <= tp_at else (tp1, "tp")
+
 
 def recover_after_restart():
     """
     After server restart, check if any active trades hit TP/SL during downtime.
-    Uses MT5 historical data to backfill.
+    Each symbol's M1 history is loaded once (bar source, so the local store
+    serves what it already holds) and every trade on it is resolved with a
+    first-index search over the bars since it opened.
     """
+    t_start = time.perf_counter()
     active = load_active()
     if not active["active"]:
         return {"recovered": 0}
 
+    by_symbol = defaultdict(list)
+    for trade in active["active"]:
+        opened = _opened_epoch(trade)
+        if opened is not None:
+            by_symbol[trade.get("symbol", "XAUUSD")].append((trade, opened))
+
+    timing = {"symbols": len(by_symbol), "trades": len(active["active"]),
+              "bars": 0, "missing": [], "fetch_ms": 0.0, "scan_ms": 0.0, "record_ms": 0.0}
     recovered = 0
     try:
-        import MetaTrader5 as mt5
-        from backend.mt5.mt5_connector import MT5Connector
-        connector = MT5Connector.get_instance()
-        if not connector.ensure_connected():
-            return {"recovered": 0, "error": "MT5 not connected"}
-
-        _BROKER_MAP = {
-            "XAUUSD": "XAUUSD+", "XAGUSD": "XAGUSD+", "EURUSD": "EURUSD+",
-            "GBPUSD": "GBPUSD+", "USDJPY": "USDJPY+", "AUDUSD": "AUDUSD+",
-            "USDCAD": "USDCAD+", "NZDUSD": "NZDUSD+", "USDCHF": "USDCHF+",
-            "BTCUSD": "BTCUSD", "NAS100": "NAS100", "US30": "DJ30",
-        }
-
-        for trade in list(active["active"]):
-            symbol = trade.get("symbol", "XAUUSD")
-            broker_sym = _BROKER_MAP.get(symbol, symbol)
-            opened_at = trade.get("opened_at", "")
-            sl = trade.get("sl_price", 0)
-            tp1 = trade.get("tp1_price", 0)
-            direction = trade.get("direction", "BUY")
+        from backend.mt5.bar_source import get_bar_source
+        source = get_bar_source()
 
-            # Get bars since trade opened
+        exits = []
+        for symbol, trades in by_symbol.items():
+            t0 = time.perf_counter()
             try:
-                from datetime import datetime as dt
-                start_time = dt.fromisoformat(opened_at.replace("Z", "+00:00"))
-                rates = mt5.copy_rates_from(broker_sym, mt5.TIMEFRAME_M1, start_time, 10000)
-                if rates is None or len(rates) == 0:
-                    continue
-
-                for bar in rates:
-                    high = bar["high"]
-                    low = bar["low"]
-
-                    # Check SL hit
-                    sl_hit = False
-                    tp_hit = False
-                    if direction == "BUY":
-                        if sl > 0 and low <= sl:
-                            sl_hit = True
-                        if tp1 > 0 and high >= tp1:
-                            tp_hit = True
-                    else:
-                        if sl > 0 and high >= sl:
-                            sl_hit = True
-                        if tp1 > 0 and low <= tp1:
-                            tp_hit = True
-
-                    if sl_hit:
-                        pip = _get_pip(symbol)
-                        tv = _get_tv(symbol)
-                        record_event(trade["id"], "recovery",
-                                     sl, "Server was down — SL hit detected from history")
-                        record_exit(trade["id"], sl, "sl_recovery", pip, tv)
-                        recovered += 1
-                        break
-                    elif tp_hit:
-                        pip = _get_pip(symbol)
-                        tv = _get_tv(symbol)
-                        record_event(trade["id"], "recovery",
-                                     tp1, "Server was down — TP hit detected from history")
-                        record_exit(trade["id"], tp1, "tp_recovery", pip, tv)
-                        recovered += 1
-                        break
-
+                earliest = min(opened for _, opened in trades)
+                # No count: it keeps the newest bars, which would start the scan
+                # mid-trade for anything older than RECOVERY_BARS. _first_exit caps it.
+                rates = source.rates(symbol, "M1", start=earliest)
             except Exception:
+                rates = None
+            t1 = time.perf_counter()
+            timing["fetch_ms"] += (t1 - t0) * 1000
+            if rates is None or len(rates) == 0:
+                timing["missing"].append(symbol)
                 continue
+            timing["bars"] += len(rates)
 
-    except Exception:
-        pass
-
-    return {"recovered": recovered}
+            times, highs, lows = rates["time"], rates["high"], rates["low"]
+            for trade, opened in trades:
+                try:
+                    hit = _first_exit(times, highs, lows, trade, opened)
+                except Exception:
+                    continue
+                if hit:
+                    exits.append((trade, symbol) + hit)
+            timing["scan_ms"] += (time.perf_counter() - t1) * 1000
+
+        t2 = time.perf_counter()
+        for trade, symbol, price, kind in exits:
+            pip = _get_pip(symbol)
+            tv = _get_tv(symbol)
+            label = "SL" if kind == "sl" else "TP"
+            record_event(trade["id"], "recovery",
+                         price, f"Server was down — {label} hit detected from history")
+            record_exit(trade["id"], price, f"{kind}_recovery", pip, tv)
+            recovered += 1
+        timing["record_ms"] = (time.perf_counter() - t2) * 1000
+
+    except Exception as e:
+        timing["error"] = str(e)
+
+    for key in ("fetch_ms", "scan_ms", "record_ms"):
+        timing[key] = round(timing[key], 1)
+    timing["total_ms"] = round((time.perf_counter() - t_start) * 1000, 1)
+    return {"recovered": recovered, "timing": timing}
 
 
 # ══════ TRACKER STATUS ══════
@@ -597,12 +635,7 @@ def get_strategy_records(strategy_id):
 
 def get_all_strategy_ids():
     """List all strategies that have records."""
-    ids = []
-    for f in os.listdir(TRACK_DIR):
-        if f.startswith("rec_") and f.endswith(".json"):
-            sid = f[4:-5]
-            ids.append(sid)
-    return ids
+    return trade_store.strategy_ids()
 
 
 # ══════ HELPERS ══════
@@ -645,41 +678,22 @@ MAX_RECORD_FILES = 500        # Total record files to keep
 
 
 def cleanup_storage():
-    """Trim trade records and remove oversized files. Returns stats."""
-    trimmed = 0
-    removed = 0
-
+    """Trim trade records and drop stale near-empty strategies. Returns stats."""
     # 1. Trim trades per strategy to MAX_TRADES_PER_RECORD
-    rec_files = [f for f in os.listdir(TRACK_DIR) if f.startswith("rec_") and f.endswith(".json")]
-    for fname in rec_files:
-        fpath = os.path.join(TRACK_DIR, fname)
-        try:
-            data = _safe_load(fpath)
-            trades = data.get("trades", [])
-            if len(trades) > MAX_TRADES_PER_RECORD:
-                data["trades"] = trades[:MAX_TRADES_PER_RECORD]
-                _safe_save(fpath, data)
-                trimmed += 1
-        except Exception:
-            continue
-
-    # 2. If too many record files, remove oldest/smallest ones
-    if len(rec_files) > MAX_RECORD_FILES:
-        # Sort by modification time (oldest first)
-        full_paths = [os.path.join(TRACK_DIR, f) for f in rec_files]
-        full_paths.sort(key=os.path.getmtime)
-        # Remove oldest until under limit
-        to_remove = full_paths[:len(rec_files) - MAX_RECORD_FILES]
-        for fpath in to_remove:
-            try:
-                # Only remove if it has < 5 trades (not valuable)
-                data = _safe_load(fpath)
-                if len(data.get("trades", [])) < 5:
-                    os.remove(fpath)
-                    removed += 1
-            except Exception:
-                continue
+    trimmed = trade_store.trim_records(MAX_TRADES_PER_RECORD)
+
+    # 2. If too many strategies, remove the least recently active ones
+    removed = 0
+    activity = trade_store.strategy_activity()
+    if len(activity) > MAX_RECORD_FILES:
+        oldest = sorted(activity.items(), key=lambda kv: kv[1][1])
+        for sid, (count, _) in oldest[:len(activity) - MAX_RECORD_FILES]:
+            # Only remove if it has < 5 trades (not valuable)
+            if count < 5:
+                trade_store.delete_strategy(sid)
+                trade_aggregates.drop_strategy(sid)
+                removed += 1
 
     if trimmed or removed:
-        print(f"[TRACKER] Storage cleanup: trimmed {trimmed} files, removed {removed} files")
+        print(f"[TRACKER] Storage cleanup: trimmed {trimmed} strategies, removed {removed} strategies")
     return {"trimmed": trimmed, "removed": removed}
@@ -0,0 +1,381 @@
+"""
+Whilber-AI — Running Trade Aggregates
+=======================================
+Tracker stats maintained incrementally as trades close, instead of
+re-reading every strategy's history to rebuild the ranking.
+
+Scopes (one bucket per key):
+  strategy  — per strategy_id, plus by_symbol / last_5 / equity tail
+  symbol    — per symbol
+  category  — per strategy category
+
+Each bucket holds counts, USD + pip sums, gross profit/loss, equity
+peak/max drawdown and win/loss streaks. record_trade() applies one closed
+trade in O(1); buckets are persisted to trades.db together with the seq of
+the last applied trade, so a restart (or another process appending) only
+catches up on rows newer than that seq.
+
+Usage:
+    from backend.api import trade_aggregates
+    trade_aggregates.record_trade(strategy_id, trade, seq)   # on exit
+    cache = trade_aggregates.get_cache()                     # O(strategies)
+"""
+
+import threading
+import time
+from collections import deque
+
+from backend.api import trade_store
+
+# ═══ PIP VALUES (per 1 standard lot) ═══
+PIP_SIZE = {
+    "XAUUSD": 0.1, "XAGUSD": 0.01, "EURUSD": 0.0001, "GBPUSD": 0.0001,
+    "USDJPY": 0.01, "AUDUSD": 0.0001, "USDCAD": 0.0001, "NZDUSD": 0.0001,
+    "USDCHF": 0.0001, "BTCUSD": 1.0, "NAS100": 1.0, "US30": 1.0,
+}
+
+# PIP_VALUE per 0.01 lot (what tracker uses)
+PIP_VALUE_001 = {
+    "XAUUSD": 0.10, "XAGUSD": 0.50, "EURUSD": 0.10, "GBPUSD": 0.10,
+    "USDJPY": 0.07, "AUDUSD": 0.10, "USDCAD": 0.07, "NZDUSD": 0.10,
+    "USDCHF": 0.10, "BTCUSD": 0.01, "NAS100": 0.10, "US30": 0.10,
+}
+
+EQUITY_TAIL = 50
+LAST_N = 5
+QUALITY_WINDOW = 200          # newest trades fed to the quality check (= MAX_TRADES_PER_RECORD)
+
+_lock = threading.RLock()
+_aggs = {"strategy": {}, "symbol": {}, "category": {}}
+_last_seq = 0
+_loaded = False
+_version = 0
+_cache = {"version": -1, "data": None}
+
+
+def calc_pips(trade):
+    """Calculate PnL in pips from trade data."""
+    pnl_pips = trade.get("pnl_pips", 0)
+    if pnl_pips and pnl_pips != 0:
+        return pnl_pips
+
+    # Fallback: calculate from entry/exit prices
+    entry = trade.get("entry_price", 0)
+    exit_p = trade.get("exit_price", 0)
+    symbol = trade.get("symbol", "")
+    direction = trade.get("direction", "BUY")
+    pip_size = PIP_SIZE.get(symbol, 0.0001)
+
+    if entry and exit_p and pip_size:
+        if direction == "BUY":
+            return round((exit_p - entry) / pip_size, 1)
+        else:
+            return round((entry - exit_p) / pip_size, 1)
+
+    # Last fallback: estimate from pnl_usd
+    pnl_usd = trade.get("pnl_usd", 0)
+    pip_val = PIP_VALUE_001.get(symbol, 0.10)
+    if pnl_usd and pip_val:
+        return round(pnl_usd / pip_val, 1)
+
+    return 0
+
+
+def _category_of(strategy_id, trade):
+    return trade.get("category") or (strategy_id.split("_")[0] if "_" in strategy_id else "other")
+
+
+# ══════ BUCKETS ══════
+
+def _new_bucket():
+    return {
+        "total": 0, "wins": 0, "losses": 0, "loss_n": 0,
+        "pnl_usd": 0.0, "pnl_pips": 0.0,
+        "gross_win_usd": 0.0, "gross_loss_usd": 0.0,
+        "win_pips": 0.0, "win_pips_n": 0, "loss_pips": 0.0, "loss_pips_n": 0,
+        "equity_pips": 0.0, "peak_pips": 0.0, "max_dd_pips": 0.0,
+        "equity_usd": 0.0, "peak_usd": 0.0, "max_dd_usd": 0.0,
+        "streak": 0, "max_win_streak": 0, "max_loss_streak": 0,
+        "last_trade": "", "last_closed_at": "",
+    }
+
+
+def _apply(b, trade, pips):
+    """Fold one closed trade into a bucket. Trades must arrive oldest first."""
+    usd = trade.get("pnl_usd", 0) or 0
+    outcome = trade.get("outcome")
+    b["total"] += 1
+    b["pnl_usd"] += usd
+    b["pnl_pips"] += pips
+    if outcome == "win":
+        b["wins"] += 1
+        b["gross_win_usd"] += usd
+        b["streak"] = b["streak"] + 1 if b["streak"] > 0 else 1
+        b["max_win_streak"] = max(b["max_win_streak"], b["streak"])
+    else:
+        b["losses"] += 1
+        if outcome == "loss":
+            b["loss_n"] += 1
+            b["gross_loss_usd"] += usd
+        b["streak"] = b["streak"] - 1 if b["streak"] < 0 else -1
+        b["max_loss_streak"] = max(b["max_loss_streak"], -b["streak"])
+    if pips > 0:
+        b["win_pips"] += pips
+        b["win_pips_n"] += 1
+    elif pips < 0:
+        b["loss_pips"] += pips
+        b["loss_pips_n"] += 1
+
+    b["equity_pips"] += pips
+    b["peak_pips"] = max(b["peak_pips"], b["equity_pips"])
+    b["max_dd_pips"] = max(b["max_dd_pips"], b["peak_pips"] - b["equity_pips"])
+    b["equity_usd"] += usd
+    b["peak_usd"] = max(b["peak_usd"], b["equity_usd"])
+    b["max_dd_usd"] = max(b["max_dd_usd"], b["peak_usd"] - b["equity_usd"])
+
+    b["last_trade"] = trade.get("opened_at", "") or b["last_trade"]
+    b["last_closed_at"] = trade.get("closed_at", "") or b["last_closed_at"]
+
+
+def _apply_strategy(b, key, trade, pips):
+    if "by_symbol" not in b:
+        b.update({"strategy_id": key, "by_symbol": {}, "last_5": [], "equity_tail": []})
+    _apply(b, trade, pips)
+    b["strategy_name"] = b.get("strategy_name") or trade.get("strategy_name") or key
+    b["category"] = b.get("category") or _category_of(key, trade)
+
+    sym = trade.get("symbol", "")
+    if sym:
+        s = b["by_symbol"].setdefault(sym, {"total": 0, "wins": 0, "pnl": 0.0, "pnl_pips": 0.0})
+        s["total"] += 1
+        if trade.get("outcome") == "win":
+            s["wins"] += 1
+        s["pnl"] += trade.get("pnl_usd", 0) or 0
+        s["pnl_pips"] += pips
+
+    last = deque(b["last_5"], maxlen=LAST_N)
+    last.append(trade.get("outcome", "loss"))
+    b["last_5"] = list(last)
+    tail = deque(b["equity_tail"], maxlen=EQUITY_TAIL)
+    tail.append(pips)
+    b["equity_tail"] = list(tail)
+
+
+def _fold(key, trade):
+    """Apply one trade to all scopes; return the (scope, key) pairs touched."""
+    pips = calc_pips(trade)
+    _apply_strategy(_aggs["strategy"].setdefault(key, _new_bucket()), key, trade, pips)
+    touched = [("strategy", key)]
+    sym = trade.get("symbol", "")
+    if sym:
+        _apply(_aggs["symbol"].setdefault(sym, _new_bucket()), trade, pips)
+        touched.append(("symbol", sym))
+    cat = _category_of(key, trade)
+    _apply(_aggs["category"].setdefault(cat, _new_bucket()), trade, pips)
+    touched.append(("category", cat))
+    return touched
+
+
+def _flag_quality(key):
+    """Re-run the record quality check for one strategy (its newest QUALITY_WINDOW rows)."""
+    b = _aggs["strategy"].get(key)
+    if b is None:
+        return
+    if b["total"] < 3:
+        b["quality"] = "unknown"
+        return
+    try:
+        from backend.api.signal_validator import flag_strategy_record
+        q = flag_strategy_record(trade_store.load_trades(key, limit=QUALITY_WINDOW))
+        b["quality"] = q.get("quality", "unknown")
+        b["flags"] = q.get("flags", [])
+    except Exception:
+        b["quality"] = "unknown"
+
+
+# ══════ LOAD / CATCH UP ══════
+
+def _ensure_loaded():
+    """Load the persisted snapshot once, then apply any rows newer than it."""
+    global _loaded, _last_seq
+    with _lock:
+        if not _loaded:
+            snap, seq = trade_store.load_aggregates()
+            for scope in _aggs:
+                _aggs[scope] = snap.get(scope, {})
+            _last_seq = seq
+            _loaded = True
+        _catch_up()
+
+
+def _catch_up():
+    global _last_seq, _version
+    touched = set()
+    seq = _last_seq
+    for seq, key, trade in trade_store.iter_since(_last_seq):
+        touched.update(_fold(key, trade))
+    if not touched:
+        return 0
+    for scope, key in touched:
+        if scope == "strategy":
+            _flag_quality(key)
+    trade_store.save_aggregates([(sc, k, _aggs[sc][k]) for sc, k in touched], seq)
+    _last_seq = seq
+    _version += 1
+    return len(touched)
+
+
+def record_trade(strategy_id, trade, seq=None):
+    """Fold a just-closed trade into the aggregates. Called from tracker_engine on exit."""
+    global _last_seq, _version
+    with _lock:
+        if not _loaded or seq is None or seq != _last_seq + 1:
+            # Gap (other writer, first call) — catch up from the store instead
+            _ensure_loaded()
+            return
+        key = trade_store.record_key(strategy_id)
+        touched = _fold(key, trade)
+        _flag_quality(key)
+        trade_store.save_aggregates([(sc, k, _aggs[sc][k]) for sc, k in touched], seq)
+        _last_seq = seq
+        _version += 1
+
+
+def drop_strategy(strategy_id):
+    """Forget a strategy removed by storage cleanup (symbol/category totals keep its history)."""
+    global _version
+    key = trade_store.record_key(strategy_id)
+    with _lock:
+        _aggs["strategy"].pop(key, None)
+        trade_store.drop_aggregate("strategy", key)
+        _version += 1
+
+
+def rebuild():
+    """Recompute every bucket from the full trade history (manual/CLI repair only)."""
+    global _loaded, _last_seq, _version
+    t0 = time.time()
+    with _lock:
+        for scope in _aggs:
+            _aggs[scope] = {}
+        seq = 0
+        for seq, key, trade in trade_store.iter_since(0):
+            _fold(key, trade)
+        for key in _aggs["strategy"]:
+            _flag_quality(key)
+        rows = [(sc, k, b) for sc in _aggs for k, b in _aggs[sc].items()]
+        trade_store.save_aggregates(rows, seq, replace=True)
+        _last_seq = seq
+        _loaded = True
+        _version += 1
+    print(f"[AGG] Rebuilt {len(_aggs['strategy'])} strategies in {time.time() - t0:.1f}s")
+
+
+# ══════ VIEWS ══════
+
+def _bucket_view(b):
+    n = b["total"]
+    pf = round(abs(b["gross_win_usd"] / b["gross_loss_usd"]), 2) if b["gross_loss_usd"] else 0
+    return {
+        "total": n,
+        "wins": b["wins"],
+        "losses": n - b["wins"],
+        "win_rate": round(b["wins"] / n * 100, 1) if n else 0,
+        "total_pnl": round(b["pnl_usd"], 2),
+        "total_pnl_pips": round(b["pnl_pips"], 1),
+        "gross_profit": round(b["gross_win_usd"], 2),
+        "gross_loss": round(b["gross_loss_usd"], 2),
+        "profit_factor": pf,
+        "max_drawdown": round(b["max_dd_usd"], 2),
+        "max_drawdown_pips": round(b["max_dd_pips"], 1),
+        "streak": b["streak"],
+        "max_win_streak": b["max_win_streak"],
+        "max_loss_streak": b["max_loss_streak"],
+        "last_trade": b["last_trade"],
+    }
+
+
+def _ranking_item(key, b):
+    """Same fields rebuild_cache used to produce, from the running sums."""
+    n = b["total"]
+    v = _bucket_view(b)
+    wr = v["win_rate"]
+    avg_pnl_pips = round(round(b["pnl_pips"], 1) / n, 1) if n else 0
+    score = round((wr / 100) * avg_pnl_pips, 2) if avg_pnl_pips > 0 else round((wr / 100) * avg_pnl_pips * 0.5, 2)
+    eq, cs = [], 0
+    for p in b.get("equity_tail", []):
+        cs += p
+        eq.append(round(cs, 1))
+    symbols = b.get("by_symbol", {})
+    item = {
+        "strategy_id": key,
+        "strategy_name": b.get("strategy_name") or key,
+        "category": b.get("category", ""),
+        "symbol": ", ".join(sorted(symbols.keys())) if symbols else "-",
+        "avg_pnl": round(b["pnl_usd"] / n, 2) if n else 0,
+        "avg_win": round(b["gross_win_usd"] / b["wins"], 2) if b["wins"] else 0,
+        "avg_loss": round(b["gross_loss_usd"] / b["loss_n"], 2) if b["loss_n"] else 0,
+        "avg_pnl_pips": avg_pnl_pips,
+        "avg_win_pips": round(b["win_pips"] / b["win_pips_n"], 1) if b["win_pips_n"] else 0,
+        "avg_loss_pips": round(b["loss_pips"] / b["loss_pips_n"], 1) if b["loss_pips_n"] else 0,
+        "score": score,
+        "by_symbol": {k: {"total": s["total"], "wins": s["wins"],
+                          "pnl": round(s["pnl"], 2), "pnl_pips": round(s["pnl_pips"], 1)}
+                      for k, s in symbols.items()},
+        "last_5": list(b.get("last_5", [])),
+        "equity_curve": eq,
+        "quality": b.get("quality", "unknown"),
+    }
+    item.update(v)
+    if b.get("flags"):
+        item["flags"] = b["flags"]
+    return item
+
+
+def get_cache():
+    """
+    Ranking cache in the tracker_cache.json layout, built from the buckets.
+    O(strategies); memoized until the next trade is applied.
+    """
+    _ensure_loaded()
+    with _lock:
+        if _cache["version"] == _version and _cache["data"] is not None:
+            return _cache["data"]
+        ranking = [_ranking_item(k, b) for k, b in _aggs["strategy"].items() if b["total"]]
+        ranking.sort(key=lambda x: x.get("score", 0), reverse=True)
+        data = {
+            "ranking": ranking,
+            "summary": [{"strategy_id": r["strategy_id"], "strategy_name": r["strategy_name"],
+                         "category": r.get("category", ""), "symbol": r["symbol"], "total": r["total"],
+                         "wins": r["wins"], "win_rate": r["win_rate"], "total_pnl": r["total_pnl"],
+                         "last_trade": r.get("last_trade", "")} for r in ranking],
+            "symbols": sorted(_aggs["symbol"].keys()),
+            "strategies": [{"id": r["strategy_id"], "name": r["strategy_name"], "count": r["total"]}
+                           for r in ranking],
+            "by_symbol": {k: _bucket_view(b) for k, b in _aggs["symbol"].items()},
+            "by_category": {k: _bucket_view(b) for k, b in _aggs["category"].items()},
+            "total_trades": sum(r["total"] for r in ranking),
+            "total_strategies": len(ranking),
+            "built_at": time.time(),
+            "rebuilt_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "since": "all",
+        }
+        _cache["version"] = _version
+        _cache["data"] = data
+        return data
+
+
+def get_agg_info():
+    with _lock:
+        return {
+            "strategies": len(_aggs["strategy"]),
+            "symbols": len(_aggs["symbol"]),
+            "categories": len(_aggs["category"]),
+            "last_seq": _last_seq,
+            "loaded": _loaded,
+        }
+
+
+if __name__ == "__main__":
+    rebuild()
+    print(get_agg_info())
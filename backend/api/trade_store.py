@@ -0,0 +1,399 @@
+"""
+Whilber-AI — Trade Record Store
+=================================
+Append-only storage for closed tracked trades (SQLite, WAL mode).
+
+Replaces the per-strategy rec_<id>.json files, which were reserialized in
+full on every entry/exit. Closing a trade is now one INSERT.
+
+Tables:
+  trades         — one row per closed trade, full trade dict in `data`
+                   indexed on (strategy_id, seq), (symbol, closed_at), closed_at
+  strategy_meta  — non-trade fields of a record (e.g. "stats")
+  store_meta     — migration flags, aggregate high-water mark
+  aggregates     — running stats snapshots (see trade_aggregates.py)
+
+Order: `seq` grows with each append, so "newest first" == ORDER BY seq DESC,
+matching the old rec file layout (trades.insert(0, trade)). A row keeps its
+seq for life (no delete + re-insert): trade_aggregates folds in every row
+above its high-water seq, so a re-numbered trade would be counted twice.
+"""
+
+import glob
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+PROJECT_DIR = r"C:\Users\Administrator\Desktop\mvp"
+TRACK_DIR = os.path.join(PROJECT_DIR, "track_records")
+DB_FILE = os.path.join(TRACK_DIR, "trades.db")
+MIGRATED_DIR = os.path.join(TRACK_DIR, "_migrated_json")
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+_COLUMNS = ("symbol", "timeframe", "category", "direction", "status",
+            "outcome", "exit_reason", "pnl_pips", "pnl_usd", "opened_at", "closed_at")
+
+
+def record_key(strategy_id):
+    """Storage key for a strategy — same normalization the rec_ files used."""
+    return str(strategy_id).replace("/", "_").replace("\\", "_")[:60]
+
+
+def _get_db():
+    """Per-thread connection; schema + one-shot JSON migration on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == DB_FILE:
+        return conn
+    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    _local.conn = conn
+    _local.path = DB_FILE
+    with _init_lock:
+        if DB_FILE not in _initialized:
+            _init_tables(conn)
+            _initialized.add(DB_FILE)
+            migrate_json_records(conn)
+    return conn
+
+
+def _init_tables(conn):
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS trades (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            strategy_id TEXT NOT NULL,
+            trade_id TEXT NOT NULL,
+            symbol TEXT DEFAULT '',
+            timeframe TEXT DEFAULT '',
+            category TEXT DEFAULT '',
+            direction TEXT DEFAULT '',
+            status TEXT DEFAULT '',
+            outcome TEXT DEFAULT '',
+            exit_reason TEXT DEFAULT '',
+            pnl_pips REAL DEFAULT 0,
+            pnl_usd REAL DEFAULT 0,
+            opened_at TEXT DEFAULT '',
+            closed_at TEXT DEFAULT '',
+            data TEXT NOT NULL,
+            UNIQUE(strategy_id, trade_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_trades_strategy ON trades(strategy_id, seq);
+        CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol, closed_at);
+        CREATE INDEX IF NOT EXISTS idx_trades_closed ON trades(closed_at);
+        CREATE TABLE IF NOT EXISTS strategy_meta (
+            strategy_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS store_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS aggregates (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (scope, key)
+        );
+    """)
+    conn.commit()
+
+
+def _row_values(key, trade):
+    vals = []
+    for col in _COLUMNS:
+        v = trade.get(col)
+        if col in ("pnl_pips", "pnl_usd"):
+            try:
+                v = float(v or 0)
+            except (TypeError, ValueError):
+                v = 0.0
+        else:
+            v = "" if v is None else str(v)
+        vals.append(v)
+    tid = str(trade.get("id", "")) or f"_{time.time_ns()}"
+    return (key, tid, *vals, json.dumps(trade, default=str))
+
+
+_INSERT_NEW_SQL = (
+    f"INSERT OR IGNORE INTO trades (strategy_id, trade_id, {', '.join(_COLUMNS)}, data) "
+    f"VALUES (?, ?, {', '.join('?' * len(_COLUMNS))}, ?)"
+)
+
+# Upsert: a re-sent trade updates its row in place and keeps its seq, so it
+# is never seen as a new append by iter_since / the running aggregates.
+_INSERT_SQL = (
+    _INSERT_NEW_SQL.replace("INSERT OR IGNORE", "INSERT")
+    + " ON CONFLICT(strategy_id, trade_id) DO UPDATE SET "
+    + ", ".join(f"{c}=excluded.{c}" for c in (*_COLUMNS, "data"))
+)
+
+
+# ══════ WRITE ══════
+
+def append_trade(strategy_id, trade):
+    """
+    Append one closed trade — O(1), the only write on a trade exit. Returns its
+    seq, or None if the trade was already stored (its row is updated in place).
+    """
+    vals = _row_values(record_key(strategy_id), trade)
+    conn = _get_db()
+    with conn:
+        cur = conn.execute(_INSERT_NEW_SQL, vals)
+        if cur.rowcount:
+            return cur.lastrowid
+        conn.execute(_INSERT_SQL, vals)
+    return None
+
+
+def trim_records(max_per_strategy):
+    """Keep only the newest max_per_strategy trades per strategy. Returns strategies trimmed."""
+    conn = _get_db()
+    over = conn.execute(
+        "SELECT strategy_id FROM trades GROUP BY strategy_id HAVING COUNT(*) > ?",
+        (max_per_strategy,)).fetchall()
+    with conn:
+        for row in over:
+            conn.execute(
+                "DELETE FROM trades WHERE strategy_id=? AND seq NOT IN "
+                "(SELECT seq FROM trades WHERE strategy_id=? ORDER BY seq DESC LIMIT ?)",
+                (row[0], row[0], max_per_strategy))
+    return len(over)
+
+
+def delete_strategy(strategy_id):
+    key = record_key(strategy_id)
+    conn = _get_db()
+    with conn:
+        conn.execute("DELETE FROM trades WHERE strategy_id=?", (key,))
+        conn.execute("DELETE FROM strategy_meta WHERE strategy_id=?", (key,))
+
+
+# ══════ READ ══════
+
+def load_trades(strategy_id, limit=None):
+    """Trades of one strategy, newest first."""
+    sql = "SELECT data FROM trades WHERE strategy_id=? ORDER BY seq DESC"
+    args = [record_key(strategy_id)]
+    if limit:
+        sql += " LIMIT ?"
+        args.append(int(limit))
+    return [json.loads(r[0]) for r in _get_db().execute(sql, args)]
+
+
+def load_meta(strategy_id):
+    row = _get_db().execute("SELECT data FROM strategy_meta WHERE strategy_id=?",
+                            (record_key(strategy_id),)).fetchone()
+    return json.loads(row[0]) if row else {}
+
+
+def get_trade(strategy_id, trade_id):
+    row = _get_db().execute("SELECT data FROM trades WHERE strategy_id=? AND trade_id=?",
+                            (record_key(strategy_id), str(trade_id))).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def find_trade(trade_id):
+    """Look a trade up by id alone (newest match)."""
+    row = _get_db().execute("SELECT data FROM trades WHERE trade_id=? ORDER BY seq DESC LIMIT 1",
+                            (str(trade_id),)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def strategy_ids():
+    rows = _get_db().execute(
+        "SELECT strategy_id FROM trades GROUP BY strategy_id ORDER BY MIN(seq)").fetchall()
+    return [r[0] for r in rows]
+
+
+def strategy_activity():
+    """{strategy_id: (trade_count, last_seq)} — used by storage cleanup."""
+    rows = _get_db().execute(
+        "SELECT strategy_id, COUNT(*), MAX(seq) FROM trades GROUP BY strategy_id").fetchall()
+    return {r[0]: (r[1], r[2]) for r in rows}
+
+
+def iter_trades(strategy_ids=None, symbols=None, closed_only=True, since=None,
+                per_strategy_limit=None):
+    """
+    Yield (strategy_key, trade) newest first per strategy, grouped by strategy.
+    Filters run on indexed columns so unrelated rows are never decoded.
+    """
+    where, args = [], []
+    if closed_only:
+        where.append("status='closed'")
+    if strategy_ids:
+        keys = [record_key(s) for s in strategy_ids]
+        where.append(f"strategy_id IN ({','.join('?' * len(keys))})")
+        args.extend(keys)
+    if symbols:
+        where.append(f"symbol IN ({','.join('?' * len(symbols))})")
+        args.extend(symbols)
+    if since:
+        where.append("closed_at >= ?")
+        args.append(since)
+    sql = "SELECT strategy_id, data FROM trades"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY strategy_id, seq DESC"
+
+    current, n = None, 0
+    for row in _get_db().execute(sql, args):
+        if row[0] != current:
+            current, n = row[0], 0
+        n += 1
+        if per_strategy_limit and n > per_strategy_limit:
+            continue
+        yield row[0], json.loads(row[1])
+
+
+def grouped_trades(strategy_ids=None, symbols=None, closed_only=True, since=None,
+                   per_strategy_limit=None):
+    """{strategy_key: [trades newest first]} — drop-in for "read every rec_ file"."""
+    out = {}
+    for key, trade in iter_trades(strategy_ids, symbols, closed_only, since, per_strategy_limit):
+        out.setdefault(key, []).append(trade)
+    return out
+
+
+def iter_since(seq, closed_only=True):
+    """Yield (seq, strategy_key, trade) appended after seq, oldest first."""
+    sql = "SELECT seq, strategy_id, data FROM trades WHERE seq > ?"
+    if closed_only:
+        sql += " AND status='closed'"
+    for row in _get_db().execute(sql + " ORDER BY seq", (int(seq),)):
+        yield row[0], row[1], json.loads(row[2])
+
+
+def load_by_seq(seqs):
+    """{seq: trade} for the given row ids (used to page through query results)."""
+    seqs = [int(s) for s in seqs]
+    out = {}
+    conn = _get_db()
+    for i in range(0, len(seqs), 500):
+        chunk = seqs[i:i + 500]
+        sql = f"SELECT seq, data FROM trades WHERE seq IN ({','.join('?' * len(chunk))})"
+        for row in conn.execute(sql, chunk):
+            out[row[0]] = json.loads(row[1])
+    return out
+
+
+def row_count(max_seq=None):
+    """Rows in the store, optionally only those with seq <= max_seq."""
+    if max_seq is None:
+        return _get_db().execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+    return _get_db().execute("SELECT COUNT(*) FROM trades WHERE seq <= ?",
+                             (int(max_seq),)).fetchone()[0]
+
+
+# ══════ AGGREGATE SNAPSHOTS ══════
+
+def load_aggregates():
+    """Return ({scope: {key: data}}, last_seq)."""
+    conn = _get_db()
+    out = {}
+    for row in conn.execute("SELECT scope, key, data FROM aggregates"):
+        out.setdefault(row[0], {})[row[1]] = json.loads(row[2])
+    row = conn.execute("SELECT value FROM store_meta WHERE key='agg_seq'").fetchone()
+    return out, int(row[0]) if row else 0
+
+
+def save_aggregates(rows, last_seq, replace=False):
+    """Upsert [(scope, key, data)] and the high-water seq in one transaction."""
+    conn = _get_db()
+    with conn:
+        if replace:
+            conn.execute("DELETE FROM aggregates")
+        conn.executemany("INSERT OR REPLACE INTO aggregates (scope, key, data) VALUES (?, ?, ?)",
+                         [(sc, k, json.dumps(d, default=str)) for sc, k, d in rows])
+        conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('agg_seq', ?)",
+                     (str(int(last_seq)),))
+
+
+def drop_aggregate(scope, key):
+    conn = _get_db()
+    with conn:
+        conn.execute("DELETE FROM aggregates WHERE scope=? AND key=?", (scope, key))
+
+
+# ══════ MIGRATION ══════
+
+def migrate_json_records(conn=None, track_dir=None):
+    """
+    One-shot import of rec_*.json into the store. Imported files are moved
+    to track_records/_migrated_json/ so old readers can't see stale copies.
+    Safe to call again — it only imports files still sitting in track_dir.
+    """
+    conn = conn or _get_db()
+    track_dir = track_dir or TRACK_DIR
+    files = sorted(glob.glob(os.path.join(track_dir, "rec_*.json")))
+    if not files:
+        return {"migrated_files": 0, "migrated_trades": 0}
+
+    t0 = time.time()
+    loaded, rows, metas = [], [], []
+    for fpath in files:
+        try:
+            with open(fpath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[TRADE_STORE] Skip {os.path.basename(fpath)}: {e}")
+            continue
+        key = os.path.basename(fpath)[4:-5]
+        trades = data.get("trades", []) if isinstance(data, dict) else []
+        meta = {k: v for k, v in data.items() if k != "trades"} if isinstance(data, dict) else {}
+        # rec layout is newest-first; pos counts from the oldest trade in the file
+        for pos, t in enumerate(reversed(trades)):
+            if isinstance(t, dict):
+                when = str(t.get("closed_at") or t.get("opened_at") or "")
+                rows.append(((when, key, pos), _row_values(key, t)))
+        metas.append((key, json.dumps(meta, default=str)))
+        loaded.append(fpath)
+
+    # seq must follow time across all files, or the aggregates replay
+    # equity / drawdown / streaks out of order
+    rows.sort(key=lambda r: r[0])
+    with conn:
+        conn.executemany(_INSERT_SQL, [r[1] for r in rows])
+        conn.executemany("INSERT OR REPLACE INTO strategy_meta (strategy_id, data) VALUES (?, ?)",
+                         metas)
+
+    os.makedirs(MIGRATED_DIR, exist_ok=True)
+    for fpath in loaded:
+        try:
+            shutil.move(fpath, os.path.join(MIGRATED_DIR, os.path.basename(fpath)))
+        except OSError as e:
+            print(f"[TRADE_STORE] Could not move {fpath}: {e}")
+    n_files, n_trades = len(loaded), len(rows)
+
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('json_migrated_at', ?)",
+                     (time.strftime("%Y-%m-%dT%H:%M:%S"),))
+    print(f"[TRADE_STORE] Migrated {n_trades} trades from {n_files} rec files "
+          f"in {time.time() - t0:.1f}s")
+    return {"migrated_files": n_files, "migrated_trades": n_trades}
+
+
+def get_store_info():
+    conn = _get_db()
+    total = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+    strategies = conn.execute("SELECT COUNT(DISTINCT strategy_id) FROM trades").fetchone()[0]
+    row = conn.execute("SELECT value FROM store_meta WHERE key='json_migrated_at'").fetchone()
+    return {
+        "db_file": DB_FILE,
+        "trades": total,
+        "strategies": strategies,
+        "json_migrated_at": row[0] if row else None,
+    }
+
+
+if __name__ == "__main__":
+    print(migrate_json_records())
+    print(get_store_info())
@@ -0,0 +1,404 @@
+"""
+Whilber-AI — Columnar Trade Table
+===================================
+In-memory column store over trades.db for the filter / export screens.
+
+filter_trades used to decode every strategy's history, tag each trade dict
+and walk ~15 filters in Python per request. Here the filterable fields live
+in NumPy columns (strings dictionary-encoded), a filter dict compiles to a
+list of vectorized masks, and full trade dicts are only decoded for the page
+actually returned.
+
+Refresh is incremental: each query first folds in the rows appended since
+the last seen seq (normally the few trades closed since the last request).
+If rows at or below that seq disappeared (trim, cleanup)
+the table is rebuilt from the store.
+
+Scope and order match the old filter_trades exactly: the newest
+MAX_TRADES_PER_RECORD trades of each strategy, newest opened_at first, ties
+in strategy order then newest first.
+
+Usage:
+    from backend.api import trade_table
+    res = trade_table.query(filters, cursor=None, limit=500)
+    for trade in trade_table.iter_matches(filters):   # streaming, batched
+        ...
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from backend.api import trade_store
+
+# Dictionary-encoded columns: codes per row + one value list per column
+_CAT_COLS = ("strategy", "symbol", "category", "timeframe", "direction", "outcome", "exit_reason")
+
+# filter key → column (list filters, exact membership)
+_LIST_FILTERS = {
+    "symbols": "symbol", "categories": "category", "timeframes": "timeframe",
+    "directions": "direction", "outcomes": "outcome", "exit_reasons": "exit_reason",
+}
+
+BATCH = 500
+
+_lock = threading.RLock()
+_table = None
+_last_seq = 0
+_stats = {"rebuilds": 0, "appended": 0, "queries": 0}
+
+
+# ══════ TABLE ══════
+
+class _Table:
+    """Immutable snapshot of the columns; refresh builds a new one."""
+
+    def __init__(self, cols, dicts, values):
+        self.cols = cols            # name → np.ndarray
+        self.dicts = dicts          # cat column → {value: code}
+        self.values = values        # cat column → [value by code]
+        self.n = len(cols["seq"])
+        self._derive()
+
+    def _derive(self):
+        """Per-strategy rank (0 = newest) and strategy order (by first seq)."""
+        seq, strat = self.cols["seq"], self.cols["strategy"]
+        n_strat = len(self.values["strategy"])
+        order = np.lexsort((-seq, strat))
+        rank = np.empty(self.n, dtype=np.int64)
+        if self.n:
+            starts = np.r_[0, np.flatnonzero(np.diff(strat[order])) + 1]
+            sizes = np.diff(np.r_[starts, self.n])
+            rank[order] = np.arange(self.n) - np.repeat(starts, sizes)
+        self.rank = rank
+        first = np.full(n_strat, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first, strat, seq)
+        strat_order = np.empty(n_strat, dtype=np.int64)
+        strat_order[np.argsort(first, kind="stable")] = np.arange(n_strat)
+        self.strat_order = strat_order
+
+    def codes(self, col, wanted):
+        d = self.dicts[col]
+        return np.array([d[v] for v in wanted if _hashable(v) and v in d], dtype=np.int32)
+
+
+def _hashable(v):
+    try:
+        hash(v)
+        return True
+    except TypeError:
+        return False
+
+
+def _num(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _rows_to_columns(rows, dicts, values):
+    """[(seq, key, trade)] → column arrays, extending the code dictionaries in place."""
+    raw = {c: [] for c in _CAT_COLS}
+    seq, opened, pnl, dur, be, trail, search = [], [], [], [], [], [], []
+    for s, key, t in rows:
+        get = t.get
+        seq.append(s)
+        raw["strategy"].append(key)
+        for c in _CAT_COLS[1:]:
+            raw[c].append(get(c, ""))
+        o = get("opened_at", "")
+        opened.append(o if isinstance(o, str) else "")
+        pnl.append(_num(get("pnl_usd", 0)))
+        dur.append(_num(get("duration_minutes", 0)))
+        be.append(bool(get("sl_moved_to_be")))
+        trail.append(bool(get("trailing_active")))
+        search.append(f"{get('strategy_name','')} {get('symbol','')} {get('category','')}".lower())
+
+    cols = {
+        "seq": np.array(seq, dtype=np.int64),
+        "opened_at": np.array(opened, dtype=str),
+        "pnl_usd": np.array(pnl, dtype=np.float64),
+        "duration": np.array(dur, dtype=np.float64),
+        "be": np.array(be, dtype=bool),
+        "trailing": np.array(trail, dtype=bool),
+        "search": np.array(search, dtype=str),
+    }
+    for c in _CAT_COLS:
+        d, vals = dicts[c], values[c]
+        codes = []
+        for v in raw[c]:
+            if not _hashable(v):
+                v = str(v)
+            code = d.get(v)
+            if code is None:
+                code = d[v] = len(vals)
+                vals.append(v)
+            codes.append(code)
+        cols[c] = np.array(codes, dtype=np.int32)
+    return cols
+
+
+def _refresh():
+    """Fold in rows appended since the last query; rebuild if rows were removed."""
+    global _table, _last_seq
+    if _table is not None and trade_store.row_count(_last_seq) != _table.n:
+        _table = None
+    if _table is None:
+        _last_seq = 0
+        dicts = {c: {} for c in _CAT_COLS}
+        values = {c: [] for c in _CAT_COLS}
+        base = None
+        _stats["rebuilds"] += 1
+    else:
+        dicts = {c: dict(d) for c, d in _table.dicts.items()}
+        values = {c: list(v) for c, v in _table.values.items()}
+        base = _table.cols
+
+    rows = list(trade_store.iter_since(_last_seq, closed_only=False))
+    if not rows and base is not None:
+        return _table
+    cols = _rows_to_columns(rows, dicts, values)
+    if base is not None:
+        cols = {c: np.concatenate([base[c], cols[c]]) for c in cols}
+        _stats["appended"] += len(rows)
+    if rows:
+        _last_seq = rows[-1][0]
+    _table = _Table(cols, dicts, values)
+    return _table
+
+
+def get_table():
+    with _lock:
+        return _refresh()
+
+
+def invalidate():
+    """Force a rebuild on the next query."""
+    global _table
+    with _lock:
+        _table = None
+
+
+# ══════ FILTER COMPILER ══════
+
+def compile_filters(filters):
+    """
+    Filter dict (same keys as filter_trades) → list of mask functions
+    table → bool array. Empty / missing keys produce no mask.
+    """
+    filters = filters or {}
+    masks = []
+
+    for key, col in _LIST_FILTERS.items():
+        wanted = filters.get(key) or []
+        if wanted:
+            masks.append(lambda tb, col=col, wanted=wanted:
+                         np.isin(tb.cols[col], tb.codes(col, wanted)))
+
+    date_from = filters.get("date_from", "")
+    if date_from:
+        masks.append(lambda tb: tb.cols["opened_at"] >= date_from)
+    date_to = filters.get("date_to", "")
+    if date_to:
+        masks.append(lambda tb: tb.cols["opened_at"] <= date_to)
+
+    for key, col, op in (("min_pnl", "pnl_usd", np.greater_equal), ("max_pnl", "pnl_usd", np.less_equal),
+                         ("min_duration", "duration", np.greater_equal),
+                         ("max_duration", "duration", np.less_equal)):
+        if filters.get(key) is not None:
+            masks.append(lambda tb, col=col, op=op, v=filters[key]: op(tb.cols[col], v))
+
+    if filters.get("had_be") is True:
+        masks.append(lambda tb: tb.cols["be"])
+    if filters.get("had_trailing") is True:
+        masks.append(lambda tb: tb.cols["trailing"])
+
+    q = (filters.get("search") or "").lower()
+    if q:
+        masks.append(lambda tb: np.char.find(tb.cols["search"], q) >= 0)
+    return masks
+
+
+def _select(tb, filters):
+    """
+    Matching row indices in result order, plus {strategy code: id as the
+    caller named it} for _strategy_id.
+    """
+    from backend.api.tracker_engine import MAX_TRADES_PER_RECORD
+
+    filters = filters or {}
+    mask = tb.rank < MAX_TRADES_PER_RECORD
+    strat_order = tb.strat_order
+    names = {}
+    target = filters.get("strategy_ids") or []
+    if target:
+        keys = {}
+        for sid in target:
+            keys.setdefault(trade_store.record_key(sid), sid)
+        codes = tb.codes("strategy", list(keys))
+        mask &= np.isin(tb.cols["strategy"], codes)
+        # Requested order instead of store order
+        strat_order = np.zeros(len(tb.values["strategy"]), dtype=np.int64)
+        for pos, key in enumerate(keys):
+            code = tb.dicts["strategy"].get(key)
+            if code is not None:
+                strat_order[code] = pos
+                names[code] = keys[key]
+
+    for m in compile_filters(filters):
+        mask &= m(tb)
+
+    idx = np.flatnonzero(mask)
+    if not len(idx):
+        return idx, names
+    # opened_at desc, then strategy order, then newest first
+    _, opened_rank = np.unique(tb.cols["opened_at"][idx], return_inverse=True)
+    order = np.lexsort((-tb.cols["seq"][idx], strat_order[tb.cols["strategy"][idx]], -opened_rank))
+    return idx[order], names
+
+
+# ══════ QUERIES ══════
+
+def _load(tb, idx, names):
+    """Decode the trade dicts for idx (in order) and tag _strategy_id."""
+    seqs = tb.cols["seq"][idx].tolist()
+    found = trade_store.load_by_seq(seqs)
+    strat_vals = tb.values["strategy"]
+    out = []
+    for s, code in zip(seqs, tb.cols["strategy"][idx].tolist()):
+        t = found.get(s)
+        if t is None:
+            continue
+        t["_strategy_id"] = names.get(code, strat_vals[code])
+        out.append(t)
+    return out
+
+
+def compute_stats(tb, idx):
+    """Same figures as the old _compute_filtered_stats, from the columns."""
+    if not len(idx):
+        return {"total": 0}
+    pnls = tb.cols["pnl_usd"][idx]
+    win_code = tb.dicts["outcome"].get("win", -1)
+    wins = int(np.count_nonzero(tb.cols["outcome"][idx] == win_code))
+    gross_p = float(pnls[pnls > 0].sum())
+    gross_l = abs(float(pnls[pnls < 0].sum()))
+    total = len(idx)
+    return {
+        "total": total,
+        "wins": wins,
+        "losses": total - wins,
+        "win_rate": round(wins / total * 100, 1),
+        "total_pnl": round(float(pnls.sum()), 2),
+        "avg_pnl": round(float(pnls.sum()) / total, 2),
+        "best": round(float(pnls.max()), 2),
+        "worst": round(float(pnls.min()), 2),
+        "profit_factor": round(gross_p / gross_l, 2) if gross_l > 0 else 99.9,
+        "strategies_count": len(np.unique(tb.cols["strategy"][idx])),
+        "symbols_count": len(np.unique(tb.cols["symbol"][idx])),
+    }
+
+
+def _cursor_start(tb, idx, cursor):
+    """Position after the cursor row; falls back to opened_at if that row is gone."""
+    if not cursor:
+        return 0
+    opened, _, seq = str(cursor).rpartition("|")
+    try:
+        seq = int(seq)
+    except ValueError:
+        return 0
+    hit = np.flatnonzero(tb.cols["seq"][idx] == seq)
+    if len(hit):
+        return int(hit[0]) + 1
+    return int(np.count_nonzero(tb.cols["opened_at"][idx] >= opened))
+
+
+def _cursor_of(tb, i):
+    return f"{tb.cols['opened_at'][i]}|{int(tb.cols['seq'][i])}"
+
+
+def query(filters=None, cursor=None, limit=500, with_stats=True):
+    """
+    One page of matching trades.
+    Returns {trades, total_found, stats, next_cursor, ms}; next_cursor is None
+    on the last page. Cursors stay valid while trades close in between.
+    """
+    t0 = time.perf_counter()
+    with _lock:
+        tb = _refresh()
+        _stats["queries"] += 1
+    idx, names = _select(tb, filters)
+    start = _cursor_start(tb, idx, cursor)
+    page = idx[start:start + limit] if limit else idx[start:]
+    more = start + len(page) < len(idx)
+    return {
+        "trades": _load(tb, page, names),
+        "total_found": int(len(idx)),
+        "stats": compute_stats(tb, idx) if with_stats else {},
+        "next_cursor": _cursor_of(tb, page[-1]) if more and len(page) else None,
+        "ms": round((time.perf_counter() - t0) * 1000, 1),
+    }
+
+
+def select(filters=None, limit=None):
+    """(table, ordered row indices) — for callers that only need columns."""
+    with _lock:
+        tb = _refresh()
+        _stats["queries"] += 1
+    idx, _ = _select(tb, filters)
+    return tb, (idx[:limit] if limit else idx)
+
+
+def iter_matches(filters=None, limit=None, batch=BATCH):
+    """Yield matching trade dicts in result order, decoding `batch` at a time."""
+    with _lock:
+        tb = _refresh()
+        _stats["queries"] += 1
+    idx, names = _select(tb, filters)
+    if limit:
+        idx = idx[:limit]
+    for i in range(0, len(idx), batch):
+        yield from _load(tb, idx[i:i + batch], names)
+
+
+def filter_options():
+    """Distinct symbols / categories / timeframes and per-strategy counts."""
+    from backend.api.tracker_engine import MAX_TRADES_PER_RECORD
+
+    tb = get_table()
+    scope = np.flatnonzero(tb.rank < MAX_TRADES_PER_RECORD)
+
+    def distinct(col):
+        return {tb.values[col][c] for c in np.unique(tb.cols[col][scope]).tolist()}
+
+    strat = tb.cols["strategy"][scope]
+    counts = np.bincount(strat, minlength=len(tb.values["strategy"]))
+    newest = np.flatnonzero(tb.rank == 0)
+    names = trade_store.load_by_seq(tb.cols["seq"][newest].tolist())
+    strategies = []
+    for i in newest[np.argsort(tb.strat_order[tb.cols["strategy"][newest]], kind="stable")].tolist():
+        code = int(tb.cols["strategy"][i])
+        sid = tb.values["strategy"][code]
+        first = names.get(int(tb.cols["seq"][i]), {})
+        strategies.append({"id": sid, "name": first.get("strategy_name", sid),
+                           "category": first.get("category", ""), "count": int(counts[code])})
+    return {
+        "symbols": distinct("symbol"),
+        "categories": {c for c in distinct("category") if c},
+        "timeframes": {t for t in distinct("timeframe") if t},
+        "strategies": strategies,
+    }
+
+
+def get_table_info():
+    with _lock:
+        tb = _table
+        return {
+            "rows": tb.n if tb is not None else 0,
+            "strategies": len(tb.values["strategy"]) if tb is not None else 0,
+            "last_seq": _last_seq,
+            **_stats,
+        }
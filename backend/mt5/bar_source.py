@@ -0,0 +1,532 @@
+"""
+Whilber-AI MVP - Bar Sources & Local History Store
+=====================================================
+Pluggable source of CLOSED OHLC bars.
+
+  MT5BarSource    — live from the terminal (copy_rates_from_pos / _range)
+  HistoryStore    — per-symbol/timeframe record files on disk, memory-mapped
+  StoreBarSource  — reads the store; with an upstream source it first
+                    appends whatever closed since the last stored bar
+
+Every source returns MT5's own rate layout (BAR_DTYPE: time in epoch
+seconds, open/high/low/close, tick_volume, spread, real_volume), oldest
+first, forming bar excluded. load_bars() wraps that in the DataFrame the
+backtest / monitor code used to build from copy_rates_from_pos.
+
+Store layout: {HISTORY_DIR}/{SYMBOL}/{TF}.bars — headerless BAR_DTYPE
+records. New bars are a plain file append (no .npy header to rewrite),
+and readers np.memmap the file, so a 5-year M15 slice is a view, not a
+parse. Writers serialize on a sidecar .lock file, which keeps the tracker
+and the scan worker processes from appending the same bar twice.
+
+Source selection (WHILBER_BAR_SOURCE):
+  auto   — store synced from MT5 when MetaTrader5 is importable, else store only
+  mt5    — live terminal only, nothing written to disk (previous behaviour)
+  store  — store only: offline, Linux boxes, benchmarks
+
+Usage:
+    from backend.mt5.bar_source import load_bars
+    df = load_bars("XAUUSD", "H1", 5000)
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+PROJECT_DIR = r"C:\Users\Administrator\Desktop\mvp"
+HISTORY_DIR = os.environ.get("WHILBER_HISTORY_DIR", os.path.join(PROJECT_DIR, "data", "history"))
+BAR_SOURCE = os.environ.get("WHILBER_BAR_SOURCE", "auto").lower()
+
+SYNC_INTERVAL = 30      # seconds between upstream checks per (symbol, timeframe)
+SEED_BARS = 5000        # bars pulled the first time a series is synced
+
+# Same fields/types as MetaTrader5.copy_rates_*
+BAR_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+    ("tick_volume", "<u8"), ("spread", "<i4"), ("real_volume", "<u8"),
+])
+_EMPTY = np.zeros(0, dtype=BAR_DTYPE)
+
+
+# ══════ SYMBOL MAPPING ══════
+
+_MT5_SYMBOL_MAP = {
+    "XAUUSD": "XAUUSD+",
+    "EURUSD": "EURUSD+",
+    "GBPUSD": "GBPUSD+",
+    "USDJPY": "USDJPY+",
+    "AUDUSD": "AUDUSD+",
+    "USDCAD": "USDCAD+",
+    "NZDUSD": "NZDUSD+",
+    "USDCHF": "USDCHF+",
+    "US30": "DJ30",
+}
+
+
+def _resolve_symbol(symbol):
+    """Map our symbol name to MT5 symbol name."""
+    if symbol in _MT5_SYMBOL_MAP:
+        return _MT5_SYMBOL_MAP[symbol]
+    # Try adding + suffix
+    for candidate in [symbol, symbol + "+", symbol + ".crp"]:
+        info = mt5.symbol_info(candidate)
+        if info:
+            return candidate
+    return symbol
+
+
+# ══════ HELPERS ══════
+
+def _epoch(value):
+    """datetime / Timestamp / epoch seconds → int epoch seconds (naive = as stored by MT5)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer, float, np.floating)):
+        return int(value)
+    return int(pd.Timestamp(value).value // 10**9)
+
+
+def _window(rates, count=None, start=None, end=None):
+    """Slice a time-sorted rate array; views only, no copies."""
+    if start is not None or end is not None:
+        times = rates["time"]
+        lo = int(np.searchsorted(times, _epoch(start), "left")) if start is not None else 0
+        hi = int(np.searchsorted(times, _epoch(end), "right")) if end is not None else len(rates)
+        rates = rates[lo:hi]
+    if count is not None and 0 < count < len(rates):
+        rates = rates[len(rates) - count:]
+    return rates
+
+
+def as_rates(data):
+    """BAR_DTYPE array from MT5 rates, any structured array or an OHLC DataFrame."""
+    if isinstance(data, pd.DataFrame):
+        out = np.zeros(len(data), dtype=BAR_DTYPE)
+        t = data["time"]
+        if pd.api.types.is_datetime64_any_dtype(t):
+            t = t.values.astype("datetime64[s]").astype(np.int64)
+        out["time"] = t
+        for col in ("open", "high", "low", "close", "spread", "real_volume"):
+            if col in data.columns:
+                out[col] = data[col].values
+        vol = "tick_volume" if "tick_volume" in data.columns else "volume"
+        if vol in data.columns:
+            out["tick_volume"] = data[vol].values
+        return out
+
+    data = np.asarray(data)
+    if data.dtype == BAR_DTYPE:
+        return data
+    out = np.zeros(len(data), dtype=BAR_DTYPE)
+    for name in BAR_DTYPE.names:
+        if name in data.dtype.names:
+            out[name] = data[name]
+    return out
+
+
+def to_frame(rates):
+    """Rate array → DataFrame with datetime `time` (copies out of the memmap)."""
+    df = pd.DataFrame(rates)
+    df["time"] = pd.to_datetime(df["time"], unit="s")
+    return df
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive cross-process lock on `path`.lock (threads included)."""
+    with open(path + ".lock", "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# ══════ SOURCES ══════
+
+class BarSource:
+    """
+    Interface. rates() returns a BAR_DTYPE array of closed bars, oldest
+    first, or None when the source has nothing for that series.
+    """
+
+    name = "base"
+
+    def rates(self, symbol, timeframe, count=None, start=None, end=None):
+        raise NotImplementedError
+
+    def last_closed(self, symbol, timeframe):
+        """Open time (epoch s) of the newest closed bar, or None."""
+        last = self.rates(symbol, timeframe, count=1)
+        return int(last["time"][-1]) if last is not None and len(last) else None
+
+
+class MT5BarSource(BarSource):
+    """Live bars from the MetaTrader 5 terminal."""
+
+    name = "mt5"
+
+    def _connected(self):
+        if mt5 is None:
+            return False
+        try:
+            from backend.mt5.mt5_connector import MT5Connector
+        except ImportError:
+            return False
+        return MT5Connector.get_instance().ensure_connected()
+
+    def _names(self, symbol):
+        """Broker names to try: symbol_map primary + alternates, then the name as given."""
+        try:
+            from backend.mt5.symbol_map import get_mt5_name, get_alternates
+            primary = get_mt5_name(symbol)
+            names = [primary] + [a for a in get_alternates(symbol) if a != primary]
+        except ImportError:
+            names = []
+        if symbol not in names:
+            names.append(symbol)
+        return names
+
+    def rates(self, symbol, timeframe, count=None, start=None, end=None):
+        if not self._connected():
+            return None
+        tf = getattr(mt5, "TIMEFRAME_" + timeframe.upper(), None)
+        if tf is None:
+            logger.error(f"Unknown timeframe: {timeframe}")
+            return None
+
+        for name in self._names(symbol):
+            if not mt5.symbol_select(name, True):
+                continue
+            broker = _resolve_symbol(name)
+            if start is None and end is None:
+                # Position 0 is the forming bar — start from 1
+                raw = mt5.copy_rates_from_pos(broker, tf, 1, count or SEED_BARS)
+            else:
+                date_from = datetime.fromtimestamp(_epoch(start) if start is not None else 0, tz=timezone.utc)
+                date_to = (datetime.fromtimestamp(_epoch(end), tz=timezone.utc) if end is not None
+                           else datetime.now(timezone.utc) + timedelta(days=1))   # broker clock may run ahead of UTC
+                raw = mt5.copy_rates_range(broker, tf, date_from, date_to)
+                forming = mt5.copy_rates_from_pos(broker, tf, 0, 1)
+                if raw is not None and forming is not None and len(forming):
+                    raw = raw[raw["time"] < forming[0]["time"]]
+                if raw is not None and count:
+                    raw = raw[-count:]
+            if raw is not None and len(raw) > 0:
+                return as_rates(raw)
+
+        logger.error(f"MT5: no bars for {symbol} {timeframe}: {mt5.last_error()}")
+        return None
+
+
+class HistoryStore:
+    """Append-only, memory-mapped bar files: {root}/{SYMBOL}/{TF}.bars."""
+
+    def __init__(self, root=None):
+        self.root = root or HISTORY_DIR
+        self._maps = {}          # path → ((size, mtime_ns), memmap)
+        self._lock = threading.Lock()
+
+    def path(self, symbol, timeframe):
+        return os.path.join(self.root, symbol.upper(), f"{timeframe.upper()}.bars")
+
+    def _map(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return _EMPTY
+        stamp = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._maps.get(path)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            n = st.st_size // BAR_DTYPE.itemsize     # ignores a torn trailing record
+            mm = np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(n,)) if n else _EMPTY
+            self._maps[path] = (stamp, mm)
+            return mm
+
+    def _forget(self, path):
+        with self._lock:
+            self._maps.pop(path, None)
+
+    # ── Reads ───────────────────────────────────────────────
+
+    def read(self, symbol, timeframe, count=None, start=None, end=None):
+        """Memory-mapped view of the stored bars (empty array if none)."""
+        return _window(self._map(self.path(symbol, timeframe)), count, start, end)
+
+    def count(self, symbol, timeframe):
+        return len(self._map(self.path(symbol, timeframe)))
+
+    def first_time(self, symbol, timeframe):
+        mm = self._map(self.path(symbol, timeframe))
+        return int(mm["time"][0]) if len(mm) else None
+
+    def last_time(self, symbol, timeframe):
+        mm = self._map(self.path(symbol, timeframe))
+        return int(mm["time"][-1]) if len(mm) else None
+
+    def series(self):
+        """All stored series with bar count and time range."""
+        out = []
+        if not os.path.isdir(self.root):
+            return out
+        for symbol in sorted(os.listdir(self.root)):
+            folder = os.path.join(self.root, symbol)
+            if not os.path.isdir(folder):
+                continue
+            for fname in sorted(os.listdir(folder)):
+                if not fname.endswith(".bars"):
+                    continue
+                tf = fname[:-5]
+                mm = self.read(symbol, tf)
+                out.append({
+                    "symbol": symbol,
+                    "timeframe": tf,
+                    "bars": len(mm),
+                    "first": str(pd.to_datetime(int(mm["time"][0]), unit="s")) if len(mm) else None,
+                    "last": str(pd.to_datetime(int(mm["time"][-1]), unit="s")) if len(mm) else None,
+                    "mb": round(len(mm) * BAR_DTYPE.itemsize / 1e6, 2),
+                })
+        return out
+
+    # ── Writes ──────────────────────────────────────────────
+
+    def update(self, symbol, timeframe, rates):
+        """
+        Add closed bars; returns how many were new.
+        Bars after the last stored one are appended in place. Bars before
+        the first stored one (backfill) force a one-off rewrite. Bars inside
+        the stored range are already there and are skipped.
+        """
+        rates = as_rates(rates)
+        if not len(rates):
+            return 0
+        rates = rates[np.argsort(rates["time"], kind="stable")]
+        keep = np.ones(len(rates), dtype=bool)
+        keep[:-1] = rates["time"][1:] != rates["time"][:-1]      # last copy of a duplicate wins
+        rates = rates[keep]
+
+        path = self.path(symbol, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with _file_lock(path):
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            n = size // BAR_DTYPE.itemsize
+            if size != n * BAR_DTYPE.itemsize:
+                with open(path, "r+b") as f:                      # torn write from a crash
+                    f.truncate(n * BAR_DTYPE.itemsize)
+
+            if n == 0:
+                with open(path, "ab") as f:
+                    f.write(rates.tobytes())
+                return len(rates)
+
+            with open(path, "rb") as f:
+                first = int(np.frombuffer(f.read(BAR_DTYPE.itemsize), dtype=BAR_DTYPE)[0]["time"])
+                f.seek((n - 1) * BAR_DTYPE.itemsize)
+                last = int(np.frombuffer(f.read(BAR_DTYPE.itemsize), dtype=BAR_DTYPE)[0]["time"])
+
+            older = rates[rates["time"] < first]
+            fresh = rates[rates["time"] > last]
+            if len(older):
+                merged = np.concatenate([older, np.fromfile(path, dtype=BAR_DTYPE, count=n), fresh])
+                tmp = path + ".tmp"
+                merged.tofile(tmp)
+                self._forget(path)   # drop our own mapping so Windows lets us replace the file
+                try:
+                    os.replace(tmp, path)
+                except OSError as e:
+                    logger.warning(f"History backfill skipped for {symbol} {timeframe}: {e}")
+                    os.remove(tmp)
+                    older = older[:0]
+                    if len(fresh):
+                        with open(path, "ab") as f:
+                            f.write(fresh.tobytes())
+            elif len(fresh):
+                with open(path, "ab") as f:
+                    f.write(fresh.tobytes())
+            return len(older) + len(fresh)
+
+    def delete(self, symbol, timeframe):
+        path = self.path(symbol, timeframe)
+        self._forget(path)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class StoreBarSource(BarSource):
+    """
+    Serves bars from a HistoryStore. With an upstream source, each read
+    first appends the bars that closed since the last stored one (at most
+    once per SYNC_INTERVAL per series) and backfills when a caller asks for
+    more history than the store holds (by count, or by a start before the
+    first stored bar). Upstream failures are logged and the stored bars are
+    served as-is.
+    """
+
+    def __init__(self, store=None, upstream=None, sync_interval=SYNC_INTERVAL):
+        self.store = store or HistoryStore()
+        self.upstream = upstream
+        self.sync_interval = sync_interval
+        self.name = f"store+{upstream.name}" if upstream is not None else "store"
+        self._synced = {}        # (symbol, tf) → (monotonic time, bars requested)
+        self._backfilled = {}    # (symbol, tf) → (monotonic time, earliest start asked of upstream)
+        self._lock = threading.Lock()
+
+    def sync(self, symbol, timeframe, count=None):
+        """Pull new closed bars from upstream into the store; returns bars added."""
+        if self.upstream is None:
+            return 0
+        key = (symbol.upper(), timeframe.upper())
+        want = count or 0
+        now = time.monotonic()
+        with self._lock:
+            prev = self._synced.get(key)
+            if prev is not None and now - prev[0] < self.sync_interval and want <= prev[1]:
+                return 0
+            self._synced[key] = (now, max(want, prev[1]) if prev is not None else want)
+
+        have = self.store.count(symbol, timeframe)
+        try:
+            if have == 0:
+                rates = self.upstream.rates(symbol, timeframe, count=max(want, SEED_BARS))
+            elif have < want:
+                rates = self.upstream.rates(symbol, timeframe, count=want)
+            else:
+                rates = self.upstream.rates(symbol, timeframe,
+                                            start=self.store.last_time(symbol, timeframe) + 1)
+            if rates is None:
+                return 0
+            added = self.store.update(symbol, timeframe, rates)
+        except Exception as e:
+            logger.warning(f"History sync failed for {symbol} {timeframe}: {e}")
+            return 0
+        if added:
+            logger.debug(f"History +{added} bars | {symbol} {timeframe}")
+        return added
+
+    def backfill(self, symbol, timeframe, start):
+        """
+        Make the store reach back to `start` (epoch s) by fetching the bars
+        before its first one. Returns False when the store could not take
+        them, i.e. the stored window still starts after `start`.
+        """
+        key = (symbol.upper(), timeframe.upper())
+        now = time.monotonic()
+        with self._lock:
+            tried = self._backfilled.get(key)
+            if tried is not None and tried[1] <= start and now - tried[0] < self.sync_interval:
+                return True      # upstream had nothing older moments ago
+        first = self.store.first_time(symbol, timeframe)
+        try:
+            older = self.upstream.rates(symbol, timeframe, start=start,
+                                        end=first - 1 if first is not None else None)
+            if older is not None and len(older):
+                added = self.store.update(symbol, timeframe, older)
+                first = self.store.first_time(symbol, timeframe)
+                if first is None or first > int(older["time"][0]):
+                    return False
+                logger.debug(f"History backfill +{added} bars | {symbol} {timeframe}")
+        except Exception as e:
+            logger.warning(f"History backfill failed for {symbol} {timeframe}: {e}")
+            return False
+        with self._lock:
+            self._backfilled[key] = (now, start)
+        return True
+
+    def last_closed(self, symbol, timeframe):
+        self.sync(symbol, timeframe)
+        last = self.store.last_time(symbol, timeframe)
+        if last is None and self.upstream is not None:
+            return self.upstream.last_closed(symbol, timeframe)
+        return last
+
+    def rates(self, symbol, timeframe, count=None, start=None, end=None):
+        self.sync(symbol, timeframe, count)
+        if start is not None and self.upstream is not None:
+            first = self.store.first_time(symbol, timeframe)
+            if (first is None or _epoch(start) < first) and not self.backfill(symbol, timeframe, _epoch(start)):
+                # store couldn't take the older bars — don't serve a clipped window
+                return self.upstream.rates(symbol, timeframe, count, start, end)
+        out = self.store.read(symbol, timeframe, count, start, end)
+        if len(out):
+            return out
+        if self.upstream is not None:    # store not writable — don't lose the live data
+            return self.upstream.rates(symbol, timeframe, count, start, end)
+        return None
+
+
+# ══════ DEFAULT SOURCE ══════
+
+_source = None
+_source_lock = threading.Lock()
+
+
+def make_bar_source(mode="auto"):
+    mode = (mode or "auto").lower()
+    if mode == "mt5":
+        return MT5BarSource()
+    if mode == "store":
+        return StoreBarSource()
+    if mode != "auto":
+        logger.warning(f"Unknown bar source '{mode}', using auto")
+    return StoreBarSource(upstream=MT5BarSource() if mt5 is not None else None)
+
+
+def get_bar_source():
+    global _source
+    if _source is None:
+        with _source_lock:
+            if _source is None:
+                _source = make_bar_source(BAR_SOURCE)
+                logger.info(f"Bar source: {_source.name}")
+    return _source
+
+
+def set_bar_source(source):
+    """Swap the process-wide source (a BarSource or a mode string)."""
+    global _source
+    with _source_lock:
+        _source = make_bar_source(source) if isinstance(source, str) else source
+    return _source
+
+
+def load_bars(symbol, timeframe, count=None, start=None, end=None, source=None):
+    """
+    Closed bars as a DataFrame: time (datetime64), open, high, low, close,
+    tick_volume, spread, real_volume. None when no source has the series.
+    """
+    rates = (source or get_bar_source()).rates(symbol, timeframe, count, start, end)
+    if rates is None or not len(rates):
+        return None
+    return to_frame(rates)
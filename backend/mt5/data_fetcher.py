@@ -1,12 +1,13 @@
 """
 Whilber-AI MVP - Data Fetcher
 ================================
-Core module for extracting price data (bars/candles) from MT5.
+Core module for extracting price data (bars/candles) from MT5
+or the local history store (see bar_source).
 
 Features:
   - Fetches OHLCV bars for any symbol/timeframe
   - Ensures last closed bar is included
-  - Short-term memory cache (30s) to avoid duplicate MT5 calls
+  - Zero-copy LRU cache, valid until a new bar closes
   - Auto-cleanup after use
   - Tries alternate symbol names if primary fails
 """
@@ -14,101 +15,166 @@ Features:
 import time
 import threading
 from datetime import datetime, timezone
-from typing import Optional, Dict, Tuple
+from collections import OrderedDict
+from typing import Optional, Dict
 
-import MetaTrader5 as mt5
 import pandas as pd
 import numpy as np
 from loguru import logger
 
-# ═══ SYMBOL MAPPING ═══
-_MT5_SYMBOL_MAP = {
-    "XAUUSD": "XAUUSD+",
-    "EURUSD": "EURUSD+",
-    "GBPUSD": "GBPUSD+",
-    "USDJPY": "USDJPY+",
-    "AUDUSD": "AUDUSD+",
-    "USDCAD": "USDCAD+",
-    "NZDUSD": "NZDUSD+",
-    "USDCHF": "USDCHF+",
-    "US30": "DJ30",
-}
-
-def _resolve_symbol(symbol):
-    """Map our symbol name to MT5 symbol name."""
-    if symbol in _MT5_SYMBOL_MAP:
-        return _MT5_SYMBOL_MAP[symbol]
-    # Try adding + suffix
+try:
     import MetaTrader5 as mt5
-    for candidate in [symbol, symbol + "+", symbol + ".crp"]:
-        info = mt5.symbol_info(candidate)
-        if info:
-            return candidate
-    return symbol
-
+except ImportError:     # Linux / offline: bars come from the local history store
+    mt5 = None
 
 # Import our modules (will be at backend.mt5.xxx when deployed)
 # For now, direct import for testing
 try:
     from backend.mt5.mt5_connector import MT5Connector
     from backend.mt5.symbol_map import get_mt5_name, get_alternates, validate_symbol
-    from backend.mt5.timeframes import get_mt5_timeframe, get_bar_count, Timeframe
+    from backend.mt5.timeframes import get_bar_count, Timeframe
+    from backend.mt5.bar_source import get_bar_source, to_frame
 except ImportError:
     from mt5_connector import MT5Connector
     from symbol_map import get_mt5_name, get_alternates, validate_symbol
-    from timeframes import get_mt5_timeframe, get_bar_count, Timeframe
+    from timeframes import get_bar_count, Timeframe
+    from bar_source import get_bar_source, to_frame
 
 
 # ── In-Memory Cache ─────────────────────────────────────────────
 
 class DataCache:
     """
-    Short-lived in-memory cache for fetched data.
-    Prevents duplicate MT5 calls within CACHE_TTL seconds.
+    In-memory cache of closed-bar OHLCV blocks.
+
+    Each (symbol, timeframe) entry holds read-only NumPy columns tagged
+    with the time of its last closed bar. A lookup that passes the
+    source's current last-closed time hits until a new bar actually
+    closes; without one it falls back to `ttl` seconds. Hits are
+    DataFrames over views of the block — nothing is copied, and the
+    read-only flag (copy-on-write on pandas 3) keeps callers from
+    changing the cached bars. Requests for fewer bars than cached are
+    served from the tail.
+
+    Bounded LRU: least recently used entries are dropped past max_bytes
+    or max_entries; cleanup_expired() removes entries idle for idle_ttl.
     """
 
-    def __init__(self, ttl: int = 30):
-        self._cache: Dict[str, Tuple[pd.DataFrame, float]] = {}
+    def __init__(self, ttl: int = 30, max_bytes: int = 64 * 1024 * 1024,
+                 max_entries: int = 256, idle_ttl: int = 3600):
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
         self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._idle_ttl = idle_ttl
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
         self._lock = threading.Lock()
 
     def _make_key(self, symbol: str, timeframe: str) -> str:
         return f"{symbol}_{timeframe}"
 
-    def get(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+    def _drop(self, key: str):
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["nbytes"]
+
+    @staticmethod
+    def _frame(entry: Dict, count: Optional[int]) -> pd.DataFrame:
+        # Shallow copies share the read-only columns; only the tail case re-indexes
+        frame = entry["frame"]
+        if count and count < entry["rows"]:
+            return frame.iloc[entry["rows"] - count:].reset_index(drop=True)
+        return frame.copy(deep=False)
+
+    def get(self, symbol: str, timeframe: str, count: int = None,
+            last_closed: int = None) -> Optional[pd.DataFrame]:
         key = self._make_key(symbol, timeframe)
+        now = time.time()
         with self._lock:
-            if key in self._cache:
-                df, timestamp = self._cache[key]
-                if time.time() - timestamp < self._ttl:
-                    logger.debug(f"Cache HIT: {key}")
-                    return df.copy()
+            entry = self._cache.get(key)
+            if entry is not None:
+                if last_closed is not None:
+                    stale = entry["last_closed"] != last_closed
                 else:
-                    del self._cache[key]
-                    logger.debug(f"Cache EXPIRED: {key}")
-        return None
-
-    def set(self, symbol: str, timeframe: str, df: pd.DataFrame):
+                    stale = now - entry["stored"] >= self._ttl
+                if stale:
+                    self._drop(key)
+                    logger.debug(f"Cache STALE: {key}")
+                    entry = None
+                elif count is not None and count > max(entry["rows"], entry["requested"]):
+                    entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._cache.move_to_end(key)
+            entry["used"] = now
+            self._hits += 1
+        logger.debug(f"Cache HIT: {key}")
+        return self._frame(entry, count)
+
+    def set(self, symbol: str, timeframe: str, df: pd.DataFrame,
+            last_closed: int = None, requested: int = None) -> pd.DataFrame:
+        """Store df as a read-only block; returns a view frame over it."""
+        cols = {}
+        for c in df.columns:
+            arr = np.array(df[c].to_numpy(), copy=True)
+            arr.flags.writeable = False
+            cols[c] = arr
+        if last_closed is None and len(df) and "time" in cols:
+            last_closed = int(cols["time"][-1:].astype("datetime64[s]").astype(np.int64)[0])
+        now = time.time()
+        entry = {
+            "frame": pd.DataFrame(cols, copy=False),    # built once, one block per column
+            "rows": len(df),
+            "requested": requested or 0,    # asked for more than exist → block is all there is
+            "nbytes": sum(a.nbytes for a in cols.values()),
+            "last_closed": last_closed,
+            "stored": now,
+            "used": now,
+        }
         key = self._make_key(symbol, timeframe)
         with self._lock:
-            self._cache[key] = (df.copy(), time.time())
-            logger.debug(f"Cache SET: {key} ({len(df)} bars)")
+            self._drop(key)
+            self._cache[key] = entry
+            self._bytes += entry["nbytes"]
+            while len(self._cache) > 1 and (self._bytes > self._max_bytes
+                                            or len(self._cache) > self._max_entries):
+                self._drop(next(iter(self._cache)))
+        logger.debug(f"Cache SET: {key} ({len(df)} bars, {entry['nbytes']} bytes)")
+        return self._frame(entry, None)
 
     def clear(self):
         with self._lock:
             self._cache.clear()
+            self._bytes = 0
             logger.debug("Cache cleared")
 
     def cleanup_expired(self):
         now = time.time()
         with self._lock:
-            expired = [k for k, (_, t) in self._cache.items()
-                       if now - t >= self._ttl]
+            expired = [k for k, e in self._cache.items()
+                       if now - e["used"] >= self._idle_ttl]
             for k in expired:
-                del self._cache[k]
+                self._drop(k)
             if expired:
                 logger.debug(f"Cache cleanup: removed {len(expired)} entries")
 
+    def info(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "max_entries": self._max_entries,
+                "ttl": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "keys": {k: {"rows": e["rows"], "bytes": e["nbytes"], "last_closed": e["last_closed"]}
+                         for k, e in self._cache.items()},
+            }
+
 
 # ── Global Cache Instance ───────────────────────────────────────
 
@@ -144,59 +210,28 @@ def fetch_bars(
         logger.error(f"Unknown symbol: {symbol}")
         return None
 
-    # Check cache
-    if use_cache:
-        cached = _cache.get(symbol, timeframe)
-        if cached is not None:
-            return cached
-
     # Determine bar count
     if count is None:
         count = get_bar_count(timeframe)
 
-    # Ensure MT5 connected
-    connector = MT5Connector.get_instance()
-    if not connector.ensure_connected():
-        logger.error("Cannot connect to MT5")
-        return None
-
-    # Get MT5 timeframe constant
-    mt5_tf = get_mt5_timeframe(timeframe)
-
-    # Try to fetch with primary name, then alternates
-    mt5_symbol = get_mt5_name(symbol)
-    alternates = get_alternates(symbol)
-    all_names = [mt5_symbol] + [a for a in alternates if a != mt5_symbol]
-
-    rates = None
-    used_name = None
-
-    for name in all_names:
-        # Ensure symbol is visible in Market Watch
-        if not mt5.symbol_select(name, True):
-            continue
-
-        # Fetch bars: position 0 = current (incomplete) bar
-        # We fetch count+1 and skip the first (incomplete) one
-        rates = mt5.copy_rates_from_pos(_resolve_symbol(name), mt5_tf, 0, count + 1)
+    # Closed bars only (the forming bar is never returned by a source):
+    # live MT5, or the local history store synced from it — see bar_source
+    source = get_bar_source()
 
-        if rates is not None and len(rates) > 0:
-            used_name = name
-            break
+    # Check cache — an entry stays valid until the source has a newer closed bar
+    if use_cache:
+        cached = _cache.get(symbol, timeframe, count, source.last_closed(symbol, timeframe))
+        if cached is not None:
+            return cached
 
+    rates = source.rates(symbol, timeframe, count)
     if rates is None or len(rates) == 0:
-        error = mt5.last_error()
-        logger.error(f"Failed to fetch {symbol} {timeframe}: {error}")
-        logger.error(f"Tried names: {all_names}")
+        logger.error(f"Failed to fetch {symbol} {timeframe} from {source.name}")
         return None
 
-    # Convert to DataFrame
-    df = pd.DataFrame(rates)
-
-    # Convert time from unix timestamp to datetime
-    df["time"] = pd.to_datetime(df["time"], unit="s")
-
     # Column names: time, open, high, low, close, tick_volume, spread, real_volume
+    df = to_frame(rates)
+
     # Rename tick_volume to volume for consistency
     if "tick_volume" in df.columns:
         df = df.rename(columns={"tick_volume": "volume"})
@@ -205,11 +240,6 @@ def fetch_bars(
     if "real_volume" in df.columns:
         df = df.drop(columns=["real_volume"])
 
-    # Remove the FIRST row (current incomplete bar)
-    # The last row in MT5 copy_rates_from_pos(pos=0) is the CURRENT bar
-    # So we drop the LAST row to only keep CLOSED bars
-    df = df.iloc[:-1].reset_index(drop=True)
-
     # Verify we have data
     if len(df) == 0:
         logger.error(f"No closed bars for {symbol} {timeframe}")
@@ -222,13 +252,13 @@ def fetch_bars(
     df["spread"] = df["spread"].astype(np.int32)
 
     logger.info(
-        f"Fetched {len(df)} bars | {symbol} ({used_name}) {timeframe} | "
+        f"Fetched {len(df)} bars | {symbol} ({source.name}) {timeframe} | "
         f"Range: {df['time'].iloc[0]} → {df['time'].iloc[-1]}"
     )
 
-    # Cache it
+    # Cache it (callers get a read-only view of the cached block)
     if use_cache:
-        _cache.set(symbol, timeframe, df)
+        df = _cache.set(symbol, timeframe, df, requested=count)
 
     return df
 
@@ -243,6 +273,8 @@ def fetch_current_price(symbol: str) -> Optional[Dict]:
         Dict with bid, ask, spread, time. None if fails.
     """
     symbol = symbol.upper()
+    if mt5 is None:
+        return None
     connector = MT5Connector.get_instance()
     if not connector.ensure_connected():
         return None
@@ -277,8 +309,5 @@ def cleanup_expired_cache():
 
 
 def get_cache_info() -> Dict:
-    """Get cache statistics."""
-    return {
-        "entries": len(_cache._cache),
-        "ttl": _cache._ttl,
-    }
+    """Get cache statistics (per-key rows/bytes/last closed bar)."""
+    return _cache.info()
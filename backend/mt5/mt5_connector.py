@@ -7,10 +7,14 @@ Handles connect, disconnect, retry, and health checks.
 
 import time
 import threading
-import MetaTrader5 as mt5
 from pathlib import Path
 from loguru import logger
 
+try:
+    import MetaTrader5 as mt5
+except ImportError:     # Linux / offline: connect() fails, bar_source serves the history store
+    mt5 = None
+
 # Load MT5 credentials from settings
 try:
     import sys
@@ -79,6 +83,10 @@ class MT5Connector:
             logger.debug("MT5 already connected and healthy")
             return True
 
+        if mt5 is None:
+            logger.error("MetaTrader5 package not installed")
+            return False
+
         mt5_path = path or self.MT5_PATH
         # Use provided credentials or fall back to settings
         _login = login or _MT5_LOGIN
@@ -0,0 +1,116 @@
+"""
+Whilber-AI MVP - Tick Snapshot
+=================================
+One bid/ask per distinct symbol per cycle.
+
+The tracker used to call mt5.symbol_info_tick once per open trade (up to
+150) and again per emitted signal. A TickSnapshot memoizes ticks for the
+lifetime of one cycle, so terminal I/O scales with distinct symbols (~33)
+instead of trades.
+
+Price bus: realtime._price_loop publishes every price it fetches for
+WebSocket subscribers. A snapshot reuses a bus tick younger than max_age
+instead of asking the terminal again, and ticks a snapshot fetches are
+published back for the next reader.
+
+Usage:
+    from backend.mt5.tick_snapshot import TickSnapshot
+    ticks = TickSnapshot(resolve=_mt5_sym)
+    ticks.prefetch(t["symbol"] for t in trades)     # {symbol: Tick(bid, ask, time)}
+    tick = ticks.get("XAUUSD")
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+BUS_MAX_AGE = 1.0       # seconds a published tick may be reused
+
+Tick = namedtuple("Tick", ["bid", "ask", "time"])
+
+_bus = {}               # symbol → (Tick, monotonic receive time)
+_bus_lock = threading.Lock()
+
+
+# ══════ PRICE BUS ══════
+
+def publish_tick(symbol, bid, ask, tick_time=None):
+    """Share a freshly fetched price with every snapshot in this process."""
+    tick = Tick(float(bid), float(ask), tick_time if tick_time is not None else time.time())
+    with _bus_lock:
+        _bus[symbol] = (tick, time.monotonic())
+    return tick
+
+
+def latest_tick(symbol, max_age=BUS_MAX_AGE):
+    """Bus tick for symbol if younger than max_age seconds, else None."""
+    with _bus_lock:
+        entry = _bus.get(symbol)
+    if entry is None or time.monotonic() - entry[1] > max_age:
+        return None
+    return entry[0]
+
+
+def clear_bus():
+    with _bus_lock:
+        _bus.clear()
+
+
+# ══════ SNAPSHOT ══════
+
+class TickSnapshot:
+    """
+    Ticks for one cycle. get() asks the bus, then the terminal, at most once
+    per symbol; a failed fetch is remembered as None for the rest of the cycle.
+    resolve maps our symbol to the broker name (each caller keeps its own map).
+    """
+
+    def __init__(self, resolve=None, max_age=BUS_MAX_AGE):
+        self.resolve = resolve or (lambda s: s)
+        self.max_age = max_age
+        self.ticks = {}
+        self.fetched = 0
+        self.from_bus = 0
+        self.elapsed = 0.0
+
+    def _fetch(self, symbol):
+        try:
+            import MetaTrader5 as mt5
+            t = mt5.symbol_info_tick(self.resolve(symbol))
+        except Exception:
+            return None
+        if not t:
+            return None
+        return publish_tick(symbol, t.bid, t.ask, t.time)
+
+    def get(self, symbol):
+        if symbol in self.ticks:
+            return self.ticks[symbol]
+        t0 = time.perf_counter()
+        tick = latest_tick(symbol, self.max_age)
+        if tick is not None:
+            self.from_bus += 1
+        else:
+            tick = self._fetch(symbol)
+            self.fetched += 1
+        self.ticks[symbol] = tick
+        self.elapsed += time.perf_counter() - t0
+        return tick
+
+    def prefetch(self, symbols):
+        """Fetch every distinct symbol once; returns {symbol: Tick} for those with a price."""
+        for symbol in dict.fromkeys(symbols):
+            self.get(symbol)
+        return self.as_dict()
+
+    def as_dict(self):
+        return {s: t for s, t in self.ticks.items() if t is not None}
+
+    def stats(self):
+        return {
+            "symbols": len(self.ticks),
+            "fetched": self.fetched,
+            "from_bus": self.from_bus,
+            "missing": sum(1 for t in self.ticks.values() if t is None),
+            "ms": round(self.elapsed * 1000, 1),
+        }
@@ -8,7 +8,6 @@ Handles last-closed-bar logic.
 
 from enum import Enum
 from datetime import datetime, timedelta
-import MetaTrader5 as mt5
 from typing import Dict, Optional
 
 
@@ -26,15 +25,28 @@ class Timeframe(str, Enum):
 
 # ── MT5 Mapping ─────────────────────────────────────────────────
 
-TF_TO_MT5 = {
-    Timeframe.M1:  mt5.TIMEFRAME_M1,
-    Timeframe.M5:  mt5.TIMEFRAME_M5,
-    Timeframe.M15: mt5.TIMEFRAME_M15,
-    Timeframe.M30: mt5.TIMEFRAME_M30,
-    Timeframe.H1:  mt5.TIMEFRAME_H1,
-    Timeframe.H4:  mt5.TIMEFRAME_H4,
-    Timeframe.D1:  mt5.TIMEFRAME_D1,
-}
+try:
+    import MetaTrader5 as mt5
+    TF_TO_MT5 = {
+        Timeframe.M1:  mt5.TIMEFRAME_M1,
+        Timeframe.M5:  mt5.TIMEFRAME_M5,
+        Timeframe.M15: mt5.TIMEFRAME_M15,
+        Timeframe.M30: mt5.TIMEFRAME_M30,
+        Timeframe.H1:  mt5.TIMEFRAME_H1,
+        Timeframe.H4:  mt5.TIMEFRAME_H4,
+        Timeframe.D1:  mt5.TIMEFRAME_D1,
+    }
+except ImportError:
+    # No terminal package (Linux / offline) — same values as the MT5 constants
+    TF_TO_MT5 = {
+        Timeframe.M1:  1,
+        Timeframe.M5:  5,
+        Timeframe.M15: 15,
+        Timeframe.M30: 30,
+        Timeframe.H1:  16385,
+        Timeframe.H4:  16388,
+        Timeframe.D1:  16408,
+    }
 
 # ── Bar Counts ──────────────────────────────────────────────────
 # How many bars to fetch per timeframe for analysis.
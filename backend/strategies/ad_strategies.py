@@ -8,7 +8,9 @@ AD_05: AD + Price
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
+@shared_indicator("ema")
 def _ema(data, period):
     if len(data) < period: return None
     e = np.zeros(len(data))
@@ -18,10 +20,12 @@ def _ema(data, period):
         e[i] = data[i] * m + e[i-1] * (1 - m)
     return e
 
+@shared_indicator("sma")
 def _sma(data, period):
     if len(data) < period: return None
     return np.array([np.mean(data[max(0,i-period+1):i+1]) for i in range(len(data))])
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1: return None
     tr = np.maximum(high[1:]-low[1:], np.maximum(abs(high[1:]-close[:-1]), abs(low[1:]-close[:-1])))
@@ -10,6 +10,7 @@ ADP_06: State Machine
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 
 def _get_other_results(context):
@@ -18,6 +19,7 @@ def _get_other_results(context):
     return context.get("strategy_results", [])
 
 
+@shared_indicator("ema_seed0")
 def _ema(data, period):
     if len(data) < period:
         return None
@@ -9,8 +9,10 @@ Total: 15
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 
+@shared_indicator("ema_seed0")
 def _ema(data, period):
     if len(data) < period:
         return None
@@ -22,6 +24,7 @@ def _ema(data, period):
     return ema
 
 
+@shared_indicator("sma_valid")
 def _sma(data, period):
     if len(data) < period:
         return None
@@ -9,6 +9,7 @@ ALLI_05: Alligator + Accelerator Oscillator
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "ALLI"
 CATEGORY_NAME = "Williams Alligator"
@@ -67,6 +68,7 @@ def _ac(high, low):
     return ao - sma5_ao
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1: return None
     tr = np.maximum(high[1:] - low[1:], np.maximum(abs(high[1:] - close[:-1]), abs(low[1:] - close[:-1])))
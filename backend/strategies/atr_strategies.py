@@ -9,8 +9,10 @@ ATR_04: ATR Channel (Keltner-like)
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
 
 
+@shared_indicator("atr_pd")
 def _atr(df, period=14):
     high = df['high']; low = df['low']; close = df['close']
     tr1 = high - low
@@ -20,10 +22,12 @@ def _atr(df, period=14):
     return tr.rolling(window=period, min_periods=period).mean()
 
 
+@shared_indicator("ema_pd")
 def _ema(series, period):
     return series.ewm(span=period, adjust=False).mean()
 
 
+@shared_indicator("sma_pd")
 def _sma(series, period):
     return series.rolling(window=period, min_periods=period).mean()
 
@@ -15,8 +15,11 @@ BB_10: Wide BB (2.5 SD)
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
+from backend.strategies.signal_history import arr, prev, pick, trunc, before, window_run_starts
 
 
+@shared_indicator("bb_bb")
 def _bb(close, period=20, std_dev=2.0):
     sma = close.rolling(window=period).mean()
     std = close.rolling(window=period).std()
@@ -27,6 +30,7 @@ def _bb(close, period=20, std_dev=2.0):
     return sma, upper, lower, width, pct_b
 
 
+@shared_indicator("rsi_pd")
 def _rsi(series, period=14):
     delta = series.diff()
     gain = delta.where(delta > 0, 0.0)
@@ -361,19 +365,151 @@ def bb_10_wide(df, context=None):
             "reason_fa": f"BB عریض (2.5σ) بدون سیگنال (%B: {b:.0f}%)"}
 
 
+# ═══════════════════════════════════════════════════════
+# VECTORIZED (full history) — bar i == func(df.iloc[:i+1])
+# ═══════════════════════════════════════════════════════
+
+def _bb_arrays(df, period=20, std_dev=2.0):
+    return tuple(arr(x) for x in _bb(df['close'], period, std_dev))
+
+
+def bb_01_bounce_vec(df, context=None):
+    _, upper, lower, _, _ = _bb_arrays(df, 20, 2.0)
+    c = arr(df['close'])
+    cp = prev(c)
+    return pick(len(c), [
+        ((prev(arr(df['low'])) <= prev(lower)) & (c > cp), 1, 72),
+        ((prev(arr(df['high'])) >= prev(upper)) & (c < cp), -1, 72),
+        (c <= lower * 1.002, 1, 55),
+        (c >= upper * 0.998, -1, 55),
+    ])
+
+
+def bb_02_squeeze_vec(df, context=None):
+    close = df['close']
+    sma, upper, lower, width, _ = _bb(close, 20, 2.0)
+    c, sma, upper, lower, w = arr(close), arr(sma), arr(upper), arr(lower), arr(width)
+    ok = ~before(len(c), 30)
+    squeeze = ok & (w < arr(width.rolling(20, min_periods=1).min()) * 1.15)
+    expanding = ok & (w > arr(width.rolling(5, min_periods=1).min()) * 1.5)
+    return pick(len(c), [
+        (squeeze & (c > upper), 1, 82),
+        (squeeze & (c < lower), -1, 82),
+        (squeeze, 0, 30),
+        (expanding & (c > sma), 1, 60),
+        (expanding & (c < sma), -1, 60),
+    ])
+
+
+def bb_03_pctb_vec(df, context=None):
+    *_, b = _bb_arrays(df, 20, 2.0)
+    bp = prev(b)
+    return pick(len(b), [
+        ((bp < 0) & (b >= 0), 1, 78),
+        ((bp > 100) & (b <= 100), -1, 78),
+        (b < 5, 1, 60),
+        (b > 95, -1, 60),
+        (b < 20, 1, 45),
+        (b > 80, -1, 45),
+    ])
+
+
+def bb_04_width_expansion_vec(df, context=None):
+    close = df['close']
+    sma, _, _, width, _ = _bb(close, 20, 2.0)
+    c, mid, w = arr(close), arr(sma), arr(width)
+    ok = ~before(len(c), 25)
+    w_min = prev(arr(width.rolling(19, min_periods=1).min()))
+    expansion = (w / (w_min + 1e-10) - 1) * 100
+    conf = np.minimum(80, 55 + trunc(expansion / 10))
+    return pick(len(c), [
+        (ok & (expansion > 50) & (c > mid), 1, conf),
+        (ok & (expansion > 50) & (c < mid), -1, conf),
+    ])
+
+
+def bb_05_band_walk_vec(df, context=None):
+    *_, b = _bb_arrays(df, 20, 2.0)
+    ok = ~before(len(b), 5)
+    b1, b2 = prev(b), prev(b, 2)
+    return pick(len(b), [
+        (ok & (b > 70) & (b1 > 70) & (b2 > 70), 1, 68),
+        (ok & (b < 30) & (b1 < 30) & (b2 < 30), -1, 68),
+    ])
+
+
+def bb_06_rsi_combo_vec(df, context=None):
+    close = df['close']
+    _, upper, lower, _, b = _bb_arrays(df, 20, 2.0)
+    c = arr(close)
+    r = arr(_rsi(close, 14))
+    return pick(len(c), [
+        ((c <= lower) & (r < 30), 1, np.minimum(90, 75 + trunc((30 - r) / 2))),
+        ((c >= upper) & (r > 70), -1, np.minimum(90, 75 + trunc((r - 70) / 2))),
+        ((b < 10) & (r < 35), 1, 60),
+        ((b > 90) & (r > 65), -1, 60),
+    ])
+
+
+def bb_07_double_pattern_vec(df, context=None):
+    *_, b = _bb_arrays(df, 20, 2.0)
+    ok = ~before(len(b), 25)
+    lo1, lo2 = window_run_starts(b < 5, 20)
+    hi1, hi2 = window_run_starts(b > 95, 20)
+    return pick(len(b), [
+        (ok & (lo1 >= 0) & (lo2 - lo1 > 3) & (b > 20), 1, 77),
+        (ok & (hi1 >= 0) & (hi2 - hi1 > 3) & (b < 80), -1, 77),
+    ])
+
+
+def bb_08_mean_reversion_vec(df, context=None):
+    pct_b = _bb(df['close'], 20, 2.0)[4]
+    b = arr(pct_b)
+    # pct_b.iloc[-6:-1] → bars i-5 .. i-1
+    prev5_min = prev(arr(pct_b.rolling(5, min_periods=1).min()))
+    prev5_max = prev(arr(pct_b.rolling(5, min_periods=1).max()))
+    return pick(len(b), [
+        ((prev5_min < 10) & (b > 20) & (b < 50), 1, 65),
+        ((prev5_max > 90) & (b > 50) & (b < 80), -1, 65),
+    ])
+
+
+def _band_reentry_vec(df, std_dev, reentry_conf, outside_conf, near):
+    _, upper, lower, _, b = _bb_arrays(df, 20, std_dev)
+    c = arr(df['close'])
+    cp = prev(c)
+    if near:
+        # BB_09: still-outside check on %B
+        outside = [(b < 5, 1, outside_conf), (b > 95, -1, outside_conf)]
+    else:
+        outside = [(c <= lower, 1, outside_conf), (c >= upper, -1, outside_conf)]
+    return pick(len(c), [
+        ((cp <= prev(lower)) & (c > lower), 1, reentry_conf),
+        ((cp >= prev(upper)) & (c < upper), -1, reentry_conf),
+    ] + outside)
+
+
+def bb_09_tight_vec(df, context=None):
+    return _band_reentry_vec(df, 1.5, 60, 50, near=True)
+
+
+def bb_10_wide_vec(df, context=None):
+    return _band_reentry_vec(df, 2.5, 85, 72, near=False)
+
+
 # ═══════════════════════════════════════════════════════
 # REGISTRY
 # ═══════════════════════════════════════════════════════
 
 BB_STRATEGIES = [
-    {"id": "BB_01", "name": "BB Bounce", "name_fa": "بولینگر برگشتی", "func": bb_01_bounce},
-    {"id": "BB_02", "name": "BB Squeeze Breakout", "name_fa": "شکست Squeeze بولینگر", "func": bb_02_squeeze},
-    {"id": "BB_03", "name": "BB %B", "name_fa": "بولینگر %B", "func": bb_03_pctb},
-    {"id": "BB_04", "name": "BB Width Expansion", "name_fa": "باز شدن باند بولینگر", "func": bb_04_width_expansion},
-    {"id": "BB_05", "name": "BB Band Walk", "name_fa": "حرکت روی باند بولینگر", "func": bb_05_band_walk},
-    {"id": "BB_06", "name": "BB + RSI Combo", "name_fa": "بولینگر + RSI ترکیبی", "func": bb_06_rsi_combo},
-    {"id": "BB_07", "name": "BB Double Pattern", "name_fa": "الگوی W/M بولینگر", "func": bb_07_double_pattern},
-    {"id": "BB_08", "name": "BB Mean Reversion", "name_fa": "بازگشت به میانگین بولینگر", "func": bb_08_mean_reversion},
-    {"id": "BB_09", "name": "BB Tight (1.5σ)", "name_fa": "بولینگر تنگ (1.5σ)", "func": bb_09_tight},
-    {"id": "BB_10", "name": "BB Wide (2.5σ)", "name_fa": "بولینگر عریض (2.5σ)", "func": bb_10_wide},
+    {"id": "BB_01", "name": "BB Bounce", "name_fa": "بولینگر برگشتی", "func": bb_01_bounce, "vec": bb_01_bounce_vec},
+    {"id": "BB_02", "name": "BB Squeeze Breakout", "name_fa": "شکست Squeeze بولینگر", "func": bb_02_squeeze, "vec": bb_02_squeeze_vec},
+    {"id": "BB_03", "name": "BB %B", "name_fa": "بولینگر %B", "func": bb_03_pctb, "vec": bb_03_pctb_vec},
+    {"id": "BB_04", "name": "BB Width Expansion", "name_fa": "باز شدن باند بولینگر", "func": bb_04_width_expansion, "vec": bb_04_width_expansion_vec},
+    {"id": "BB_05", "name": "BB Band Walk", "name_fa": "حرکت روی باند بولینگر", "func": bb_05_band_walk, "vec": bb_05_band_walk_vec},
+    {"id": "BB_06", "name": "BB + RSI Combo", "name_fa": "بولینگر + RSI ترکیبی", "func": bb_06_rsi_combo, "vec": bb_06_rsi_combo_vec},
+    {"id": "BB_07", "name": "BB Double Pattern", "name_fa": "الگوی W/M بولینگر", "func": bb_07_double_pattern, "vec": bb_07_double_pattern_vec},
+    {"id": "BB_08", "name": "BB Mean Reversion", "name_fa": "بازگشت به میانگین بولینگر", "func": bb_08_mean_reversion, "vec": bb_08_mean_reversion_vec},
+    {"id": "BB_09", "name": "BB Tight (1.5σ)", "name_fa": "بولینگر تنگ (1.5σ)", "func": bb_09_tight, "vec": bb_09_tight_vec},
+    {"id": "BB_10", "name": "BB Wide (2.5σ)", "name_fa": "بولینگر عریض (2.5σ)", "func": bb_10_wide, "vec": bb_10_wide_vec},
 ]
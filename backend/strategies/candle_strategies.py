@@ -15,6 +15,7 @@ CDL_10: Spinning Top + Trend Context
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
 
 
 def _body(o, c):
@@ -53,6 +54,7 @@ def _trend_direction(df, lookback=10):
         return -1
     return 0
 
+@shared_indicator("sma_pd")
 def _sma(series, period):
     return series.rolling(window=period, min_periods=period).mean()
 
@@ -9,6 +9,7 @@ CCI_04: CCI + EMA Filter
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
 
 
 def _cci(df, period=20):
@@ -18,6 +19,7 @@ def _cci(df, period=20):
     return (tp - sma) / (0.015 * mad).replace(0, 1e-10)
 
 
+@shared_indicator("ema_pd")
 def _ema(series, period):
     return series.ewm(span=period, adjust=False).mean()
 
@@ -10,8 +10,10 @@ CH_06: Envelope
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 
+@shared_indicator("ema_seed0")
 def _ema(data, period):
     if len(data) < period:
         return None
@@ -23,6 +25,7 @@ def _ema(data, period):
     return e
 
 
+@shared_indicator("atr_tr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1:
         return None
@@ -8,7 +8,9 @@ CMO_05: Trend
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
+@shared_indicator("ema")
 def _ema(data, period):
     if len(data) < period: return None
     e = np.zeros(len(data))
@@ -18,6 +20,7 @@ def _ema(data, period):
         e[i] = data[i] * m + e[i-1] * (1 - m)
     return e
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1: return None
     tr = np.maximum(high[1:]-low[1:], np.maximum(abs(high[1:]-close[:-1]), abs(low[1:]-close[:-1])))
@@ -3,13 +3,16 @@ Whilber-AI — Combo Strategy Pack (18)
 Multi-indicator confirmation strategies for highest-quality signals.
 """
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
+@shared_indicator("ema")
 def _ema(data, period):
     if len(data) < period: return None
     e = np.zeros(len(data)); e[period-1] = np.mean(data[:period]); m = 2/(period+1)
     for i in range(period, len(data)): e[i] = data[i]*m + e[i-1]*(1-m)
     return e
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period+1: return None
     tr = np.maximum(high[1:]-low[1:], np.maximum(abs(high[1:]-close[:-1]), abs(low[1:]-close[:-1])))
@@ -17,6 +20,7 @@ def _atr(high, low, close, period=14):
     for i in range(period, len(tr)): a[i] = (a[i-1]*(period-1)+tr[i])/period
     return np.concatenate([[0], a])
 
+@shared_indicator("rsi_combo")
 def _rsi(close, period=14):
     if len(close) < period+1: return None
     gains = np.zeros(len(close)); losses = np.zeros(len(close))
@@ -29,12 +33,14 @@ def _rsi(close, period=14):
     rs = np.where(al > 0, ag/al, 100)
     return 100 - 100/(1+rs)
 
+@shared_indicator("bb_combo")
 def _bb(close, period=20, std=2):
     if len(close) < period: return None, None, None
     sma = np.array([np.mean(close[max(0,i-period+1):i+1]) for i in range(len(close))])
     s = np.array([np.std(close[max(0,i-period+1):i+1]) for i in range(len(close))])
     return sma, sma+std*s, sma-std*s
 
+@shared_indicator("adx")
 def _adx(high, low, close, period=14):
     if len(high)<period*2+1: return None, None, None
     n=len(high); pdm=np.zeros(n); mdm=np.zeros(n); tr=np.zeros(n)
@@ -13,8 +13,10 @@ DIV_08: Multi-Indicator Divergence (2+ agree)
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
 
 
+@shared_indicator("rsi_pd")
 def _rsi(series, period=14):
     delta = series.diff()
     gain = delta.where(delta > 0, 0.0)
@@ -25,6 +27,7 @@ def _rsi(series, period=14):
     return 100 - (100 / (1 + rs))
 
 
+@shared_indicator("ema_pd")
 def _ema(series, period):
     return series.ewm(span=period, adjust=False).mean()
 
@@ -9,6 +9,7 @@ DON_05: Turtle Trading System (20/55 dual channel)
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "DON"
 CATEGORY_NAME = "Donchian Channel"
@@ -27,6 +28,7 @@ def _donchian(high, low, period=20):
     return upper, lower, middle
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     """Calculate ATR."""
     if len(high) < period + 1:
@@ -9,6 +9,7 @@ ENV_05: Envelope Trend (price within upper/lower half)
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "ENV"
 CATEGORY_NAME = "Envelope"
@@ -17,12 +18,14 @@ ICON = "📦"
 COLOR = "#9c27b0"
 
 
+@shared_indicator("sma")
 def _sma(data, period):
     if len(data) < period:
         return None
     return np.array([np.mean(data[max(0,i-period+1):i+1]) for i in range(len(data))])
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1:
         return None
@@ -13,8 +13,10 @@ FIB_08: Auto Fib (Dynamic Swing Detection)
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
 
 
+@shared_indicator("rsi_pd")
 def _rsi(series, period=14):
     delta = series.diff()
     gain = delta.where(delta > 0, 0.0)
@@ -25,6 +27,7 @@ def _rsi(series, period=14):
     return 100 - (100 / (1 + rs))
 
 
+@shared_indicator("sma_pd")
 def _sma(series, period):
     return series.rolling(window=period, min_periods=period).mean()
 
@@ -7,8 +7,10 @@ Total: 12
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 
+@shared_indicator("ema_seed0")
 def _ema(data, period):
     if len(data) < period:
         return None
@@ -0,0 +1,318 @@
+"""
+Whilber-AI — Incremental Context Indicators
+=============================================
+Streaming versions of the shared indicators in orchestrator._build_context
+(EMA 9/21/50/200, RSI 14, Stochastic %K, ATR, Bollinger, ADX/DI).
+
+One ContextState per (symbol, timeframe) persists between analyses. Each
+call only feeds the bars that closed since the previous call — normally
+zero or one — so the context costs O(1) per cycle instead of re-running
+pandas over all 500 bars.
+
+The state is rebuilt from the frame when continuity can't be proven:
+first call, the previous last bar is no longer in the frame (restart,
+outage longer than the fetch window), its close changed (history
+rewritten), or more than MAX_CATCHUP bars arrived at once.
+
+Formulas mirror _build_context exactly (pandas ewm with adjust=True,
+rolling windows ending at the last bar), so values match a full
+recompute on the same bars. The only long-memory term is EMA 200: when
+streamed past the 500-bar window it keeps the older history that a
+500-bar recompute would drop.
+
+Usage:
+    from backend.strategies.incremental_context import incremental_context
+    ctx = incremental_context(symbol, timeframe, df)
+"""
+
+import math
+import threading
+from collections import deque
+
+MAX_CATCHUP = 50
+
+_states = {}
+_lock = threading.Lock()
+_stats = {"rebuilds": 0, "advanced_bars": 0, "reused": 0}
+
+
+# ══════ STREAMING PRIMITIVES ══════
+
+class EWM:
+    """pandas Series.ewm(alpha=..., adjust=True, min_periods=...).mean(), one value at a time."""
+
+    __slots__ = ("decay", "min_periods", "num", "den", "count")
+
+    def __init__(self, alpha, min_periods=0):
+        self.decay = 1.0 - alpha
+        self.min_periods = min_periods
+        self.num = 0.0
+        self.den = 0.0
+        self.count = 0
+
+    @classmethod
+    def span(cls, span, min_periods=0):
+        return cls(2.0 / (span + 1), min_periods)
+
+    def update(self, x):
+        self.num = x + self.decay * self.num
+        self.den = 1.0 + self.decay * self.den
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        if self.count == 0 or self.count < self.min_periods:
+            return math.nan
+        return self.num / self.den
+
+
+class RollingWindow:
+    """
+    Last `size` values with O(1) mean/std/min/max.
+    Sums are taken around an anchor and re-anchored every `size` updates,
+    which bounds float drift; min/max use monotonic deques.
+    """
+
+    __slots__ = ("size", "values", "_anchor", "_sum", "_sumsq", "_since", "_mins", "_maxs", "_n")
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self._mins = deque()    # (index, value), increasing values
+        self._maxs = deque()    # (index, value), decreasing values
+        self._n = 0
+        self._reanchor(0.0)
+
+    def _reanchor(self, anchor):
+        self._anchor = anchor
+        self._sum = sum(v - anchor for v in self.values)
+        self._sumsq = sum((v - anchor) ** 2 for v in self.values)
+        self._since = 0
+
+    def update(self, x):
+        if len(self.values) == self.size:
+            old = self.values[0] - self._anchor
+            self._sum -= old
+            self._sumsq -= old * old
+        self.values.append(x)
+        d = x - self._anchor
+        self._sum += d
+        self._sumsq += d * d
+        self._since += 1
+        if self._since >= self.size:
+            self._reanchor(x)
+
+        i = self._n
+        self._n += 1
+        while self._mins and self._mins[-1][1] >= x:
+            self._mins.pop()
+        self._mins.append((i, x))
+        while self._maxs and self._maxs[-1][1] <= x:
+            self._maxs.pop()
+        self._maxs.append((i, x))
+        first = i - self.size + 1
+        if self._mins[0][0] < first:
+            self._mins.popleft()
+        if self._maxs[0][0] < first:
+            self._maxs.popleft()
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def mean(self):
+        if not self.full:
+            return math.nan
+        return self._anchor + self._sum / self.size
+
+    def std(self):
+        """Sample std (ddof=1), like pandas rolling().std()."""
+        if not self.full or self.size < 2:
+            return math.nan
+        var = (self._sumsq - self._sum * self._sum / self.size) / (self.size - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def min(self):
+        return self._mins[0][1] if self.full else math.nan
+
+    def max(self):
+        return self._maxs[0][1] if self.full else math.nan
+
+
+# ══════ PER-SYMBOL STATE ══════
+
+class ContextState:
+    """All streaming indicators _build_context needs, for one (symbol, timeframe)."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.bars = 0
+        self.last_time = None
+        self.last_close = None
+        self.prev = None    # (high, low, close) of the previous bar
+        self.ema = {p: EWM.span(p) for p in (9, 21, 50, 200)}
+        self.gain = EWM(1 / 14, min_periods=14)
+        self.loss = EWM(1 / 14, min_periods=14)
+        self.low14 = RollingWindow(14)
+        self.high14 = RollingWindow(14)
+        self.tr14 = RollingWindow(14)
+        self.close20 = RollingWindow(20)
+        self.atr_ewm = EWM(1 / 14)
+        self.pdm_ewm = EWM(1 / 14)
+        self.mdm_ewm = EWM(1 / 14)
+        self.dx_ewm = EWM(1 / 14)
+        self.close = self.high = self.low = math.nan
+        self.plus_di = self.minus_di = math.nan
+        self._ctx = None
+
+    def update(self, high, low, close):
+        for e in self.ema.values():
+            e.update(close)
+
+        if self.prev is None:
+            gain = loss = 0.0
+            tr = high - low
+            pdm = mdm = 0.0
+        else:
+            ph, pl, pc = self.prev
+            delta = close - pc
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            tr = max(high - low, abs(high - pc), abs(low - pc))
+            up, down = high - ph, pl - low
+            # same order as _build_context: minus_dm is compared to the filtered plus_dm
+            pdm = up if (up > down and up > 0) else 0.0
+            mdm = down if (down > pdm and down > 0) else 0.0
+        self.gain.update(gain)
+        self.loss.update(loss)
+
+        self.low14.update(low)
+        self.high14.update(high)
+        self.tr14.update(tr)
+        self.close20.update(close)
+
+        atr = self.atr_ewm.update(tr)
+        self.plus_di = 100 * (self.pdm_ewm.update(pdm) / (atr + 1e-10))
+        self.minus_di = 100 * (self.mdm_ewm.update(mdm) / (atr + 1e-10))
+        self.dx_ewm.update(100 * abs(self.plus_di - self.minus_di) / (self.plus_di + self.minus_di + 1e-10))
+
+        self.prev = (high, low, close)
+        self.high, self.low, self.close = high, low, close
+        self.bars += 1
+        self._ctx = None
+
+    def context(self):
+        """Same keys and formulas as orchestrator._build_context, at the last fed bar."""
+        if self._ctx is not None:
+            return dict(self._ctx)
+        c = self.close
+        ctx = {}
+        try:
+            ctx['ema_9'] = self.ema[9].value
+            ctx['ema_21'] = self.ema[21].value
+            ctx['ema_50'] = self.ema[50].value
+            ctx['ema_200'] = self.ema[200].value if self.bars > 200 else None
+
+            loss = self.loss.value
+            rs = self.gain.value / (loss if loss != 0 else 1e-10)
+            ctx['rsi_14'] = 100 - (100 / (1 + rs))
+
+            low14, high14 = self.low14.min(), self.high14.max()
+            ctx['stoch_k'] = (c - low14) / (high14 - low14 + 1e-10) * 100
+
+            atr = self.tr14.mean()
+            ctx['atr_14'] = atr
+            ctx['atr_percent'] = (atr / c) * 100
+
+            sma20, std20 = self.close20.mean(), self.close20.std()
+            ctx['bb_upper'] = sma20 + 2 * std20
+            ctx['bb_lower'] = sma20 - 2 * std20
+            ctx['bb_percent_b'] = ((c - ctx['bb_lower']) /
+                                   (ctx['bb_upper'] - ctx['bb_lower'] + 1e-10) * 100)
+
+            ctx['adx'] = self.dx_ewm.value
+            ctx['plus_di'] = self.plus_di
+            ctx['minus_di'] = self.minus_di
+
+            # Regime
+            if ctx['adx'] > 25:
+                ctx['regime'] = 'صعودی' if ctx['plus_di'] > ctx['minus_di'] else 'نزولی'
+            else:
+                ctx['regime'] = 'رنج'
+
+            # MA Stack
+            if ctx.get('ema_200'):
+                if ctx['ema_9'] > ctx['ema_21'] > ctx['ema_50'] > ctx['ema_200']:
+                    ctx['ma_stack'] = 1
+                elif ctx['ema_9'] < ctx['ema_21'] < ctx['ema_50'] < ctx['ema_200']:
+                    ctx['ma_stack'] = -1
+                else:
+                    ctx['ma_stack'] = 0
+            else:
+                ctx['ma_stack'] = 0
+
+            # SuperTrend
+            st_upper = (self.high + self.low) / 2 - 3 * atr
+            ctx['supertrend_dir'] = 1 if c > st_upper else -1
+        except Exception:
+            pass
+        self._ctx = ctx
+        return dict(ctx)
+
+    def _feed(self, high, low, close, times, start):
+        for i in range(start, len(close)):
+            self.update(float(high[i]), float(low[i]), float(close[i]))
+        self.last_time = times[-1] if len(times) else None
+        self.last_close = float(close[-1]) if len(close) else None
+
+    def _continuation(self, times, close):
+        """Index of the first unseen bar, or None if the state must be rebuilt."""
+        if self.last_time is None:
+            return None
+        n = len(times)
+        for i in range(n - 1, max(-1, n - 2 - MAX_CATCHUP), -1):
+            if times[i] == self.last_time:
+                return i + 1 if float(close[i]) == self.last_close else None
+        return None
+
+    def advance(self, df):
+        """Bring the state up to df's last bar; returns the context dict."""
+        high = df['high'].values
+        low = df['low'].values
+        close = df['close'].values
+        times = df['time'].values if 'time' in df.columns else None
+
+        start = self._continuation(times, close) if times is not None else None
+        if start is None:
+            self.reset()
+            self._feed(high, low, close, times if times is not None else [None] * len(close), 0)
+            _stats["rebuilds"] += 1
+        elif start < len(close):
+            self._feed(high, low, close, times, start)
+            _stats["advanced_bars"] += len(close) - start
+        else:
+            _stats["reused"] += 1
+        return self.context()
+
+
+def incremental_context(symbol, timeframe, df):
+    """Context for df's last bar from the persistent (symbol, timeframe) state."""
+    key = (symbol, timeframe)
+    with _lock:
+        state = _states.get(key)
+        if state is None:
+            state = _states[key] = ContextState()
+        return state.advance(df)
+
+
+def reset_states():
+    with _lock:
+        _states.clear()
+
+
+def get_incremental_stats():
+    with _lock:
+        return {"states": len(_states), **_stats}
@@ -0,0 +1,226 @@
+"""
+Whilber-AI — Shared Indicator Store
+=====================================
+Memoizes indicator series across all strategy packs during one analysis.
+
+Every pack keeps its own private helpers (_rsi, _ema, _atr, ...) and many of
+them are identical copies. Helpers decorated with @shared_indicator("name")
+look up the active store first and reuse the full series if another strategy
+already computed it on the same source with the same params.
+
+Cache key:  (indicator name, params, source)
+  source = OHLCV column name ("close", "high", ...) when the input is a
+           column of the bound DataFrame, or the key of another stored
+           indicator when the input is its output (EMA of EMA, RSI peaks, ...).
+           Inputs that are neither are computed normally and not cached.
+
+Stores are built once per (symbol, timeframe, last closed bar time) and kept
+in a small LRU, so repeated analyze_symbol() calls on the same bar set reuse
+everything.
+
+Usage:
+    store = get_store(symbol, timeframe, df)
+    with use_store(store):
+        ...run strategies...
+"""
+
+import inspect
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+import numpy as np
+
+_MAX_STORES = 128
+_OHLCV_COLUMNS = ("open", "high", "low", "close", "volume", "tick_volume")
+
+_current = ContextVar("indicator_store", default=None)
+_stores = OrderedDict()
+_stores_lock = threading.Lock()
+_stats = {"stores_built": 0, "stores_reused": 0}
+
+
+def _fingerprint(data):
+    """Identify an array by its memory (address, length, stride)."""
+    arr = getattr(data, "values", data)
+    if not isinstance(arr, np.ndarray) or arr.ndim != 1:
+        return None
+    return (arr.__array_interface__["data"][0], arr.shape[0], arr.strides[0], arr.dtype.str)
+
+
+def _freeze(value):
+    """Make numpy outputs read-only so one strategy can't corrupt another's input."""
+    if isinstance(value, np.ndarray):
+        if value.flags.owndata:
+            value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for v in value:
+            _freeze(v)
+    return value
+
+
+class IndicatorStore:
+    """Per-bar-set memo of indicator series."""
+
+    def __init__(self, symbol, timeframe, df):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.last_bar = _last_bar_key(df)
+        self.bars = len(df)
+        self._memo = {}
+        self._sources = {}
+        self._columns = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.bind(df)
+
+    def bind(self, df):
+        """Point column sources at df (same bars, possibly a fresh copy)."""
+        with self._lock:
+            for fp in [fp for fp, src in self._sources.items() if isinstance(src, str)]:
+                del self._sources[fp]
+            # Hold our own references so column memory can't be reused
+            # by unrelated arrays while fingerprints point at it.
+            self._columns = {}
+            for col in _OHLCV_COLUMNS:
+                if col not in df.columns:
+                    continue
+                arr = df[col].values
+                self._columns[col] = arr
+                fp = _fingerprint(arr)
+                if fp is not None:
+                    self._sources[fp] = col
+
+    def source_of(self, data):
+        fp = _fingerprint(data)
+        if fp is None:
+            return None
+        return self._sources.get(fp)
+
+    def _register(self, key, value):
+        if isinstance(value, tuple):
+            for i, v in enumerate(value):
+                fp = _fingerprint(v)
+                if fp is not None:
+                    self._sources[fp] = (key, i)
+        else:
+            fp = _fingerprint(value)
+            if fp is not None:
+                self._sources[fp] = key
+
+    def get(self, name, func, args):
+        """Return func(*args), memoized when every array arg is a known source."""
+        sources = []
+        for a in args:
+            if isinstance(a, (int, float, str, bool)) or a is None:
+                sources.append(a)
+                continue
+            src = self.source_of(a)
+            if src is None:
+                return func(*args)
+            sources.append(src)
+
+        key = (name, tuple(sources))
+        with self._lock:
+            if key in self._memo:
+                self.hits += 1
+                return self._memo[key]
+
+        value = _freeze(func(*args))
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = value
+                self._register(key, value)
+                self.misses += 1
+            return self._memo[key]
+
+    def stats(self):
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "bars": self.bars,
+            "series": len(self._memo),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _last_bar_key(df):
+    if "time" in df.columns and len(df):
+        return str(df["time"].iloc[-1])
+    return len(df)
+
+
+def get_store(symbol, timeframe, df):
+    """Return the store for (symbol, timeframe, last bar time), building it if new."""
+    key = (symbol, timeframe, _last_bar_key(df), len(df))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is not None:
+            _stores.move_to_end(key)
+            _stats["stores_reused"] += 1
+        else:
+            store = IndicatorStore(symbol, timeframe, df)
+            _stores[key] = store
+            _stats["stores_built"] += 1
+            while len(_stores) > _MAX_STORES:
+                _stores.popitem(last=False)
+            return store
+    store.bind(df)
+    return store
+
+
+@contextmanager
+def use_store(store):
+    """Make store the active one for shared_indicator helpers in this context."""
+    token = _current.set(store)
+    try:
+        yield store
+    finally:
+        _current.reset(token)
+
+
+def current_store():
+    return _current.get()
+
+
+def shared_indicator(name):
+    """
+    Decorator for pack helpers. Helpers sharing a name MUST be identical
+    implementations — the first one computed is served to all of them.
+    """
+    def deco(func):
+        sig = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            store = _current.get()
+            if store is None or not args:
+                return func(*args, **kwargs)
+            # _rsi(close), _rsi(close, 14) and _rsi(close, period=14) share one key
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return store.get(name, func, bound.args)
+        return wrapper
+    return deco
+
+
+def clear_stores():
+    with _stores_lock:
+        _stores.clear()
+
+
+def get_store_info():
+    with _stores_lock:
+        stores = [s.stats() for s in _stores.values()]
+    return {
+        "stores": len(stores),
+        "max_stores": _MAX_STORES,
+        "stores_built": _stats["stores_built"],
+        "stores_reused": _stats["stores_reused"],
+        "hits": sum(s["hits"] for s in stores),
+        "misses": sum(s["misses"] for s in stores),
+    }
@@ -9,6 +9,7 @@ KAMA_05: KAMA Efficiency Ratio Breakout
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "KAMA"
 CATEGORY_NAME = "Kaufman Adaptive MA"
@@ -40,6 +41,7 @@ def _kama(close, period=10, fast=2, slow=30):
     return result, er
 
 
+@shared_indicator("rsi_kama")
 def _rsi(close, period=14):
     if len(close) < period + 1: return None
     n = len(close)
@@ -63,6 +65,7 @@ def _rsi(close, period=14):
     return rsi
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1: return None
     tr = np.maximum(high[1:] - low[1:], np.maximum(abs(high[1:] - close[:-1]), abs(low[1:] - close[:-1])))
@@ -9,6 +9,7 @@ KC_05: Keltner Width Expansion (channel widening → trend)
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "KC"
 CATEGORY_NAME = "Keltner Channel"
@@ -17,6 +18,7 @@ ICON = "📈"
 COLOR = "#ff9800"
 
 
+@shared_indicator("ema")
 def _ema(data, period):
     if len(data) < period:
         return None
@@ -28,6 +30,7 @@ def _ema(data, period):
     return e
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1:
         return None
@@ -50,6 +53,7 @@ def _keltner(high, low, close, ema_period=20, atr_period=10, multiplier=2.0):
     return upper, lower, ema
 
 
+@shared_indicator("bb_keltner")
 def _bb(close, period=20, std_mult=2.0):
     if len(close) < period:
         return None, None, None
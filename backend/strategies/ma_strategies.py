@@ -17,12 +17,15 @@ MA_12: Adaptive MA (KAMA)
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
 
 
+@shared_indicator("sma_pd")
 def _sma(series, period):
     return series.rolling(window=period, min_periods=period).mean()
 
 
+@shared_indicator("ema_pd")
 def _ema(series, period):
     return series.ewm(span=period, adjust=False).mean()
 
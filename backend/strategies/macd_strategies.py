@@ -15,12 +15,16 @@ MACD_10: MACD Hidden Divergence
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
+from backend.strategies.signal_history import arr, prev, pick, trunc, before, peak_pairs, at
 
 
+@shared_indicator("ema_pd")
 def _ema(series, period):
     return series.ewm(span=period, adjust=False).mean()
 
 
+@shared_indicator("macd_pd")
 def _macd(close, fast=12, slow=26, signal=9):
     ema_fast = _ema(close, fast)
     ema_slow = _ema(close, slow)
@@ -30,6 +34,7 @@ def _macd(close, fast=12, slow=26, signal=9):
     return macd_line, signal_line, histogram
 
 
+@shared_indicator("rsi_pd")
 def _rsi(series, period=14):
     delta = series.diff()
     gain = delta.where(delta > 0, 0.0)
@@ -342,19 +347,149 @@ def macd_10_hidden_div(df, context=None):
             "reason_fa": "بدون واگرایی مخفی MACD"}
 
 
+# ═══════════════════════════════════════════════════════
+# VECTORIZED (full history) — bar i == func(df.iloc[:i+1])
+# ═══════════════════════════════════════════════════════
+
+def _macd_arrays(df, fast=12, slow=26, signal=9):
+    macd, sig, hist = _macd(df['close'], fast, slow, signal)
+    return arr(macd), arr(sig), arr(hist)
+
+
+def macd_01_classic_vec(df, context=None):
+    m, _, h = _macd_arrays(df, 12, 26, 9)
+    hp = prev(h)
+    conf = np.minimum(85, 60 + trunc(np.abs(h) / (np.abs(m) + 1e-10) * 100))
+    return pick(len(h), [
+        ((hp <= 0) & (h > 0), 1, conf),
+        ((hp >= 0) & (h < 0), -1, conf),
+        ((h > 0) & (h > hp), 1, 45),
+        ((h < 0) & (h < hp), -1, 45),
+    ])
+
+
+def _signal_cross_vec(df, fast, slow, signal, conf):
+    _, _, h = _macd_arrays(df, fast, slow, signal)
+    hp = prev(h)
+    return pick(len(h), [
+        ((hp <= 0) & (h > 0), 1, conf),
+        ((hp >= 0) & (h < 0), -1, conf),
+    ])
+
+
+def macd_02_fast_vec(df, context=None):
+    return _signal_cross_vec(df, 8, 21, 5, 62)
+
+
+def macd_03_scalp_vec(df, context=None):
+    return _signal_cross_vec(df, 5, 13, 3, 55)
+
+
+def macd_04_zero_cross_vec(df, context=None):
+    m, _, _ = _macd_arrays(df, 12, 26, 9)
+    mp = prev(m)
+    return pick(len(m), [
+        ((mp <= 0) & (m > 0), 1, 72),
+        ((mp >= 0) & (m < 0), -1, 72),
+        (m > 0, 1, 40),
+        (m < 0, -1, 40),
+    ])
+
+
+def macd_05_hist_reversal_vec(df, context=None):
+    _, _, h0 = _macd_arrays(df, 12, 26, 9)
+    h1, h2 = prev(h0), prev(h0, 2)
+    ok = ~before(len(h0), 5)
+    buy_conf = np.minimum(75, 55 + trunc(np.abs(h0 - h1) / (np.abs(h1) + 1e-10) * 100 / 5))
+    sell_conf = np.minimum(75, 55 + trunc(np.abs(h1 - h0) / (np.abs(h1) + 1e-10) * 100 / 5))
+    return pick(len(h0), [
+        (ok & (h2 < h1) & (h1 < 0) & (h0 > h1), 1, buy_conf),
+        (ok & (h2 > h1) & (h1 > 0) & (h0 < h1), -1, sell_conf),
+    ])
+
+
+def _divergence_vec(df, line, hidden, conf):
+    close = arr(df['close'])
+    (ph1, ph2), (pl1, pl2) = peak_pairs(close, 5)
+    (lh1, lh2), (ll1, ll2) = peak_pairs(line, 3)
+    ok = ~before(len(line), 30)
+    lows = ok & (pl1 >= 0) & (ll1 >= 0)
+    highs = ok & (ph1 >= 0) & (lh1 >= 0)
+    if hidden:
+        bull = lows & (at(close, pl2) > at(close, pl1)) & (at(line, ll2) < at(line, ll1))
+        bear = highs & (at(close, ph2) < at(close, ph1)) & (at(line, lh2) > at(line, lh1))
+    else:
+        bull = lows & (at(close, pl2) < at(close, pl1)) & (at(line, ll2) > at(line, ll1))
+        bear = highs & (at(close, ph2) > at(close, ph1)) & (at(line, lh2) < at(line, lh1))
+    return pick(len(line), [(bull, 1, conf), (bear, -1, conf)])
+
+
+def macd_06_hist_divergence_vec(df, context=None):
+    _, _, h = _macd_arrays(df, 12, 26, 9)
+    return _divergence_vec(df, h, hidden=False, conf=76)
+
+
+def macd_07_double_cross_vec(df, context=None):
+    m, _, h = _macd_arrays(df, 12, 26, 9)
+    hp = prev(h)
+    up = (hp <= 0) & (h > 0)
+    down = (hp >= 0) & (h < 0)
+    return pick(len(h), [
+        (up & (m > 0), 1, 85),
+        (down & (m < 0), -1, 85),
+        (up, 1, 55),
+        (down, -1, 55),
+    ])
+
+
+def macd_08_momentum_vec(df, context=None):
+    _, _, h0 = _macd_arrays(df, 12, 26, 9)
+    h1, h2, h3 = prev(h0), prev(h0, 2), prev(h0, 3)
+    ok = ~before(len(h0), 5)
+    rising = ok & (h0 > h1) & (h1 > h2) & (h2 > h3)
+    falling = ok & (h0 < h1) & (h1 < h2) & (h2 < h3)
+    up_conf = np.minimum(78, 55 + trunc(np.abs((h0 - h3) / 3) * 500))
+    down_conf = np.minimum(78, 55 + trunc(np.abs((h3 - h0) / 3) * 500))
+    return pick(len(h0), [
+        (rising & (h0 > 0), 1, up_conf),
+        (rising, 1, np.maximum(50, up_conf - 10)),
+        (falling & (h0 < 0), -1, down_conf),
+        (falling, -1, np.maximum(50, down_conf - 10)),
+    ])
+
+
+def macd_09_rsi_combo_vec(df, context=None):
+    _, _, h = _macd_arrays(df, 12, 26, 9)
+    r = arr(_rsi(df['close'], 14))
+    hp = prev(h)
+    up = (hp <= 0) & (h > 0)
+    down = (hp >= 0) & (h < 0)
+    return pick(len(h), [
+        (up & (r < 40), 1, np.minimum(88, 70 + trunc(40 - r))),
+        (down & (r > 60), -1, np.minimum(88, 70 + trunc(r - 60))),
+        (up, 1, 52),
+        (down, -1, 52),
+    ])
+
+
+def macd_10_hidden_div_vec(df, context=None):
+    m, _, _ = _macd_arrays(df, 12, 26, 9)
+    return _divergence_vec(df, m, hidden=True, conf=74)
+
+
 # ═══════════════════════════════════════════════════════
 # REGISTRY
 # ═══════════════════════════════════════════════════════
 
 MACD_STRATEGIES = [
-    {"id": "MACD_01", "name": "MACD Classic (12,26,9)", "name_fa": "MACD کلاسیک", "func": macd_01_classic},
-    {"id": "MACD_02", "name": "MACD Fast (8,21,5)", "name_fa": "MACD سریع", "func": macd_02_fast},
-    {"id": "MACD_03", "name": "MACD Scalp (5,13,3)", "name_fa": "MACD اسکالپ", "func": macd_03_scalp},
-    {"id": "MACD_04", "name": "MACD Zero Cross", "name_fa": "MACD تقاطع صفر", "func": macd_04_zero_cross},
-    {"id": "MACD_05", "name": "MACD Hist Reversal", "name_fa": "برگشت هیستوگرام MACD", "func": macd_05_hist_reversal},
-    {"id": "MACD_06", "name": "MACD Hist Divergence", "name_fa": "واگرایی هیستوگرام MACD", "func": macd_06_hist_divergence},
-    {"id": "MACD_07", "name": "MACD Double Cross", "name_fa": "MACD تقاطع دوگانه", "func": macd_07_double_cross},
-    {"id": "MACD_08", "name": "MACD Momentum", "name_fa": "مومنتوم MACD", "func": macd_08_momentum},
-    {"id": "MACD_09", "name": "MACD + RSI Combo", "name_fa": "MACD + RSI ترکیبی", "func": macd_09_rsi_combo},
-    {"id": "MACD_10", "name": "MACD Hidden Divergence", "name_fa": "واگرایی مخفی MACD", "func": macd_10_hidden_div},
+    {"id": "MACD_01", "name": "MACD Classic (12,26,9)", "name_fa": "MACD کلاسیک", "func": macd_01_classic, "vec": macd_01_classic_vec},
+    {"id": "MACD_02", "name": "MACD Fast (8,21,5)", "name_fa": "MACD سریع", "func": macd_02_fast, "vec": macd_02_fast_vec},
+    {"id": "MACD_03", "name": "MACD Scalp (5,13,3)", "name_fa": "MACD اسکالپ", "func": macd_03_scalp, "vec": macd_03_scalp_vec},
+    {"id": "MACD_04", "name": "MACD Zero Cross", "name_fa": "MACD تقاطع صفر", "func": macd_04_zero_cross, "vec": macd_04_zero_cross_vec},
+    {"id": "MACD_05", "name": "MACD Hist Reversal", "name_fa": "برگشت هیستوگرام MACD", "func": macd_05_hist_reversal, "vec": macd_05_hist_reversal_vec},
+    {"id": "MACD_06", "name": "MACD Hist Divergence", "name_fa": "واگرایی هیستوگرام MACD", "func": macd_06_hist_divergence, "vec": macd_06_hist_divergence_vec},
+    {"id": "MACD_07", "name": "MACD Double Cross", "name_fa": "MACD تقاطع دوگانه", "func": macd_07_double_cross, "vec": macd_07_double_cross_vec},
+    {"id": "MACD_08", "name": "MACD Momentum", "name_fa": "مومنتوم MACD", "func": macd_08_momentum, "vec": macd_08_momentum_vec},
+    {"id": "MACD_09", "name": "MACD + RSI Combo", "name_fa": "MACD + RSI ترکیبی", "func": macd_09_rsi_combo, "vec": macd_09_rsi_combo_vec},
+    {"id": "MACD_10", "name": "MACD Hidden Divergence", "name_fa": "واگرایی مخفی MACD", "func": macd_10_hidden_div, "vec": macd_10_hidden_div_vec},
 ]
@@ -9,16 +9,20 @@ MTF_04: Trend Alignment Score (Multiple indicators across periods)
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
 
 
+@shared_indicator("ema_pd")
 def _ema(series, period):
     return series.ewm(span=period, adjust=False).mean()
 
 
+@shared_indicator("sma_pd")
 def _sma(series, period):
     return series.rolling(window=period, min_periods=period).mean()
 
 
+@shared_indicator("rsi_pd")
 def _rsi(series, period=14):
     delta = series.diff()
     gain = delta.where(delta > 0, 0.0)
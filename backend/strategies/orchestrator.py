@@ -162,6 +162,9 @@ except ImportError:
     logger.warning("MT5Connector not found")
 
 from backend.mt5 import data_fetcher as _df_module
+from backend.mt5.bar_source import get_bar_source, MT5BarSource
+from backend.strategies.indicator_store import get_store, use_store
+from backend.strategies.incremental_context import incremental_context
 
 try:
     from backend.mt5.symbol_map import get_farsi_name, get_symbol_info, validate_symbol
@@ -239,7 +242,8 @@ if _price_func is None:
 
 
 def _fetch_data(symbol: str, timeframe: str, bars: int = 500):
-    if MT5Connector is not None:
+    # Only a live-only source needs the terminal; the history store serves offline
+    if MT5Connector is not None and isinstance(get_bar_source(), MT5BarSource):
         connector = MT5Connector.get_instance()
         if not connector.ensure_connected():
             return None, "MT5 متصل نیست"
@@ -476,8 +480,13 @@ def analyze_symbol(symbol: str, timeframe: str = "H1",
     if err:
         return {"success": False, "error": err}
 
-    # Context (shared indicators)
-    context = _build_context(df)
+    # Context (shared indicators) — streamed per (symbol, timeframe); only
+    # bars closed since the last call are fed, full rebuild on gaps
+    try:
+        context = incremental_context(symbol, timeframe, df)
+    except Exception as e:
+        logger.debug(f"Incremental context failed ({e}), full rebuild")
+        context = _build_context(df)
 
     # Price
     price = (_price_func(symbol) if _price_func else {}) or {}
@@ -487,275 +496,277 @@ def analyze_symbol(symbol: str, timeframe: str = "H1",
     if strategies:
         strats_to_run = [s for s in ALL_STRATEGIES if s["id"] in strategies]
 
-    # Run all strategies
-    results = []
-    for strat in strats_to_run:
-        try:
-            r = strat["func"](df, context)
-            results.append({
-                "strategy_id": strat["id"],
-                "strategy_name": strat["name"],
-                "strategy_name_fa": strat["name_fa"],
-                "signal": r.get("signal", "NEUTRAL"),
-                "signal_fa": "خرید" if r.get("signal") == "BUY" else "فروش" if r.get("signal") == "SELL" else "خنثی",
-                "confidence": r.get("confidence", 0),
-                "reason_fa": r.get("reason_fa", ""),
-            })
-        except Exception as e:
-            logger.debug(f"Strategy {strat['id']} error: {e}")
-            results.append({
-                "strategy_id": strat["id"],
-                "strategy_name": strat["name"],
-                "strategy_name_fa": strat["name_fa"],
-                "signal": "NEUTRAL",
-                "signal_fa": "خنثی",
-                "confidence": 0,
-                "reason_fa": f"خطای محاسبه",
-            })
-
-
-    # ── Pack 1: Channel & Band (25 strategies) ──
-    if PACK1_LOADED:
-        for pack_strats, cat_id, cat_fa in [
-            (DON_STRATEGIES, "DON", "کانال دونچیان"),
-            (KC_STRATEGIES, "KC", "کانال کلتنر"),
-            (ENV_STRATEGIES, "ENV", "پوشش میانگین"),
-            (PSAR_STRATEGIES, "PSAR", "پارابولیک SAR"),
-            (REG_STRATEGIES, "REG", "کانال رگرسیون"),
-        ]:
-            for strat in pack_strats:
-                try:
-                    r = strat["func"](df, context, symbol, timeframe)
-                    r["strategy_id"] = strat["id"]
-                    r["strategy_name"] = strat["name"]
-                    r["strategy_name_fa"] = strat["name_fa"]
-                    r["category"] = cat_id
-                    r["category_fa"] = cat_fa
-                    r["symbol"] = symbol
-                    r["timeframe"] = timeframe
-                    results.append(r)
-                except Exception as e:
-                    results.append({
-                        "strategy_id": strat["id"], "strategy_name": strat["name"],
-                        "strategy_name_fa": strat["name_fa"], "category": cat_id,
-                        "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
-                        "signal": "NEUTRAL", "confidence": 0,
-                        "reason_fa": f"خطا: {str(e)[:50]}",
-                        "setup": {"has_setup": False},
-                    })
-
-
-    # ── Pack 2: Momentum & Oscillator (25 strategies) ──
-    if PACK2_LOADED:
-        for pack2_strats, cat_id, cat_fa in [
-            (TRIX_STRATEGIES, "TRIX", "تریکس"),
-            (ROC_STRATEGIES, "ROC", "نرخ تغییر"),
-            (CMO_STRATEGIES, "CMO", "مومنتوم چاند"),
-            (RVI_STRATEGIES, "RVI", "شاخص نیروی نسبی"),
-            (PPO_STRATEGIES, "PPO", "اسیلاتور درصدی قیمت"),
-        ]:
-            for strat in pack2_strats:
-                try:
-                    r = strat["func"](df, context, symbol, timeframe)
-                    r["strategy_id"] = strat["id"]
-                    r["strategy_name"] = strat["name"]
-                    r["strategy_name_fa"] = strat["name_fa"]
-                    r["category"] = cat_id
-                    r["category_fa"] = cat_fa
-                    r["symbol"] = symbol
-                    r["timeframe"] = timeframe
-                    results.append(r)
-                except Exception as e:
-                    results.append({
-                        "strategy_id": strat["id"], "strategy_name": strat["name"],
-                        "strategy_name_fa": strat["name_fa"], "category": cat_id,
-                        "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
-                        "signal": "NEUTRAL", "confidence": 0,
-                        "reason_fa": f"خطا: {str(e)[:50]}",
-                        "setup": {"has_setup": False},
-                    })
-
-
-    # ── Pack 3: Volume & Flow (25 strategies) ──
-    if PACK3_LOADED:
-        for pack3_strats, cat_id, cat_fa in [
-            (OBV_STRATEGIES, "OBV", "حجم تعادلی"),
-            (MFI_STRATEGIES, "MFI", "شاخص جریان پول"),
-            (VWAP_STRATEGIES, "VWAP", "میانگین وزنی حجم"),
-            (AD_STRATEGIES, "AD", "تجمع/توزیع"),
-            (FI_STRATEGIES, "FI", "شاخص قدرت"),
-        ]:
-            for strat in pack3_strats:
-                try:
-                    r = strat["func"](df, context, symbol, timeframe)
-                    r["strategy_id"] = strat["id"]
-                    r["strategy_name"] = strat["name"]
-                    r["strategy_name_fa"] = strat["name_fa"]
-                    r["category"] = cat_id
-                    r["category_fa"] = cat_fa
-                    r["symbol"] = symbol
-                    r["timeframe"] = timeframe
-                    results.append(r)
-                except Exception as e:
-                    results.append({
-                        "strategy_id": strat["id"], "strategy_name": strat["name"],
-                        "strategy_name_fa": strat["name_fa"], "category": cat_id,
-                        "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
-                        "signal": "NEUTRAL", "confidence": 0,
-                        "reason_fa": f"خطا: {str(e)[:50]}",
-                        "setup": {"has_setup": False},
-                    })
-
-
-    # ── Pack 4: Trend Systems (25 strategies) ──
-    if PACK4_LOADED:
-        for pack4_strats, cat_id, cat_fa in [
-            (ADX_ADV_STRATEGIES, "ADX_ADV", "ADX پیشرفته"),
-            (STREND_STRATEGIES, "STREND", "سوپرترند"),
-            (AROON_STRATEGIES, "AROON", "آرون"),
-            (DPO_STRATEGIES, "DPO", "DPO"),
-            (VORTEX_STRATEGIES, "VORTEX", "ورتکس"),
-        ]:
-            for strat in pack4_strats:
-                try:
-                    r = strat["func"](df, context, symbol, timeframe)
-                    r["strategy_id"] = strat["id"]
-                    r["strategy_name"] = strat["name"]
-                    r["strategy_name_fa"] = strat["name_fa"]
-                    r["category"] = cat_id
-                    r["category_fa"] = cat_fa
-                    r["symbol"] = symbol
-                    r["timeframe"] = timeframe
-                    results.append(r)
-                except Exception as e:
-                    results.append({
-                        "strategy_id": strat["id"], "strategy_name": strat["name"],
-                        "strategy_name_fa": strat["name_fa"], "category": cat_id,
-                        "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
-                        "signal": "NEUTRAL", "confidence": 0,
-                        "reason_fa": f"خطا: {str(e)[:50]}",
-                        "setup": {"has_setup": False},
-                    })
-
-
-    # ── Pack 5: Statistical & Transform (25 strategies) ──
-    if PACK5_LOADED:
-        for pack5_strats, cat_id, cat_fa in [
-            (ELDER_STRATEGIES, "ELDER", "Elder Ray"),
-            (FISHER_STRATEGIES, "FISHER", "Fisher Transform"),
-            (HEIKIN_STRATEGIES, "HEIKIN", "هیکن آشی"),
-            (CHOP_STRATEGIES, "CHOP", "شاخص Choppiness"),
-            (MASS_STRATEGIES, "MASS", "شاخص Mass"),
-        ]:
-            for strat in pack5_strats:
-                try:
-                    r = strat["func"](df, context, symbol, timeframe)
-                    r["strategy_id"] = strat["id"]
-                    r["strategy_name"] = strat["name"]
-                    r["strategy_name_fa"] = strat["name_fa"]
-                    r["category"] = cat_id
-                    r["category_fa"] = cat_fa
-                    r["symbol"] = symbol
-                    r["timeframe"] = timeframe
-                    results.append(r)
-                except Exception as e:
-                    results.append({
-                        "strategy_id": strat["id"], "strategy_name": strat["name"],
-                        "strategy_name_fa": strat["name_fa"], "category": cat_id,
-                        "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
-                        "signal": "NEUTRAL", "confidence": 0,
-                        "reason_fa": f"خطا: {str(e)[:50]}",
-                        "setup": {"has_setup": False},
-                    })
-
-
-    # ── Pack 6: Pattern & Structure (25 strategies) ──
-    if PACK6_LOADED:
-        for pack6_strats, cat_id, cat_fa in [
-            (PIVOT_ADV_STRATEGIES, "PIVOT_ADV", "پیوت پیشرفته"),
-            (GAPS_STRATEGIES, "GAPS", "تحلیل گپ"),
-            (RANGE_STRATEGIES, "RANGE", "تشخیص رنج"),
-            (SWING_STRATEGIES, "SWING", "سوئینگ"),
-            (HARMONIC_STRATEGIES, "HARMONIC", "الگوی هارمونیک"),
-        ]:
-            for strat in pack6_strats:
-                try:
-                    r = strat["func"](df, context, symbol, timeframe)
-                    r["strategy_id"] = strat["id"]
-                    r["strategy_name"] = strat["name"]
-                    r["strategy_name_fa"] = strat["name_fa"]
-                    r["category"] = cat_id
-                    r["category_fa"] = cat_fa
-                    r["symbol"] = symbol
-                    r["timeframe"] = timeframe
-                    results.append(r)
-                except Exception as e:
-                    results.append({
-                        "strategy_id": strat["id"], "strategy_name": strat["name"],
-                        "strategy_name_fa": strat["name_fa"], "category": cat_id,
-                        "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
-                        "signal": "NEUTRAL", "confidence": 0,
-                        "reason_fa": f"خطا: {str(e)[:50]}",
-                        "setup": {"has_setup": False},
-                    })
-
-
-    # ── Pack 7: Multi-Indicator Combos (18 strategies) ──
-    if PACK7_LOADED:
-        for pack7_strats, cat_id, cat_fa in [
-            (COMBO_STRATEGIES, "COMBO", "ترکیبی"),
-        ]:
-            for strat in pack7_strats:
-                try:
-                    r = strat["func"](df, context, symbol, timeframe)
-                    r["strategy_id"] = strat["id"]
-                    r["strategy_name"] = strat["name"]
-                    r["strategy_name_fa"] = strat["name_fa"]
-                    r["category"] = cat_id
-                    r["category_fa"] = cat_fa
-                    r["symbol"] = symbol
-                    r["timeframe"] = timeframe
-                    results.append(r)
-                except Exception as e:
-                    results.append({
-                        "strategy_id": strat["id"], "strategy_name": strat["name"],
-                        "strategy_name_fa": strat["name_fa"], "category": cat_id,
-                        "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
-                        "signal": "NEUTRAL", "confidence": 0,
-                        "reason_fa": f"خطا: {str(e)[:50]}",
-                        "setup": {"has_setup": False},
-                    })
-
-
-    # ── Pack 8: Advanced Indicators (25 strategies) ──
-    if PACK8_LOADED:
-        for pack8_strats, cat_id, cat_fa in [
-            (TSI_STRATEGIES, "TSI", "شاخص قدرت واقعی"),
-            (SQZ_STRATEGIES, "SQZ", "فشردگی مومنتوم"),
-            (ALLI_STRATEGIES, "ALLI", "تمساح ویلیامز"),
-            (KAMA_STRATEGIES, "KAMA", "میانگین تطبیقی کافمن"),
-            (ZLEMA_STRATEGIES, "ZLEMA", "میانگین بدون تاخیر"),
-        ]:
-            for strat in pack8_strats:
-                try:
-                    r = strat["func"](df, context, symbol, timeframe)
-                    r["strategy_id"] = strat["id"]
-                    r["strategy_name"] = strat["name"]
-                    r["strategy_name_fa"] = strat["name_fa"]
-                    r["category"] = cat_id
-                    r["category_fa"] = cat_fa
-                    r["symbol"] = symbol
-                    r["timeframe"] = timeframe
-                    results.append(r)
-                except Exception as e:
-                    results.append({
-                        "strategy_id": strat["id"], "strategy_name": strat["name"],
-                        "strategy_name_fa": strat["name_fa"], "category": cat_id,
-                        "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
-                        "signal": "NEUTRAL", "confidence": 0,
-                        "reason_fa": f"خطا: {str(e)[:50]}",
-                        "setup": {"has_setup": False},
-                    })
+    # Run all strategies — pack helpers share one indicator store per bar set
+    store = get_store(symbol, timeframe, df)
+    with use_store(store):
+        results = []
+        for strat in strats_to_run:
+            try:
+                r = strat["func"](df, context)
+                results.append({
+                    "strategy_id": strat["id"],
+                    "strategy_name": strat["name"],
+                    "strategy_name_fa": strat["name_fa"],
+                    "signal": r.get("signal", "NEUTRAL"),
+                    "signal_fa": "خرید" if r.get("signal") == "BUY" else "فروش" if r.get("signal") == "SELL" else "خنثی",
+                    "confidence": r.get("confidence", 0),
+                    "reason_fa": r.get("reason_fa", ""),
+                })
+            except Exception as e:
+                logger.debug(f"Strategy {strat['id']} error: {e}")
+                results.append({
+                    "strategy_id": strat["id"],
+                    "strategy_name": strat["name"],
+                    "strategy_name_fa": strat["name_fa"],
+                    "signal": "NEUTRAL",
+                    "signal_fa": "خنثی",
+                    "confidence": 0,
+                    "reason_fa": f"خطای محاسبه",
+                })
+
+
+        # ── Pack 1: Channel & Band (25 strategies) ──
+        if PACK1_LOADED:
+            for pack_strats, cat_id, cat_fa in [
+                (DON_STRATEGIES, "DON", "کانال دونچیان"),
+                (KC_STRATEGIES, "KC", "کانال کلتنر"),
+                (ENV_STRATEGIES, "ENV", "پوشش میانگین"),
+                (PSAR_STRATEGIES, "PSAR", "پارابولیک SAR"),
+                (REG_STRATEGIES, "REG", "کانال رگرسیون"),
+            ]:
+                for strat in pack_strats:
+                    try:
+                        r = strat["func"](df, context, symbol, timeframe)
+                        r["strategy_id"] = strat["id"]
+                        r["strategy_name"] = strat["name"]
+                        r["strategy_name_fa"] = strat["name_fa"]
+                        r["category"] = cat_id
+                        r["category_fa"] = cat_fa
+                        r["symbol"] = symbol
+                        r["timeframe"] = timeframe
+                        results.append(r)
+                    except Exception as e:
+                        results.append({
+                            "strategy_id": strat["id"], "strategy_name": strat["name"],
+                            "strategy_name_fa": strat["name_fa"], "category": cat_id,
+                            "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
+                            "signal": "NEUTRAL", "confidence": 0,
+                            "reason_fa": f"خطا: {str(e)[:50]}",
+                            "setup": {"has_setup": False},
+                        })
+
+
+        # ── Pack 2: Momentum & Oscillator (25 strategies) ──
+        if PACK2_LOADED:
+            for pack2_strats, cat_id, cat_fa in [
+                (TRIX_STRATEGIES, "TRIX", "تریکس"),
+                (ROC_STRATEGIES, "ROC", "نرخ تغییر"),
+                (CMO_STRATEGIES, "CMO", "مومنتوم چاند"),
+                (RVI_STRATEGIES, "RVI", "شاخص نیروی نسبی"),
+                (PPO_STRATEGIES, "PPO", "اسیلاتور درصدی قیمت"),
+            ]:
+                for strat in pack2_strats:
+                    try:
+                        r = strat["func"](df, context, symbol, timeframe)
+                        r["strategy_id"] = strat["id"]
+                        r["strategy_name"] = strat["name"]
+                        r["strategy_name_fa"] = strat["name_fa"]
+                        r["category"] = cat_id
+                        r["category_fa"] = cat_fa
+                        r["symbol"] = symbol
+                        r["timeframe"] = timeframe
+                        results.append(r)
+                    except Exception as e:
+                        results.append({
+                            "strategy_id": strat["id"], "strategy_name": strat["name"],
+                            "strategy_name_fa": strat["name_fa"], "category": cat_id,
+                            "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
+                            "signal": "NEUTRAL", "confidence": 0,
+                            "reason_fa": f"خطا: {str(e)[:50]}",
+                            "setup": {"has_setup": False},
+                        })
+
+
+        # ── Pack 3: Volume & Flow (25 strategies) ──
+        if PACK3_LOADED:
+            for pack3_strats, cat_id, cat_fa in [
+                (OBV_STRATEGIES, "OBV", "حجم تعادلی"),
+                (MFI_STRATEGIES, "MFI", "شاخص جریان پول"),
+                (VWAP_STRATEGIES, "VWAP", "میانگین وزنی حجم"),
+                (AD_STRATEGIES, "AD", "تجمع/توزیع"),
+                (FI_STRATEGIES, "FI", "شاخص قدرت"),
+            ]:
+                for strat in pack3_strats:
+                    try:
+                        r = strat["func"](df, context, symbol, timeframe)
+                        r["strategy_id"] = strat["id"]
+                        r["strategy_name"] = strat["name"]
+                        r["strategy_name_fa"] = strat["name_fa"]
+                        r["category"] = cat_id
+                        r["category_fa"] = cat_fa
+                        r["symbol"] = symbol
+                        r["timeframe"] = timeframe
+                        results.append(r)
+                    except Exception as e:
+                        results.append({
+                            "strategy_id": strat["id"], "strategy_name": strat["name"],
+                            "strategy_name_fa": strat["name_fa"], "category": cat_id,
+                            "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
+                            "signal": "NEUTRAL", "confidence": 0,
+                            "reason_fa": f"خطا: {str(e)[:50]}",
+                            "setup": {"has_setup": False},
+                        })
+
+
+        # ── Pack 4: Trend Systems (25 strategies) ──
+        if PACK4_LOADED:
+            for pack4_strats, cat_id, cat_fa in [
+                (ADX_ADV_STRATEGIES, "ADX_ADV", "ADX پیشرفته"),
+                (STREND_STRATEGIES, "STREND", "سوپرترند"),
+                (AROON_STRATEGIES, "AROON", "آرون"),
+                (DPO_STRATEGIES, "DPO", "DPO"),
+                (VORTEX_STRATEGIES, "VORTEX", "ورتکس"),
+            ]:
+                for strat in pack4_strats:
+                    try:
+                        r = strat["func"](df, context, symbol, timeframe)
+                        r["strategy_id"] = strat["id"]
+                        r["strategy_name"] = strat["name"]
+                        r["strategy_name_fa"] = strat["name_fa"]
+                        r["category"] = cat_id
+                        r["category_fa"] = cat_fa
+                        r["symbol"] = symbol
+                        r["timeframe"] = timeframe
+                        results.append(r)
+                    except Exception as e:
+                        results.append({
+                            "strategy_id": strat["id"], "strategy_name": strat["name"],
+                            "strategy_name_fa": strat["name_fa"], "category": cat_id,
+                            "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
+                            "signal": "NEUTRAL", "confidence": 0,
+                            "reason_fa": f"خطا: {str(e)[:50]}",
+                            "setup": {"has_setup": False},
+                        })
+
+
+        # ── Pack 5: Statistical & Transform (25 strategies) ──
+        if PACK5_LOADED:
+            for pack5_strats, cat_id, cat_fa in [
+                (ELDER_STRATEGIES, "ELDER", "Elder Ray"),
+                (FISHER_STRATEGIES, "FISHER", "Fisher Transform"),
+                (HEIKIN_STRATEGIES, "HEIKIN", "هیکن آشی"),
+                (CHOP_STRATEGIES, "CHOP", "شاخص Choppiness"),
+                (MASS_STRATEGIES, "MASS", "شاخص Mass"),
+            ]:
+                for strat in pack5_strats:
+                    try:
+                        r = strat["func"](df, context, symbol, timeframe)
+                        r["strategy_id"] = strat["id"]
+                        r["strategy_name"] = strat["name"]
+                        r["strategy_name_fa"] = strat["name_fa"]
+                        r["category"] = cat_id
+                        r["category_fa"] = cat_fa
+                        r["symbol"] = symbol
+                        r["timeframe"] = timeframe
+                        results.append(r)
+                    except Exception as e:
+                        results.append({
+                            "strategy_id": strat["id"], "strategy_name": strat["name"],
+                            "strategy_name_fa": strat["name_fa"], "category": cat_id,
+                            "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
+                            "signal": "NEUTRAL", "confidence": 0,
+                            "reason_fa": f"خطا: {str(e)[:50]}",
+                            "setup": {"has_setup": False},
+                        })
+
+
+        # ── Pack 6: Pattern & Structure (25 strategies) ──
+        if PACK6_LOADED:
+            for pack6_strats, cat_id, cat_fa in [
+                (PIVOT_ADV_STRATEGIES, "PIVOT_ADV", "پیوت پیشرفته"),
+                (GAPS_STRATEGIES, "GAPS", "تحلیل گپ"),
+                (RANGE_STRATEGIES, "RANGE", "تشخیص رنج"),
+                (SWING_STRATEGIES, "SWING", "سوئینگ"),
+                (HARMONIC_STRATEGIES, "HARMONIC", "الگوی هارمونیک"),
+            ]:
+                for strat in pack6_strats:
+                    try:
+                        r = strat["func"](df, context, symbol, timeframe)
+                        r["strategy_id"] = strat["id"]
+                        r["strategy_name"] = strat["name"]
+                        r["strategy_name_fa"] = strat["name_fa"]
+                        r["category"] = cat_id
+                        r["category_fa"] = cat_fa
+                        r["symbol"] = symbol
+                        r["timeframe"] = timeframe
+                        results.append(r)
+                    except Exception as e:
+                        results.append({
+                            "strategy_id": strat["id"], "strategy_name": strat["name"],
+                            "strategy_name_fa": strat["name_fa"], "category": cat_id,
+                            "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
+                            "signal": "NEUTRAL", "confidence": 0,
+                            "reason_fa": f"خطا: {str(e)[:50]}",
+                            "setup": {"has_setup": False},
+                        })
+
+
+        # ── Pack 7: Multi-Indicator Combos (18 strategies) ──
+        if PACK7_LOADED:
+            for pack7_strats, cat_id, cat_fa in [
+                (COMBO_STRATEGIES, "COMBO", "ترکیبی"),
+            ]:
+                for strat in pack7_strats:
+                    try:
+                        r = strat["func"](df, context, symbol, timeframe)
+                        r["strategy_id"] = strat["id"]
+                        r["strategy_name"] = strat["name"]
+                        r["strategy_name_fa"] = strat["name_fa"]
+                        r["category"] = cat_id
+                        r["category_fa"] = cat_fa
+                        r["symbol"] = symbol
+                        r["timeframe"] = timeframe
+                        results.append(r)
+                    except Exception as e:
+                        results.append({
+                            "strategy_id": strat["id"], "strategy_name": strat["name"],
+                            "strategy_name_fa": strat["name_fa"], "category": cat_id,
+                            "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
+                            "signal": "NEUTRAL", "confidence": 0,
+                            "reason_fa": f"خطا: {str(e)[:50]}",
+                            "setup": {"has_setup": False},
+                        })
+
+
+        # ── Pack 8: Advanced Indicators (25 strategies) ──
+        if PACK8_LOADED:
+            for pack8_strats, cat_id, cat_fa in [
+                (TSI_STRATEGIES, "TSI", "شاخص قدرت واقعی"),
+                (SQZ_STRATEGIES, "SQZ", "فشردگی مومنتوم"),
+                (ALLI_STRATEGIES, "ALLI", "تمساح ویلیامز"),
+                (KAMA_STRATEGIES, "KAMA", "میانگین تطبیقی کافمن"),
+                (ZLEMA_STRATEGIES, "ZLEMA", "میانگین بدون تاخیر"),
+            ]:
+                for strat in pack8_strats:
+                    try:
+                        r = strat["func"](df, context, symbol, timeframe)
+                        r["strategy_id"] = strat["id"]
+                        r["strategy_name"] = strat["name"]
+                        r["strategy_name_fa"] = strat["name_fa"]
+                        r["category"] = cat_id
+                        r["category_fa"] = cat_fa
+                        r["symbol"] = symbol
+                        r["timeframe"] = timeframe
+                        results.append(r)
+                    except Exception as e:
+                        results.append({
+                            "strategy_id": strat["id"], "strategy_name": strat["name"],
+                            "strategy_name_fa": strat["name_fa"], "category": cat_id,
+                            "category_fa": cat_fa, "symbol": symbol, "timeframe": timeframe,
+                            "signal": "NEUTRAL", "confidence": 0,
+                            "reason_fa": f"خطا: {str(e)[:50]}",
+                            "setup": {"has_setup": False},
+                        })
 
     # Aggregate
     buy_count = sum(1 for r in results if r["signal"] == "BUY")
@@ -815,6 +826,7 @@ def analyze_symbol(symbol: str, timeframe: str = "H1",
             "total_time": round(elapsed, 3),
             "bars_analyzed": len(df),
             "strategies_run": total,
+            "indicator_cache": store.stats(),
         },
     }
 
@@ -9,6 +9,7 @@ PSAR_05: SAR Trailing System (entry + trail management)
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "PSAR"
 CATEGORY_NAME = "Parabolic SAR"
@@ -61,6 +62,7 @@ def _psar(high, low, close, af_start=0.02, af_step=0.02, af_max=0.2):
     return sar, direction, af_arr
 
 
+@shared_indicator("ema")
 def _ema(data, period):
     if len(data) < period: return None
     e = np.zeros(len(data))
@@ -71,6 +73,7 @@ def _ema(data, period):
     return e
 
 
+@shared_indicator("adx_psar")
 def _adx(high, low, close, period=14):
     if len(high) < period * 2: return None, None, None
     n = len(high)
@@ -105,6 +108,7 @@ def _adx(high, low, close, period=14):
     return adx, plus_di, minus_di
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1: return None
     tr = np.maximum(high[1:]-low[1:], np.maximum(abs(high[1:]-close[:-1]), abs(low[1:]-close[:-1])))
@@ -9,6 +9,7 @@ REG_05: Regression Mean Revert (return to center line)
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "REG"
 CATEGORY_NAME = "Regression Channel"
@@ -40,6 +41,7 @@ def _linreg(close, period=50):
     return reg_line, slope, std, r_sq, residuals
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1: return None
     tr = np.maximum(high[1:]-low[1:], np.maximum(abs(high[1:]-close[:-1]), abs(low[1:]-close[:-1])))
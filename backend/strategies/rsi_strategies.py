@@ -17,8 +17,13 @@ RSI_12: RSI Range Shift
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
+from backend.strategies.signal_history import (
+    arr, prev, pick, trunc, before, peak_pairs, at, window_run_starts,
+)
 
 
+@shared_indicator("rsi_pd")
 def _rsi(series, period=14):
     delta = series.diff()
     gain = delta.where(delta > 0, 0.0)
@@ -41,6 +46,7 @@ def _find_peaks(series, order=5):
     return highs, lows
 
 
+@shared_indicator("ema_pd")
 def _ema(series, period):
     return series.ewm(span=period, adjust=False).mean()
 
@@ -414,21 +420,145 @@ def rsi_12_range_shift(df, context=None):
             "reason_fa": f"بدون رژیم مشخص RSI ({r:.1f})"}
 
 
+# ═══════════════════════════════════════════════════════
+# VECTORIZED (full history) — bar i == func(df.iloc[:i+1])
+# ═══════════════════════════════════════════════════════
+
+def _threshold_vec(df, period, lo, hi, cross_conf, zone_conf, zone_lo=None, zone_hi=None):
+    """Shared shape of RSI_02/03/04/06/07: cross back over lo/hi, then zone."""
+    r = arr(_rsi(df['close'], period))
+    rp = prev(r)
+    zl = lo if zone_lo is None else zone_lo
+    zh = hi if zone_hi is None else zone_hi
+    return pick(len(r), [
+        ((rp < lo) & (r >= lo), 1, cross_conf),
+        ((rp > hi) & (r <= hi), -1, cross_conf),
+        (r < zl, 1, zone_conf),
+        (r > zh, -1, zone_conf),
+    ])
+
+
+def rsi_01_classic_vec(df, context=None):
+    r = arr(_rsi(df['close'], 14))
+    rp, r3 = prev(r), prev(r, 2)
+    return pick(len(r), [
+        ((rp < 30) & (r >= 30), 1, np.minimum(90, 60 + trunc((30 - r3) * 2))),
+        ((rp > 70) & (r <= 70), -1, np.minimum(90, 60 + trunc((r3 - 70) * 2))),
+        (r < 30, 1, 55),
+        (r > 70, -1, 55),
+    ])
+
+
+def rsi_02_conservative_vec(df, context=None):
+    return _threshold_vec(df, 14, 25, 75, 80, 65)
+
+
+def rsi_03_aggressive_vec(df, context=None):
+    return _threshold_vec(df, 14, 35, 65, 60, 50)
+
+
+def rsi_04_ultra_vec(df, context=None):
+    return _threshold_vec(df, 14, 20, 80, 88, 75)
+
+
+def rsi_05_midline_vec(df, context=None):
+    r = arr(_rsi(df['close'], 14))
+    rp, r2 = prev(r), prev(r, 2)
+    return pick(len(r), [
+        ((rp < 50) & (r >= 50), 1, np.maximum(50, np.minimum(75, 55 + trunc((r - r2) * 2)))),
+        ((rp > 50) & (r <= 50), -1, np.maximum(50, np.minimum(75, 55 + trunc((r2 - r) * 2)))),
+    ])
+
+
+def rsi_06_fast_vec(df, context=None):
+    return _threshold_vec(df, 7, 30, 70, 65, 55, zone_lo=25, zone_hi=75)
+
+
+def rsi_07_slow_vec(df, context=None):
+    return _threshold_vec(df, 21, 30, 70, 75, 60)
+
+
+def _divergence_pairs(df):
+    close = arr(df['close'])
+    r = arr(_rsi(df['close'], 14))
+    (ph1, ph2), (pl1, pl2) = peak_pairs(close, 5)
+    (rh1, rh2), (rl1, rl2) = peak_pairs(r, 5)
+    lows = (pl1 >= 0) & (rl1 >= 0)
+    highs = (ph1 >= 0) & (rh1 >= 0)
+    return close, r, (pl1, pl2, rl1, rl2, lows), (ph1, ph2, rh1, rh2, highs)
+
+
+def rsi_08_divergence_vec(df, context=None):
+    close, r, (pl1, pl2, rl1, rl2, lows), (ph1, ph2, rh1, rh2, highs) = _divergence_pairs(df)
+    ok = ~before(len(r), 30)
+    bull = lows & (at(close, pl2) < at(close, pl1)) & (at(r, rl2) > at(r, rl1)) & (r < 40)
+    bear = highs & (at(close, ph2) > at(close, ph1)) & (at(r, rh2) < at(r, rh1)) & (r > 60)
+    return pick(len(r), [(ok & bull, 1, 78), (ok & bear, -1, 78)])
+
+
+def rsi_09_hidden_div_vec(df, context=None):
+    close, r, (pl1, pl2, rl1, rl2, lows), (ph1, ph2, rh1, rh2, highs) = _divergence_pairs(df)
+    ok = ~before(len(r), 30)
+    bull = lows & (at(close, pl2) > at(close, pl1)) & (at(r, rl2) < at(r, rl1))
+    bear = highs & (at(close, ph2) < at(close, ph1)) & (at(r, rh2) > at(r, rh1))
+    return pick(len(r), [(ok & bull, 1, 72), (ok & bear, -1, 72)])
+
+
+def rsi_10_double_pattern_vec(df, context=None):
+    r = arr(_rsi(df['close'], 14))
+    ok = ~before(len(r), 30)
+    os1, os2 = window_run_starts(r < 30, 30)
+    ob1, ob2 = window_run_starts(r > 70, 30)
+    w_bottom = (os1 >= 0) & (os2 - os1 > 3) & (r > 30) & (r < 50)
+    m_top = (ob1 >= 0) & (ob2 - ob1 > 3) & (r < 70) & (r > 50)
+    return pick(len(r), [(ok & w_bottom, 1, 76), (ok & m_top, -1, 76)])
+
+
+def rsi_11_ema_filter_vec(df, context=None):
+    close = df['close']
+    r = arr(_rsi(close, 14))
+    price = arr(close)
+    ema_val = arr(_ema(close, 50))
+    return pick(len(r), [
+        ((r < 30) & (price > ema_val), 1, 82),
+        ((r > 70) & (price < ema_val), -1, 82),
+        ((r < 35) & (price > ema_val), 1, 60),
+        ((r > 65) & (price < ema_val), -1, 60),
+    ])
+
+
+def rsi_12_range_shift_vec(df, context=None):
+    rsi = _rsi(df['close'], 14)
+    r = arr(rsi)
+    rp = prev(r)
+    ok = ~before(len(r), 50)
+    rsi_min = arr(rsi.rolling(50, min_periods=1).min())
+    rsi_max = arr(rsi.rolling(50, min_periods=1).max())
+    bull = ok & (rsi_min > 35) & (rsi_max < 85)
+    bear = ok & (rsi_min > 15) & (rsi_max < 65)
+    return pick(len(r), [
+        (bull & (rp < 45) & (r >= 45), 1, 74),
+        (bull & (r > 75), 0, 0),
+        (bear & (rp > 55) & (r <= 55), -1, 74),
+        (bear & (r < 25), 0, 0),
+    ])
+
+
 # ═══════════════════════════════════════════════════════
 # REGISTRY
 # ═══════════════════════════════════════════════════════
 
 RSI_STRATEGIES = [
-    {"id": "RSI_01", "name": "RSI Classic 30/70", "name_fa": "RSI کلاسیک ۳۰/۷۰", "func": rsi_01_classic},
-    {"id": "RSI_02", "name": "RSI Conservative 25/75", "name_fa": "RSI محافظه‌کار ۲۵/۷۵", "func": rsi_02_conservative},
-    {"id": "RSI_03", "name": "RSI Aggressive 35/65", "name_fa": "RSI تهاجمی ۳۵/۶۵", "func": rsi_03_aggressive},
-    {"id": "RSI_04", "name": "RSI Ultra 20/80", "name_fa": "RSI فوق‌العاده ۲۰/۸۰", "func": rsi_04_ultra},
-    {"id": "RSI_05", "name": "RSI Midline Cross", "name_fa": "RSI تقاطع خط ۵۰", "func": rsi_05_midline},
-    {"id": "RSI_06", "name": "RSI Fast(7)", "name_fa": "RSI سریع (۷)", "func": rsi_06_fast},
-    {"id": "RSI_07", "name": "RSI Slow(21)", "name_fa": "RSI آهسته (۲۱)", "func": rsi_07_slow},
-    {"id": "RSI_08", "name": "RSI Divergence", "name_fa": "واگرایی RSI", "func": rsi_08_divergence},
-    {"id": "RSI_09", "name": "RSI Hidden Divergence", "name_fa": "واگرایی مخفی RSI", "func": rsi_09_hidden_div},
-    {"id": "RSI_10", "name": "RSI Double Pattern", "name_fa": "الگوی دوگانه RSI", "func": rsi_10_double_pattern},
-    {"id": "RSI_11", "name": "RSI + EMA Filter", "name_fa": "RSI + فیلتر EMA", "func": rsi_11_ema_filter},
-    {"id": "RSI_12", "name": "RSI Range Shift", "name_fa": "تغییر رژیم RSI", "func": rsi_12_range_shift},
+    {"id": "RSI_01", "name": "RSI Classic 30/70", "name_fa": "RSI کلاسیک ۳۰/۷۰", "func": rsi_01_classic, "vec": rsi_01_classic_vec},
+    {"id": "RSI_02", "name": "RSI Conservative 25/75", "name_fa": "RSI محافظه‌کار ۲۵/۷۵", "func": rsi_02_conservative, "vec": rsi_02_conservative_vec},
+    {"id": "RSI_03", "name": "RSI Aggressive 35/65", "name_fa": "RSI تهاجمی ۳۵/۶۵", "func": rsi_03_aggressive, "vec": rsi_03_aggressive_vec},
+    {"id": "RSI_04", "name": "RSI Ultra 20/80", "name_fa": "RSI فوق‌العاده ۲۰/۸۰", "func": rsi_04_ultra, "vec": rsi_04_ultra_vec},
+    {"id": "RSI_05", "name": "RSI Midline Cross", "name_fa": "RSI تقاطع خط ۵۰", "func": rsi_05_midline, "vec": rsi_05_midline_vec},
+    {"id": "RSI_06", "name": "RSI Fast(7)", "name_fa": "RSI سریع (۷)", "func": rsi_06_fast, "vec": rsi_06_fast_vec},
+    {"id": "RSI_07", "name": "RSI Slow(21)", "name_fa": "RSI آهسته (۲۱)", "func": rsi_07_slow, "vec": rsi_07_slow_vec},
+    {"id": "RSI_08", "name": "RSI Divergence", "name_fa": "واگرایی RSI", "func": rsi_08_divergence, "vec": rsi_08_divergence_vec},
+    {"id": "RSI_09", "name": "RSI Hidden Divergence", "name_fa": "واگرایی مخفی RSI", "func": rsi_09_hidden_div, "vec": rsi_09_hidden_div_vec},
+    {"id": "RSI_10", "name": "RSI Double Pattern", "name_fa": "الگوی دوگانه RSI", "func": rsi_10_double_pattern, "vec": rsi_10_double_pattern_vec},
+    {"id": "RSI_11", "name": "RSI + EMA Filter", "name_fa": "RSI + فیلتر EMA", "func": rsi_11_ema_filter, "vec": rsi_11_ema_filter_vec},
+    {"id": "RSI_12", "name": "RSI Range Shift", "name_fa": "تغییر رژیم RSI", "func": rsi_12_range_shift, "vec": rsi_12_range_shift_vec},
 ]
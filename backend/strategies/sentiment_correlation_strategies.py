@@ -7,8 +7,10 @@ Total: 10
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 
+@shared_indicator("ema_seed0")
 def _ema(data, period):
     if len(data) < period:
         return None
@@ -20,6 +22,7 @@ def _ema(data, period):
     return e
 
 
+@shared_indicator("rsi_sentiment")
 def _rsi(close, period=14):
     if len(close) < period + 1:
         return None
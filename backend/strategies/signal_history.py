@@ -0,0 +1,237 @@
+"""
+Whilber-AI — Full-History Signal Evaluation
+=============================================
+Strategy functions answer "what is the signal on the last bar". For
+backtests / ranking we need the answer on EVERY bar.
+
+Vectorized contract (opt-in, per registry entry):
+    {"id": "RSI_01", ..., "func": rsi_01_classic, "vec": rsi_01_classic_vec}
+
+    vec(df, context=None) -> (signal, confidence)
+        signal      np.ndarray, len(df): 1 = BUY, -1 = SELL, 0 = NEUTRAL
+        confidence  np.ndarray, len(df): float, NaN where undefined
+
+    Bar i of the output must equal func(df.iloc[:i+1]) — i.e. only data up
+    to and including bar i may be used.
+
+Strategies without "vec" fall back to calling func on each window
+(df.iloc[:i+1], or the last `window` bars) — slow but always available.
+
+Usage:
+    from backend.strategies.signal_history import signal_history
+    res = signal_history(strat, df)          # {"signal", "confidence", "mode", ...}
+"""
+
+import time
+
+import numpy as np
+
+SIGNAL_CODES = {"BUY": 1, "SELL": -1, "NEUTRAL": 0}
+DEFAULT_MIN_BARS = 50
+
+
+# ══════ HELPERS FOR VEC IMPLEMENTATIONS ══════
+
+def arr(series):
+    """Series/array → float ndarray (no copy when already float)."""
+    return np.asarray(getattr(series, "values", series), dtype=float)
+
+
+def prev(a, k=1):
+    """Value k bars back (a.iloc[-1-k] at every bar); NaN where unavailable."""
+    a = np.asarray(a, dtype=float)
+    out = np.full(a.shape, np.nan)
+    if k < len(a):
+        out[k:] = a[:len(a) - k]
+    return out
+
+
+def pick(n, cases):
+    """
+    if/elif chain over whole arrays.
+    cases: [(condition, signal_code, confidence), ...] in the scalar
+    function's order — the first true condition wins, like its returns.
+    """
+    conds = [np.asarray(c, dtype=bool) for c, _, _ in cases]
+    sig = np.select(conds, [np.full(n, s, dtype=np.int8) for _, s, _ in cases], 0).astype(np.int8)
+    conf = np.select(conds, [np.broadcast_to(np.asarray(c, dtype=float), (n,)) for _, _, c in cases], 0.0)
+    return sig, conf
+
+
+def trunc(x):
+    """int() semantics (toward zero) for arrays."""
+    return np.trunc(x)
+
+
+def before(n, min_len):
+    """Mask of bars where the scalar function bails out with len(series) < min_len."""
+    return np.arange(n) < (min_len - 1)
+
+
+def peak_masks(a, order=5):
+    """Vector form of the packs' _find_peaks: (is_high, is_low) per index."""
+    a = np.asarray(a, dtype=float)
+    n = len(a)
+    hi = np.zeros(n, dtype=bool)
+    lo = np.zeros(n, dtype=bool)
+    if n <= 2 * order:
+        return hi, lo
+    core = a[order:n - order]
+    hi_c = np.ones(len(core), dtype=bool)
+    lo_c = np.ones(len(core), dtype=bool)
+    for j in range(1, order + 1):
+        left = a[order - j:n - order - j]
+        right = a[order + j:n - order + j]
+        hi_c &= (core >= left) & (core >= right)
+        lo_c &= (core <= left) & (core <= right)
+    hi[order:n - order] = hi_c
+    lo[order:n - order] = lo_c
+    return hi, lo
+
+
+def last_two(mask, lag=0):
+    """
+    (second_last, last) index of True entries visible at each bar, -1 if none.
+    lag: entries at j only become visible at bar j + lag (peaks need `order`
+    bars on their right before _find_peaks can see them).
+    """
+    mask = np.asarray(mask, dtype=bool)
+    n = len(mask)
+    idx = np.maximum.accumulate(np.where(mask, np.arange(n), -1)) if n else np.zeros(0, int)
+    before_j = np.concatenate([[-1], idx[:-1]]) if n else idx
+    last = np.full(n, -1)
+    if lag < n:
+        last[lag:] = idx[:n - lag]
+    second = np.where(last >= 0, before_j[np.maximum(last, 0)], -1)
+    return second, last
+
+
+def peak_pairs(a, order=5):
+    """Last two highs and lows as _find_peaks(series[:i+1]) would see them at bar i."""
+    hi, lo = peak_masks(a, order)
+    h1, h2 = last_two(hi, order)
+    l1, l2 = last_two(lo, order)
+    return (h1, h2), (l1, l2)
+
+
+def at(a, idx):
+    """a[idx] with NaN where idx == -1."""
+    a = np.asarray(a, dtype=float)
+    return np.where(idx >= 0, a[np.maximum(idx, 0)], np.nan)
+
+
+def window_run_starts(mask, win):
+    """
+    (second_last, last) start index of runs of True inside the trailing
+    `win`-bar window, counting a run already in progress at the window's
+    first bar as starting there (the packs' in_zone loops over iloc[-win:]).
+    """
+    mask = np.asarray(mask, dtype=bool)
+    n = len(mask)
+    ar = np.arange(n)
+    starts = mask & ~np.concatenate([[False], mask[:-1]])
+    s1, s2 = last_two(starts)
+    w = ar - win + 1
+    wc = np.maximum(w, 0)
+    edge = (w >= 0) & mask[wc] & ~starts[wc]
+    in_win = s2 >= w
+    last = np.where(in_win, s2, np.where(edge, wc, -1))
+    second = np.where(in_win, np.where(s1 >= w, s1, np.where(edge, wc, -1)), -1)
+    return second, last
+
+
+def any_in(mask, start_back, end_back):
+    """True where mask held on any bar in [i-start_back, i-end_back]."""
+    mask = np.asarray(mask, dtype=bool).astype(np.int64)
+    n = len(mask)
+    c = np.concatenate([[0], np.cumsum(mask)])
+    ar = np.arange(n)
+    lo = np.clip(ar - start_back, 0, n)
+    hi = np.clip(ar - end_back + 1, 0, n)
+    return (c[hi] - c[np.minimum(lo, hi)]) > 0
+
+
+# ══════ ADAPTER ══════
+
+def _rolling(func, df, context, window, start):
+    n = len(df)
+    sig = np.zeros(n, dtype=np.int8)
+    conf = np.zeros(n)
+    for i in range(start, n):
+        lo = 0 if window is None else max(0, i + 1 - window)
+        try:
+            r = func(df.iloc[lo:i + 1], context)
+        except Exception:
+            continue
+        if not r:
+            continue
+        sig[i] = SIGNAL_CODES.get(r.get("signal"), 0)
+        conf[i] = r.get("confidence", 0) or 0
+    return sig, conf
+
+
+def signal_history(strat, df, context=None, window=None, min_bars=DEFAULT_MIN_BARS,
+                   force_rolling=False):
+    """
+    Signal + confidence for every bar of df.
+
+    strat:   registry entry ({"id", "func", optional "vec"}) or a bare function.
+    window:  rolling fallback only — bars per call (None = full prefix, which is
+             what the vectorized path reproduces).
+    Bars before min_bars are NEUTRAL in both modes.
+    """
+    if callable(strat):
+        strat = {"id": getattr(strat, "__name__", "?"), "func": strat}
+    n = len(df)
+    start = min(max(int(min_bars), 1), n)
+    t0 = time.time()
+
+    vec = strat.get("vec")
+    if vec is not None and not force_rolling and window is None:
+        sig, conf = vec(df, context)
+        sig = np.asarray(sig, dtype=np.int8).copy()
+        conf = np.asarray(conf, dtype=float).copy()
+        # A NaN confidence means the scalar version would have raised → no signal
+        bad = np.isnan(conf)
+        sig[bad] = 0
+        conf[bad] = 0.0
+        sig[:start] = 0
+        conf[:start] = 0.0
+        mode = "vectorized"
+    else:
+        sig, conf = _rolling(strat["func"], df, context, window, start)
+        mode = "rolling"
+
+    return {
+        "id": strat.get("id"),
+        "signal": sig,
+        "confidence": conf,
+        "mode": mode,
+        "start": start,
+        "elapsed_ms": round((time.time() - t0) * 1000, 2),
+    }
+
+
+def evaluate_all(strategies, df, context=None, window=None, min_bars=DEFAULT_MIN_BARS):
+    """signal_history for a list of registry entries. Returns {id: result} + counts."""
+    results = {}
+    modes = {"vectorized": 0, "rolling": 0}
+    t0 = time.time()
+    for strat in strategies:
+        try:
+            res = signal_history(strat, df, context, window, min_bars)
+        except Exception as e:
+            print(f"[SIGNAL_HISTORY] {strat.get('id')}: {e}")
+            continue
+        results[strat["id"]] = res
+        modes[res["mode"]] += 1
+    return {
+        "results": results,
+        "modes": modes,
+        "bars": len(df),
+        "elapsed_sec": round(time.time() - t0, 3),
+    }
+
+
+def has_vectorized(strat):
+    return strat.get("vec") is not None
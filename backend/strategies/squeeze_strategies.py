@@ -9,6 +9,7 @@ SQZ_05: Squeeze Momentum Shift (histogram color change)
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "SQZ"
 CATEGORY_NAME = "Squeeze Momentum"
@@ -17,6 +18,7 @@ ICON = "🔥"
 COLOR = "#ff5722"
 
 
+@shared_indicator("ema")
 def _ema(data, period):
     if len(data) < period: return None
     e = np.zeros(len(data))
@@ -27,6 +29,7 @@ def _ema(data, period):
     return e
 
 
+@shared_indicator("sma_zero")
 def _sma(data, period):
     if len(data) < period: return None
     r = np.zeros(len(data))
@@ -35,6 +38,7 @@ def _sma(data, period):
     return r
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1: return None
     tr = np.maximum(high[1:] - low[1:], np.maximum(abs(high[1:] - close[:-1]), abs(low[1:] - close[:-1])))
@@ -45,6 +49,7 @@ def _atr(high, low, close, period=14):
     return np.concatenate([[0], atr])
 
 
+@shared_indicator("adx_line")
 def _adx(high, low, close, period=14):
     if len(high) < period * 2: return None
     n = len(high)
@@ -13,8 +13,11 @@ STOCH_08: Stoch Pop (George Lane)
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
+from backend.strategies.signal_history import arr, prev, pick, trunc, before, peak_pairs, at, any_in
 
 
+@shared_indicator("stoch_pd")
 def _stoch(df, k_period=14, d_period=3, smooth=3):
     low_min = df['low'].rolling(window=k_period).min()
     high_max = df['high'].rolling(window=k_period).max()
@@ -24,6 +27,7 @@ def _stoch(df, k_period=14, d_period=3, smooth=3):
     return k, d
 
 
+@shared_indicator("rsi_pd")
 def _rsi(series, period=14):
     delta = series.diff()
     gain = delta.where(delta > 0, 0.0)
@@ -263,17 +267,108 @@ def stoch_08_pop(df, context=None):
             "reason_fa": f"بدون Pop استوکاستیک (K:{k0:.0f})"}
 
 
+# ═══════════════════════════════════════════════════════
+# VECTORIZED (full history) — bar i == func(df.iloc[:i+1])
+# ═══════════════════════════════════════════════════════
+
+def _stoch_arrays(df, k_period=14, d_period=3, smooth=3):
+    k, d = _stoch(df, k_period, d_period, smooth)
+    return arr(k), arr(d)
+
+
+def _kd_cross_vec(df, k_period, d_period, smooth, lo, hi, cross_conf, zone=None):
+    """STOCH_01/02/03: K/D cross inside lo/hi, optional zone fallback (zone_lo, zone_hi, conf)."""
+    k0, d0 = _stoch_arrays(df, k_period, d_period, smooth)
+    k1, d1 = prev(k0), prev(d0)
+    cases = [
+        ((k0 < lo) & (k1 <= d1) & (k0 > d0), 1, cross_conf),
+        ((k0 > hi) & (k1 >= d1) & (k0 < d0), -1, cross_conf),
+    ]
+    if zone:
+        zl, zh, zc = zone
+        cases += [(k0 < zl, 1, zc), (k0 > zh, -1, zc)]
+    return pick(len(k0), cases)
+
+
+def stoch_01_classic_vec(df, context=None):
+    return _kd_cross_vec(df, 14, 3, 3, 20, 80, 75, zone=(20, 80, 50))
+
+
+def stoch_02_fast_vec(df, context=None):
+    return _kd_cross_vec(df, 5, 3, 3, 25, 75, 62)
+
+
+def stoch_03_slow_vec(df, context=None):
+    return _kd_cross_vec(df, 21, 7, 7, 20, 80, 78, zone=(25, 75, 55))
+
+
+def stoch_04_conservative_vec(df, context=None):
+    k0, d0 = _stoch_arrays(df, 14, 3, 3)
+    k1 = prev(k0)
+    return pick(len(k0), [
+        ((k0 < 25) & (d0 < 25) & (k0 > k1), 1, 70),
+        ((k0 > 75) & (d0 > 75) & (k0 < k1), -1, 70),
+    ])
+
+
+def stoch_05_kd_cross_vec(df, context=None):
+    k0, d0 = _stoch_arrays(df, 14, 3, 3)
+    k1, d1 = prev(k0), prev(d0)
+    buy_bonus = np.where(k0 < 30, 15, np.where(k0 < 50, 5, 0))
+    sell_bonus = np.where(k0 > 70, 15, np.where(k0 > 50, 5, 0))
+    return pick(len(k0), [
+        ((k1 <= d1) & (k0 > d0), 1, 55 + buy_bonus),
+        ((k1 >= d1) & (k0 < d0), -1, 55 + sell_bonus),
+    ])
+
+
+def stoch_06_divergence_vec(df, context=None):
+    close = arr(df['close'])
+    k, _ = _stoch_arrays(df, 14, 3, 3)
+    (ph1, ph2), (pl1, pl2) = peak_pairs(close, 5)
+    (kh1, kh2), (kl1, kl2) = peak_pairs(k, 3)
+    ok = ~before(len(k), 30)
+    bull = (ok & (pl1 >= 0) & (kl1 >= 0) & (at(close, pl2) < at(close, pl1))
+            & (at(k, kl2) > at(k, kl1)) & (k < 40))
+    bear = (ok & (ph1 >= 0) & (kh1 >= 0) & (at(close, ph2) > at(close, ph1))
+            & (at(k, kh2) < at(k, kh1)) & (k > 60))
+    return pick(len(k), [(bull, 1, 75), (bear, -1, 75)])
+
+
+def stoch_07_rsi_combo_vec(df, context=None):
+    k0, _ = _stoch_arrays(df, 14, 3, 3)
+    r = arr(_rsi(df['close'], 14))
+    return pick(len(k0), [
+        ((k0 < 20) & (r < 35), 1, np.minimum(88, 70 + trunc((35 - r) + (20 - k0) / 2))),
+        ((k0 > 80) & (r > 65), -1, np.minimum(88, 70 + trunc((r - 65) + (k0 - 80) / 2))),
+        ((k0 < 25) & (r < 40), 1, 60),
+        ((k0 > 75) & (r > 60), -1, 60),
+    ])
+
+
+def stoch_08_pop_vec(df, context=None):
+    k0, _ = _stoch_arrays(df, 14, 3, 3)
+    ok = ~before(len(k0), 10)
+    # recent_10.iloc[:-2] → bars i-9 .. i-2
+    return pick(len(k0), [
+        (ok & any_in(k0 < 20, 9, 2) & (k0 > 75), 1, 80),
+        (ok & any_in(k0 > 80, 9, 2) & (k0 < 25), -1, 80),
+        (ok & any_in(k0 < 30, 9, 2) & (k0 > 60), 1, 58),
+        (ok & any_in(k0 > 70, 9, 2) & (k0 < 40), -1, 58),
+    ])
+
+
 # ═══════════════════════════════════════════════════════
 # REGISTRY
 # ═══════════════════════════════════════════════════════
 
 STOCH_STRATEGIES = [
-    {"id": "STOCH_01", "name": "Stoch Classic 20/80", "name_fa": "استوکاستیک کلاسیک", "func": stoch_01_classic},
-    {"id": "STOCH_02", "name": "Stoch Fast (5,3,3)", "name_fa": "استوکاستیک سریع", "func": stoch_02_fast},
-    {"id": "STOCH_03", "name": "Stoch Slow (21,7,7)", "name_fa": "استوکاستیک آهسته", "func": stoch_03_slow},
-    {"id": "STOCH_04", "name": "Stoch Conservative 25/75", "name_fa": "استوکاستیک محافظه‌کار", "func": stoch_04_conservative},
-    {"id": "STOCH_05", "name": "Stoch K/D Cross", "name_fa": "تقاطع K/D استوکاستیک", "func": stoch_05_kd_cross},
-    {"id": "STOCH_06", "name": "Stoch Divergence", "name_fa": "واگرایی استوکاستیک", "func": stoch_06_divergence},
-    {"id": "STOCH_07", "name": "Stoch + RSI Combo", "name_fa": "استوکاستیک + RSI ترکیبی", "func": stoch_07_rsi_combo},
-    {"id": "STOCH_08", "name": "Stoch Pop", "name_fa": "پرش استوکاستیک (Lane)", "func": stoch_08_pop},
+    {"id": "STOCH_01", "name": "Stoch Classic 20/80", "name_fa": "استوکاستیک کلاسیک", "func": stoch_01_classic, "vec": stoch_01_classic_vec},
+    {"id": "STOCH_02", "name": "Stoch Fast (5,3,3)", "name_fa": "استوکاستیک سریع", "func": stoch_02_fast, "vec": stoch_02_fast_vec},
+    {"id": "STOCH_03", "name": "Stoch Slow (21,7,7)", "name_fa": "استوکاستیک آهسته", "func": stoch_03_slow, "vec": stoch_03_slow_vec},
+    {"id": "STOCH_04", "name": "Stoch Conservative 25/75", "name_fa": "استوکاستیک محافظه‌کار", "func": stoch_04_conservative, "vec": stoch_04_conservative_vec},
+    {"id": "STOCH_05", "name": "Stoch K/D Cross", "name_fa": "تقاطع K/D استوکاستیک", "func": stoch_05_kd_cross, "vec": stoch_05_kd_cross_vec},
+    {"id": "STOCH_06", "name": "Stoch Divergence", "name_fa": "واگرایی استوکاستیک", "func": stoch_06_divergence, "vec": stoch_06_divergence_vec},
+    {"id": "STOCH_07", "name": "Stoch + RSI Combo", "name_fa": "استوکاستیک + RSI ترکیبی", "func": stoch_07_rsi_combo, "vec": stoch_07_rsi_combo_vec},
+    {"id": "STOCH_08", "name": "Stoch Pop", "name_fa": "پرش استوکاستیک (Lane)", "func": stoch_08_pop, "vec": stoch_08_pop_vec},
 ]
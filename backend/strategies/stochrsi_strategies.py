@@ -9,6 +9,7 @@ SRSI_05: StochRSI Multi-Period
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 
 def _calc_rsi(close, period=14):
@@ -44,6 +45,7 @@ def _calc_stoch_rsi(close, rsi_period=14, stoch_period=14, k_smooth=3, d_smooth=
     return k, d
 
 
+@shared_indicator("ema_seed0")
 def _ema(data, period):
     if len(data) < period:
         return None
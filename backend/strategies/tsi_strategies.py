@@ -9,6 +9,7 @@ TSI_05: TSI Divergence
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "TSI"
 CATEGORY_NAME = "True Strength Index"
@@ -17,6 +18,7 @@ ICON = "💪"
 COLOR = "#00bcd4"
 
 
+@shared_indicator("ema")
 def _ema(data, period):
     if len(data) < period:
         return None
@@ -47,6 +49,7 @@ def _tsi(close, long_p=25, short_p=13, signal_p=7):
     return tsi_line, sig
 
 
+@shared_indicator("adx_line")
 def _adx(high, low, close, period=14):
     if len(high) < period * 2:
         return None
@@ -82,6 +85,7 @@ def _adx(high, low, close, period=14):
     return adx
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1:
         return None
@@ -8,13 +8,16 @@ VORTEX_05: Divergence
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
+@shared_indicator("ema")
 def _ema(data, period):
     if len(data) < period: return None
     e = np.zeros(len(data)); e[period-1] = np.mean(data[:period]); m = 2/(period+1)
     for i in range(period, len(data)): e[i] = data[i]*m + e[i-1]*(1-m)
     return e
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period+1: return None
     tr = np.maximum(high[1:]-low[1:], np.maximum(abs(high[1:]-close[:-1]), abs(low[1:]-close[:-1])))
@@ -45,6 +48,7 @@ def _make_setup(direction, entry, atr_val, pip, rr_min=1.5):
 def _neutral(r):
     return {"signal":"NEUTRAL","confidence":0,"reason_fa":r,"setup":{"has_setup":False}}
 
+@shared_indicator("adx")
 def _adx(high, low, close, period=14):
     if len(high) < period*2+1: return None, None, None
     n = len(high); pdm=np.zeros(n); mdm=np.zeros(n); tr=np.zeros(n)
@@ -8,6 +8,7 @@ WR_03: Williams %R + Trend Filter
 
 import numpy as np
 import pandas as pd
+from backend.strategies.indicator_store import shared_indicator
 
 
 def _williams_r(df, period=14):
@@ -17,6 +18,7 @@ def _williams_r(df, period=14):
     return wr
 
 
+@shared_indicator("ema_pd")
 def _ema(series, period):
     return series.ewm(span=period, adjust=False).mean()
 
@@ -9,6 +9,7 @@ ZLEMA_05: ZLEMA Momentum (slope acceleration)
 """
 
 import numpy as np
+from backend.strategies.indicator_store import shared_indicator
 
 CATEGORY_ID = "ZLEMA"
 CATEGORY_NAME = "Zero-Lag EMA"
@@ -34,6 +35,7 @@ def _zlema(data, period):
     return e
 
 
+@shared_indicator("ema")
 def _ema(data, period):
     if len(data) < period: return None
     e = np.zeros(len(data))
@@ -44,6 +46,7 @@ def _ema(data, period):
     return e
 
 
+@shared_indicator("sma_zero")
 def _sma(data, period):
     if len(data) < period: return None
     r = np.zeros(len(data))
@@ -52,6 +55,7 @@ def _sma(data, period):
     return r
 
 
+@shared_indicator("atr")
 def _atr(high, low, close, period=14):
     if len(high) < period + 1: return None
     tr = np.maximum(high[1:] - low[1:], np.maximum(abs(high[1:] - close[:-1]), abs(low[1:] - close[:-1])))
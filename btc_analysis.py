@@ -1,4 +1,4 @@
-import json, os, glob
+import os, sys
 from datetime import datetime, timezone
 
 TRACK_DIR = os.path.join("C:\\", "Users", "Administrator", "Desktop", "mvp", "track_records")
@@ -11,18 +11,16 @@ POINT_VALUE = 0.01
 START_DATE = datetime(2026, 2, 21, 0, 0, tzinfo=timezone.utc)
 END_DATE = datetime(2026, 2, 25, 0, 0, tzinfo=timezone.utc)
 
-files = glob.glob(os.path.join(TRACK_DIR, "rec_*_BTCUSD_H1.json"))
+sys.path.insert(0, os.path.dirname(TRACK_DIR))
+from backend.api import trade_store
+
+records = trade_store.grouped_trades(symbols=["BTCUSD"], closed_only=False)
 
 strategy_results = {}
 
-for fpath in files:
-    try:
-        with open(fpath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except:
+for key, trades in records.items():
+    if not key.endswith("_BTCUSD_H1"):
         continue
-
-    trades = data.get("trades", [])
     if not trades:
         continue
 
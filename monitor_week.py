@@ -1,5 +1,5 @@
 """Daily health monitor — run anytime to check system."""
-import urllib.request, json, os, glob, time
+import urllib.request, json, os, sys, time
 from datetime import datetime, timezone
 from collections import defaultdict
 
@@ -47,16 +47,16 @@ if os.path.exists(sf):
 # Symbols
 print(f"\n  Symbols:")
 syms = defaultdict(lambda: {"t":0, "a":0})
-for fp in glob.glob(os.path.join(TR, "rec_*.json")):
-    try:
-        with open(fp, "r", encoding="utf-8") as f:
-            d = json.load(f)
-        for t in d.get("trades", []):
-            s = t.get("symbol", "?")
-            syms[s]["t"] += 1
-            if t.get("status") == "active":
-                syms[s]["a"] += 1
-    except: pass
+try:
+    sys.path.insert(0, os.path.dirname(TR))
+    from backend.api import trade_store
+    for _, t in trade_store.iter_trades(closed_only=False):
+        s = t.get("symbol", "?")
+        syms[s]["t"] += 1
+        if t.get("status") == "active":
+            syms[s]["a"] += 1
+except Exception as e:
+    print(f"    Trade store error: {e}")
 
 for s in ["XAUUSD","EURUSD","GBPUSD","USDJPY","BTCUSD","NAS100","US30","XAGUSD","AUDUSD","USDCAD","NZDUSD","USDCHF"]:
     d = syms.get(s, {"t":0, "a":0})
@@ -1,5 +1,5 @@
 """Analyze BTCUSD + XAUUSD track records for bit.md report."""
-import json, glob, os, sys
+import json, os, sys
 from datetime import datetime, timezone
 from collections import defaultdict
 
@@ -18,20 +18,18 @@ COSTS = {
 all_trades = {}
 file_count = {'BTCUSD': 0, 'XAUUSD': 0}
 
+sys.path.insert(0, os.path.dirname(BASE))
+from backend.api import trade_store
+
 for symbol in ['BTCUSD', 'XAUUSD']:
-    pattern = os.path.join(BASE, f'rec_*_{symbol}_*.json')
-    files = glob.glob(pattern)
-    file_count[symbol] = len(files)
-    for fpath in files:
-        try:
-            with open(fpath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            for t in data.get('trades', []):
-                tid = t.get('id', '')
-                if tid:
-                    all_trades[tid] = t
-        except Exception:
-            pass
+    grouped = trade_store.grouped_trades(symbols=[symbol], closed_only=False)
+    keys = [k for k in grouped if f'_{symbol}_' in k]
+    file_count[symbol] = len(keys)
+    for key in keys:
+        for t in grouped[key]:
+            tid = t.get('id', '')
+            if tid:
+                all_trades[tid] = t
 
 # Filter: opened AND closed in window
 results = []
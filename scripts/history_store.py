@@ -0,0 +1,73 @@
+"""
+Whilber-AI — Local Bar History Store
+======================================
+Inspect and fill the memory-mapped history store (backend.mt5.bar_source).
+
+  python scripts/history_store.py info
+  python scripts/history_store.py sync XAUUSD H1 50000      (needs MT5)
+  python scripts/history_store.py import XAUUSD H1 bars.csv (time,open,high,low,close[,tick_volume,spread])
+  python scripts/history_store.py bench XAUUSD H1 [bars]
+
+Copy the history directory to a Linux box and run with
+WHILBER_BAR_SOURCE=store WHILBER_HISTORY_DIR=<dir> — no terminal needed.
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.mt5.bar_source import HistoryStore, MT5BarSource, load_bars, StoreBarSource
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return 1
+    cmd = sys.argv[1]
+    store = HistoryStore()
+
+    if cmd == "info":
+        print(f"History dir: {store.root}")
+        for s in store.series():
+            print(f"  {s['symbol']:<10}{s['timeframe']:<5}{s['bars']:>9} bars  "
+                  f"{s['first']} → {s['last']}  ({s['mb']} MB)")
+        return 0
+
+    symbol, tf = sys.argv[2].upper(), sys.argv[3].upper()
+
+    if cmd == "sync":
+        count = int(sys.argv[4]) if len(sys.argv) > 4 else 50000
+        rates = MT5BarSource().rates(symbol, tf, count=count)
+        if rates is None:
+            print("No data from MT5")
+            return 1
+        print(f"{symbol} {tf}: +{store.update(symbol, tf, rates)} bars, {store.count(symbol, tf)} stored")
+        return 0
+
+    if cmd == "import":
+        df = pd.read_csv(sys.argv[4])
+        df["time"] = pd.to_datetime(df["time"])
+        print(f"{symbol} {tf}: +{store.update(symbol, tf, df)} bars, {store.count(symbol, tf)} stored")
+        return 0
+
+    if cmd == "bench":
+        count = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        source = StoreBarSource(store)
+        t0 = time.perf_counter()
+        view = store.read(symbol, tf, count)
+        t1 = time.perf_counter()
+        df = load_bars(symbol, tf, count, source=source)
+        t2 = time.perf_counter()
+        print(f"{symbol} {tf}: {len(view)} bars | memmap view {(t1 - t0) * 1000:.2f} ms | "
+              f"DataFrame {(t2 - t1) * 1000:.2f} ms")
+        return 0 if df is not None else 1
+
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
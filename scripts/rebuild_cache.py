@@ -2,58 +2,32 @@
 import os, json, time, sys, glob
 from datetime import datetime, timezone, timedelta
 
-TRACK_DIR = r"C:\Users\Administrator\Desktop\mvp\track_records"
+PROJECT_DIR = r"C:\Users\Administrator\Desktop\mvp"
+TRACK_DIR = os.path.join(PROJECT_DIR, "track_records")
 CACHE_FILE = r"C:\Users\Administrator\Desktop\mvp\data\tracker_cache.json"
 
-# ═══ PIP VALUES (per 1 standard lot) ═══
-PIP_SIZE = {
-    "XAUUSD": 0.1, "XAGUSD": 0.01, "EURUSD": 0.0001, "GBPUSD": 0.0001,
-    "USDJPY": 0.01, "AUDUSD": 0.0001, "USDCAD": 0.0001, "NZDUSD": 0.0001,
-    "USDCHF": 0.0001, "BTCUSD": 1.0, "NAS100": 1.0, "US30": 1.0,
-}
-
-# PIP_VALUE per 0.01 lot (what tracker uses)
-PIP_VALUE_001 = {
-    "XAUUSD": 0.10, "XAGUSD": 0.50, "EURUSD": 0.10, "GBPUSD": 0.10,
-    "USDJPY": 0.07, "AUDUSD": 0.10, "USDCAD": 0.07, "NZDUSD": 0.10,
-    "USDCHF": 0.10, "BTCUSD": 0.01, "NAS100": 0.10, "US30": 0.10,
-}
-
-def calc_pips(trade):
-    """Calculate PnL in pips from trade data."""
-    pnl_pips = trade.get("pnl_pips", 0)
-    if pnl_pips and pnl_pips != 0:
-        return pnl_pips
-    
-    # Fallback: calculate from entry/exit prices
-    entry = trade.get("entry_price", 0)
-    exit_p = trade.get("exit_price", 0)
-    symbol = trade.get("symbol", "")
-    direction = trade.get("direction", "BUY")
-    pip_size = PIP_SIZE.get(symbol, 0.0001)
-    
-    if entry and exit_p and pip_size:
-        if direction == "BUY":
-            return round((exit_p - entry) / pip_size, 1)
-        else:
-            return round((entry - exit_p) / pip_size, 1)
-    
-    # Last fallback: estimate from pnl_usd
-    pnl_usd = trade.get("pnl_usd", 0)
-    pip_val = PIP_VALUE_001.get(symbol, 0.10)
-    if pnl_usd and pip_val:
-        return round(pnl_usd / pip_val, 1)
-    
-    return 0
+sys.path.insert(0, PROJECT_DIR)
+from backend.api.trade_aggregates import calc_pips
 
 
 def rebuild(since_date=None):
     """
     Rebuild cache with optional date filter.
     since_date: ISO string or None for all trades
+
+    The all-trades ranking comes straight from the running aggregates
+    (O(strategies)); only a date-filtered rebuild scans the trade store.
     """
     t0 = time.time()
     
+    if not since_date:
+        from backend.api import trade_aggregates
+        cache = trade_aggregates.get_cache()
+        _save(cache)
+        print(f"[REBUILD] {len(cache['ranking'])} strategies, {cache['total_trades']} trades, "
+              f"{round(time.time() - t0, 1)}s (aggregates)")
+        return cache
+    
     # Parse since_date
     cutoff = None
     if since_date:
@@ -62,23 +36,13 @@ def rebuild(since_date=None):
         except:
             cutoff = None
     
-    files = [f for f in os.listdir(TRACK_DIR) if f.startswith("rec_") and f.endswith(".json")]
+    from backend.api import trade_store
+    grouped = trade_store.grouped_trades()
     ranking = []
     all_symbols = set()
     total_trades = 0
     
-    for filename in files:
-        filepath = os.path.join(TRACK_DIR, filename)
-        sid = filename[4:-5]
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                rec = json.load(f)
-        except:
-            continue
-        
-        trades = rec.get("trades", [])
-        closed = [t for t in trades if t.get("status") == "closed"]
-        
+    for sid, closed in grouped.items():
         # ═══ DATE FILTER ═══
         if cutoff:
             filtered = []
@@ -178,16 +142,12 @@ def rebuild(since_date=None):
     
     # ═══ QUALITY FLAGS ═══
     try:
-        sys.path.insert(0, r"C:\Users\Administrator\Desktop\mvp")
         from backend.api.signal_validator import flag_strategy_record as _fsr
         
         for item in ranking:
             sid = item["strategy_id"]
-            rec_path = os.path.join(TRACK_DIR, f"rec_{sid}.json")
             try:
-                with open(rec_path, "r", encoding="utf-8") as f:
-                    rd = json.load(f)
-                cl = [t for t in rd.get("trades", []) if t.get("status") == "closed"]
+                cl = grouped.get(sid, [])
                 if len(cl) >= 3:
                     q = _fsr(cl)
                     item["quality"] = q.get("quality", "unknown")
@@ -212,8 +172,7 @@ def rebuild(since_date=None):
         "since": since_date or "all",
     }
     
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=1)
+    _save(cache)
     
     elapsed = round(time.time() - t0, 1)
     print(f"[REBUILD] {len(ranking)} strategies, {total_trades} trades, {elapsed}s")
@@ -221,6 +180,11 @@ def rebuild(since_date=None):
     return cache
 
 
+def _save(cache):
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=1)
+
+
 if __name__ == "__main__":
     # Support command-line date filter
     since = None
@@ -12,6 +12,7 @@ from pathlib import Path
 import requests
 
 BASE_DIR = Path(r"C:\Users\Administrator\Desktop\mvp")
+sys.path.insert(0, str(BASE_DIR))
 BOT_URL = "http://localhost:8001"
 WEB_URL = "http://localhost:8000"
 
@@ -80,10 +81,11 @@ for s in wl_data.get("strategies", []):
     test(f"{s['strategy_id']} WR >= 75%", s.get("win_rate", 0) >= 75, f"got {s.get('win_rate')}")
     test(f"{s['strategy_id']} net profitable", s.get("net_pips", 0) > 0, f"got {s.get('net_pips')}")
 
-# Verify track record files exist for each strategy
+# Verify track records exist for each strategy
+from backend.api import trade_store
 for s in wl_data.get("strategies", []):
-    rec_path = BASE_DIR / "track_records" / f"rec_{s['strategy_id']}.json"
-    test(f"Track record exists: {s['strategy_id']}", rec_path.exists())
+    test(f"Track record exists: {s['strategy_id']}",
+         bool(trade_store.load_trades(s["strategy_id"], limit=1)))
 
 
 # ==================================================================
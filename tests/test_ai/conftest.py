@@ -0,0 +1,28 @@
+"""Shared fixtures for the AI core tests."""
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope="session")
+def make_ohlcv() -> Callable[..., pd.DataFrame]:
+    """Factory for a synthetic hourly OHLCV frame: make_ohlcv(n, seed=0)."""
+
+    def _make(n: int, seed: int = 0) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        close = 100 + np.cumsum(rng.normal(0, 1, n))
+        return pd.DataFrame(
+            {
+                "open": close + rng.normal(0, 0.3, n),
+                "high": close + 1.0,
+                "low": close - 1.0,
+                "close": close,
+                "tick_volume": rng.integers(1, 1000, n),
+            },
+            index=pd.date_range("2024-01-01", periods=n, freq="h"),
+        )
+
+    return _make
@@ -0,0 +1,63 @@
+"""Tests for the AI pipeline orchestration."""
+
+from typing import Callable
+
+import pandas as pd
+import pytest
+
+from ai_core.pipeline import AIPipeline
+from ai_core.utils import clear_feature_cache
+
+
+@pytest.fixture(scope="module")
+def pipeline(make_ohlcv: Callable[..., pd.DataFrame]) -> AIPipeline:
+    clear_feature_cache()
+    pipe = AIPipeline()
+    pipe.train(make_ohlcv(600, seed=99))
+    return pipe
+
+
+class TestAnalyzeMany:
+    def test_matches_analyze_per_symbol(self, pipeline: AIPipeline, make_ohlcv: Callable[..., pd.DataFrame]) -> None:
+        requests = [
+            {"symbol": f"SYM{i}", "timeframe": "H1", "df": make_ohlcv(300, seed=i)}
+            for i in range(5)
+        ]
+        results = list(pipeline.analyze_many(requests, max_workers=2, batch_size=2))
+
+        assert sorted(r.symbol for r in results) == [r["symbol"] for r in requests]
+        by_symbol = {r.symbol: r for r in results}
+        for req in requests:
+            single = pipeline.analyze(req["symbol"], req["timeframe"], req["df"])
+            batched = by_symbol[req["symbol"]]
+            assert batched.errors == single.errors == []
+            assert batched.ml_signal == single.ml_signal
+            assert batched.ml_confidence == pytest.approx(single.ml_confidence)
+            assert batched.regime.regime == single.regime.regime
+            assert batched.regime.atr_percentile == pytest.approx(single.regime.atr_percentile)
+
+    def test_records_stage_latency(self, pipeline: AIPipeline, make_ohlcv: Callable[..., pd.DataFrame]) -> None:
+        requests = [
+            {"symbol": "XAUUSD", "timeframe": "M15", "df": make_ohlcv(200, seed=7)},
+            {"symbol": "EURUSD", "timeframe": "M15", "df": make_ohlcv(200, seed=8)},
+        ]
+        results = list(pipeline.analyze_many(requests))
+
+        for res in results:
+            assert {"features", "predict", "regime", "total"} <= set(res.stage_ms)
+            assert res.processing_time_ms > 0
+        stats = pipeline.stage_latency()
+        assert stats["total"]["count"] >= 2
+        assert sum(stats["features"]["buckets"].values()) == stats["features"]["count"]
+
+    def test_bad_frame_reports_error(self, pipeline: AIPipeline, make_ohlcv: Callable[..., pd.DataFrame]) -> None:
+        bad = make_ohlcv(100).drop(columns=["tick_volume", "open"])
+        requests = [
+            {"symbol": "BAD", "timeframe": "H1", "df": bad},
+            {"symbol": "GOOD", "timeframe": "H1", "df": make_ohlcv(300, seed=3)},
+        ]
+        results = {r.symbol: r for r in pipeline.analyze_many(requests)}
+
+        assert results["GOOD"].errors == []
+        assert results["BAD"].ml_signal == "HOLD"
+        assert any(e.startswith("Prediction") for e in results["BAD"].errors)
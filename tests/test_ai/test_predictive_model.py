@@ -72,3 +72,118 @@ class TestPredictiveModel:
 
         result = model2.predict(sample_features.tail(5))
         assert result.signal in ("BUY", "SELL", "HOLD")
+
+    def test_predict_batch_matches_predict(
+        self, sample_features: pd.DataFrame, sample_target: pd.Series
+    ) -> None:
+        model = PredictiveModel()
+        model.train(sample_features, sample_target)
+        batch = model.predict_batch(sample_features.tail(20))
+
+        assert len(batch) == 20
+        assert batch.probabilities.shape == (20, 3)
+        assert set(batch.signals) <= {"BUY", "SELL", "HOLD"}
+        assert ((batch.confidence >= 0.0) & (batch.confidence <= 1.0)).all()
+        for i in (0, 19):
+            single = model.predict(sample_features.tail(20).iloc[[i]])
+            assert batch.result(i) == single
+
+    def test_predict_batch_fills_missing_features_without_mutating(
+        self, sample_features: pd.DataFrame, sample_target: pd.Series
+    ) -> None:
+        model = PredictiveModel()
+        model.train(sample_features, sample_target)
+        partial = sample_features.tail(5).drop(columns=["feat_9"])
+
+        frame = model.predict_batch(partial).to_frame()
+        assert list(frame.columns) == ["signal", "confidence", "agreement"]
+        assert frame.index.equals(partial.index)
+        assert "feat_9" not in partial.columns
+
+    def test_predict_latest_per_symbol(
+        self, sample_features: pd.DataFrame, sample_target: pd.Series
+    ) -> None:
+        model = PredictiveModel()
+        model.train(sample_features, sample_target)
+        frames = {
+            "XAUUSD": sample_features.iloc[:100],
+            "EURUSD": sample_features.iloc[100:250],
+            "EMPTY": sample_features.iloc[:0],
+        }
+        results = model.predict_latest(frames)
+
+        assert set(results) == {"XAUUSD", "EURUSD"}
+        assert results["EURUSD"] == model.predict(frames["EURUSD"])
+
+    def test_parallel_training_matches_serial(
+        self, sample_features: pd.DataFrame, sample_target: pd.Series
+    ) -> None:
+        def config(workers: int) -> AIConfig:
+            cfg = AIConfig()
+            cfg.predictive.rf_n_estimators = 30
+            cfg.predictive.lgb_n_estimators = 30
+            cfg.predictive.n_cv_splits = 3
+            cfg.predictive.train_workers = workers
+            cfg.predictive.train_cpu_budget = 2
+            return cfg
+
+        serial = PredictiveModel(config(1)).train(sample_features, sample_target)
+        parallel = PredictiveModel(config(2)).train(sample_features, sample_target)
+
+        assert parallel.workers == 2
+        assert parallel.cv_scores == serial.cv_scores
+        assert parallel.best_model == serial.best_model
+        # one job per (family × fold) plus one final fit per family
+        assert len(parallel.job_timings) == len(parallel.models_trained) * 4
+        assert all(j["wall_sec"] > 0 for j in parallel.job_timings)
+
+    def test_artifact_bundle_loads_lazily(
+        self, sample_features: pd.DataFrame, sample_target: pd.Series, tmp_path
+    ) -> None:
+        import json
+
+        model = PredictiveModel()
+        model.train(sample_features, sample_target)
+        save_dir = tmp_path / "bundle"
+        model.save(str(save_dir))
+
+        manifest = json.loads((save_dir / "manifest.json").read_text())
+        assert manifest["feature_names"] == list(sample_features.columns)
+        assert set(manifest["models"]) == set(model._models)
+
+        loaded = PredictiveModel()
+        loaded.load(str(save_dir))
+        assert loaded.is_trained
+        assert loaded._models == {}  # nothing read until the first predict
+        assert isinstance(loaded._scaler.mean_, np.memmap)
+
+        expected = model.predict_batch(sample_features.tail(50))
+        actual = loaded.predict_batch(sample_features.tail(50))
+        assert list(actual.signals) == list(expected.signals)
+        np.testing.assert_allclose(actual.probabilities, expected.probabilities)
+
+    def test_legacy_load_replaces_opened_bundle(
+        self, sample_features: pd.DataFrame, sample_target: pd.Series, tmp_path
+    ) -> None:
+        import joblib
+
+        model = PredictiveModel()
+        model.train(sample_features, sample_target)
+        model.save(str(tmp_path / "bundle"))
+
+        legacy_dir = tmp_path / "legacy"
+        legacy_dir.mkdir()
+        joblib.dump(model._scaler, legacy_dir / "scaler.joblib")
+        joblib.dump(model._feature_names, legacy_dir / "feature_names.joblib")
+        for name, clf in model._models.items():
+            joblib.dump(clf, legacy_dir / f"{name}.joblib")
+
+        loaded = PredictiveModel()
+        loaded.load(str(tmp_path / "bundle"))
+        loaded.load(str(legacy_dir))
+        assert loaded._pending == {}
+        assert set(loaded._models) == set(model._models)
+
+        expected = model.predict_batch(sample_features.tail(20))
+        actual = loaded.predict_batch(sample_features.tail(20))
+        assert list(actual.signals) == list(expected.signals)
@@ -0,0 +1,67 @@
+"""Tests for the feature utilities and feature cache."""
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_core.utils import (
+    _FEATURE_CACHE,
+    build_feature_matrix,
+    clear_feature_cache,
+    get_feature_cache_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_feature_cache()
+    yield
+    clear_feature_cache()
+
+
+class TestFeatureCache:
+    def test_hit_returns_cached_matrix(self, make_ohlcv: Callable[..., pd.DataFrame]) -> None:
+        df = make_ohlcv(300)
+        first, _ = build_feature_matrix(df, symbol="XAUUSD", timeframe="H1")
+        second, _ = build_feature_matrix(df, symbol="XAUUSD", timeframe="H1")
+
+        assert second is first
+        stats = get_feature_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_new_bar_extends_cached_rows(self, make_ohlcv: Callable[..., pd.DataFrame]) -> None:
+        full = make_ohlcv(400)
+        build_feature_matrix(full.iloc[:-1], symbol="XAUUSD", timeframe="H1")
+        extended, names = build_feature_matrix(full, symbol="XAUUSD", timeframe="H1")
+        expected, expected_names = build_feature_matrix(full, use_cache=False)
+
+        assert get_feature_cache_stats()["extensions"] == 1
+        assert names == expected_names
+        assert extended.index.equals(expected.index)
+        np.testing.assert_allclose(extended.values, expected.values, rtol=1e-7, atol=1e-9)
+
+    def test_sliding_window_matches_full_build(self, make_ohlcv: Callable[..., pd.DataFrame]) -> None:
+        full = make_ohlcv(600)
+        build_feature_matrix(full.iloc[0:500], symbol="EURUSD", timeframe="M15")
+        window = full.iloc[1:501]
+        extended, _ = build_feature_matrix(window, symbol="EURUSD", timeframe="M15")
+        expected, _ = build_feature_matrix(window, use_cache=False)
+
+        assert get_feature_cache_stats()["extensions"] == 1
+        assert extended.index.equals(expected.index)
+        np.testing.assert_allclose(extended.values, expected.values, rtol=1e-7, atol=1e-9)
+
+    def test_lru_eviction_bounds_entries(self, make_ohlcv: Callable[..., pd.DataFrame]) -> None:
+        limit = _FEATURE_CACHE.max_entries
+        _FEATURE_CACHE.max_entries = 3
+        try:
+            for seed in range(6):
+                build_feature_matrix(make_ohlcv(200, seed=seed))
+            stats = get_feature_cache_stats()
+            assert stats["entries"] == 3
+            assert stats["evictions"] == 3
+        finally:
+            _FEATURE_CACHE.max_entries = limit
@@ -0,0 +1,61 @@
+"""Tests for the vectorized indicator kernels."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.api.indicator_calc import compute_indicator
+
+FLAT = 30
+
+
+@pytest.fixture
+def flat_df() -> pd.DataFrame:
+    """Random walk with three flat stretches of FLAT bars."""
+    rng = np.random.default_rng(1)
+    c = 100 + np.cumsum(rng.normal(0, 1, 400))
+    for s in (100, 200, 300):
+        c[s:s + FLAT] = c[s]
+    return pd.DataFrame({"open": c, "high": c, "low": c, "close": c, "tick_volume": np.ones(400)})
+
+
+def _loop_rsi(close, period):
+    """The original per-bar Wilder RSI."""
+    out = np.full(len(close), np.nan)
+    delta = np.diff(close)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    avg_g, avg_l = np.mean(gain[:period]), np.mean(loss[:period])
+    out[period] = 100.0 if avg_l == 0 else 100.0 - 100.0 / (1.0 + avg_g / avg_l)
+    for i in range(period, len(delta)):
+        avg_g = (avg_g * (period - 1) + gain[i]) / period
+        avg_l = (avg_l * (period - 1) + loss[i]) / period
+        out[i + 1] = 100.0 if avg_l == 0 else 100.0 - 100.0 / (1.0 + avg_g / avg_l)
+    return out
+
+
+class TestFlatRanges:
+    def test_stochrsi_flat_segments(self, flat_df: pd.DataFrame) -> None:
+        k = compute_indicator(flat_df, "STOCHRSI", {})["k"]
+        rsi = _loop_rsi(flat_df["close"].values, 14)
+        rsi[np.isnan(rsi)] = 50
+
+        n = len(rsi)
+        raw = np.full(n, np.nan)
+        span = np.full(n, np.nan)
+        for i in range(13, n):
+            w = rsi[i - 13:i + 1]
+            span[i] = w.max() - w.min()
+            raw[i] = (rsi[i] - w.min()) / span[i] * 100 if span[i] > 1e-9 else 50.0
+        ref = pd.Series(raw).rolling(3).mean().values
+
+        for s in (100, 200, 300):
+            # RSI holds its bar-s value through the run; smoothed %K from s+13+2
+            np.testing.assert_allclose(k[s + 15:s + FLAT], 50.0, atol=1e-9)
+        real = pd.Series(span > 1e-9).rolling(3).min().fillna(0).astype(bool).values
+        np.testing.assert_allclose(k[real], ref[real], rtol=1e-6, atol=1e-6)
+
+    def test_williams_flat_segments(self, flat_df: pd.DataFrame) -> None:
+        out = compute_indicator(flat_df, "WILLIAMS", {"period": 14})["value"]
+        for s in (100, 200, 300):
+            np.testing.assert_array_equal(out[s + 13:s + FLAT], -50.0)
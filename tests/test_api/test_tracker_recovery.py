@@ -0,0 +1,93 @@
+"""Tests for downtime recovery in the tracker engine."""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from backend.api import tracker_engine
+from backend.mt5 import bar_source
+
+NOW = 1_760_000_000 // 60 * 60
+N_BARS = 15_000          # ~10 days of M1, more than RECOVERY_BARS
+
+
+class FakeSource(bar_source.BarSource):
+    """Flat M1 series at 100.0 with one spike down; honours count/start/end like MT5."""
+
+    def __init__(self, dip_at):
+        bars = np.zeros(N_BARS, dtype=bar_source.BAR_DTYPE)
+        bars["time"] = NOW - 60 * np.arange(N_BARS, 0, -1)
+        bars["open"] = bars["high"] = bars["close"] = 100.0
+        bars["low"] = 99.9
+        bars["low"][dip_at] = 98.0
+        self.bars = bars
+
+    def rates(self, symbol, timeframe, count=None, start=None, end=None):
+        out = self.bars
+        if start is not None:
+            out = out[out["time"] >= start]
+        if end is not None:
+            out = out[out["time"] <= end]
+        if count:
+            out = out[-count:]
+        return out
+
+
+@pytest.fixture
+def recovery(monkeypatch):
+    """Run recover_after_restart on one BUY trade; return the recorded exits."""
+    exits = []
+    monkeypatch.setattr(tracker_engine, "record_event", lambda *a, **k: True)
+    monkeypatch.setattr(tracker_engine, "record_exit",
+                        lambda tid, price, reason, *a: exits.append((tid, price, reason)))
+
+    def run(source, opened_bar):
+        bars = getattr(source, "upstream", source).bars
+        opened = datetime.fromtimestamp(int(bars["time"][opened_bar]), tz=timezone.utc)
+        trade = {"id": "t1", "symbol": "XAUUSD", "direction": "BUY",
+                 "opened_at": opened.isoformat(), "sl_price": 99.0, "tp1_price": 105.0}
+        monkeypatch.setattr(tracker_engine, "load_active", lambda: {"active": [trade]})
+        monkeypatch.setattr(bar_source, "_source", source)
+        result = tracker_engine.recover_after_restart()
+        return result, exits
+
+    return run
+
+
+class TestRecoverAfterRestart:
+    def test_sl_hit_in_recent_window(self, recovery) -> None:
+        result, exits = recovery(FakeSource(dip_at=N_BARS - 50), opened_bar=N_BARS - 100)
+        assert result["recovered"] == 1
+        assert exits == [("t1", 99.0, "sl_recovery")]
+
+    def test_trade_older_than_window_scans_from_open(self, recovery) -> None:
+        # SL hit shortly after the open, long before the newest RECOVERY_BARS bars
+        result, exits = recovery(FakeSource(dip_at=200), opened_bar=100)
+        assert result["recovered"] == 1
+        assert exits == [("t1", 99.0, "sl_recovery")]
+
+    def test_hit_past_scan_cap_is_ignored(self, recovery) -> None:
+        result, exits = recovery(FakeSource(dip_at=100 + tracker_engine.RECOVERY_BARS + 10),
+                                 opened_bar=100)
+        assert result["recovered"] == 0
+        assert exits == []
+
+    def test_old_trade_through_empty_store(self, recovery, tmp_path) -> None:
+        source = bar_source.StoreBarSource(bar_source.HistoryStore(str(tmp_path)),
+                                           upstream=FakeSource(dip_at=200))
+        result, exits = recovery(source, opened_bar=100)
+        assert result["recovered"] == 1
+        assert exits == [("t1", 99.0, "sl_recovery")]
+
+    def test_old_trade_through_partial_store(self, recovery, tmp_path) -> None:
+        upstream = FakeSource(dip_at=200)
+        store = bar_source.HistoryStore(str(tmp_path))
+        store.update("XAUUSD", "M1", upstream.bars[-bar_source.SEED_BARS:])
+        source = bar_source.StoreBarSource(store, upstream=upstream)
+
+        result, exits = recovery(source, opened_bar=100)
+
+        assert result["recovered"] == 1
+        assert exits == [("t1", 99.0, "sl_recovery")]
+        assert store.first_time("XAUUSD", "M1") <= int(upstream.bars["time"][100])
@@ -0,0 +1,63 @@
+"""Tests for the append-only trade record store."""
+
+import json
+
+import pytest
+
+from backend.api import trade_store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Point the store at an empty database under tmp_path."""
+    track_dir = tmp_path / "track_records"
+    track_dir.mkdir()
+    monkeypatch.setattr(trade_store, "TRACK_DIR", str(track_dir))
+    monkeypatch.setattr(trade_store, "DB_FILE", str(track_dir / "trades.db"))
+    monkeypatch.setattr(trade_store, "MIGRATED_DIR", str(track_dir / "_migrated_json"))
+    return track_dir
+
+
+def _trade(tid, closed_at, pnl=1.0):
+    return {"id": tid, "symbol": "EURUSD", "status": "closed", "outcome": "win",
+            "pnl_usd": pnl, "opened_at": closed_at, "closed_at": closed_at}
+
+
+class TestAppendTrade:
+    def test_append_returns_seq(self, store) -> None:
+        seq = trade_store.append_trade("RSI_01", _trade("t1", "2026-01-01T10:00:00"))
+        assert seq == 1
+        assert trade_store.row_count() == 1
+
+    def test_same_trade_twice_keeps_seq(self, store) -> None:
+        first = trade_store.append_trade("RSI_01", _trade("t1", "2026-01-01T10:00:00", pnl=1.0))
+        again = trade_store.append_trade("RSI_01", _trade("t1", "2026-01-01T10:00:00", pnl=2.5))
+
+        assert first == 1
+        assert again is None
+        assert trade_store.row_count() == 1
+        # updated in place, not re-appended
+        assert [s for s, _, _ in trade_store.iter_since(0)] == [1]
+        assert trade_store.get_trade("RSI_01", "t1")["pnl_usd"] == 2.5
+
+    def test_same_id_other_strategy_is_new(self, store) -> None:
+        trade_store.append_trade("RSI_01", _trade("t1", "2026-01-01T10:00:00"))
+        assert trade_store.append_trade("MACD_02", _trade("t1", "2026-01-01T10:00:00")) == 2
+
+
+class TestMigration:
+    def test_seq_follows_closed_at_across_files(self, store) -> None:
+        # rec files are newest-first; "a" sorts first by name but holds later trades
+        files = {
+            "rec_a.json": [_trade("a2", "2026-01-04T00:00:00"), _trade("a1", "2026-01-02T00:00:00")],
+            "rec_b.json": [_trade("b2", "2026-01-03T00:00:00"), _trade("b1", "2026-01-01T00:00:00")],
+        }
+        for name, trades in files.items():
+            (store / name).write_text(json.dumps({"trades": trades, "stats": {}}), encoding="utf-8")
+
+        trade_store.row_count()  # first use runs the migration
+
+        order = [t["id"] for _, _, t in trade_store.iter_since(0)]
+        assert order == ["b1", "a1", "b2", "a2"]
+        assert not list(store.glob("rec_*.json"))
+        assert trade_store.load_meta("a") == {"stats": {}}
@@ -0,0 +1,84 @@
+"""Tests for the bar sources and the local history store."""
+
+import numpy as np
+import pytest
+
+from backend.mt5.bar_source import BAR_DTYPE, SEED_BARS, BarSource, HistoryStore, StoreBarSource
+
+N_BARS = 20_000
+T0 = 1_700_000_000 // 60 * 60
+
+
+class FakeUpstream(BarSource):
+    """Broker-like M1 series; counts calls and honours count/start/end like MT5."""
+
+    name = "fake"
+
+    def __init__(self, n=N_BARS):
+        self.bars = np.zeros(n, dtype=BAR_DTYPE)
+        self.bars["time"] = T0 + 60 * np.arange(n)
+        self.bars["close"] = np.arange(n, dtype=float)
+        self.calls = 0
+
+    def rates(self, symbol, timeframe, count=None, start=None, end=None):
+        self.calls += 1
+        out = self.bars
+        if start is not None:
+            out = out[out["time"] >= start]
+        if end is not None:
+            out = out[out["time"] <= end]
+        if count:
+            out = out[-count:]
+        return out.copy()
+
+
+@pytest.fixture
+def upstream() -> FakeUpstream:
+    return FakeUpstream()
+
+
+@pytest.fixture
+def source(tmp_path, upstream) -> StoreBarSource:
+    return StoreBarSource(HistoryStore(str(tmp_path)), upstream=upstream)
+
+
+class TestStoreBarSource:
+    def test_empty_store_seeds_newest_bars(self, source: StoreBarSource) -> None:
+        out = source.rates("XAUUSD", "M1", count=10)
+        assert len(out) == 10
+        assert source.store.count("XAUUSD", "M1") == SEED_BARS
+
+    def test_start_before_store_is_backfilled(self, source: StoreBarSource, upstream) -> None:
+        source.rates("XAUUSD", "M1", count=10)           # store holds the newest SEED_BARS
+        start = int(upstream.bars["time"][1000])
+
+        out = source.rates("XAUUSD", "M1", start=start)
+
+        assert int(out["time"][0]) == start
+        assert len(out) == N_BARS - 1000
+        assert source.store.first_time("XAUUSD", "M1") == start
+        np.testing.assert_array_equal(np.diff(out["time"]), 60)
+
+    def test_backfill_is_not_repeated(self, source: StoreBarSource, upstream) -> None:
+        start = int(upstream.bars["time"][500])
+        source.rates("XAUUSD", "M1", start=start)
+        calls = upstream.calls
+        source.rates("XAUUSD", "M1", start=start)
+        assert upstream.calls == calls
+
+    def test_start_before_broker_history_serves_what_exists(self, source: StoreBarSource,
+                                                            upstream) -> None:
+        out = source.rates("XAUUSD", "M1", start=T0 - 3600)
+        assert int(out["time"][0]) == T0
+        assert len(out) == N_BARS
+
+    def test_unwritable_store_falls_back_to_upstream(self, source: StoreBarSource, upstream,
+                                                     monkeypatch) -> None:
+        source.rates("XAUUSD", "M1", count=10)
+        monkeypatch.setattr(source.store, "update", lambda *a: 0)
+        start = int(upstream.bars["time"][1000])
+
+        out = source.rates("XAUUSD", "M1", start=start)
+
+        assert int(out["time"][0]) == start
+        assert len(out) == N_BARS - 1000